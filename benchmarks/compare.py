@@ -0,0 +1,261 @@
+"""Compare two benchmark runs: ``python -m benchmarks.compare``.
+
+A benchmark counts as slower or faster only when its median moved by more
+than both a relative threshold and the noise of the two runs, measured as
+a multiple of the larger interquartile range.  Contributors run::
+
+    git stash && python -m benchmarks.run -o base.json && git stash pop
+    python -m benchmarks.compare base.json
+
+which runs the suite again with the parameters of ``base.json`` and exits
+with status 1 when anything got slower.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from fnmatch import fnmatchcase
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from pydantic import BaseModel
+
+from .run import format_seconds, summarize
+
+# A median has to move by more than this fraction...
+DEFAULT_THRESHOLD = 0.10
+# ...and by more than this many interquartile ranges to count.
+NOISE_FACTOR = 1.5
+# Fewer rounds than this give no meaningful spread.
+MIN_ROUNDS = 3
+
+SLOWER, FASTER, SAME = "slower", "faster", "same"
+ADDED, REMOVED, NOISY = "added", "removed", "too few rounds"
+EXIT_SLOWER = 1
+
+
+class Comparison(BaseModel):
+    """How one benchmark changed between two runs."""
+
+    name: str
+    verdict: str
+    baseline: Optional[float] = None
+    current: Optional[float] = None
+    # Smallest change of the median that counts, in seconds.
+    threshold: float = 0.0
+
+    @property
+    def change(self) -> Optional[float]:
+        if not self.baseline or self.current is None:
+            return None
+        return self.current / self.baseline - 1
+
+
+def load(path: Path) -> Dict[str, Any]:
+    results = json.loads(Path(path).read_text())
+    if "benchmarks" not in results:
+        raise ValueError(f"{path} is not a benchmark results file")
+    return results
+
+
+def _stats(result: Dict[str, Any]) -> Tuple[Dict[str, float], int]:
+    rounds = result.get("rounds") or [result["median"]]
+    return summarize(rounds), len(rounds)
+
+
+def threshold_for(name: str, thresholds: Dict[str, float]) -> float:
+    """Return the relative threshold of the last pattern matching ``name``."""
+    value = DEFAULT_THRESHOLD
+    for pattern, threshold in thresholds.items():
+        if fnmatchcase(name, pattern):
+            value = threshold
+    return value
+
+
+def compare(
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    *,
+    thresholds: Optional[Dict[str, float]] = None,
+    noise_factor: float = NOISE_FACTOR,
+) -> List[Comparison]:
+    """Compare every benchmark of two results files."""
+    thresholds = thresholds or {}
+    before = baseline["benchmarks"]
+    after = current["benchmarks"]
+    comparisons = []
+    for name in sorted(set(before) | set(after)):
+        if name not in after:
+            median = before[name]["median"]
+            item = Comparison(name=name, verdict=REMOVED, baseline=median)
+            comparisons.append(item)
+            continue
+        if name not in before:
+            median = after[name]["median"]
+            item = Comparison(name=name, verdict=ADDED, current=median)
+            comparisons.append(item)
+            continue
+        old, old_rounds = _stats(before[name])
+        new, new_rounds = _stats(after[name])
+        noise = noise_factor * max(old["iqr"], new["iqr"])
+        relative = threshold_for(name, thresholds) * old["median"]
+        threshold = max(relative, noise)
+        delta = new["median"] - old["median"]
+        if min(old_rounds, new_rounds) < MIN_ROUNDS:
+            verdict = NOISY
+        elif delta > threshold:
+            verdict = SLOWER
+        elif delta < -threshold:
+            verdict = FASTER
+        else:
+            verdict = SAME
+        comparisons.append(
+            Comparison(
+                name=name,
+                verdict=verdict,
+                baseline=old["median"],
+                current=new["median"],
+                threshold=threshold,
+            )
+        )
+    return comparisons
+
+
+def format_table(comparisons: List[Comparison]) -> str:
+    rows = [("benchmark", "baseline", "current", "change", "noise", "")]
+    for item in comparisons:
+        change = item.change
+        base, current = item.baseline, item.current
+        rows.append(
+            (
+                item.name,
+                "-" if base is None else format_seconds(base),
+                "-" if current is None else format_seconds(current),
+                "-" if change is None else f"{change:+.1%}",
+                f"±{item.threshold / base:.1%}" if base else "-",
+                item.verdict,
+            )
+        )
+    widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+    lines = []
+    for row in rows:
+        cells = [row[0].ljust(widths[0])]
+        for cell, width in zip(row[1:-1], widths[1:]):
+            cells.append(cell.rjust(width))
+        cells.append(row[-1])
+        lines.append("  ".join(cells).rstrip())
+    return "\n".join(lines)
+
+
+def summary(comparisons: List[Comparison]) -> str:
+    counts = {verdict: 0 for verdict in (SLOWER, FASTER, SAME)}
+    for item in comparisons:
+        if item.verdict in counts:
+            counts[item.verdict] += 1
+    status = "FAIL" if counts[SLOWER] else "PASS"
+    details = ", ".join(f"{n} {verdict}" for verdict, n in counts.items())
+    return f"{status}: {details}"
+
+
+def _environment_warnings(
+    baseline: Dict[str, Any], current: Dict[str, Any]
+) -> List[str]:
+    warnings = []
+    old = baseline.get("environment", {})
+    new = current.get("environment", {})
+    for key in ("python", "implementation", "machine", "cpus"):
+        if old.get(key) != new.get(key):
+            warnings.append(f"{key} differs: {old.get(key)} != {new.get(key)}")
+    if baseline.get("parameters") != current.get("parameters"):
+        warnings.append("runs used different parameters")
+    return warnings
+
+
+def _threshold(text: str) -> Tuple[str, float]:
+    pattern, _, value = text.rpartition("=")
+    scale = 100 if value.endswith("%") else 1
+    try:
+        threshold = float(value.rstrip("%")) / scale
+    except ValueError:
+        message = f"Invalid threshold {text!r}"
+        raise argparse.ArgumentTypeError(message) from None
+    return pattern or "*", threshold
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.compare",
+        description="Compare benchmark results and fail on slowdowns.",
+    )
+    parser.add_argument("baseline", type=Path, help="Results to compare with")
+    parser.add_argument(
+        "current",
+        type=Path,
+        nargs="?",
+        default=None,
+        help="New results; by default the suite is run now",
+    )
+    parser.add_argument(
+        "--threshold",
+        "-t",
+        type=_threshold,
+        action="append",
+        default=[],
+        metavar="[PATTERN=]VALUE",
+        help=(
+            "Relative change that counts, e.g. 0.05, 5%% or "
+            "'classify.*=3%%'; the last matching pattern applies "
+            f"(default {DEFAULT_THRESHOLD:.0%}%)"
+        ),
+    )
+    parser.add_argument(
+        "--noise-factor",
+        type=float,
+        default=NOISE_FACTOR,
+        help="Interquartile ranges a change must exceed",
+    )
+    parser.add_argument(
+        "--output", "-o", type=Path, default=None, help="Save new results"
+    )
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    baseline = load(args.baseline)
+    if args.current is not None:
+        current = load(args.current)
+    else:
+        from .generator import CATALOG_ASSETS
+        from .run import run_suite
+
+        parameters = baseline.get("parameters", {})
+        current = run_suite(
+            parameters.get("sources", 40),
+            seed=parameters.get("seed", 0),
+            rounds=parameters.get("rounds", 7),
+            select=parameters.get("groups", ()),
+            catalog_assets=parameters.get("catalog_assets", CATALOG_ASSETS),
+        )
+    if args.output is not None:
+        args.output.write_text(json.dumps(current, indent=2))
+
+    for warning in _environment_warnings(baseline, current):
+        print(f"warning: {warning}", file=sys.stderr)
+    comparisons = compare(
+        baseline,
+        current,
+        thresholds=dict(args.threshold),
+        noise_factor=args.noise_factor,
+    )
+    print(format_table(comparisons))
+    print()
+    print(summary(comparisons))
+    slower = any(item.verdict == SLOWER for item in comparisons)
+    return EXIT_SLOWER if slower else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
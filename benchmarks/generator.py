@@ -0,0 +1,286 @@
+"""Deterministic synthetic supplier sources for benchmarks.
+
+Sources mimic what artists drop into the workspace: texture sets in
+nested folders or zip archives named after supplier conventions such as
+``Bark_COL_4K.jpg``, models shipped with their textures, and loose HDRIs.
+The same ``seed`` always produces byte-identical files.
+"""
+
+from __future__ import annotations
+
+import io
+import random
+import zipfile
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from PIL import Image
+from pydantic import BaseModel
+
+from asset_organiser.config_models import (
+    AssetTypeDefinition,
+    ClassificationSettings,
+    FileTypeDefinition,
+    LibraryConfig,
+)
+from asset_organiser.library import CatalogEntry
+
+FOLDER, ZIP, LOOSE = "folder", "zip", "loose"
+
+# Fixed timestamp so archives do not depend on when they were written.
+ZIP_DATE = (2020, 1, 1, 0, 0, 0)
+
+SCALES = {"tiny": 4, "small": 40, "medium": 400, "large": 2000}
+# Assets in the generated library catalog searched by the benchmarks.
+CATALOG_ASSETS = 100_000
+
+# file type -> (keywords, standalone)
+FILE_TYPES: Dict[str, Tuple[List[str], bool]] = {
+    "MAP_COL": (["col", "albedo", "basecolor", "diffuse", "color"], False),
+    "MAP_NRM": (["nrm", "normal"], False),
+    "MAP_ROUGH": (["rough", "roughness"], False),
+    "MAP_METAL": (["metal", "metalness", "metallic"], False),
+    "MAP_AO": (["ao", "ambientocclusion", "occlusion"], False),
+    "MAP_DISP": (["disp", "displacement", "height"], False),
+    "MAP_OPC": (["opacity", "alpha", "mask"], False),
+    "PREVIEW": (["preview", "thumb"], False),
+    "MODEL": ([".fbx", ".obj"], True),
+    "HDRI": ([".hdr", ".exr"], True),
+}
+ASSET_TYPES: Dict[str, List[str]] = {
+    "TEXTURE": ["wood", "bark", "rock", "metal", "fabric"],
+    "MODEL": ["mesh", ".fbx", ".obj"],
+    "HDRI": [".hdr", ".exr", "sky"],
+}
+
+# How each supplier spells map names, and how it names files.
+SUPPLIERS: Dict[str, Tuple[Dict[str, str], str]] = {
+    "Poliigon": (
+        {
+            "MAP_COL": "COL",
+            "MAP_NRM": "NRM",
+            "MAP_ROUGH": "ROUGH",
+            "MAP_METAL": "METAL",
+            "MAP_AO": "AO",
+            "MAP_DISP": "DISP",
+        },
+        "{name}_{map}_{res}.jpg",
+    ),
+    "AmbientCG": (
+        {
+            "MAP_COL": "Color",
+            "MAP_NRM": "NormalGL",
+            "MAP_ROUGH": "Roughness",
+            "MAP_METAL": "Metalness",
+            "MAP_AO": "AmbientOcclusion",
+            "MAP_DISP": "Displacement",
+            "MAP_OPC": "Opacity",
+        },
+        "{name}_{res}-JPG_{map}.jpg",
+    ),
+    "Quixel": (
+        {
+            "MAP_COL": "Albedo",
+            "MAP_NRM": "Normal",
+            "MAP_ROUGH": "Roughness",
+            "MAP_AO": "AO",
+            "MAP_DISP": "Displacement",
+        },
+        "{code}_{res}_{map}.png",
+    ),
+}
+SURFACES = [
+    "Bark",
+    "Rock",
+    "Wood",
+    "Fabric",
+    "Metal",
+    "Concrete",
+    "Brick",
+    "Moss",
+    "Sand",
+    "Tiles",
+]
+RESOLUTIONS = ["1K", "2K", "4K", "8K"]
+FINISHES = ["Old", "Wet", "Rough", "Painted", "Cracked", "Polished", "Dark"]
+TAGS = ["outdoor", "indoor", "nature", "urban", "worn", "clean", "tiling"]
+SKIES = ["Sky_Sunset", "Sky_Overcast", "Studio_Soft", "Forest_Clearing"]
+
+
+class SyntheticSource(BaseModel):
+    """One generated source and the relative paths of its files."""
+
+    name: str
+    layout: str
+    supplier: str
+    files: List[str]
+
+
+def _texture_files(
+    rng: random.Random, supplier: str, name: str, nested: bool
+) -> List[str]:
+    maps, pattern = SUPPLIERS[supplier]
+    res = rng.choice(RESOLUTIONS)
+    code = f"{name[:4].lower()}{rng.randrange(16**4):04x}"
+    chosen = [t for t in maps if t == "MAP_COL" or rng.random() < 0.8]
+    folder = f"{name}/{res}/" if nested else f"{name}/"
+    files = [
+        folder + pattern.format(name=name, map=maps[t], res=res, code=code)
+        for t in chosen
+    ]
+    if rng.random() < 0.5:
+        files.append(f"{name}/{name}_preview.png")
+    return files
+
+
+def plan_sources(count: int, seed: int = 0) -> List[SyntheticSource]:
+    """Describe ``count`` sources without writing anything."""
+    rng = random.Random(seed)
+    sources: List[SyntheticSource] = []
+    for index in range(count):
+        supplier = rng.choice(sorted(SUPPLIERS))
+        roll = rng.random()
+        if roll < 0.1:
+            # A loose HDRI dropped on its own.
+            sky = rng.choice(SKIES)
+            ext = rng.choice([".hdr", ".exr"])
+            name = f"{sky}_{rng.choice(RESOLUTIONS)}{ext}"
+            source = SyntheticSource(
+                name=f"{index:05d}_{name}",
+                layout=LOOSE,
+                supplier=supplier,
+                files=[name],
+            )
+        else:
+            layout = ZIP if roll < 0.5 else FOLDER
+            files = ["readme.txt"] if rng.random() < 0.3 else []
+            for _ in range(rng.randint(1, 4)):
+                surface = rng.choice(SURFACES)
+                name = f"{surface}{rng.randint(1, 99):02d}"
+                nested = rng.random() < 0.5
+                files.extend(_texture_files(rng, supplier, name, nested))
+            if rng.random() < 0.2:
+                model = f"{rng.choice(SURFACES)}_Mesh{rng.randint(1, 9)}"
+                ext = rng.choice([".fbx", ".obj"])
+                files.append(f"{model}/{model}{ext}")
+                files.extend(_texture_files(rng, supplier, model, False))
+            suffix = ".zip" if layout == ZIP else ""
+            source = SyntheticSource(
+                name=f"{index:05d}_{supplier}_Pack{suffix}",
+                layout=layout,
+                supplier=supplier,
+                files=list(dict.fromkeys(files)),
+            )
+        sources.append(source)
+    return sources
+
+
+def catalog_entries(count: int, seed: int = 0) -> List[CatalogEntry]:
+    """Describe ``count`` processed library assets for the catalog."""
+    rng = random.Random(seed)
+    entries: List[CatalogEntry] = []
+    for index in range(count):
+        supplier = rng.choice(sorted(SUPPLIERS))
+        asset_type = rng.choice(sorted(ASSET_TYPES))
+        surface = rng.choice(SURFACES)
+        name = f"{rng.choice(FINISHES)}{surface}{index:06d}"
+        entries.append(
+            CatalogEntry(
+                path=f"{supplier}/{asset_type}/{name}",
+                asset_id=f"{supplier}/{asset_type}/{name}",
+                name=name,
+                asset_type=asset_type,
+                supplier=supplier,
+                tags=[surface.lower(), *rng.sample(TAGS, 2)],
+                filetypes=rng.sample(sorted(FILE_TYPES), 4),
+                resolutions=[rng.choice(RESOLUTIONS)],
+            )
+        )
+    return entries
+
+
+def _content(name: str, seed: int, size: int) -> bytes:
+    """Return tiny placeholder contents for the file ``name``."""
+    suffix = Path(name).suffix.lower()
+    if suffix in (".png", ".jpg"):
+        rng = random.Random(f"{seed}:{name}")
+        pixels = bytes(rng.randrange(256) for _ in range(size * size * 3))
+        image = Image.frombytes("RGB", (size, size), pixels)
+        buffer = io.BytesIO()
+        image.save(buffer, "PNG" if suffix == ".png" else "JPEG")
+        return buffer.getvalue()
+    if suffix == ".hdr":
+        return b"#?RADIANCE\nFORMAT=32-bit_rle_rgbe\n\n"
+    if suffix == ".exr":
+        return b"\x76\x2f\x31\x01"
+    if suffix == ".obj":
+        return b"v 0 0 0\nv 1 0 0\nv 0 1 0\nf 1 2 3\n"
+    if suffix == ".fbx":
+        return b"Kaydara FBX Binary  \x00"
+    return f"Synthetic file {name}\n".encode()
+
+
+def write_sources(
+    sources: List[SyntheticSource],
+    root: Path,
+    *,
+    seed: int = 0,
+    image_size: int = 4,
+) -> List[Path]:
+    """Write ``sources`` below ``root``; returns their paths."""
+    root = Path(root)
+    root.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for source in sources:
+        path = root / source.name
+        if source.layout == LOOSE:
+            path.write_bytes(_content(source.files[0], seed, image_size))
+        elif source.layout == ZIP:
+            with zipfile.ZipFile(path, "w") as archive:
+                for name in source.files:
+                    info = zipfile.ZipInfo(name, date_time=ZIP_DATE)
+                    data = _content(name, seed, image_size)
+                    archive.writestr(info, data)
+        else:
+            for name in source.files:
+                target = path / name
+                target.parent.mkdir(parents=True, exist_ok=True)
+                target.write_bytes(_content(name, seed, image_size))
+        paths.append(path)
+    return paths
+
+
+def generate(
+    root: Path,
+    count: int,
+    *,
+    seed: int = 0,
+    image_size: int = 4,
+) -> List[Path]:
+    """Plan and write ``count`` sources below ``root``."""
+    sources = plan_sources(count, seed)
+    return write_sources(sources, root, seed=seed, image_size=image_size)
+
+
+def library_config() -> LibraryConfig:
+    """Return a library configuration matching the generated names."""
+    file_types = {
+        name: FileTypeDefinition(
+            alias=name.removeprefix("MAP_"),
+            rule_keywords=keywords,
+            is_standalone=standalone,
+        )
+        for name, (keywords, standalone) in FILE_TYPES.items()
+    }
+    asset_types = {
+        name: AssetTypeDefinition(rule_keywords=keywords)
+        for name, keywords in ASSET_TYPES.items()
+    }
+    return LibraryConfig(
+        FILE_TYPE_DEFINITIONS=file_types,
+        ASSET_TYPE_DEFINITIONS=asset_types,
+        CLASSIFICATION=ClassificationSettings(
+            providers=[],
+            keyword_rules={"readme": "IGNORE", "license": "IGNORE"},
+        ),
+    )
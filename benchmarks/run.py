@@ -0,0 +1,405 @@
+"""Run the benchmark suite: ``python -m benchmarks.run``.
+
+Every benchmark is timed for several rounds on sources fabricated by
+:mod:`benchmarks.generator`; the per-round timings and their median and
+interquartile range are written as JSON so runs can be compared.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from asset_organiser.classification.models import ClassificationState
+from asset_organiser.classification.service import ClassificationService
+from asset_organiser.config_service import ConfigService
+from asset_organiser.library import LibraryCatalog
+from asset_organiser.llm import NoOpLLMClient
+from asset_organiser.scanning import collect_files
+
+from . import generator
+
+RESULTS_VERSION = 1
+DEFAULT_ROUNDS = 7
+DEFAULT_OUTPUT_DIR = Path(".benchmarks")
+# Fast operations are repeated until a round lasts at least this long.
+MIN_ROUND_TIME = 0.02
+
+Samples = Dict[str, List[float]]
+
+
+class Context:
+    """Generated sources and services shared by all benchmarks."""
+
+    def __init__(
+        self,
+        root: Path,
+        count: int,
+        seed: int = 0,
+        catalog_assets: int = generator.CATALOG_ASSETS,
+    ) -> None:
+        self.root = Path(root)
+        self.seed = seed
+        self.catalog_assets = catalog_assets
+        sources = self.root / "sources"
+        self.sources = generator.generate(sources, count, seed=seed)
+        self.config = ConfigService(app_config_path=self.root / "app.json")
+        self.config.set_library_path(self.root / "library")
+        self.config.library_config = generator.library_config()
+        self.classifier = ClassificationService(self.config, NoOpLLMClient())
+        self.file_lists = [
+            [str(f) for f in collect_files(path)] for path in self.sources
+        ]
+
+    def states(self) -> List[ClassificationState]:
+        """Return fresh, unclassified states for every source."""
+        return [self.classifier.from_file_list(f) for f in self.file_lists]
+
+    def classified(self) -> List[ClassificationState]:
+        return [self.classifier.classify(state) for state in self.states()]
+
+
+def repeat(func: Callable[[], Any], rounds: int) -> List[float]:
+    """Return the seconds per call of ``func`` for each round."""
+    func()
+    started = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - started
+    number = max(1, min(10_000, int(MIN_ROUND_TIME / max(elapsed, 1e-9))))
+    samples = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for _ in range(number):
+            func()
+        samples.append((time.perf_counter() - started) / number)
+    return samples
+
+
+def timed(
+    setup: Callable[[], Any], func: Callable[[Any], Any], rounds: int
+) -> List[float]:
+    """Time one call of ``func(setup())`` per round, excluding setup."""
+    func(setup())
+    samples = []
+    for _ in range(rounds):
+        data = setup()
+        started = time.perf_counter()
+        func(data)
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+# ----------------------------------------------------------------------
+BENCHMARKS: Dict[str, Callable[[Context, int], Samples]] = {}
+
+
+def benchmark(name: str):
+    def register(func: Callable[[Context, int], Samples]):
+        BENCHMARKS[name] = func
+        return func
+
+    return register
+
+
+@benchmark("scan")
+def bench_scan(ctx: Context, rounds: int) -> Samples:
+    def scan() -> None:
+        for path in ctx.sources:
+            collect_files(path)
+
+    return {"scan.collect_files": repeat(scan, rounds)}
+
+
+@benchmark("classify")
+def bench_classify(ctx: Context, rounds: int) -> Samples:
+    def classify(states: List[ClassificationState]) -> None:
+        for state in states:
+            ctx.classifier.classify(state)
+
+    return {
+        "classify.from_file_list": repeat(ctx.states, rounds),
+        "classify.service": timed(ctx.states, classify, rounds),
+    }
+
+
+@benchmark("modules")
+def bench_modules(ctx: Context, rounds: int) -> Samples:
+    """Time each classification module over the whole corpus."""
+    modules = ctx.classifier.pipeline.modules
+    totals = dict.fromkeys(modules, 0.0)
+
+    def wrap(name: str, run: Callable) -> Callable:
+        def timed_run(state):
+            started = time.perf_counter()
+            try:
+                return run(state)
+            finally:
+                totals[name] += time.perf_counter() - started
+
+        return timed_run
+
+    for name, module in modules.items():
+        module.run = wrap(name, module.run)
+    samples: Samples = {f"classify.module.{name}": [] for name in modules}
+    try:
+        ctx.classified()
+        for _ in range(rounds):
+            states = ctx.states()
+            totals.update(dict.fromkeys(totals, 0.0))
+            for state in states:
+                ctx.classifier.classify(state)
+            for name, total in totals.items():
+                samples[f"classify.module.{name}"].append(total)
+    finally:
+        for module in modules.values():
+            del module.run
+    return samples
+
+
+@benchmark("serialize")
+def bench_serialize(ctx: Context, rounds: int) -> Samples:
+    combined = ClassificationState()
+    for index, state in enumerate(ctx.classified()):
+        combined.sources[str(index)] = state.sources["src"]
+    text = combined.to_json()
+    return {
+        "serialize.to_json": repeat(combined.to_json, rounds),
+        "serialize.from_json": repeat(
+            lambda: ClassificationState.from_json(text), rounds
+        ),
+    }
+
+
+@benchmark("catalog")
+def bench_catalog(ctx: Context, rounds: int) -> Samples:
+    """Time searching a library catalog of ``ctx.catalog_assets`` assets."""
+    root = ctx.root / "catalog"
+    entries = generator.catalog_entries(ctx.catalog_assets, ctx.seed)
+    with LibraryCatalog(root / "catalog.db", root) as catalog:
+        catalog.upsert_many(entries)
+        searches = {
+            "catalog.search.name": lambda: catalog.search("bar"),
+            # The first letter typed matches most of the library.
+            "catalog.search.letter": lambda: catalog.search("t"),
+            "catalog.search.words": lambda: catalog.search("rough bar"),
+            "catalog.search.tags": lambda: catalog.search("worn"),
+            "catalog.search.filtered": lambda: catalog.search(
+                "bar", supplier="Quixel", tags=["outdoor"]
+            ),
+            "catalog.search.page": lambda: catalog.search(
+                "bar", limit=50, offset=5_000
+            ),
+        }
+        return {name: repeat(func, rounds) for name, func in searches.items()}
+
+
+@benchmark("ui")
+def bench_ui(ctx: Context, rounds: int) -> Samples:
+    """Time filling the workspace tree with classified sources."""
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    try:
+        from PySide6.QtWidgets import QApplication, QTreeWidgetItem
+    except ImportError:
+        return {}
+
+    from asset_organiser.ui.workspace import WorkspaceView
+
+    app = QApplication.instance() or QApplication([])
+    view = WorkspaceView(ctx.config)
+    results = ctx.classified()
+
+    def setup() -> None:
+        view.tree.clear()
+        app.processEvents()
+
+    def populate(_) -> None:
+        for path, state in zip(ctx.sources, results):
+            item = QTreeWidgetItem([path.name, ""])
+            view.tree.addTopLevelItem(item)
+            view._populate_from_state(item, state)
+
+    try:
+        return {"ui.populate": timed(setup, populate, rounds)}
+    finally:
+        view.deleteLater()
+        app.processEvents()
+
+
+# ----------------------------------------------------------------------
+def summarize(samples: List[float]) -> Dict[str, float]:
+    """Return the median, interquartile range and extremes of ``samples``."""
+    if len(samples) > 1:
+        q1, median, q3 = statistics.quantiles(samples, n=4, method="inclusive")
+    else:
+        q1 = median = q3 = samples[0]
+    return {
+        "median": median,
+        "iqr": q3 - q1,
+        "min": min(samples),
+        "max": max(samples),
+    }
+
+
+def _commit() -> Optional[str]:
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            text=True,
+            timeout=10,
+        )
+    except OSError:
+        return None
+    return result.stdout.strip() or None
+
+
+def environment() -> Dict[str, Any]:
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "commit": _commit(),
+    }
+
+
+def run_suite(
+    count: int,
+    *,
+    seed: int = 0,
+    rounds: int = DEFAULT_ROUNDS,
+    select: Iterable[str] = (),
+    workdir: Optional[Path] = None,
+    catalog_assets: int = generator.CATALOG_ASSETS,
+) -> Dict[str, Any]:
+    """Run the benchmarks whose names contain any of ``select``."""
+    select = list(select)
+    names = [
+        name
+        for name in BENCHMARKS
+        if not select or any(part in name for part in select)
+    ]
+    with tempfile.TemporaryDirectory(dir=workdir) as tmp:
+        ctx = Context(Path(tmp), count, seed, catalog_assets)
+        samples: Samples = {}
+        for name in names:
+            samples.update(BENCHMARKS[name](ctx, rounds))
+    files = sum(len(files) for files in ctx.file_lists)
+    return {
+        "version": RESULTS_VERSION,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "environment": environment(),
+        "parameters": {
+            "sources": count,
+            "files": files,
+            "seed": seed,
+            "rounds": rounds,
+            "catalog_assets": catalog_assets,
+            "groups": names,
+        },
+        "benchmarks": {
+            name: {"unit": "s", "rounds": values, **summarize(values)}
+            for name, values in samples.items()
+        },
+    }
+
+
+def format_seconds(value: float) -> str:
+    for unit, scale in (("s", 1.0), ("ms", 1e-3), ("us", 1e-6)):
+        if abs(value) >= scale:
+            return f"{value / scale:.3g} {unit}"
+    return f"{value / 1e-9:.3g} ns"
+
+
+def format_results(results: Dict[str, Any]) -> str:
+    rows = [("benchmark", "median", "iqr", "rounds")]
+    for name, result in sorted(results["benchmarks"].items()):
+        rows.append(
+            (
+                name,
+                format_seconds(result["median"]),
+                format_seconds(result["iqr"]),
+                str(len(result["rounds"])),
+            )
+        )
+    widths = [max(len(row[i]) for row in rows) for i in range(4)]
+    return "\n".join(
+        "  ".join(
+            cell.ljust(width) if i == 0 else cell.rjust(width)
+            for i, (cell, width) in enumerate(zip(row, widths))
+        )
+        for row in rows
+    )
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.run",
+        description="Benchmark scanning, classification, search and the UI.",
+    )
+    parser.add_argument(
+        "--scale",
+        choices=generator.SCALES,
+        default="small",
+        help="Number of generated sources",
+    )
+    parser.add_argument(
+        "--sources",
+        type=int,
+        default=None,
+        help="Number of sources, overriding --scale",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--rounds", type=int, default=DEFAULT_ROUNDS)
+    parser.add_argument(
+        "-k",
+        "--select",
+        action="append",
+        default=[],
+        help=f"Only run benchmarks containing this ({', '.join(BENCHMARKS)})",
+    )
+    parser.add_argument(
+        "--output",
+        "-o",
+        type=Path,
+        default=None,
+        help=f"Results file, by default in {DEFAULT_OUTPUT_DIR}/",
+    )
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    if args.rounds < 1:
+        build_parser().error("--rounds must be at least 1")
+    count = args.sources or generator.SCALES[args.scale]
+    results = run_suite(
+        count,
+        seed=args.seed,
+        rounds=args.rounds,
+        select=args.select,
+    )
+    output = args.output
+    if output is None:
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        output = DEFAULT_OUTPUT_DIR / f"results-{stamp}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2))
+    print(format_results(results))
+    print(f"\nResults written to {output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
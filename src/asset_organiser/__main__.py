@@ -1,19 +1,36 @@
 from __future__ import annotations
 
 import sys
+from typing import List, Optional
 
-from PySide6.QtWidgets import QApplication
 
-from .config_service import ConfigService
-from .ui import MainWindow
+def run_gui() -> int:
+    from PySide6.QtWidgets import QApplication
 
+    from .config_service import ConfigService
+    from .ui import MainWindow
 
-def main() -> None:
     app = QApplication(sys.argv)
     config = ConfigService()
     window = MainWindow(config)
     window.show()
-    sys.exit(app.exec())
+    status = app.exec()
+    config.flush()
+    return status
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Start the GUI, or run ``batch``/``serve`` without importing Qt."""
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] == "batch":
+        from .cli import main as batch
+
+        sys.exit(batch(argv[1:]))
+    if argv and argv[0] == "serve":
+        from .server import main as serve
+
+        sys.exit(serve(argv[1:]))
+    sys.exit(run_gui())
 
 
 if __name__ == "__main__":
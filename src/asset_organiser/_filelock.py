@@ -0,0 +1,50 @@
+"""Advisory locks on open files, shared between processes."""
+
+from __future__ import annotations
+
+import os
+from typing import IO
+
+
+def lock(handle: IO, *, shared: bool = False, blocking: bool = True) -> bool:
+    """Lock the open file ``handle``; returns ``False`` if it is held.
+
+    The operating system drops the lock when the handle is closed or its
+    process exits, so a lock that can be taken means its previous owner
+    is gone.  Windows has no shared locks; there they always succeed
+    without locking, and exclusive locks cover the first byte.
+    """
+    try:
+        if os.name == "nt":  # pragma: no cover - platform specific
+            import msvcrt
+
+            if shared:
+                return True
+            mode = msvcrt.LK_LOCK if blocking else msvcrt.LK_NBLCK
+            handle.seek(0)
+            msvcrt.locking(handle.fileno(), mode, 1)
+        else:
+            import fcntl
+
+            flags = fcntl.LOCK_SH if shared else fcntl.LOCK_EX
+            if not blocking:
+                flags |= fcntl.LOCK_NB
+            fcntl.flock(handle.fileno(), flags)
+    except OSError:
+        return False
+    return True
+
+
+def unlock(handle: IO) -> None:
+    if os.name == "nt":  # pragma: no cover - platform specific
+        import msvcrt
+
+        handle.seek(0)
+        try:
+            msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+        except OSError:
+            pass
+    else:
+        import fcntl
+
+        fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
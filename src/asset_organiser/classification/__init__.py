@@ -1,18 +1,43 @@
 """Classification service module framework."""
 
-from .constants import AssignConstantsModule
-from .llm_asset_type import LLMAssetTypeModule
-from .llm_filetypes import LLMFiletypeModule
-from .llm_grouping import LLMGroupFilesModule
-from .llm_naming import LLMAssetNameModule
-from .llm_tagging import LLMTaggingModule
-from .models import ClassificationState
-from .module import ClassificationModule
-from .output import OutputModule
-from .pipeline import ClassificationPipeline
-from .rule_based import KeywordAssetTypeModule, RuleBasedFileTypeModule
-from .service import ClassificationService
-from .standalone import AssignStandaloneNameModule, SeparateStandaloneModule
+from typing import TYPE_CHECKING
+
+from .._lazy import lazy_exports
+
+_EXPORTS = {
+    "AssignConstantsModule": ".constants",
+    "LLMAssetTypeModule": ".llm_asset_type",
+    "LLMFiletypeModule": ".llm_filetypes",
+    "LLMGroupFilesModule": ".llm_grouping",
+    "LLMAssetNameModule": ".llm_naming",
+    "LLMTaggingModule": ".llm_tagging",
+    "ClassificationState": ".models",
+    "ClassificationModule": ".module",
+    "OutputModule": ".output",
+    "ClassificationPipeline": ".pipeline",
+    "KeywordAssetTypeModule": ".rule_based",
+    "RuleBasedFileTypeModule": ".rule_based",
+    "ClassificationService": ".service",
+    "AssignStandaloneNameModule": ".standalone",
+    "SeparateStandaloneModule": ".standalone",
+}
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .constants import AssignConstantsModule
+    from .llm_asset_type import LLMAssetTypeModule
+    from .llm_filetypes import LLMFiletypeModule
+    from .llm_grouping import LLMGroupFilesModule
+    from .llm_naming import LLMAssetNameModule
+    from .llm_tagging import LLMTaggingModule
+    from .models import ClassificationState
+    from .module import ClassificationModule
+    from .output import OutputModule
+    from .pipeline import ClassificationPipeline
+    from .rule_based import KeywordAssetTypeModule, RuleBasedFileTypeModule
+    from .service import ClassificationService
+    from .standalone import AssignStandaloneNameModule  # isort: split
+    from .standalone import SeparateStandaloneModule
 
 __all__ = [
     "ClassificationState",
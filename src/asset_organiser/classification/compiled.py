@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional
+
+from ..config_models import FileTypeDefinition, LibraryConfig
+from ..config_models import LLMProviderProfile as Profile
+from .constants import DEFAULT_CONSTANTS
+from .keywords import KeywordMatcher
+
+
+def _active_provider(config: LibraryConfig) -> Optional[Profile]:
+    classification = config.CLASSIFICATION
+    for profile in classification.providers:
+        if profile.profile_name == classification.active_provider:
+            return profile
+    if classification.providers:
+        return classification.providers[0]
+    return None
+
+
+class CompiledClassificationConfig:
+    """Read-only classification tables derived from a library config.
+
+    Everything :class:`~.service.ClassificationService` needs is computed
+    here once: keyword matchers for constants, file types and asset types,
+    the file type definitions, prompts and the active provider profile.
+    Instances never change after construction, compare and hash by the
+    :attr:`fingerprint` of the configuration they were built from, and
+    pickle cleanly so they can be handed to worker processes.
+
+    Use :func:`compile_classification` rather than constructing one from
+    the canonical JSON ``source`` directly.
+    """
+
+    __slots__ = (
+        "_source",
+        "fingerprint",
+        "constants",
+        "file_type_keywords",
+        "asset_type_keywords",
+        "file_types",
+        "prompts",
+        "provider",
+    )
+
+    fingerprint: str
+    constants: KeywordMatcher
+    file_type_keywords: KeywordMatcher
+    asset_type_keywords: KeywordMatcher
+    file_types: Mapping[str, FileTypeDefinition]
+    prompts: Mapping[str, str]
+    provider: Optional[Profile]
+
+    def __init__(self, source: str) -> None:
+        fingerprint = hashlib.blake2b(source.encode(), digest_size=16)
+        config = LibraryConfig.model_validate(json.loads(source))
+        classification = config.CLASSIFICATION
+        # ``config`` was parsed from ``source`` and is private to us.
+        file_types = config.FILE_TYPE_DEFINITIONS
+        rules = []
+        for filetype, definition in file_types.items():
+            for keyword in definition.rule_keywords:
+                rules.append((keyword, filetype))
+        # Extra keywords from the classification settings are merged into
+        # new lists; the definitions themselves are never extended.
+        asset_keywords: Dict[str, List[str]] = {}
+        for asset_type, definition in config.ASSET_TYPE_DEFINITIONS.items():
+            asset_keywords[asset_type] = list(definition.rule_keywords)
+        for asset_type, extra in classification.asset_type_keywords.items():
+            asset_keywords.setdefault(asset_type, []).extend(extra)
+        asset_rules = [
+            (keyword, asset_type)
+            for asset_type, keywords in asset_keywords.items()
+            for keyword in keywords
+        ]
+        constants = classification.keyword_rules or DEFAULT_CONSTANTS
+        provider = _active_provider(config)
+
+        values = {
+            "_source": source,
+            "fingerprint": fingerprint.hexdigest(),
+            "constants": KeywordMatcher(constants.items()),
+            "file_type_keywords": KeywordMatcher(rules),
+            "asset_type_keywords": KeywordMatcher(asset_rules),
+            "file_types": MappingProxyType(file_types),
+            "prompts": MappingProxyType(dict(classification.prompts)),
+            "provider": provider,
+        }
+        for name, value in values.items():
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, CompiledClassificationConfig):
+            return NotImplemented
+        return self.fingerprint == other.fingerprint
+
+    def __hash__(self) -> int:
+        return hash(self.fingerprint)
+
+    def __reduce__(self):
+        # Rebuilt (and cached) from its source in the receiving process.
+        return _compile, (self._source,)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.fingerprint[:12]})"
+
+
+def _classification_source(config: LibraryConfig) -> str:
+    """Return the canonical JSON of the sections classification uses."""
+    data = config.model_dump(
+        mode="json",
+        by_alias=True,
+        include={
+            "FILE_TYPE_DEFINITIONS",
+            "ASSET_TYPE_DEFINITIONS",
+            "CLASSIFICATION",
+        },
+    )
+    return json.dumps(data, sort_keys=True, separators=(",", ":"))
+
+
+@lru_cache(maxsize=16)
+def _compile(source: str) -> CompiledClassificationConfig:
+    return CompiledClassificationConfig(source)
+
+
+def compile_classification(
+    config: LibraryConfig,
+) -> CompiledClassificationConfig:
+    """Return the compiled classification tables for ``config``.
+
+    Equal configurations share one compiled instance per process.
+    """
+    return _compile(_classification_source(config))
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from typing import Dict
 
+from .keywords import KeywordMatcher
 from .models import ClassificationState
 from .module import ClassificationModule
 
@@ -17,20 +18,24 @@ DEFAULT_CONSTANTS: Dict[str, str] = {
 class AssignConstantsModule(ClassificationModule):
     """Assign file types based on constant filename patterns or extensions."""
 
-    def __init__(self, constants: Dict[str, str] | None = None) -> None:
+    def __init__(
+        self,
+        constants: Dict[str, str] | None = None,
+        *,
+        matcher: KeywordMatcher | None = None,
+    ) -> None:
         super().__init__()
-        constants = constants or DEFAULT_CONSTANTS
-        # Normalise patterns for case-insensitive comparison
-        self.constants = {k.lower(): v for k, v in constants.items()}
+        if matcher is None:
+            constants = constants or DEFAULT_CONSTANTS
+            matcher = KeywordMatcher(constants.items())
+        self.matcher = matcher
 
     def run(self, state: ClassificationState) -> ClassificationState:
         for source in state.sources.values():
             for entry in source.contents.values():
                 if entry.filetype:
                     continue
-                name = entry.filename.lower()
-                for pattern, filetype in self.constants.items():
-                    if name.endswith(pattern) or pattern in name:
-                        entry.filetype = filetype
-                        break
+                filetype = self.matcher.match(entry.filename)
+                if filetype is not None:
+                    entry.filetype = filetype
         return state
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Below this many keywords testing each one with ``in`` is faster than
+# walking the automaton character by character in Python.
+AUTOMATON_THRESHOLD = 32
+
+
+class KeywordMatcher:
+    """Find which of an ordered set of keywords occurs in a name.
+
+    Keywords are matched case-insensitively as substrings.  When several
+    occur, the value of the keyword listed first wins, exactly like
+    testing the keywords one after another.  Larger sets are compiled into
+    an Aho-Corasick automaton so a lookup costs one pass over the name no
+    matter how many keywords there are.  Matchers are immutable and can
+    be pickled to worker processes.
+    """
+
+    __slots__ = ("_rules", "_values", "_delta", "_best")
+
+    def __init__(self, rules: Iterable[Tuple[str, str]]) -> None:
+        ordered: Dict[str, str] = {}
+        for keyword, value in rules:
+            ordered[keyword.lower()] = value
+        self._rules: Tuple[Tuple[str, str], ...] = tuple(ordered.items())
+        self._values = tuple(ordered.values())
+        self._delta: List[Dict[str, int]] = []
+        self._best: List[int] = []
+        if len(self._rules) >= AUTOMATON_THRESHOLD:
+            self._build()
+
+    def __len__(self) -> int:
+        return len(self._rules)
+
+    def __bool__(self) -> bool:
+        return bool(self._rules)
+
+    @property
+    def rules(self) -> Tuple[Tuple[str, str], ...]:
+        """``(keyword, value)`` pairs in priority order."""
+        return self._rules
+
+    def _build(self) -> None:
+        # Trie of the keywords; ``best`` is the highest priority (lowest
+        # index) of any keyword ending in a state.
+        missing = len(self._rules)
+        goto: List[Dict[str, int]] = [{}]
+        best = [missing]
+        for priority, (keyword, _) in enumerate(self._rules):
+            state = 0
+            for char in keyword:
+                nxt = goto[state].get(char)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][char] = nxt
+                    goto.append({})
+                    best.append(missing)
+                state = nxt
+            best[state] = min(best[state], priority)
+
+        # Fold the failure links into a full transition table so a lookup
+        # never backtracks, and propagate matches along the links.
+        delta: List[Dict[str, int]] = [dict(goto[0])] + [{} for _ in goto[1:]]
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            link = fail[state]
+            best[state] = min(best[state], best[link])
+            table = dict(delta[link])
+            for char, child in goto[state].items():
+                fail[child] = delta[link].get(char, 0)
+                table[char] = child
+                queue.append(child)
+            delta[state] = table
+        self._delta = delta
+        self._best = best
+
+    def match(self, name: str) -> Optional[str]:
+        """Return the value of the first keyword found in ``name``."""
+        name = name.lower()
+        if not self._delta:
+            for keyword, value in self._rules:
+                if keyword in name:
+                    return value
+            return None
+        delta, best = self._delta, self._best
+        found = best[0]
+        state = 0
+        for char in name:
+            state = delta[state].get(char, 0)
+            if best[state] < found:
+                found = best[state]
+                if found == 0:
+                    break
+        if found < len(self._values):
+            return self._values[found]
+        return None
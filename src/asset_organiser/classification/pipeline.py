@@ -1,8 +1,10 @@
 from __future__ import annotations
 
 from collections import defaultdict, deque
-from typing import Dict, Iterable, List
+from types import MappingProxyType
+from typing import Dict, Iterable, List, Mapping
 
+from .. import tracing
 from .models import ClassificationState
 from .module import ClassificationModule
 
@@ -15,6 +17,11 @@ class ClassificationPipeline:
         self._graph: Dict[str, List[str]] = defaultdict(list)
         self._reverse: Dict[str, List[str]] = defaultdict(list)
 
+    @property
+    def modules(self) -> Mapping[str, ClassificationModule]:
+        """Modules by name, in the order they were added."""
+        return MappingProxyType(self._modules)
+
     def add_module(
         self,
         module: ClassificationModule,
@@ -38,20 +45,22 @@ class ClassificationPipeline:
         for name in self._modules:
             indegree[name] = len(self._reverse.get(name, []))
         queue = deque([n for n, d in indegree.items() if d == 0])
-        while queue:
-            name = queue.popleft()
-            module = self._modules[name]
-            result = module.run(state)
-            if isinstance(result, tuple):
-                state, next_modules = result
-                children = list(next_modules)
-            else:
-                state = result
-                children = self._graph.get(name, [])
-            for child in children:
-                if child not in self._modules:
-                    raise KeyError(f"Unknown module {child!r}")
-                indegree[child] -= 1
-                if indegree[child] == 0:
-                    queue.append(child)
+        with tracing.span("classify", "classification"):
+            while queue:
+                name = queue.popleft()
+                module = self._modules[name]
+                with tracing.span(name, "classification"):
+                    result = module.run(state)
+                if isinstance(result, tuple):
+                    state, next_modules = result
+                    children = list(next_modules)
+                else:
+                    state = result
+                    children = self._graph.get(name, [])
+                for child in children:
+                    if child not in self._modules:
+                        raise KeyError(f"Unknown module {child!r}")
+                    indegree[child] -= 1
+                    if indegree[child] == 0:
+                        queue.append(child)
         return state
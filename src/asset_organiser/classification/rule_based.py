@@ -3,6 +3,7 @@ from __future__ import annotations
 from typing import Dict, List
 
 from ..config_models import AssetTypeDefinition, FileTypeDefinition
+from .keywords import KeywordMatcher
 from .models import ClassificationState
 from .module import ClassificationModule
 
@@ -15,16 +16,20 @@ class RuleBasedFileTypeModule(ClassificationModule):
 
     def __init__(
         self,
-        filetype_definitions: FileTypeDefs,
+        filetype_definitions: FileTypeDefs | None = None,
         *,
         next_module: str | None = None,
+        matcher: KeywordMatcher | None = None,
     ) -> None:
         super().__init__()
-        keyword_rules: Dict[str, str] = {}
-        for filetype, definition in filetype_definitions.items():
-            for keyword in definition.rule_keywords:
-                keyword_rules[keyword.lower()] = filetype
-        self.keyword_rules = keyword_rules
+        if matcher is None:
+            rules = []
+            definitions = filetype_definitions or {}
+            for filetype, definition in definitions.items():
+                for keyword in definition.rule_keywords:
+                    rules.append((keyword, filetype))
+            matcher = KeywordMatcher(rules)
+        self.matcher = matcher
         self._next_module = next_module
 
     def run(
@@ -35,15 +40,11 @@ class RuleBasedFileTypeModule(ClassificationModule):
             for entry in source.contents.values():
                 if entry.filetype:
                     continue
-                name = entry.filename.lower()
-                matched = False
-                for keyword, filetype in self.keyword_rules.items():
-                    if keyword in name:
-                        entry.filetype = filetype
-                        matched = True
-                        break
-                if not matched:
+                filetype = self.matcher.match(entry.filename)
+                if filetype is None:
                     route = True
+                else:
+                    entry.filetype = filetype
         if self._next_module and route:
             return state, [self._next_module]
         return state
@@ -54,16 +55,20 @@ class KeywordAssetTypeModule(ClassificationModule):
 
     def __init__(
         self,
-        assettype_definitions: AssetTypeDefs,
+        assettype_definitions: AssetTypeDefs | None = None,
         *,
         next_module: str | None = None,
+        matcher: KeywordMatcher | None = None,
     ) -> None:
         super().__init__()
-        keyword_rules: Dict[str, str] = {}
-        for asset_type, definition in assettype_definitions.items():
-            for keyword in definition.rule_keywords:
-                keyword_rules[keyword.lower()] = asset_type
-        self.keyword_rules = keyword_rules
+        if matcher is None:
+            rules = []
+            definitions = assettype_definitions or {}
+            for asset_type, definition in definitions.items():
+                for keyword in definition.rule_keywords:
+                    rules.append((keyword, asset_type))
+            matcher = KeywordMatcher(rules)
+        self.matcher = matcher
         self._next_module = next_module
 
     def run(
@@ -74,15 +79,11 @@ class KeywordAssetTypeModule(ClassificationModule):
             for asset in source.assets.values():
                 if asset.asset_type:
                     continue
-                name = (asset.asset_name or "").lower()
-                matched = False
-                for keyword, asset_type in self.keyword_rules.items():
-                    if keyword in name:
-                        asset.asset_type = asset_type
-                        matched = True
-                        break
-                if not matched:
+                asset_type = self.matcher.match(asset.asset_name or "")
+                if asset_type is None:
                     route = True
+                else:
+                    asset.asset_type = asset_type
         if self._next_module and route:
             return state, [self._next_module]
         return state
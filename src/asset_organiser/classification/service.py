@@ -2,9 +2,9 @@ from __future__ import annotations
 
 from typing import Iterable
 
-from ..config_models import AssetTypeDefinition
 from ..config_service import ConfigService
 from ..llm import LLMClient, NoOpLLMClient, create_llm_client
+from .compiled import CompiledClassificationConfig, compile_classification
 from .constants import AssignConstantsModule
 from .llm_asset_type import LLMAssetTypeModule
 from .llm_filetypes import LLMFiletypeModule
@@ -17,6 +17,9 @@ from .pipeline import ClassificationPipeline
 from .rule_based import KeywordAssetTypeModule, RuleBasedFileTypeModule
 from .standalone import AssignStandaloneNameModule, SeparateStandaloneModule
 
+# Key of the compiled tables in :meth:`ConfigService.cached`.
+COMPILED_KEY = "classification"
+
 
 class ClassificationService:
     """High level service for executing classification pipelines."""
@@ -28,39 +31,56 @@ class ClassificationService:
     ) -> None:
         if config_service.library_config is None:
             raise RuntimeError("Library configuration not loaded")
-        classification = config_service.library_config.CLASSIFICATION
-        filetype_defs = config_service.library_config.FILE_TYPE_DEFINITIONS
-        asset_defs_src = config_service.library_config.ASSET_TYPE_DEFINITIONS
-        assettype_defs = dict(asset_defs_src)
-        asset_keywords = config_service.get_asset_type_keywords()
-        for atype, keywords in asset_keywords.items():
-            if atype in assettype_defs:
-                assettype_defs[atype].rule_keywords.extend(keywords)
-            else:
-                assettype_defs[atype] = AssetTypeDefinition(
-                    rule_keywords=keywords,
-                )
-        self.keyword_rules = classification.keyword_rules
+        compiled = config_service.cached(
+            COMPILED_KEY,
+            lambda: compile_classification(config_service.library_config),
+        )
+        self._build(compiled, llm_client)
+        # The configuration version this pipeline was built from.
+        self.config_version: int | None = config_service.version
+
+    @classmethod
+    def from_compiled(
+        cls,
+        compiled: CompiledClassificationConfig,
+        llm_client: LLMClient | None = None,
+    ) -> "ClassificationService":
+        """Create a service from tables compiled elsewhere.
 
+        Worker processes receive the pickled tables instead of a
+        :class:`ConfigService`.
+        """
+        service = cls.__new__(cls)
+        service._build(compiled, llm_client)
+        service.config_version = None
+        return service
+
+    # ------------------------------------------------------------------
+    def _build(
+        self,
+        compiled: CompiledClassificationConfig,
+        llm_client: LLMClient | None,
+    ) -> None:
+        self.compiled = compiled
         if llm_client is None:
-            profile = config_service.get_active_provider_profile()
-            if profile:
+            if compiled.provider:
                 try:
-                    llm_client = create_llm_client(profile)
+                    llm_client = create_llm_client(compiled.provider)
                 except Exception:
                     llm_client = NoOpLLMClient()
             else:
                 llm_client = NoOpLLMClient()
 
         self.pipeline = ClassificationPipeline()
-        const_module = AssignConstantsModule(self.keyword_rules)
+        const_module = AssignConstantsModule(matcher=compiled.constants)
         self.pipeline.add_module(const_module)
 
-        prompts = config_service.get_classification_prompts()
+        prompts = compiled.prompts
+        filetype_defs = compiled.file_types
 
         llm_module = LLMFiletypeModule(llm_client, prompts.get("filetype", ""))
         rule_module = RuleBasedFileTypeModule(
-            filetype_defs, next_module=llm_module.name
+            matcher=compiled.file_type_keywords, next_module=llm_module.name
         )
         self.pipeline.add_module(rule_module, after=[const_module.name])
         self.pipeline.add_module(llm_module, after=[rule_module.name])
@@ -71,7 +91,8 @@ class ClassificationService:
             prompts.get("asset_type", ""),
         )
         keyword_type_module = KeywordAssetTypeModule(
-            assettype_defs, next_module=llm_type_module.name
+            matcher=compiled.asset_type_keywords,
+            next_module=llm_type_module.name,
         )
         assign_name_module = AssignStandaloneNameModule(
             next_module=keyword_type_module.name
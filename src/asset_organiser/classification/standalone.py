@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Dict, List
+from typing import List, Mapping
 
 from ..config_models import FileTypeDefinition
 from .models import AssetEntry, ClassificationState
@@ -26,7 +26,7 @@ class SeparateStandaloneModule(ClassificationModule):
 
     def __init__(
         self,
-        filetype_definitions: Dict[str, FileTypeDefinition],
+        filetype_definitions: Mapping[str, FileTypeDefinition],
         *,
         standalone_next: str | None = None,
         grouping_next: str | None = None,
@@ -0,0 +1,149 @@
+"""Headless batch ingestion: ``python -m asset_organiser batch``.
+
+Runs the same scanning, classification and processing as the workspace,
+without importing PySide6, and reports progress as JSON lines on stdout.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import sys
+from functools import partial
+from pathlib import Path
+from typing import IO, List, Optional
+
+from . import tracing
+from .config_service import ConfigService
+from .ingest import Emit, ingest
+from .llm import NoOpLLMClient
+
+# Exit status when any source or asset failed.
+EXIT_FAILED = 1
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m asset_organiser batch",
+        description="Classify and process source packs without the GUI.",
+    )
+    parser.add_argument(
+        "sources", nargs="+", type=Path, help="Source archives or folders"
+    )
+    parser.add_argument(
+        "--library",
+        type=Path,
+        required=True,
+        help="Library root path",
+    )
+    parser.add_argument(
+        "--settings", type=Path, default=None, help="Application settings"
+    )
+    parser.add_argument(
+        "--output",
+        default=None,
+        help="Override OUTPUT_BASE_DIR",
+    )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=None,
+        help="Worker threads for classification and processing",
+    )
+    parser.add_argument(
+        "--skip-imported",
+        action="store_true",
+        help="Skip sources that were imported before",
+    )
+    parser.add_argument(
+        "--trace",
+        type=Path,
+        default=None,
+        metavar="PATH",
+        help="Record a Chrome/Perfetto trace of the run to PATH",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Write a sampling profile to the library's .asset-library/logs",
+    )
+    parser.add_argument(
+        "--no-llm",
+        action="store_true",
+        help="Classify with rules only, never calling a language model",
+    )
+    return parser
+
+
+def _writer(out: IO[str]) -> Emit:
+    def emit(event: str, **fields: object) -> None:
+        out.write(json.dumps({"event": event, **fields}) + "\n")
+        out.flush()
+
+    return emit
+
+
+def embed_library(config: ConfigService, emit: Emit) -> None:
+    """Bring the semantic index up to date, if semantic search is on.
+
+    Runs the same :class:`EmbeddingJob` the GUI runs in the background,
+    but waits for it, then emits an ``indexed`` event.
+    """
+    library = config.library_config
+    if library is None or not library.INDEXING.enable_semantic_search:
+        return
+    from .indexing import EmbeddingJob, IndexingService
+    from .library import LibraryCatalog
+
+    assert config.library_path is not None
+    settings = library.INDEXING
+    output_root = config.library_path / config.settings.OUTPUT_BASE_DIR
+    catalog = LibraryCatalog.for_library(
+        config.library_path,
+        output_root.resolve(),
+        metadata_name=config.settings.METADATA_FILENAME,
+    )
+    index = IndexingService.for_library(config.library_path, settings)
+    with catalog, index:
+        job = EmbeddingJob.for_settings(index, catalog, settings)
+        job.start()
+        job.wait()
+    progress = job.progress
+    emit("indexed", done=progress.done, failed=progress.failed)
+
+
+def run_batch(args: argparse.Namespace, out: Optional[IO[str]] = None) -> int:
+    """Ingest ``args.sources``; returns the process exit status."""
+    config = ConfigService(app_config_path=args.settings)
+    config.set_library_path(args.library)
+    if args.output is not None:
+        config.settings.OUTPUT_BASE_DIR = args.output
+    if args.profile:
+        config.settings.PROFILING_ENABLED = True
+    emit = _writer(out or sys.stdout)
+    run = partial(
+        ingest,
+        config,
+        args.sources,
+        emit,
+        max_workers=args.jobs,
+        skip_imported=args.skip_imported,
+        llm_client=NoOpLLMClient() if args.no_llm else None,
+    )
+    if args.trace is None:
+        failed = run()
+    else:
+        with tracing.recording(args.trace):
+            failed = run()
+    embed_library(config, emit)
+    return EXIT_FAILED if failed else 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    if args.jobs is not None and args.jobs < 1:
+        build_parser().error("--jobs must be at least 1")
+    logging.basicConfig(level=logging.WARNING, stream=sys.stderr)
+    return run_batch(args)
@@ -18,6 +18,8 @@ class GeneralSettings(BaseModel):
     CALCULATE_STATS_RESOLUTION: Optional[str] = None
     DEFAULT_ASSET_TYPE: Optional[str] = None
     MERGE_DIMENSION_MISMATCH_STRATEGY: Optional[str] = None
+    # Sample classification and processing into .asset-library/logs.
+    PROFILING_ENABLED: bool = False
 
 
 class FileTypeDefinition(BaseModel):
@@ -137,6 +139,8 @@ class IndexingSettings(BaseModel):
         None,
         alias="Rendering Engine",
     )
+    batch_size: int = Field(64, alias="Batch Size", ge=1)
+    cpu_budget: float = Field(0.5, alias="CPU Budget", gt=0, le=1)
 
     model_config = ConfigDict(populate_by_name=True)
 
@@ -2,8 +2,11 @@ from __future__ import annotations
 
 import json
 import logging
+import os
+import tempfile
+import threading
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
 
 from pydantic import ValidationError
 
@@ -11,9 +14,62 @@ from .config_models import GeneralSettings, LibraryConfig, LLMProviderProfile
 
 logger = logging.getLogger(__name__)
 
+LIBRARY_CONFIG_DIRNAME = ".asset-library"
+# Every file the library configuration is split across.
+LIBRARY_CONFIG_FILES = (
+    "file-types.json",
+    "asset-types.json",
+    "suppliers.json",
+    "classification.json",
+    "llm-profiles.json",
+    "processing.json",
+    "indexing.json",
+)
+
+# Seconds :meth:`ConfigService.request_library_save` waits for more edits.
+SAVE_DELAY = 0.5
+
+# ``(size, mtime_ns)`` of a file, ``None`` when it does not exist.
+_Stamp = Optional[Tuple[int, int]]
+Listener = Callable[[int], None]
+T = TypeVar("T")
+
+
+def _stamp(path: Path) -> _Stamp:
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+def _write_atomic(path: Path, text: str) -> None:
+    """Replace ``path`` with ``text`` so readers never see half a file."""
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "w") as fh:
+            fh.write(text)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
 
 class ConfigService:
-    """Service providing access to application and library configuration."""
+    """Service providing access to application and library configuration.
+
+    Library configuration files are parsed once and cached by their size
+    and modification time; :meth:`reload_library_config` only re-reads
+    the files that changed and keeps the current :class:`LibraryConfig`
+    when none did.  Every change bumps :attr:`version` and is announced
+    to the callbacks registered with :meth:`subscribe`, so dependent
+    services can rebuild their derived state only when it is stale.
+
+    Saving only rewrites the files whose content changed, each through a
+    temporary file and a rename.  Editors call :meth:`request_library_save`
+    so a burst of edits ends up as a single write; :meth:`flush` writes a
+    pending save right away.
+    """
 
     def __init__(self, app_config_path: Optional[Path] = None) -> None:
         if app_config_path is None:
@@ -23,6 +79,58 @@ class ConfigService:
         self.settings = self._load_app_settings()
         self.library_path: Optional[Path] = None
         self.library_config: Optional[LibraryConfig] = None
+        self._version = 0
+        self._listeners: List[Listener] = []
+        self._files: Dict[str, Tuple[_Stamp, Any]] = {}
+        self._stamps: Dict[str, _Stamp] = {}
+        self._derived: Dict[str, Tuple[int, object, Any]] = {}
+        self._write_lock = threading.RLock()
+        self._pending: Optional[Tuple[Path, Dict[str, Any]]] = None
+        self._save_timer: Optional[threading.Timer] = None
+
+    # ------------------------------------------------------------------
+    @property
+    def version(self) -> int:
+        """Increases every time the configuration changes."""
+        return self._version
+
+    def subscribe(self, listener: Listener) -> Callable[[], None]:
+        """Call ``listener(version)`` on every configuration change.
+
+        Returns a function that removes the listener again.
+        """
+        self._listeners.append(listener)
+
+        def unsubscribe() -> None:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+        return unsubscribe
+
+    def cached(self, key: str, factory: Callable[[], T]) -> T:
+        """Return ``factory()``, computed once per configuration version.
+
+        Lets services share state derived from the configuration.  Edits
+        made to :attr:`library_config` in place are only picked up once
+        they are saved.
+        """
+        entry = self._derived.get(key)
+        if (
+            entry is None
+            or entry[0] != self._version
+            or entry[1] is not self.library_config
+        ):
+            entry = (self._version, self.library_config, factory())
+            self._derived[key] = entry
+        return entry[2]
+
+    def _changed(self) -> None:
+        self._version += 1
+        for listener in list(self._listeners):
+            try:
+                listener(self._version)
+            except Exception:
+                logger.exception("Configuration listener failed")
 
     # ------------------------------------------------------------------
     def _load_app_settings(self) -> GeneralSettings:
@@ -42,12 +150,18 @@ class ConfigService:
     def save_settings(self) -> None:
         """Persist application settings to disk."""
         text = self.settings.model_dump_json(indent=2)
-        self.app_config_path.write_text(text)
+        _write_atomic(self.app_config_path, text)
+        self._changed()
 
     # ------------------------------------------------------------------
     def set_library_path(self, library_root: Path) -> None:
         """Load configuration for the active asset library."""
-        config_dir = library_root / ".asset-library"
+        self.flush()
+        if library_root != self.library_path:
+            self._files.clear()
+            self._stamps.clear()
+            self.library_config = None
+        config_dir = library_root / LIBRARY_CONFIG_DIRNAME
         if not config_dir.exists():
             logger.info(
                 "Creating default library config at %s",
@@ -59,73 +173,149 @@ class ConfigService:
             self.save_library_config()
             return
 
-        data = self._load_library_config(config_dir)
-        self.library_config = LibraryConfig.model_validate(data)
         self.library_path = library_root
+        self.reload_library_config()
+
+    def reload_library_config(self) -> bool:
+        """Re-read the library files that changed on disk.
+
+        Returns ``True`` when the configuration was replaced.
+        """
+        if self.library_path is None:
+            raise RuntimeError("Library path not set")
+        # Our own pending edits are newer than anything on disk.
+        self.flush()
+        config_dir = self.library_path / LIBRARY_CONFIG_DIRNAME
+        stamps = {}
+        for name in LIBRARY_CONFIG_FILES:
+            stamps[name] = _stamp(config_dir / name)
+        if self.library_config is not None and stamps == self._stamps:
+            return False
+        data = self._load_library_config(config_dir, stamps)
+        self.library_config = LibraryConfig.model_validate(data)
+        self._stamps = stamps
+        self._changed()
+        return True
 
     # ------------------------------------------------------------------
-    def _load_library_config(self, config_dir: Path) -> dict:
-        def read_json(path: Path):
-            if path.exists():
-                return json.loads(path.read_text())
-            return None
+    def _read_json(self, config_dir: Path, name: str, stamp: _Stamp) -> Any:
+        cached = self._files.get(name)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+        data = None
+        if stamp is not None:
+            data = json.loads((config_dir / name).read_text())
+        self._files[name] = (stamp, data)
+        return data
 
-        file_types = read_json(config_dir / "file-types.json")
-        asset_types = read_json(config_dir / "asset-types.json")
-        suppliers = read_json(config_dir / "suppliers.json")
-        classification = read_json(config_dir / "classification.json") or {}
-        providers = read_json(config_dir / "llm-profiles.json")
+    def _load_library_config(
+        self,
+        config_dir: Path,
+        stamps: Dict[str, _Stamp],
+    ) -> dict:
+        raw = {}
+        for name, stamp in stamps.items():
+            raw[name] = self._read_json(config_dir, name, stamp)
+        # Cached values are shared between loads; never modify them.
+        classification = dict(raw["classification.json"] or {})
+        providers = raw["llm-profiles.json"]
         if providers and "Providers" in providers:
             classification["Providers"] = providers["Providers"]
-        processing = read_json(config_dir / "processing.json")
-        indexing = read_json(config_dir / "indexing.json")
 
         data: dict = {}
-        if file_types is not None:
-            data["FILE_TYPE_DEFINITIONS"] = file_types
-        if asset_types is not None:
-            data["ASSET_TYPE_DEFINITIONS"] = asset_types
-        if suppliers is not None:
-            data["SUPPLIERS"] = suppliers
+        sections = {
+            "FILE_TYPE_DEFINITIONS": raw["file-types.json"],
+            "ASSET_TYPE_DEFINITIONS": raw["asset-types.json"],
+            "SUPPLIERS": raw["suppliers.json"],
+            "PROCESSING": raw["processing.json"],
+            "INDEXING": raw["indexing.json"],
+        }
+        for key, value in sections.items():
+            if value is not None:
+                data[key] = value
         if classification:
             data["CLASSIFICATION"] = classification
-        if processing is not None:
-            data["PROCESSING"] = processing
-        if indexing is not None:
-            data["INDEXING"] = indexing
         return data
 
     # ------------------------------------------------------------------
-    def save_library_config(self) -> None:
+    def _library_files(self) -> Tuple[Path, Dict[str, Any]]:
         if self.library_path is None or self.library_config is None:
             raise RuntimeError("Library path not set")
-        config_dir = self.library_path / ".asset-library"
-        config_dir.mkdir(parents=True, exist_ok=True)
-
-        data = self.library_config.model_dump(by_alias=True)
-        (config_dir / "file-types.json").write_text(
-            json.dumps(data.get("FILE_TYPE_DEFINITIONS", {}), indent=2)
-        )
-        (config_dir / "asset-types.json").write_text(
-            json.dumps(data.get("ASSET_TYPE_DEFINITIONS", {}), indent=2)
-        )
-        (config_dir / "suppliers.json").write_text(
-            json.dumps(data.get("SUPPLIERS", {}), indent=2)
-        )
+        config_dir = self.library_path / LIBRARY_CONFIG_DIRNAME
+        data = self.library_config.model_dump(mode="json", by_alias=True)
         classification = data.get("CLASSIFICATION", {})
         providers = {"Providers": classification.pop("Providers", [])}
-        (config_dir / "classification.json").write_text(
-            json.dumps(classification, indent=2)
-        )
-        (config_dir / "llm-profiles.json").write_text(
-            json.dumps(providers, indent=2),
-        )
-        (config_dir / "processing.json").write_text(
-            json.dumps(data.get("PROCESSING", {}), indent=2)
-        )
-        (config_dir / "indexing.json").write_text(
-            json.dumps(data.get("INDEXING", {}), indent=2)
-        )
+        files = {
+            "file-types.json": data.get("FILE_TYPE_DEFINITIONS", {}),
+            "asset-types.json": data.get("ASSET_TYPE_DEFINITIONS", {}),
+            "suppliers.json": data.get("SUPPLIERS", {}),
+            "classification.json": classification,
+            "llm-profiles.json": providers,
+            "processing.json": data.get("PROCESSING", {}),
+            "indexing.json": data.get("INDEXING", {}),
+        }
+        return config_dir, files
+
+    def _write_library_files(
+        self, config_dir: Path, files: Dict[str, Any]
+    ) -> List[str]:
+        """Write the files whose content changed; returns their names."""
+        written = []
+        with self._write_lock:
+            config_dir.mkdir(parents=True, exist_ok=True)
+            for name, content in files.items():
+                path = config_dir / name
+                cached = self._files.get(name)
+                if cached == (_stamp(path), content):
+                    continue
+                _write_atomic(path, json.dumps(content, indent=2))
+                # What was just written needs no parsing on the next reload.
+                stamp = _stamp(path)
+                self._files[name] = (stamp, content)
+                self._stamps[name] = stamp
+                written.append(name)
+        return written
+
+    def save_library_config(self) -> None:
+        """Write the library configuration now."""
+        with self._write_lock:
+            self._cancel_save()
+            self._write_library_files(*self._library_files())
+        self._changed()
+
+    def request_library_save(self, delay: float = SAVE_DELAY) -> None:
+        """Announce an edit and save it once edits pause for ``delay``.
+
+        The configuration is captured now; only the write is deferred,
+        and further requests within ``delay`` replace it.
+        """
+        pending = self._library_files()
+        timer = threading.Timer(delay, self.flush)
+        timer.daemon = True
+        with self._write_lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+            self._pending = pending
+            self._save_timer = timer
+        timer.start()
+        self._changed()
+
+    def flush(self) -> None:
+        """Write a save requested with :meth:`request_library_save`."""
+        # Held throughout so an older pending save can never land after
+        # a newer one.
+        with self._write_lock:
+            pending = self._cancel_save()
+            if pending is not None:
+                self._write_library_files(*pending)
+
+    def _cancel_save(self) -> Optional[Tuple[Path, Dict[str, Any]]]:
+        with self._write_lock:
+            pending, self._pending = self._pending, None
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+                self._save_timer = None
+        return pending
 
     # ------------------------------------------------------------------
     def get_active_provider_profile(self) -> Optional[LLMProviderProfile]:
@@ -0,0 +1,236 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import mmap
+import os
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, Optional
+
+from . import _filelock as filelock
+
+logger = logging.getLogger(__name__)
+
+CACHE_FILENAME = "source-hashes.json"
+# Held while the cache file is merged and rewritten.
+LOCK_FILENAME = "source-hashes.lock"
+SHA256_KEY = "SHA256-ID"
+DUPLICATE_KEY = "duplicate_of"
+
+# Files at least this large are hashed through a memory map so the digest
+# is computed in one call without copying the data into Python buffers.
+MMAP_THRESHOLD = 4 * 1024 * 1024
+READ_BUFFER_SIZE = 4 * 1024 * 1024
+
+
+def sha256_file(path: Path) -> str:
+    """Return the hex SHA256 digest of the file at ``path``."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        size = os.fstat(fh.fileno()).st_size
+        if size >= MMAP_THRESHOLD:
+            with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as view:
+                digest.update(view)
+        else:
+            while chunk := fh.read(READ_BUFFER_SIZE):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+
+def hashed_files(source: Path) -> List[Path]:
+    """Return the files whose digests identify ``source``.
+
+    Archives and loose files are hashed directly; a directory is identified
+    by every file in its tree.
+    """
+    if not source.is_dir():
+        return [source]
+    found = []
+    for root, _dirs, files in os.walk(source):
+        found.extend(Path(root) / name for name in files)
+    return sorted(found)
+
+
+def tree_digest(source: Path, digests: Mapping[Path, str]) -> str:
+    """Combine the file ``digests`` of a directory into one digest.
+
+    The digest covers sorted ``(relative path, content digest)`` pairs, so
+    renaming, adding or changing any file changes it.
+    """
+    pairs = sorted(
+        (path.relative_to(source).as_posix(), digest)
+        for path, digest in digests.items()
+    )
+    combined = hashlib.sha256()
+    for name, digest in pairs:
+        combined.update(f"{name}\0{digest}\n".encode())
+    return combined.hexdigest()
+
+
+class SourceFingerprintService:
+    """Compute and cache ``SHA256-ID`` digests of sources.
+
+    Digests are cached by ``(path, size, mtime)`` in the library's
+    ``.asset-library`` directory together with the digests of sources that
+    have already been processed, so re-added packs are recognised before
+    they are classified.
+    """
+
+    def __init__(
+        self,
+        library_path: Optional[Path] = None,
+        *,
+        max_workers: int | None = None,
+    ) -> None:
+        self.max_workers = max_workers
+        self.cache_path: Optional[Path] = None
+        if library_path is not None:
+            self.cache_path = library_path / ".asset-library" / CACHE_FILENAME
+        self._lock = threading.Lock()
+        self._digests: Dict[str, dict] = {}
+        self._imported: Dict[str, str] = {}
+        self._dirty = False
+        self._load()
+
+    # ------------------------------------------------------------------
+    def _read(self) -> dict:
+        if self.cache_path is None or not self.cache_path.exists():
+            return {}
+        try:
+            return json.loads(self.cache_path.read_text())
+        except (OSError, ValueError):
+            logger.warning("Ignoring unreadable %s", self.cache_path)
+            return {}
+
+    def _load(self) -> None:
+        data = self._read()
+        self._digests = dict(data.get("digests", {}))
+        self._imported = dict(data.get("imported", {}))
+
+    def save(self) -> None:
+        """Persist the cache if it changed.
+
+        Other services (the GUI, a batch run, the server) save the same
+        file; their entries written since this one loaded are merged in
+        rather than overwritten, and picked up by this service as well.
+        """
+        if self.cache_path is None or not self._dirty:
+            return
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.cache_path.with_name(LOCK_FILENAME), "a+b") as guard:
+            filelock.lock(guard)
+            try:
+                self._merge_and_write()
+            finally:
+                filelock.unlock(guard)
+
+    def _merge_and_write(self) -> None:
+        assert self.cache_path is not None
+        data = self._read()
+        with self._lock:
+            self._digests = {**data.get("digests", {}), **self._digests}
+            self._imported = {**data.get("imported", {}), **self._imported}
+            data = {"digests": self._digests, "imported": self._imported}
+            text = json.dumps(data, indent=2, sort_keys=True)
+            self._dirty = False
+        fd, tmp = tempfile.mkstemp(
+            dir=self.cache_path.parent, prefix=f".{CACHE_FILENAME}."
+        )
+        with os.fdopen(fd, "w") as fh:
+            fh.write(text)
+        os.replace(tmp, self.cache_path)
+
+    # ------------------------------------------------------------------
+    def fingerprint(self, source: Path) -> Optional[str]:
+        """Return the ``SHA256-ID`` of ``source`` (``None`` if empty)."""
+        source = Path(source)
+        files = hashed_files(source)
+        digests = {path: self.file_digest(path) for path in files}
+        return self._combine(source, digests)
+
+    @staticmethod
+    def _combine(source: Path, digests: Mapping[Path, str]) -> Optional[str]:
+        if not digests:
+            return None
+        if not source.is_dir():
+            return digests[source]
+        return tree_digest(source, digests)
+
+    def file_digest(self, target: Path) -> str:
+        """Return the cached SHA256 of a single file."""
+        stat = target.stat()
+        key = str(target.resolve())
+        with self._lock:
+            cached = self._digests.get(key)
+        if (
+            cached
+            and cached.get("size") == stat.st_size
+            and cached.get("mtime_ns") == stat.st_mtime_ns
+        ):
+            return cached["sha256"]
+        digest = sha256_file(target)
+        with self._lock:
+            self._digests[key] = {
+                "size": stat.st_size,
+                "mtime_ns": stat.st_mtime_ns,
+                "sha256": digest,
+            }
+            self._dirty = True
+        return digest
+
+    def fingerprint_many(
+        self,
+        sources: Iterable[Path],
+    ) -> Dict[Path, Optional[str]]:
+        """Hash ``sources`` concurrently and save the cache.
+
+        The files of all sources are hashed on one pool, so a single large
+        directory is spread across the workers as well.
+        """
+        sources = [Path(s) for s in sources]
+        files = {source: hashed_files(source) for source in sources}
+        unique = list(dict.fromkeys(f for fs in files.values() for f in fs))
+        with ThreadPoolExecutor(self.max_workers) as pool:
+            digests = dict(zip(unique, pool.map(self.file_digest, unique)))
+        self.save()
+        return {
+            source: self._combine(source, {f: digests[f] for f in members})
+            for source, members in files.items()
+        }
+
+    # ------------------------------------------------------------------
+    def imported_as(self, digest: str) -> Optional[str]:
+        """Return the name a source with ``digest`` was imported under."""
+        with self._lock:
+            return self._imported.get(digest)
+
+    def mark_imported(self, digest: str, name: str) -> None:
+        with self._lock:
+            self._imported[digest] = name
+            self._dirty = True
+
+    def annotate(self, metadata: Dict[str, object], source: Path) -> bool:
+        """Store the digest of ``source`` in a ``SourceData.metadata`` dict.
+
+        Returns ``True`` when the source was imported before.
+        """
+        digest = self.fingerprint(source)
+        if digest is None:
+            return False
+        metadata[SHA256_KEY] = digest
+        previous = self.imported_as(digest)
+        if previous is not None:
+            metadata[DUPLICATE_KEY] = previous
+            return True
+        return False
+
+    def annotate_many(
+        self, metadata: Mapping[Path, Dict[str, object]]
+    ) -> Dict[Path, bool]:
+        """Annotate several sources, hashing them in parallel."""
+        self.fingerprint_many(metadata)
+        return {p: self.annotate(meta, p) for p, meta in metadata.items()}
@@ -0,0 +1,47 @@
+"""Semantic search over the processed asset library."""
+
+from typing import TYPE_CHECKING
+
+from .._lazy import lazy_exports
+
+_EXPORTS = {
+    "Embedder": ".embedding",
+    "HashingEmbedder": ".embedding",
+    "ImageEmbedder": ".embedding",
+    "SentenceTransformerEmbedder": ".embedding",
+    "create_embedder": ".embedding",
+    "IVFIndex": ".ivf",
+    "EmbeddingJob": ".job",
+    "JobProgress": ".job",
+    "IndexingService": ".service",
+    "IndexStats": ".service",
+    "VectorStore": ".store",
+}
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .embedding import (
+        Embedder,
+        HashingEmbedder,
+        ImageEmbedder,
+        SentenceTransformerEmbedder,
+        create_embedder,
+    )
+    from .ivf import IVFIndex
+    from .job import EmbeddingJob, JobProgress
+    from .service import IndexingService, IndexStats
+    from .store import VectorStore
+
+__all__ = [
+    "Embedder",
+    "EmbeddingJob",
+    "HashingEmbedder",
+    "IVFIndex",
+    "ImageEmbedder",
+    "IndexStats",
+    "IndexingService",
+    "JobProgress",
+    "SentenceTransformerEmbedder",
+    "VectorStore",
+    "create_embedder",
+]
@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import hashlib
+import re
+from functools import lru_cache
+from typing import Optional, Protocol, Sequence
+
+import numpy as np
+
+from ..config_models import IndexingSettings
+
+HASHING_MODEL = "hashing"
+DEFAULT_DIMENSION = 256
+
+_WORD = re.compile(r"[^\W_]+")
+_CAMEL = re.compile(r"(?<=[a-z0-9])(?=[A-Z])")
+
+
+class Embedder(Protocol):
+    """Maps texts to fixed-size vectors; similar texts map close together."""
+
+    name: str
+    dimension: int
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        """Return a ``(len(texts), dimension)`` float32 array."""
+
+
+class ImageEmbedder(Embedder, Protocol):
+    """An :class:`Embedder` that can also embed RGB images.
+
+    ``supports_images`` tells whether :meth:`embed_images` can be used;
+    it may depend on the model that was loaded.
+    """
+
+    supports_images: bool
+
+    def embed_images(self, images: Sequence[np.ndarray]) -> np.ndarray:
+        """Return a ``(len(images), dimension)`` float32 array."""
+
+
+def normalize(vectors: np.ndarray) -> np.ndarray:
+    """Scale each row to unit length, leaving all-zero rows as they are."""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.maximum(norms, np.float32(1e-12))
+
+
+@lru_cache(maxsize=65536)
+def _feature(feature: str, dimension: int) -> tuple[int, float]:
+    digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+    value = int.from_bytes(digest, "little")
+    return value % dimension, 1.0 if value >> 63 else -1.0
+
+
+class HashingEmbedder:
+    """Deterministic bag-of-features embedding that needs no model.
+
+    Words (with ``CamelCase`` split apart) and their character trigrams
+    are hashed into ``dimension`` signed buckets, so texts sharing words
+    or word fragments get a high cosine similarity.  It is the default
+    when no embedding model is configured and what the tests use.
+
+    Its colour layout image embedding shares nothing with the text
+    features, so it only adds noise to text queries; it is used for
+    indexing only when ``images`` is set.
+    """
+
+    TRIGRAM_WEIGHT = 0.5
+    # Images are described by the mean colour of a coarse grid of cells.
+    IMAGE_GRID = 4
+
+    def __init__(
+        self, dimension: int = DEFAULT_DIMENSION, *, images: bool = False
+    ) -> None:
+        if dimension < 1:
+            raise ValueError("Embedding dimension must be positive")
+        self.dimension = dimension
+        self.supports_images = images
+        self.name = f"{HASHING_MODEL}-{dimension}"
+        self._projection: Optional[np.ndarray] = None
+
+    def _features(self, text: str) -> list[tuple[str, float]]:
+        features = []
+        for word in _WORD.findall(_CAMEL.sub(" ", text)):
+            word = word.lower()
+            features.append((word, 1.0))
+            padded = f"#{word}#"
+            for trigram in zip(padded, padded[1:], padded[2:]):
+                features.append(("".join(trigram), self.TRIGRAM_WEIGHT))
+        return features
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dimension), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for feature, weight in self._features(text):
+                bucket, sign = _feature(feature, self.dimension)
+                vectors[row, bucket] += sign * weight
+        return normalize(vectors)
+
+    def embed_images(self, images: Sequence[np.ndarray]) -> np.ndarray:
+        """Embed the colour layout of each RGB ``uint8`` image."""
+        from PIL import Image
+
+        grid = (self.IMAGE_GRID, self.IMAGE_GRID)
+        features = np.zeros((len(images), grid[0] * grid[1] * 3))
+        for row, image in enumerate(images):
+            picture = Image.fromarray(image).convert("RGB")
+            cells = picture.resize(grid, Image.Resampling.BOX)
+            features[row] = np.asarray(cells, dtype=np.float64).ravel()
+        features = features / 127.5 - 1.0
+        if self._projection is None:
+            # A fixed random projection spreads the cells over the space.
+            rng = np.random.default_rng(self.dimension)
+            shape = (features.shape[1], self.dimension)
+            self._projection = rng.standard_normal(shape)
+        return normalize(features @ self._projection)
+
+
+class SentenceTransformerEmbedder:
+    """Embed with a ``sentence-transformers`` model run locally.
+
+    Requires the optional ``sentence-transformers`` package; the model is
+    loaded on first use.  Only multimodal (CLIP) models embed images.
+    """
+
+    def __init__(self, model: str) -> None:
+        self.name = model
+        self._model = None
+        self._dimension: Optional[int] = None
+
+    def _load(self):
+        if self._model is None:
+            try:  # defer import so the dependency stays optional
+                from sentence_transformers import SentenceTransformer
+            except Exception as exc:  # pragma: no cover - import guarded
+                raise RuntimeError(
+                    "The 'sentence-transformers' package is required for "
+                    f"embedding model {self.name!r}",
+                ) from exc
+            self._model = SentenceTransformer(self.name)
+        return self._model
+
+    @property
+    def dimension(self) -> int:
+        if self._dimension is None:
+            model = self._load()
+            self._dimension = int(model.get_sentence_embedding_dimension())
+        return self._dimension
+
+    @property
+    def supports_images(self) -> bool:
+        """Whether the model is a CLIP model, which also encodes images."""
+        modules = [type(module).__name__ for module in self._load()]
+        return "CLIPModel" in modules
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        vectors = self._load().encode(list(texts), convert_to_numpy=True)
+        return normalize(vectors)
+
+    def embed_images(self, images: Sequence[np.ndarray]) -> np.ndarray:
+        """Embed RGB images with a multimodal (CLIP) model."""
+        from PIL import Image
+
+        if not self.supports_images:
+            raise ValueError(f"Model {self.name!r} cannot embed images")
+
+        pictures = [Image.fromarray(image) for image in images]
+        vectors = self._load().encode(pictures, convert_to_numpy=True)
+        return normalize(vectors)
+
+
+def create_embedder(settings: Optional[IndexingSettings] = None) -> Embedder:
+    """Return the embedder selected by ``settings.embedding_model``.
+
+    No model, ``"hashing"`` or ``"hashing-<dimension>"`` select the
+    built-in :class:`HashingEmbedder`; anything else names a
+    ``sentence-transformers`` model.
+    """
+    model = (settings.embedding_model if settings else None) or ""
+    model = model.strip()
+    if not model or model.lower() == HASHING_MODEL:
+        return HashingEmbedder()
+    family, _, dimension = model.lower().partition("-")
+    if family == HASHING_MODEL and dimension.isdigit():
+        return HashingEmbedder(int(dimension))
+    return SentenceTransformerEmbedder(model)
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import numpy as np
+
+from .embedding import normalize
+
+# Rows multiplied against the centroids at once while assigning.
+ASSIGN_BLOCK_ROWS = 16384
+
+
+class IVFIndex:
+    """Inverted-file partition of unit vectors for approximate search.
+
+    Vectors are grouped under the nearest of ``nlist`` centroids found by
+    spherical k-means.  A query is only compared with the vectors of its
+    ``nprobe`` closest groups, which trades a little recall for scanning a
+    small fraction of the library.
+    """
+
+    def __init__(self, centroids: np.ndarray) -> None:
+        self.centroids = normalize(centroids)
+
+    @property
+    def nlist(self) -> int:
+        return len(self.centroids)
+
+    @classmethod
+    def train(
+        cls,
+        vectors: np.ndarray,
+        nlist: int,
+        *,
+        iterations: int = 10,
+        seed: int = 0,
+    ) -> "IVFIndex":
+        """Cluster ``vectors`` into ``nlist`` groups (deterministically)."""
+        vectors = normalize(vectors)
+        nlist = max(1, min(nlist, len(vectors)))
+        rng = np.random.default_rng(seed)
+        picks = rng.choice(len(vectors), nlist, replace=False)
+        index = cls(vectors[picks])
+        for _ in range(iterations):
+            labels = index.assign(vectors)
+            sums = np.zeros_like(index.centroids)
+            np.add.at(sums, labels, vectors)
+            empty = np.bincount(labels, minlength=nlist) == 0
+            # A centroid that lost all its vectors stays where it was.
+            sums[empty] = index.centroids[empty]
+            index.centroids = normalize(sums)
+        return index
+
+    def assign(self, vectors: np.ndarray) -> np.ndarray:
+        """Return the group of each row of ``vectors``."""
+        labels = np.empty(len(vectors), dtype=np.int32)
+        for start in range(0, len(vectors), ASSIGN_BLOCK_ROWS):
+            stop = start + ASSIGN_BLOCK_ROWS
+            scores = vectors[start:stop] @ self.centroids.T
+            labels[start:stop] = scores.argmax(axis=1)
+        return labels
+
+    def probe(self, query: np.ndarray, nprobe: int) -> np.ndarray:
+        """Return the ``nprobe`` groups closest to ``query``."""
+        scores = self.centroids @ query
+        if nprobe >= self.nlist:
+            return np.arange(self.nlist)
+        return np.argpartition(-scores, nprobe - 1)[:nprobe]
@@ -0,0 +1,297 @@
+from __future__ import annotations
+
+import io
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+from pydantic import BaseModel
+
+from ..config_models import IndexingSettings
+from ..library.catalog import CatalogEntry, LibraryCatalog
+from ..library.thumbnails import ThumbnailCache, asset_thumbnail
+from .service import IndexingService
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_FILENAME = "index-job.json"
+# Edge length previews are decoded at before they are embedded.
+PREVIEW_SIZE = 64
+
+_Batch = Tuple[List[CatalogEntry], List["Future[Optional[np.ndarray]]"]]
+
+
+class JobProgress(BaseModel):
+    """Where an embedding job stands."""
+
+    state: str = "idle"
+    total: int = 0
+    done: int = 0
+    failed: int = 0
+
+
+class EmbeddingJob:
+    """Embed every catalog asset missing from the semantic index.
+
+    The job runs on a background thread.  Pending assets are taken from
+    the catalog and embedded in batches; while one batch is embedded the
+    previews of the next are decoded on a thread pool.  Each batch is
+    committed to the vector store, so an interrupted run resumes where it
+    stopped.  A small checkpoint file next to the index remembers assets
+    that failed (until their metadata changes) and whether the job was
+    paused, so a pause survives restarting the application.
+
+    After each batch the job sleeps long enough to keep the process's CPU
+    use at ``cpu_budget`` of the machine, leaving room for interactive
+    work.
+    """
+
+    def __init__(
+        self,
+        service: IndexingService,
+        catalog: LibraryCatalog,
+        *,
+        thumbnails: Optional[ThumbnailCache] = None,
+        checkpoint_path: Optional[Path] = None,
+        batch_size: Optional[int] = None,
+        cpu_budget: float = 0.5,
+        max_workers: Optional[int] = None,
+        on_progress: Optional[Callable[[JobProgress], None]] = None,
+    ) -> None:
+        if not 0 < cpu_budget <= 1:
+            raise ValueError("cpu_budget must be in (0, 1]")
+        self.service = service
+        self.catalog = catalog
+        self.thumbnails = thumbnails
+        if checkpoint_path is None:
+            checkpoint_path = service.store.path.parent / CHECKPOINT_FILENAME
+        self.checkpoint_path = Path(checkpoint_path)
+        self.batch_size = batch_size or service.batch_size
+        self.cpu_budget = cpu_budget
+        cpus = os.cpu_count() or 1
+        self.max_workers = max_workers or max(1, int(cpus * cpu_budget))
+        self.on_progress = on_progress
+        self.progress = JobProgress()
+        self._failed: Dict[str, int] = {}
+        self._resume = threading.Event()
+        self._resume.set()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        # Guards ``_active`` and ``_again`` between start() and the run.
+        self._lock = threading.Lock()
+        self._active = False
+        self._again = False
+        self._load_checkpoint()
+
+    @classmethod
+    def for_settings(
+        cls,
+        service: IndexingService,
+        catalog: LibraryCatalog,
+        settings: IndexingSettings,
+        **kwargs,
+    ) -> "EmbeddingJob":
+        kwargs.setdefault("batch_size", settings.batch_size)
+        kwargs.setdefault("cpu_budget", settings.cpu_budget)
+        return cls(service, catalog, **kwargs)
+
+    # ------------------------------------------------------------------
+    def _load_checkpoint(self) -> None:
+        try:
+            data = json.loads(self.checkpoint_path.read_text())
+        except (OSError, ValueError):
+            return
+        failed = data.get("failed") or {}
+        self._failed = {str(k): int(v) for k, v in failed.items()}
+        if data.get("paused"):
+            self._resume.clear()
+            self.progress.state = "paused"
+
+    def _save_checkpoint(self) -> None:
+        data = {
+            "paused": not self._resume.is_set(),
+            "failed": self._failed,
+            "progress": self.progress.model_dump(),
+        }
+        fd, tmp = tempfile.mkstemp(
+            dir=self.checkpoint_path.parent, prefix=f".{CHECKPOINT_FILENAME}."
+        )
+        with os.fdopen(fd, "w") as fh:
+            json.dump(data, fh)
+        os.replace(tmp, self.checkpoint_path)
+
+    # ------------------------------------------------------------------
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def paused(self) -> bool:
+        return not self._resume.is_set()
+
+    def start(self) -> None:
+        """Start (or continue) indexing; a saved pause is kept.
+
+        While a run is going, another pass is queued after it so assets
+        added to the catalog in the meantime are embedded too.
+        """
+        with self._lock:
+            if self._active:
+                self._again = True
+                return
+            self._active = True
+            self._again = False
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="embedding-job", daemon=True
+            )
+            self._thread.start()
+
+    def pause(self) -> None:
+        """Stop after the current batch until :meth:`resume` is called."""
+        self._resume.clear()
+        self._set_state("paused")
+        self._save_checkpoint()
+
+    def resume(self) -> None:
+        self._resume.set()
+        if self.running:
+            self._set_state("running")
+        self._save_checkpoint()
+
+    def stop(self, timeout: float | None = None) -> None:
+        """Finish the current batch and end the run (keeps a pause)."""
+        with self._lock:
+            self._again = False
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """Block until the run ends; returns ``False`` on timeout."""
+        if self._thread is not None:
+            self._thread.join(timeout)
+        return not self.running
+
+    # ------------------------------------------------------------------
+    def pending(self) -> List[str]:
+        """Return the catalog paths that still need embedding."""
+        states = self.catalog.asset_states()
+        stamps = self.service.store.stamps()
+        gone = [path for path in stamps if path not in states]
+        if gone:
+            self.service.remove(gone)
+        pending = []
+        for path, (mtime, _) in sorted(states.items()):
+            if stamps.get(path) != mtime and self._failed.get(path) != mtime:
+                pending.append(path)
+        return pending
+
+    def _set_state(self, state: str) -> None:
+        self.progress.state = state
+        if self.on_progress is not None:
+            self.on_progress(self.progress.model_copy())
+
+    def _run(self) -> None:
+        while True:
+            finished = self._run_once()
+            with self._lock:
+                if not (finished and self._again):
+                    self._active = False
+                    return
+                self._again = False
+
+    def _run_once(self) -> bool:
+        try:
+            pending = self.pending()
+            self.progress = JobProgress(total=len(pending))
+            self._set_state("paused" if self.paused else "running")
+            with ThreadPoolExecutor(
+                self.max_workers, thread_name_prefix="embedding-preview"
+            ) as pool:
+                finished = self._embed_all(pending, pool)
+            self._set_state("done" if finished else "stopped")
+            self._save_checkpoint()
+            return finished
+        except Exception:
+            logger.exception("Embedding job failed")
+            self._set_state("failed")
+            return False
+
+    def _embed_all(self, pending: List[str], pool: ThreadPoolExecutor) -> bool:
+        batches = []
+        for start in range(0, len(pending), self.batch_size):
+            stop = start + self.batch_size
+            batches.append(pending[start:stop])
+        upcoming = self._prefetch(batches[0], pool) if batches else None
+        for number in range(len(batches)):
+            while not self._resume.wait(0.1):
+                if self._stop.is_set():
+                    return False
+            if self._stop.is_set():
+                return False
+            self._set_state("running")
+            started = time.perf_counter()
+            cpu_started = time.process_time()
+            entries, previews = upcoming
+            if number + 1 < len(batches):
+                # Decode the next previews while this batch is embedded.
+                upcoming = self._prefetch(batches[number + 1], pool)
+            images = [future.result() for future in previews] or None
+            try:
+                self.progress.done += self.service.index_batch(entries, images)
+            except Exception:
+                logger.exception("Embedding a batch failed")
+                for entry in entries:
+                    self._failed[entry.path] = entry.mtime_ns
+                self.progress.failed += len(entries)
+            self._save_checkpoint()
+            if self.on_progress is not None:
+                self.on_progress(self.progress.model_copy())
+            self._throttle(started, cpu_started)
+        return True
+
+    def _prefetch(self, paths: List[str], pool: ThreadPoolExecutor) -> _Batch:
+        entries = self.catalog.get_many(paths)
+        if not self.service.embeds_images:
+            return entries, []
+        previews = [pool.submit(self._preview, entry) for entry in entries]
+        return entries, previews
+
+    def _throttle(self, started: float, cpu_started: float) -> None:
+        """Sleep until the process's CPU use is back within budget."""
+        cpu = time.process_time() - cpu_started
+        elapsed = time.perf_counter() - started
+        capacity = self.cpu_budget * (os.cpu_count() or 1)
+        delay = cpu / capacity - elapsed
+        if delay > 0:
+            self._stop.wait(delay)
+
+    def _preview(self, entry: CatalogEntry) -> Optional[np.ndarray]:
+        """Decode a small RGB preview of ``entry`` (``None`` if none)."""
+        from PIL import Image
+
+        try:
+            data = None
+            if self.thumbnails is not None:
+                data = self.thumbnails.thumbnail(entry)
+            else:
+                asset_dir = self.catalog.output_root / entry.path
+                metadata_name = self.catalog.metadata_name
+                data = asset_thumbnail(asset_dir, metadata_name, PREVIEW_SIZE)
+            if data is None:
+                return None
+            with Image.open(io.BytesIO(data)) as image:
+                image.thumbnail((PREVIEW_SIZE, PREVIEW_SIZE))
+                return np.asarray(image.convert("RGB"))
+        except (OSError, ValueError) as exc:
+            logger.debug("No preview for %s: %s", entry.path, exc)
+            return None
@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import logging
+from pathlib import Path
+from typing import Iterable, List, Optional, Sequence, cast
+
+import numpy as np
+from pydantic import BaseModel
+
+from ..config_models import IndexingSettings
+from ..library.catalog import CatalogEntry, LibraryCatalog
+from .embedding import Embedder, ImageEmbedder, create_embedder, normalize
+from .store import Hit, VectorStore
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILENAME = "index.db"
+BATCH_SIZE = 64
+# Share of an asset's vector taken by its preview image, when embedded.
+IMAGE_WEIGHT = 0.5
+
+
+class IndexStats(BaseModel):
+    """What a sync of the semantic index changed."""
+
+    indexed: int = 0
+    removed: int = 0
+    unchanged: int = 0
+
+
+class IndexingService:
+    """Semantic search over the assets of a library catalog.
+
+    Each asset is embedded from its name, type, supplier, tags and file
+    types (plus its preview image, when given and the embedder supports
+    images) and stored in a :class:`VectorStore` under its catalog path,
+    stamped with the metadata mtime so :meth:`sync` only re-embeds assets
+    that changed.
+    """
+
+    def __init__(
+        self,
+        index_path: Path,
+        embedder: Optional[Embedder] = None,
+        *,
+        batch_size: int = BATCH_SIZE,
+    ) -> None:
+        self.embedder = embedder or create_embedder()
+        self.batch_size = batch_size
+        self.store = VectorStore(
+            index_path, self.embedder.dimension, model=self.embedder.name
+        )
+
+    @classmethod
+    def for_library(
+        cls,
+        library_path: Path,
+        settings: Optional[IndexingSettings] = None,
+        *,
+        embedder: Optional[Embedder] = None,
+        **kwargs,
+    ) -> "IndexingService":
+        """Open ``.asset-library/index.db`` with the configured model."""
+        path = Path(library_path) / ".asset-library" / INDEX_FILENAME
+        return cls(path, embedder or create_embedder(settings), **kwargs)
+
+    @property
+    def embeds_images(self) -> bool:
+        """Whether previews passed to :meth:`index_batch` are used."""
+        return bool(getattr(self.embedder, "supports_images", False))
+
+    @staticmethod
+    def document(entry: CatalogEntry) -> str:
+        """Return the text an asset is embedded from."""
+        parts = [entry.name, entry.asset_type, entry.supplier]
+        parts.extend(entry.tags)
+        parts.extend(entry.filetypes)
+        return " ".join(part for part in parts if part)
+
+    # ------------------------------------------------------------------
+    def close(self) -> None:
+        self.store.close()
+
+    def __enter__(self) -> "IndexingService":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self.store)
+
+    # ------------------------------------------------------------------
+    def index(self, entries: Iterable[CatalogEntry]) -> int:
+        """Embed ``entries`` in batches and store their vectors."""
+        count = 0
+        batch: List[CatalogEntry] = []
+        for entry in entries:
+            batch.append(entry)
+            if len(batch) >= self.batch_size:
+                count += self.index_batch(batch)
+                batch = []
+        if batch:
+            count += self.index_batch(batch)
+        return count
+
+    def index_batch(
+        self,
+        batch: Sequence[CatalogEntry],
+        images: Optional[Sequence[Optional[np.ndarray]]] = None,
+    ) -> int:
+        """Embed and store one batch; ``images`` are optional previews."""
+        texts = [self.document(entry) for entry in batch]
+        vectors = self.embedder.embed(texts)
+        if images is not None and self.embeds_images:
+            rows = [row for row, img in enumerate(images) if img is not None]
+            if rows:
+                embedder = cast(ImageEmbedder, self.embedder)
+                pictures = embedder.embed_images([images[r] for r in rows])
+                mixed = vectors[rows] + IMAGE_WEIGHT * pictures
+                vectors[rows] = normalize(mixed)
+        keys = [entry.path for entry in batch]
+        stamps = [entry.mtime_ns for entry in batch]
+        self.store.add(keys, vectors, stamps)
+        return len(batch)
+
+    def remove(self, paths: Iterable[str]) -> int:
+        return self.store.remove(paths)
+
+    def sync(self, catalog: LibraryCatalog) -> IndexStats:
+        """Embed new or changed catalog assets and drop removed ones."""
+        states = catalog.asset_states()
+        stamps = self.store.stamps()
+        stale = set()
+        for path, (mtime, _) in states.items():
+            if stamps.get(path) != mtime:
+                stale.add(path)
+        stats = IndexStats(unchanged=len(states) - len(stale))
+        gone = [path for path in stamps if path not in states]
+        stats.removed = self.store.remove(gone)
+        if stale:
+            stats.indexed = self.index(catalog.get_many(sorted(stale)))
+        logger.debug("Index sync: %s", stats)
+        return stats
+
+    # ------------------------------------------------------------------
+    def search(self, text: str, k: int = 20, **kwargs) -> List[Hit]:
+        """Return ``(path, similarity)`` of the assets closest to ``text``.
+
+        ``kwargs`` are passed to :meth:`VectorStore.search`.
+        """
+        if not text.strip():
+            return []
+        query = self.embedder.embed([text])[0]
+        return self.store.search(query, k, **kwargs)
+
+    def similar(self, path: str, k: int = 20, **kwargs) -> List[Hit]:
+        """Return the assets closest to the indexed asset at ``path``."""
+        vector = self.store.vector(path)
+        if vector is None:
+            return []
+        hits = self.store.search(vector, k + 1, **kwargs)
+        return [hit for hit in hits if hit[0] != path][:k]
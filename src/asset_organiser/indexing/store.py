@@ -0,0 +1,346 @@
+from __future__ import annotations
+
+import logging
+import math
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .embedding import normalize
+from .ivf import IVFIndex
+
+logger = logging.getLogger(__name__)
+
+INITIAL_CAPACITY = 1024
+# Rows scored against the queries at once by the exact search.
+SEARCH_BLOCK_ROWS = 16384
+# Stores at least this large are searched through the IVF index unless
+# the caller asks for an exact search.
+IVF_MIN_VECTORS = 50000
+# Training sample size per IVF group.
+IVF_SAMPLE_PER_LIST = 32
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS vectors (
+    key TEXT PRIMARY KEY,
+    row INTEGER NOT NULL UNIQUE,
+    stamp INTEGER NOT NULL
+);
+"""
+
+# ``(key, cosine similarity)`` of one search hit.
+Hit = Tuple[str, float]
+
+
+class VectorStore:
+    """Unit-length float32 vectors in a memory-mapped matrix file.
+
+    Row ``i`` of the ``.vectors`` file next to ``path`` holds one vector;
+    the SQLite database at ``path`` maps keys to rows and records the
+    ``stamp`` (e.g. metadata mtime) each vector was computed from.  Rows
+    of removed keys are reused.  Vectors are flushed to the matrix before
+    the map is committed, so a crash can leave an unused row but never a
+    key pointing at the wrong vector.
+
+    Searches compare against every row in blocks, or through an
+    :class:`IVFIndex` trained in memory once the store is large.
+    """
+
+    def __init__(self, path: Path, dimension: int, *, model: str = "") -> None:
+        self.path = Path(path)
+        self.vectors_path = self.path.with_suffix(".vectors")
+        self.dimension = dimension
+        self.model = model
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(
+            self.path, check_same_thread=False, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._rows: Dict[str, int] = {}
+        self._stamps: Dict[str, int] = {}
+        self._keys: List[Optional[str]] = []
+        self._free: List[int] = []
+        self._matrix: Optional[np.memmap] = None
+        self._ivf: Optional[IVFIndex] = None
+        self._ivf_size = 0
+        self._labels = np.empty(0, dtype=np.int32)
+        self._lists: Optional[List[np.ndarray]] = None
+        self._load()
+
+    def _load(self) -> None:
+        meta = dict(self._conn.execute("SELECT key, value FROM meta"))
+        expected = {"dimension": str(self.dimension), "model": self.model}
+        if meta != expected:
+            if meta:
+                logger.info("Embedding model changed; clearing %s", self.path)
+            with self._lock:
+                self._conn.execute("BEGIN IMMEDIATE")
+                self._conn.execute("DELETE FROM vectors")
+                self._conn.execute("DELETE FROM meta")
+                self._conn.executemany(
+                    "INSERT INTO meta VALUES (?, ?)", expected.items()
+                )
+                self._conn.execute("COMMIT")
+            self.vectors_path.unlink(missing_ok=True)
+        rows = self._conn.execute("SELECT key, row, stamp FROM vectors")
+        for key, row, stamp in rows:
+            self._rows[key] = row
+            self._stamps[key] = stamp
+        used = max(self._rows.values(), default=-1) + 1
+        self._keys = [None] * used
+        for key, row in self._rows.items():
+            self._keys[row] = key
+        self._free = [row for row in range(used) if self._keys[row] is None]
+        self._free.reverse()
+        try:
+            stored = self.vectors_path.stat().st_size // self._row_bytes
+        except FileNotFoundError:
+            stored = 0
+        self._map(max(INITIAL_CAPACITY, stored, used))
+
+    @property
+    def _row_bytes(self) -> int:
+        return self.dimension * 4
+
+    def _map(self, capacity: int) -> None:
+        """(Re)map the matrix file, growing it to ``capacity`` rows."""
+        if self._matrix is not None:
+            self._matrix.flush()
+            # Drop the mapping before resizing the file underneath it.
+            self._matrix = None
+        size = capacity * self._row_bytes
+        with open(self.vectors_path, "ab") as handle:
+            if handle.tell() < size:
+                handle.truncate(size)
+        self._matrix = np.memmap(
+            self.vectors_path,
+            dtype=np.float32,
+            mode="r+",
+            shape=(capacity, self.dimension),
+        )
+
+    # ------------------------------------------------------------------
+    def close(self) -> None:
+        with self._lock:
+            if self._matrix is not None:
+                self._matrix.flush()
+                self._matrix = None
+            self._conn.close()
+
+    def __enter__(self) -> "VectorStore":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._rows
+
+    def stamps(self) -> Dict[str, int]:
+        """Return ``key -> stamp`` of every stored vector."""
+        with self._lock:
+            return dict(self._stamps)
+
+    def vector(self, key: str) -> Optional[np.ndarray]:
+        with self._lock:
+            row = self._rows.get(key)
+            if row is None:
+                return None
+            return np.array(self._matrix[row])
+
+    # ------------------------------------------------------------------
+    def add(
+        self,
+        keys: Sequence[str],
+        vectors: np.ndarray,
+        stamps: Optional[Sequence[int]] = None,
+    ) -> None:
+        """Store ``vectors`` (normalised) under ``keys``, replacing any."""
+        vectors = normalize(np.atleast_2d(vectors))
+        if vectors.shape != (len(keys), self.dimension):
+            raise ValueError(
+                f"Expected {len(keys)} vectors of dimension "
+                f"{self.dimension}, got shape {vectors.shape}"
+            )
+        if stamps is None:
+            stamps = [0] * len(keys)
+        with self._lock:
+            new = [key for key in dict.fromkeys(keys) if key not in self]
+            rows = [self._allocate(key) for key in keys]
+            self._matrix[rows] = vectors
+            self._matrix.flush()
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO vectors VALUES (?, ?, ?)",
+                    zip(keys, rows, stamps),
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                for key in new:
+                    self._free.append(self._rows.pop(key))
+                raise
+            for key, row, stamp in zip(keys, rows, stamps):
+                self._rows[key] = row
+                self._stamps[key] = stamp
+                self._keys[row] = key
+            if self._ivf is not None:
+                self._labels[rows] = self._ivf.assign(vectors)
+                self._lists = None
+
+    def _allocate(self, key: str) -> int:
+        row = self._rows.get(key)
+        if row is not None:
+            return row
+        if self._free:
+            row = self._free.pop()
+        else:
+            row = len(self._keys)
+            self._keys.append(None)
+        if row >= len(self._matrix):
+            self._map(2 * len(self._matrix))
+        if row >= len(self._labels):
+            grown = np.full(len(self._matrix), -1, dtype=np.int32)
+            grown[: len(self._labels)] = self._labels
+            self._labels = grown
+        # Reserve the row until the key is committed.
+        self._rows[key] = row
+        return row
+
+    def remove(self, keys: Iterable[str]) -> int:
+        """Drop the vectors of ``keys``; returns how many were stored."""
+        with self._lock:
+            keys = [key for key in dict.fromkeys(keys) if key in self._rows]
+            self._conn.execute("BEGIN IMMEDIATE")
+            self._conn.executemany(
+                "DELETE FROM vectors WHERE key = ?", [(k,) for k in keys]
+            )
+            self._conn.execute("COMMIT")
+            for key in keys:
+                row = self._rows.pop(key)
+                del self._stamps[key]
+                self._keys[row] = None
+                self._free.append(row)
+                if row < len(self._labels):
+                    self._labels[row] = -1
+            self._lists = None
+        return len(keys)
+
+    # ------------------------------------------------------------------
+    def search(
+        self,
+        query: np.ndarray,
+        k: int = 10,
+        *,
+        exact: Optional[bool] = None,
+        nprobe: Optional[int] = None,
+    ) -> List[Hit]:
+        """Return the ``k`` stored vectors most similar to ``query``."""
+        return self.search_many([query], k, exact=exact, nprobe=nprobe)[0]
+
+    def search_many(
+        self,
+        queries: np.ndarray,
+        k: int = 10,
+        *,
+        exact: Optional[bool] = None,
+        nprobe: Optional[int] = None,
+    ) -> List[List[Hit]]:
+        """Return the ``k`` best hits for each row of ``queries``.
+
+        ``exact`` forces (``True``) or disables (``False``) the brute-force
+        search; by default stores of at least ``IVF_MIN_VECTORS`` vectors
+        use the IVF index, probing ``nprobe`` groups.
+        """
+        queries = normalize(np.atleast_2d(queries))
+        with self._lock:
+            if not self._rows or k < 1:
+                return [[] for _ in queries]
+            if exact is None:
+                exact = len(self._rows) < IVF_MIN_VECTORS
+            if exact:
+                return self._search_exact(queries, k)
+            lists = self._ivf_lists()
+            if nprobe is None:
+                nprobe = max(8, self._ivf.nlist // 20)
+            results = []
+            for query in queries:
+                groups = self._ivf.probe(query, nprobe)
+                rows = np.concatenate([lists[group] for group in groups])
+                scores = self._matrix[rows] @ query
+                results.append(self._best(scores[None], rows[None], k)[0])
+            return results
+
+    def _search_exact(self, queries: np.ndarray, k: int) -> List[List[Hit]]:
+        used = len(self._keys)
+        live = np.fromiter(
+            (key is not None for key in self._keys), dtype=bool, count=used
+        )
+        best_scores = np.empty((len(queries), 0), dtype=np.float32)
+        best_rows = np.empty((len(queries), 0), dtype=np.int64)
+        for start in range(0, used, SEARCH_BLOCK_ROWS):
+            stop = min(used, start + SEARCH_BLOCK_ROWS)
+            scores = queries @ self._matrix[start:stop].T
+            scores[:, ~live[start:stop]] = -np.inf
+            rows = np.broadcast_to(np.arange(start, stop), scores.shape)
+            best_scores = np.concatenate([best_scores, scores], axis=1)
+            best_rows = np.concatenate([best_rows, rows], axis=1)
+            if best_scores.shape[1] > k:
+                keep = np.argpartition(-best_scores, k - 1, axis=1)[:, :k]
+                best_scores = np.take_along_axis(best_scores, keep, axis=1)
+                best_rows = np.take_along_axis(best_rows, keep, axis=1)
+        return self._best(best_scores, best_rows, k)
+
+    def _best(self, scores: np.ndarray, rows: np.ndarray, k: int) -> List:
+        results = []
+        for row_scores, row_ids in zip(scores, rows):
+            order = np.argsort(-row_scores, kind="stable")[:k]
+            hits = []
+            for position in order:
+                score = float(row_scores[position])
+                if math.isfinite(score):
+                    key = self._keys[row_ids[position]]
+                    hits.append((key, score))
+            results.append(hits)
+        return results
+
+    def _ivf_lists(self) -> List[np.ndarray]:
+        """Return the rows of each IVF group, (re)training if needed."""
+        size = len(self._rows)
+        if self._ivf is None or size > 2 * self._ivf_size:
+            self._train(size)
+        if self._lists is None:
+            labels = self._labels[: len(self._keys)]
+            order = np.argsort(labels, kind="stable")
+            groups = np.arange(self._ivf.nlist + 1)
+            bounds = np.searchsorted(labels[order], groups)
+            # The first part holds unused rows (label -1).
+            self._lists = np.split(order, bounds)[1:-1]
+        return self._lists
+
+    def _train(self, size: int) -> None:
+        live = np.array(sorted(self._rows.values()), dtype=np.int64)
+        nlist = max(1, int(math.sqrt(size)))
+        rng = np.random.default_rng(0)
+        sample_size = min(size, nlist * IVF_SAMPLE_PER_LIST)
+        sample = np.sort(rng.choice(live, sample_size, replace=False))
+        logger.debug("Training IVF index: %d lists, %d vectors", nlist, size)
+        self._ivf = IVFIndex.train(self._matrix[sample], nlist)
+        self._ivf_size = size
+        self._labels = np.full(len(self._matrix), -1, dtype=np.int32)
+        self._labels[live] = self._ivf.assign(self._matrix[live])
+        self._lists = None
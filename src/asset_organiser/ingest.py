@@ -0,0 +1,160 @@
+"""Scan, classify and process source packs without any UI.
+
+Shared by the headless ``batch`` command and the local API server.
+Progress is reported through an ``emit(event, **fields)`` callback.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from . import profiling, tracing
+from .classification.models import ClassificationState
+from .classification.service import ClassificationService
+from .config_service import ConfigService
+from .hashing import DUPLICATE_KEY, SourceFingerprintService
+from .llm import LLMClient
+from .processing.models import AssetResult
+from .processing.service import ProcessingService
+from .scanning import collect_files
+
+logger = logging.getLogger(__name__)
+
+Emit = Callable[..., None]
+
+
+def source_names(paths: Iterable[Path]) -> Dict[str, Path]:
+    """Give every source a unique name, based on its file name."""
+    names: Dict[str, Path] = {}
+    for path in paths:
+        name, counter = path.name, 1
+        while name in names:
+            counter += 1
+            name = f"{path.name}-{counter}"
+        names[name] = path
+    return names
+
+
+def ingest(
+    config: ConfigService,
+    paths: Iterable[Path],
+    emit: Emit,
+    *,
+    max_workers: Optional[int] = None,
+    skip_imported: bool = False,
+    llm_client: Optional[LLMClient] = None,
+) -> int:
+    """Import ``paths`` into the library of ``config``.
+
+    Emits ``error``, ``source``, ``skipped``, ``classified`` and
+    ``asset`` events as work progresses, ``profile`` when profiling is
+    enabled and a final ``done`` event.  Returns the number of sources
+    and assets that failed.
+    """
+    if config.library_path is None:
+        raise RuntimeError("Library path not set")
+    started = time.perf_counter()
+    paths = list(paths)
+    with profiling.session(config, "ingest") as profiler:
+        assets, failed = _ingest(
+            config, paths, emit, max_workers, skip_imported, llm_client
+        )
+    if profiler is not None:
+        emit("profile", path=str(profiler.output))
+    elapsed = round(time.perf_counter() - started, 3)
+    emit(
+        "done",
+        sources=len(paths),
+        assets=assets,
+        failed=failed,
+        seconds=elapsed,
+    )
+    return failed
+
+
+def _ingest(
+    config: ConfigService,
+    paths: List[Path],
+    emit: Emit,
+    max_workers: Optional[int],
+    skip_imported: bool,
+    llm_client: Optional[LLMClient],
+) -> Tuple[int, int]:
+    """Run the import; returns the number of assets and of failures."""
+    assert config.library_path is not None
+    classifier = ClassificationService(config, llm_client)
+    fingerprints = SourceFingerprintService(config.library_path)
+
+    failed = 0
+    sources = source_names(paths)
+    for name, path in list(sources.items()):
+        if not path.exists():
+            emit("error", source=name, stage="scan", error="Not found")
+            failed += 1
+            del sources[name]
+    metadata = {path: {} for path in sources.values()}
+    imported = fingerprints.annotate_many(metadata)
+    for name, path in list(sources.items()):
+        previous = metadata[path].get(DUPLICATE_KEY)
+        emit("source", source=name, path=str(path), imported_as=previous)
+        if imported.get(path) and skip_imported:
+            emit("skipped", source=name, reason="already imported")
+            del sources[name]
+
+    def classify(name: str) -> ClassificationState:
+        path = sources[name]
+        with tracing.span("source", "classification", source=name):
+            files = [str(f) for f in collect_files(path)]
+            state = classifier.from_file_list(files)
+            state.sources["src"].metadata.update(metadata[path])
+            return classifier.classify(state)
+
+    combined = ClassificationState()
+    task = tracing.propagate(classify)
+    with ThreadPoolExecutor(max_workers) as pool:
+        futures = {name: pool.submit(task, name) for name in sources}
+        for name, future in futures.items():
+            try:
+                result = future.result()
+            except Exception as exc:
+                logger.debug("Classifying %s failed", name, exc_info=True)
+                emit("error", source=name, stage="classify", error=str(exc))
+                failed += 1
+                continue
+            source = result.sources["src"]
+            combined.sources[name] = source
+            emit(
+                "classified",
+                source=name,
+                files=len(source.contents),
+                assets=len(source.assets),
+            )
+
+    assets = 0
+
+    def on_asset(result: AssetResult) -> None:
+        nonlocal assets, failed
+        assets += 1
+        failed += bool(result.error)
+        emit("asset", **result.model_dump())
+
+    if combined.sources:
+        service = ProcessingService(
+            config, max_workers=max_workers, fingerprints=fingerprints
+        )
+        selected = {name: sources[name] for name in combined.sources}
+        try:
+            service.process(combined, selected, on_asset=on_asset)
+        except Exception as exc:
+            logger.debug("Processing failed", exc_info=True)
+            emit("error", stage="process", error=str(exc))
+            failed += 1
+        finally:
+            for cache in (service.catalog, service.thumbnails):
+                if cache is not None:
+                    cache.close()
+    return assets, failed
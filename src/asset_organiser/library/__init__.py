@@ -0,0 +1,33 @@
+"""Indexes over the processed asset library."""
+
+from typing import TYPE_CHECKING
+
+from .._lazy import lazy_exports
+
+_EXPORTS = {
+    "CatalogEntry": ".catalog",
+    "LibraryCatalog": ".catalog",
+    "RescanStats": ".catalog",
+    "DuplicateFinder": ".duplicates",
+    "DuplicateMatch": ".duplicates",
+    "HammingIndex": ".duplicates",
+    "LibraryScanner": ".rescan",
+    "LibraryWatcher": ".rescan",
+}
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .catalog import CatalogEntry, LibraryCatalog, RescanStats
+    from .duplicates import DuplicateFinder, DuplicateMatch, HammingIndex
+    from .rescan import LibraryScanner, LibraryWatcher
+
+__all__ = [
+    "CatalogEntry",
+    "DuplicateFinder",
+    "DuplicateMatch",
+    "HammingIndex",
+    "LibraryCatalog",
+    "LibraryScanner",
+    "LibraryWatcher",
+    "RescanStats",
+]
@@ -0,0 +1,683 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+from pydantic import BaseModel, Field
+
+logger = logging.getLogger(__name__)
+
+CATALOG_FILENAME = "catalog.db"
+SCHEMA_VERSION = 4
+# Values bound per statement, well below SQLite's limit (32766 by
+# default, 999 before 3.32).
+MAX_PARAMETERS = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS assets (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    asset_id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    asset_type TEXT NOT NULL,
+    supplier TEXT NOT NULL,
+    processed_at TEXT,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS assets_type ON assets (asset_type, name);
+CREATE INDEX IF NOT EXISTS assets_supplier ON assets (supplier, name);
+CREATE INDEX IF NOT EXISTS assets_name ON assets (name COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS assets_asset_id ON assets (asset_id);
+
+CREATE TABLE IF NOT EXISTS asset_tags (
+    tag TEXT NOT NULL COLLATE NOCASE,
+    asset INTEGER NOT NULL REFERENCES assets (id) ON DELETE CASCADE,
+    PRIMARY KEY (tag, asset)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS asset_tags_asset ON asset_tags (asset);
+
+CREATE TABLE IF NOT EXISTS asset_filetypes (
+    filetype TEXT NOT NULL,
+    asset INTEGER NOT NULL REFERENCES assets (id) ON DELETE CASCADE,
+    PRIMARY KEY (filetype, asset)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS asset_filetypes_asset ON asset_filetypes (asset);
+
+CREATE TABLE IF NOT EXISTS asset_resolutions (
+    resolution TEXT NOT NULL,
+    asset INTEGER NOT NULL REFERENCES assets (id) ON DELETE CASCADE,
+    PRIMARY KEY (resolution, asset)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS asset_resolutions_asset
+    ON asset_resolutions (asset);
+
+CREATE TABLE IF NOT EXISTS asset_hashes (
+    asset INTEGER NOT NULL REFERENCES assets (id) ON DELETE CASCADE,
+    filetype TEXT NOT NULL,
+    phash INTEGER NOT NULL,
+    dhash INTEGER NOT NULL,
+    PRIMARY KEY (asset, filetype)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS directories (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    children TEXT NOT NULL,
+    is_asset INTEGER NOT NULL
+) WITHOUT ROWID;
+"""
+
+# Word-prefix index over the searchable text of each asset; the rowid is
+# the ``assets.id`` of the row it describes.
+_SEARCH_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS asset_search USING fts5 (
+    name, tags, asset_type, supplier, filetypes,
+    tokenize = "unicode61 remove_diacritics 2",
+    prefix = '1 2 3'
+);
+CREATE TRIGGER IF NOT EXISTS assets_search_delete AFTER DELETE ON assets
+BEGIN
+    DELETE FROM asset_search WHERE rowid = old.id;
+END;
+"""
+# Columns searched by each relevance tier, best first; the last searches
+# them all.  Matches are ordered by name within a tier rather than by
+# bm25, which would have to score every match before the first page.
+_SEARCH_TIERS = ("{name}", "{name tags}", "")
+_WORD = re.compile(r"\w+")
+
+# ``(mtime_ns, child directory names, holds an asset)`` of a directory.
+DirectoryState = Tuple[int, List[str], bool]
+
+# Side tables holding one row per value of a multi-valued attribute.
+_ATTRIBUTES = {
+    "tags": ("asset_tags", "tag"),
+    "filetypes": ("asset_filetypes", "filetype"),
+    "resolutions": ("asset_resolutions", "resolution"),
+}
+
+
+def _signed(value: int) -> int:
+    """Map an unsigned 64-bit hash onto SQLite's signed integers."""
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+
+def _unsigned(value: int) -> int:
+    return value & ((1 << 64) - 1)
+
+
+def _split_words(text: str) -> str:
+    """Also index the parts of ``CamelCase`` names as separate words."""
+    parts = re.sub(r"(?<=[a-z0-9])(?=[A-Z])", " ", text)
+    return text if parts == text else f"{text} {parts}"
+
+
+class CatalogEntry(BaseModel):
+    """One asset as recorded in the catalog."""
+
+    path: str
+    asset_id: str
+    name: str
+    asset_type: str
+    supplier: str
+    processed_at: Optional[str] = None
+    mtime_ns: int = 0
+    size: int = 0
+    tags: List[str] = Field(default_factory=list)
+    filetypes: List[str] = Field(default_factory=list)
+    resolutions: List[str] = Field(default_factory=list)
+    # File type -> (pHash, dHash) of the image it was exported from.
+    image_hashes: Dict[str, Tuple[int, int]] = Field(default_factory=dict)
+
+    @classmethod
+    def from_metadata(
+        cls, path: str, metadata: Mapping, mtime_ns: int = 0
+    ) -> "CatalogEntry":
+        """Build an entry from the contents of an asset's metadata file."""
+        name = str(metadata.get("asset_name") or Path(path).name)
+        asset_type = str(metadata.get("asset_type") or "")
+        supplier = str(metadata.get("supplier") or "")
+        filetypes: List[str] = []
+        image_hashes: Dict[str, Tuple[int, int]] = {}
+        for entry in metadata.get("files") or []:
+            filetype = entry.get("type") if isinstance(entry, dict) else None
+            if not filetype:
+                continue
+            if filetype not in filetypes:
+                filetypes.append(str(filetype))
+            hashes = entry.get("perceptual_hash")
+            try:
+                phash = int(hashes["phash"], 16)
+                dhash = int(hashes["dhash"], 16)
+            except (KeyError, TypeError, ValueError):
+                continue
+            image_hashes.setdefault(str(filetype), (phash, dhash))
+        asset_id = metadata.get("asset_id")
+        if not asset_id:
+            asset_id = f"{supplier}/{asset_type}/{name}"
+        resolutions = metadata.get("available_resolutions") or []
+        return cls(
+            path=path,
+            asset_id=str(asset_id),
+            name=name,
+            asset_type=asset_type,
+            supplier=supplier,
+            processed_at=metadata.get("processing_timestamp_utc"),
+            mtime_ns=mtime_ns,
+            tags=[str(tag) for tag in metadata.get("tags") or []],
+            filetypes=filetypes,
+            resolutions=[str(r) for r in resolutions],
+            image_hashes=image_hashes,
+        )
+
+
+class RescanStats(BaseModel):
+    """What a catalog rescan changed."""
+
+    added: int = 0
+    updated: int = 0
+    removed: int = 0
+    unchanged: int = 0
+    failed: List[str] = Field(default_factory=list)
+
+
+class LibraryCatalog:
+    """SQLite index of the assets in an output library.
+
+    The catalog lives in the library's ``.asset-library`` directory and
+    records one row per asset directory, keyed by its path relative to the
+    output root, with tags, file types and resolutions in indexed side
+    tables.  It is kept current by the processor as assets are published
+    and by :meth:`rescan`, which only re-reads metadata files whose
+    modification time changed.
+    """
+
+    def __init__(
+        self,
+        db_path: Path,
+        output_root: Path,
+        *,
+        metadata_name: str = "metadata.json",
+    ) -> None:
+        self.db_path = Path(db_path)
+        self.output_root = Path(output_root)
+        self.metadata_name = metadata_name
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(
+            self.db_path, check_same_thread=False, isolation_level=None
+        )
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._migrate()
+        self.has_fts = (
+            self._conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'asset_search'"
+            ).fetchone()
+            is not None
+        )
+
+    @classmethod
+    def for_library(
+        cls,
+        library_path: Path,
+        output_root: Path,
+        *,
+        metadata_name: str = "metadata.json",
+    ) -> "LibraryCatalog":
+        path = Path(library_path) / ".asset-library" / CATALOG_FILENAME
+        return cls(path, output_root, metadata_name=metadata_name)
+
+    def _migrate(self) -> None:
+        with self._lock:
+            version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+            if version == SCHEMA_VERSION:
+                return
+            if version:
+                # Older layouts are rebuilt from the metadata files.
+                logger.info("Rebuilding catalog %s", self.db_path)
+                for table, _ in _ATTRIBUTES.values():
+                    self._conn.execute(f"DROP TABLE IF EXISTS {table}")
+                self._conn.execute("DROP TABLE IF EXISTS asset_hashes")
+                self._conn.execute("DROP TABLE IF EXISTS assets")
+                self._conn.execute("DROP TABLE IF EXISTS directories")
+                self._conn.execute("DROP TABLE IF EXISTS asset_search")
+            self._conn.executescript(_SCHEMA)
+            try:
+                self._conn.executescript(_SEARCH_SCHEMA)
+            except sqlite3.OperationalError:
+                logger.warning("SQLite lacks FTS5; search uses LIKE")
+            self._conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+
+    # ------------------------------------------------------------------
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self) -> "LibraryCatalog":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def _transaction(self) -> "_Transaction":
+        return _Transaction(self)
+
+    # ------------------------------------------------------------------
+    def upsert(self, entry: CatalogEntry) -> None:
+        """Insert or replace one asset."""
+        self.upsert_many([entry])
+
+    def upsert_many(self, entries: Iterable[CatalogEntry]) -> int:
+        """Insert or replace ``entries`` in a single transaction."""
+        count = 0
+        with self._transaction() as conn:
+            for entry in entries:
+                self._write(conn, entry)
+                count += 1
+        return count
+
+    def _write(self, conn: sqlite3.Connection, entry: CatalogEntry) -> None:
+        conn.execute(
+            """
+            INSERT INTO assets (path, asset_id, name, asset_type, supplier,
+                                processed_at, mtime_ns, size)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (path) DO UPDATE SET
+                asset_id = excluded.asset_id,
+                name = excluded.name,
+                asset_type = excluded.asset_type,
+                supplier = excluded.supplier,
+                processed_at = excluded.processed_at,
+                mtime_ns = excluded.mtime_ns,
+                size = excluded.size
+            """,
+            (
+                entry.path,
+                entry.asset_id,
+                entry.name,
+                entry.asset_type,
+                entry.supplier,
+                entry.processed_at,
+                entry.mtime_ns,
+                entry.size,
+            ),
+        )
+        asset = conn.execute(
+            "SELECT id FROM assets WHERE path = ?", (entry.path,)
+        ).fetchone()[0]
+        for attribute, (table, column) in _ATTRIBUTES.items():
+            conn.execute(f"DELETE FROM {table} WHERE asset = ?", (asset,))
+            values = dict.fromkeys(getattr(entry, attribute))
+            sql = f"INSERT OR IGNORE INTO {table} ({column}, asset) VALUES"
+            rows = [(value, asset) for value in values]
+            conn.executemany(f"{sql} (?, ?)", rows)
+        conn.execute("DELETE FROM asset_hashes WHERE asset = ?", (asset,))
+        conn.executemany(
+            "INSERT INTO asset_hashes VALUES (?, ?, ?, ?)",
+            [
+                (asset, filetype, _signed(phash), _signed(dhash))
+                for filetype, (phash, dhash) in entry.image_hashes.items()
+            ],
+        )
+        if self.has_fts:
+            conn.execute("DELETE FROM asset_search WHERE rowid = ?", (asset,))
+            conn.execute(
+                "INSERT INTO asset_search (rowid, name, tags, asset_type, "
+                "supplier, filetypes) VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    asset,
+                    _split_words(entry.name),
+                    " ".join(entry.tags),
+                    _split_words(entry.asset_type),
+                    entry.supplier,
+                    " ".join(entry.filetypes),
+                ),
+            )
+
+    def refresh(self, asset_dirs: Iterable[Path]) -> List[CatalogEntry]:
+        """Re-read the metadata files of ``asset_dirs`` into the catalog.
+
+        Assets without readable metadata are removed from the catalog.
+        """
+        entries: List[CatalogEntry] = []
+        missing: List[str] = []
+        for asset_dir in asset_dirs:
+            path = self._relative(Path(asset_dir))
+            entry = self.load_entry(path)
+            if entry is None:
+                missing.append(path)
+            else:
+                entries.append(entry)
+        with self._transaction() as conn:
+            for entry in entries:
+                self._write(conn, entry)
+            conn.executemany(
+                "DELETE FROM assets WHERE path = ?",
+                [(path,) for path in missing],
+            )
+        return entries
+
+    def remove(self, path: str) -> bool:
+        with self._transaction() as conn:
+            cursor = conn.execute("DELETE FROM assets WHERE path = ?", (path,))
+        return cursor.rowcount > 0
+
+    # ------------------------------------------------------------------
+    def get(self, path: str) -> Optional[CatalogEntry]:
+        entries = self._entries("WHERE a.path = ?", [path])
+        return entries[0] if entries else None
+
+    def get_many(self, paths: Iterable[str]) -> List[CatalogEntry]:
+        """Return the entries of ``paths`` that are in the catalog."""
+        paths = list(dict.fromkeys(paths))
+        found: Dict[str, CatalogEntry] = {}
+        for start in range(0, len(paths), MAX_PARAMETERS):
+            chunk = paths[start : start + MAX_PARAMETERS]
+            marks = ", ".join("?" for _ in chunk)
+            for entry in self._entries(f"WHERE a.path IN ({marks})", chunk):
+                found[entry.path] = entry
+        return [found[path] for path in paths if path in found]
+
+    def count(self) -> int:
+        with self._lock:
+            row = self._conn.execute("SELECT COUNT(*) FROM assets").fetchone()
+        return row[0]
+
+    def query(
+        self,
+        *,
+        name: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        **filters,
+    ) -> List[CatalogEntry]:
+        """Return assets matching every given filter, ordered by name.
+
+        Filters are ``asset_type``, ``supplier``, ``tags``, ``filetypes``
+        and ``resolution``; ``tags`` and ``filetypes`` require all listed
+        values to be present.  ``name`` matches a case-insensitive
+        substring.
+        """
+        clauses, params = self._filters(**filters)
+        if name:
+            clauses.append("a.name LIKE ? ESCAPE '\\'")
+            escaped = re.sub(r"([\\%_])", r"\\\1", name)
+            params.append(f"%{escaped}%")
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        where += " ORDER BY a.name COLLATE NOCASE, a.path"
+        if limit is not None:
+            where += " LIMIT ? OFFSET ?"
+            params.extend([limit, offset])
+        return self._entries(where, params)
+
+    def search(
+        self,
+        text: str,
+        *,
+        limit: int = 100,
+        offset: int = 0,
+        **filters,
+    ) -> List[CatalogEntry]:
+        """Return assets matching the words of ``text``, best match first.
+
+        Every word must match the start of a word in the asset's name,
+        tags, type, supplier or file types, so partially typed input
+        already finds results.  Assets whose names match every word come
+        first, then those matched by their names and tags, then the rest,
+        each group ordered by name.  ``filters`` are the same as for
+        :meth:`query`.  An empty ``text`` lists assets by name.
+        """
+        words = _WORD.findall(text)
+        if not words:
+            return self.query(limit=limit, offset=offset, **filters)
+        if not self.has_fts:
+            return self._search_like(words, limit, offset, filters)
+        clauses, params = self._filters(**filters)
+        phrases = " AND ".join(f'"{word}"*' for word in words)
+        where = " AND ".join(["s.asset_search MATCH ?", *clauses])
+        # CROSS JOIN keeps SQLite from walking a filter's index instead
+        # of the matches, which are what bounds the work here.
+        sql = (
+            "SELECT a.id, a.path FROM asset_search AS s CROSS JOIN assets "
+            f"AS a ON a.id = s.rowid WHERE {where} "
+            "ORDER BY a.name COLLATE NOCASE, a.path LIMIT ?"
+        )
+        wanted = offset + limit
+        found: Dict[int, str] = {}
+        with self._lock:
+            # Each tier also matches everything the ones before it did, so
+            # it only has to be read when those came up short.
+            for columns in _SEARCH_TIERS:
+                match = f"{columns} : ({phrases})" if columns else phrases
+                rows = self._conn.execute(sql, [match, *params, wanted])
+                found.update(rows.fetchall())
+                if len(found) >= wanted:
+                    break
+            ranked = list(found.items())[offset:wanted]
+            if not ranked:
+                return []
+            marks = ", ".join("?" for _ in ranked)
+            entries = self._entries(
+                f"WHERE a.id IN ({marks})", [id_ for id_, _ in ranked]
+            )
+        order = {path: index for index, (_, path) in enumerate(ranked)}
+        return sorted(entries, key=lambda entry: order[entry.path])
+
+    def _search_like(
+        self,
+        words: List[str],
+        limit: int,
+        offset: int,
+        filters: Mapping[str, object],
+    ) -> List[CatalogEntry]:
+        """Substring search for SQLite builds without FTS5."""
+        clauses, params = self._filters(**filters)
+        for word in words:
+            escaped = re.sub(r"([\\%_])", r"\\\1", word)
+            clauses.append(
+                "(a.name LIKE ? ESCAPE '\\' OR a.id IN (SELECT asset FROM "
+                "asset_tags WHERE tag LIKE ? ESCAPE '\\'))"
+            )
+            params.extend([f"%{escaped}%", f"{escaped}%"])
+        where = f"WHERE {' AND '.join(clauses)}"
+        where += " ORDER BY a.name COLLATE NOCASE LIMIT ? OFFSET ?"
+        return self._entries(where, [*params, limit, offset])
+
+    @staticmethod
+    def _filters(
+        *,
+        asset_type: Optional[str] = None,
+        supplier: Optional[str] = None,
+        tags: Iterable[str] = (),
+        filetypes: Iterable[str] = (),
+        resolution: Optional[str] = None,
+    ) -> Tuple[List[str], List[object]]:
+        clauses: List[str] = []
+        params: List[object] = []
+        if asset_type is not None:
+            clauses.append("a.asset_type = ?")
+            params.append(asset_type)
+        if supplier is not None:
+            clauses.append("a.supplier = ?")
+            params.append(supplier)
+        for attribute, values in (("tags", tags), ("filetypes", filetypes)):
+            values = list(dict.fromkeys(values))
+            if not values:
+                continue
+            table, column = _ATTRIBUTES[attribute]
+            marks = ", ".join("?" for _ in values)
+            clauses.append(
+                f"a.id IN (SELECT asset FROM {table} WHERE {column} IN "
+                f"({marks}) GROUP BY asset HAVING COUNT(*) = ?)"
+            )
+            params.extend(values)
+            params.append(len(values))
+        if resolution is not None:
+            table, column = _ATTRIBUTES["resolutions"]
+            subquery = f"SELECT asset FROM {table} WHERE {column} = ?"
+            clauses.append(f"a.id IN ({subquery})")
+            params.append(resolution)
+        return clauses, params
+
+    def facets(self, attribute: str) -> Dict[str, int]:
+        """Return each distinct value of ``attribute`` with its asset count.
+
+        ``attribute`` is ``asset_type``, ``supplier``, ``tags``,
+        ``filetypes`` or ``resolutions``.
+        """
+        if attribute in ("asset_type", "supplier"):
+            sql = (
+                f"SELECT {attribute}, COUNT(*) FROM assets "
+                f"GROUP BY {attribute} ORDER BY {attribute}"
+            )
+        elif attribute in _ATTRIBUTES:
+            table, column = _ATTRIBUTES[attribute]
+            sql = (
+                f"SELECT {column}, COUNT(*) FROM {table} "
+                f"GROUP BY {column} ORDER BY {column}"
+            )
+        else:
+            raise ValueError(f"Unknown catalog attribute: {attribute}")
+        with self._lock:
+            return dict(self._conn.execute(sql).fetchall())
+
+    def _entries(self, where: str, params: List[object]) -> List[CatalogEntry]:
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT a.* FROM assets AS a {where}", params
+            ).fetchall()
+            if not rows:
+                return []
+            columns = [k for k in rows[0].keys() if k != "id"]
+            entries: Dict[int, CatalogEntry] = {}
+            for row in rows:
+                fields = {k: row[k] for k in columns}
+                entries[row["id"]] = CatalogEntry(**fields)
+            ids = list(entries)
+            for start in range(0, len(ids), MAX_PARAMETERS):
+                self._fill(entries, ids[start : start + MAX_PARAMETERS])
+        return list(entries.values())
+
+    def _fill(self, entries: Dict[int, CatalogEntry], ids: List[int]) -> None:
+        """Add the attribute lists and image hashes of assets ``ids``."""
+        marks = ", ".join("?" for _ in ids)
+        for attribute, (table, column) in _ATTRIBUTES.items():
+            sql = f"SELECT asset, {column} FROM {table} WHERE asset IN"
+            values = self._conn.execute(f"{sql} ({marks})", ids).fetchall()
+            for asset, value in values:
+                getattr(entries[asset], attribute).append(value)
+        sql = "SELECT asset, filetype, phash, dhash FROM asset_hashes"
+        rows = self._conn.execute(f"{sql} WHERE asset IN ({marks})", ids)
+        for asset, filetype, phash, dhash in rows:
+            hashes = (_unsigned(phash), _unsigned(dhash))
+            entries[asset].image_hashes[filetype] = hashes
+
+    def image_hashes(self) -> List[Tuple[str, str, int, int]]:
+        """Return ``(path, filetype, pHash, dHash)`` of every image."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT a.path, h.filetype, h.phash, h.dhash "
+                "FROM asset_hashes AS h JOIN assets AS a ON a.id = h.asset"
+            ).fetchall()
+        return [
+            (path, filetype, _unsigned(phash), _unsigned(dhash))
+            for path, filetype, phash, dhash in rows
+        ]
+
+    # ------------------------------------------------------------------
+    def rescan(self, *, max_workers: int | None = None) -> RescanStats:
+        """Bring the catalog in line with the metadata files on disk."""
+        from .rescan import LibraryScanner
+
+        return LibraryScanner(self, max_workers=max_workers).scan()
+
+    def asset_states(self) -> Dict[str, Tuple[int, int]]:
+        """Return ``path -> (metadata mtime, size)`` of every asset."""
+        sql = "SELECT path, mtime_ns, size FROM assets"
+        with self._lock:
+            rows = self._conn.execute(sql)
+            return {path: (mtime, size) for path, mtime, size in rows}
+
+    def directory_states(self) -> Dict[str, DirectoryState]:
+        """Return what the last rescan saw in each library directory."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT path, mtime_ns, children, is_asset FROM directories"
+            ).fetchall()
+        return {
+            path: (mtime, json.loads(children), bool(is_asset))
+            for path, mtime, children, is_asset in rows
+        }
+
+    def apply_scan(
+        self,
+        entries: Iterable[CatalogEntry],
+        removed: Iterable[str],
+        directories: Mapping[str, DirectoryState],
+    ) -> None:
+        """Store the outcome of a rescan in one transaction."""
+        with self._transaction() as conn:
+            for entry in entries:
+                self._write(conn, entry)
+            conn.executemany(
+                "DELETE FROM assets WHERE path = ?",
+                [(path,) for path in removed],
+            )
+            conn.execute("DELETE FROM directories")
+            items = directories.items()
+            conn.executemany(
+                "INSERT INTO directories VALUES (?, ?, ?, ?)",
+                [
+                    (path, mtime, json.dumps(children), int(is_asset))
+                    for path, (mtime, children, is_asset) in items
+                ],
+            )
+
+    def _relative(self, asset_dir: Path) -> str:
+        return asset_dir.relative_to(self.output_root).as_posix()
+
+    def load_entry(self, path: str) -> Optional[CatalogEntry]:
+        """Parse the metadata file of the asset at ``path``."""
+        metadata_path = self.output_root / path / self.metadata_name
+        try:
+            with open(metadata_path, "rb") as handle:
+                stat = os.fstat(handle.fileno())
+                metadata = json.loads(handle.read())
+        except (OSError, ValueError):
+            return None
+        if not isinstance(metadata, dict):
+            return None
+        entry = CatalogEntry.from_metadata(path, metadata, stat.st_mtime_ns)
+        entry.size = stat.st_size
+        return entry
+
+
+class _Transaction:
+    """Serialise writers and wrap them in ``BEGIN``/``COMMIT``."""
+
+    def __init__(self, catalog: LibraryCatalog) -> None:
+        self.catalog = catalog
+
+    def __enter__(self) -> sqlite3.Connection:
+        self.catalog._lock.acquire()
+        self.catalog._conn.execute("BEGIN IMMEDIATE")
+        return self.catalog._conn
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        try:
+            if exc_type is None:
+                self.catalog._conn.execute("COMMIT")
+            else:
+                self.catalog._conn.execute("ROLLBACK")
+        finally:
+            self.catalog._lock.release()
@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import threading
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Generic, List, Optional, Sequence, Tuple, TypeVar
+
+import numpy as np
+from pydantic import BaseModel
+
+from ..processing.perceptual import PerceptualHash, hamming, hash_source_images
+from .catalog import LibraryCatalog
+
+# Largest pHash distance (of 64 bits) still reported as a near-duplicate.
+DEFAULT_MAX_DISTANCE = 8
+# dHash must agree too, with a little more slack; it weeds out images
+# whose low frequencies match by chance.
+DHASH_SLACK = 4
+
+T = TypeVar("T")
+
+_CHUNKS = 4
+_CHUNK_BITS = 16
+_CHUNK_MASK = (1 << _CHUNK_BITS) - 1
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], np.uint8)
+
+
+def _popcount(values: np.ndarray) -> np.ndarray:
+    """Return the number of set bits of each ``uint64`` in ``values``."""
+    counts = _POPCOUNT[values.view(np.uint8)]
+    return counts.reshape(-1, 8).sum(axis=1, dtype=np.int64)
+
+
+@lru_cache(maxsize=None)
+def _flip_masks(radius: int) -> np.ndarray:
+    """Return every chunk value with at most ``radius`` bits set."""
+    values = np.arange(1 << _CHUNK_BITS, dtype=np.uint64)
+    counts = _popcount(values)
+    return values[counts <= radius].astype(np.uint16)
+
+
+class HammingIndex(Generic[T]):
+    """Multi-index hash table over 64-bit hashes (Norouzi et al.).
+
+    Each hash is split into four 16-bit chunks, each kept in its own
+    sorted table.  Two hashes within distance ``d`` agree to within
+    ``d // 4`` bits on at least one chunk, so a search only looks up the
+    few chunk values that close to the query's and checks the candidates
+    it finds, instead of comparing against every hash.
+    """
+
+    def __init__(self, values: Sequence[int], items: Sequence[T]) -> None:
+        self._values = np.array(values, dtype=np.uint64)
+        self._items = list(items)
+        self._tables: List[Tuple[np.ndarray, np.ndarray]] = []
+        for chunk in range(_CHUNKS):
+            keys = self._chunk(self._values, chunk)
+            order = np.argsort(keys, kind="stable")
+            self._tables.append((keys[order], order))
+
+    @staticmethod
+    def _chunk(values: np.ndarray, chunk: int) -> np.ndarray:
+        shift = np.uint64(chunk * _CHUNK_BITS)
+        mask = np.uint64(_CHUNK_MASK)
+        return ((values >> shift) & mask).astype(np.uint16)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def search(self, value: int, max_distance: int) -> List[Tuple[int, T]]:
+        """Return ``(distance, item)`` of every item within range."""
+        if not self._items:
+            return []
+        query = np.array([value], dtype=np.uint64)
+        flips = _flip_masks(max_distance // _CHUNKS)
+        found = []
+        for chunk, (keys, order) in enumerate(self._tables):
+            probes = np.sort(self._chunk(query, chunk)[0] ^ flips)
+            starts = np.searchsorted(keys, probes, side="left")
+            stops = np.searchsorted(keys, probes, side="right")
+            for start, stop in zip(starts, stops):
+                if start < stop:
+                    found.append(order[start:stop])
+        if not found:
+            return []
+        candidates = np.unique(np.concatenate(found))
+        distances = _popcount(self._values[candidates] ^ query)
+        near = distances <= max_distance
+        hits = sorted(zip(distances[near].tolist(), candidates[near]))
+        return [(distance, self._items[row]) for distance, row in hits]
+
+
+class DuplicateMatch(BaseModel):
+    """A library image that looks like the image being checked."""
+
+    path: str
+    filetype: str
+    distance: int
+
+
+# ``(catalog path, file type, dHash)`` stored for each hashed image.
+_Item = Tuple[str, str, int]
+
+
+class DuplicateFinder:
+    """Find library images that look like a given image.
+
+    The perceptual hashes the processor stores in the catalog are loaded
+    into a :class:`HammingIndex` on first use; call :meth:`reload` after
+    the catalog changed.
+    """
+
+    def __init__(
+        self,
+        catalog: LibraryCatalog,
+        *,
+        max_distance: int = DEFAULT_MAX_DISTANCE,
+    ) -> None:
+        self.catalog = catalog
+        self.max_distance = max_distance
+        self._index: Optional[HammingIndex[_Item]] = None
+        self._lock = threading.Lock()
+
+    def reload(self) -> None:
+        values: List[int] = []
+        items: List[_Item] = []
+        for path, filetype, phash, dhash in self.catalog.image_hashes():
+            values.append(phash)
+            items.append((path, filetype, dhash))
+        index = HammingIndex(values, items)
+        with self._lock:
+            self._index = index
+
+    def _current(self) -> HammingIndex[_Item]:
+        if self._index is None:
+            self.reload()
+        return self._index
+
+    def __len__(self) -> int:
+        return len(self._current())
+
+    def find(
+        self, value: PerceptualHash, max_distance: Optional[int] = None
+    ) -> List[DuplicateMatch]:
+        """Return the library images near ``value``, closest first."""
+        if max_distance is None:
+            max_distance = self.max_distance
+        matches = []
+        hits = self._current().search(value.phash, max_distance)
+        for distance, (path, filetype, dhash) in hits:
+            if hamming(value.dhash, dhash) > max_distance + DHASH_SLACK:
+                continue
+            matches.append(
+                DuplicateMatch(path=path, filetype=filetype, distance=distance)
+            )
+        return matches
+
+    def find_source(
+        self, path: Path, max_workers: int | None = None
+    ) -> Dict[str, List[DuplicateMatch]]:
+        """Map each image member of a source to its library look-alikes.
+
+        Nothing is decoded while the library has no hashed images.
+        """
+        if not len(self):
+            return {}
+        found: Dict[str, List[DuplicateMatch]] = {}
+        for member, value in hash_source_images(path, max_workers).items():
+            matches = self.find(value)
+            if matches:
+                found[member] = matches
+        return found
+
+    def library_duplicates(
+        self, max_distance: Optional[int] = None
+    ) -> List[Tuple[DuplicateMatch, DuplicateMatch]]:
+        """Return pairs of near-duplicate images in different assets."""
+        pairs = []
+        for path, filetype, phash, dhash in self.catalog.image_hashes():
+            value = PerceptualHash(phash=phash, dhash=dhash)
+            first = DuplicateMatch(path=path, filetype=filetype, distance=0)
+            for match in self.find(value, max_distance):
+                # Each pair is reported once, from its smaller path.
+                if match.path > path:
+                    pairs.append((first, match))
+        return pairs
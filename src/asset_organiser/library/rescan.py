@@ -0,0 +1,230 @@
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .catalog import CatalogEntry, DirectoryState, LibraryCatalog, RescanStats
+
+logger = logging.getLogger(__name__)
+
+# Directory mtimes closer than this to the scan are not trusted: a change
+# made within the filesystem's timestamp granularity would go unnoticed.
+RACY_WINDOW_NS = 2_000_000_000
+
+_Visit = Tuple[str, DirectoryState, Optional[Tuple[int, int]]]
+
+
+class LibraryScanner:
+    """Synchronise a :class:`LibraryCatalog` with the files on disk.
+
+    A directory is only listed again when its mtime changed since the last
+    scan; otherwise the child directories recorded then are reused and the
+    walk costs one ``stat`` per directory.  Asset directories are not
+    descended into, and their ``metadata.json`` is only parsed when its
+    size or mtime differ from the catalog.  Directories are visited by a
+    thread pool, which hides most of the latency of network shares.
+    """
+
+    def __init__(
+        self, catalog: LibraryCatalog, *, max_workers: int | None = None
+    ) -> None:
+        self.catalog = catalog
+        self.max_workers = max_workers or min(32, (os.cpu_count() or 1) * 4)
+
+    def scan(self) -> RescanStats:
+        root = self.catalog.output_root
+        if not root.is_dir():
+            # An unmounted share must not empty the catalog.
+            raise FileNotFoundError(f"Library not found: {root}")
+        known = self.catalog.directory_states()
+        started = time.time_ns()
+        directories: Dict[str, DirectoryState] = {}
+        metadata: Dict[str, Tuple[int, int]] = {}
+        with ThreadPoolExecutor(self.max_workers) as executor:
+
+            def visit(path: str):
+                state = known.get(path)
+                return executor.submit(self._visit, path, state, started)
+
+            pending = {visit("")}
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    result = future.result()
+                    if result is None:
+                        continue
+                    path, state, stat = result
+                    directories[path] = state
+                    if stat is not None:
+                        metadata[path] = stat
+                    for name in state[1]:
+                        pending.add(visit(f"{path}/{name}" if path else name))
+            return self._update(executor, directories, metadata)
+
+    def _visit(
+        self, path: str, known: Optional[DirectoryState], started: int
+    ) -> Optional[_Visit]:
+        folder = self.catalog.output_root / path
+        metadata_name = self.catalog.metadata_name
+        try:
+            mtime_ns = os.stat(folder).st_mtime_ns
+        except OSError:
+            return None
+        if known is not None and known[0] == mtime_ns:
+            children, is_asset = known[1], known[2]
+        else:
+            children, is_asset = [], False
+            try:
+                with os.scandir(folder) as entries:
+                    for entry in entries:
+                        if entry.name == metadata_name:
+                            is_asset = entry.is_file()
+                        # Hidden directories hold staging and tool state.
+                        elif not entry.name.startswith("."):
+                            if entry.is_dir(follow_symlinks=False):
+                                children.append(entry.name)
+            except OSError:
+                return None
+            if is_asset:
+                children = []
+            children.sort()
+        stat = None
+        if is_asset:
+            try:
+                result = os.stat(folder / metadata_name)
+            except OSError:
+                is_asset = False
+            else:
+                stat = (result.st_mtime_ns, result.st_size)
+        if started - mtime_ns < RACY_WINDOW_NS:
+            mtime_ns = -1
+        return path, (mtime_ns, children, is_asset), stat
+
+    def _update(
+        self,
+        executor: ThreadPoolExecutor,
+        directories: Dict[str, DirectoryState],
+        metadata: Dict[str, Tuple[int, int]],
+    ) -> RescanStats:
+        stats = RescanStats()
+        previous = self.catalog.asset_states()
+        changed: List[str] = []
+        for path, stat in metadata.items():
+            if previous.get(path) != stat:
+                changed.append(path)
+        loaded = executor.map(self.catalog.load_entry, changed)
+        entries: List[CatalogEntry] = []
+        for path, entry in zip(changed, loaded):
+            if entry is None:
+                stats.failed.append(path)
+                # Keep the last good record of an unreadable asset.
+                previous.pop(path, None)
+                continue
+            entries.append(entry)
+            if path in previous:
+                stats.updated += 1
+            else:
+                stats.added += 1
+        removed = [path for path in previous if path not in metadata]
+        for path in stats.failed:
+            directories.pop(path, None)
+        stats.removed = len(removed)
+        stats.unchanged = len(metadata) - len(changed)
+        self.catalog.apply_scan(entries, removed, directories)
+        return stats
+
+
+class LibraryWatcher:
+    """Rescan a library in the background at a fixed interval.
+
+    ``on_change`` is called from the watcher thread with the scan result
+    whenever assets were added, updated or removed.  :meth:`scan_now`
+    starts the next scan early.
+    """
+
+    def __init__(
+        self,
+        catalog: LibraryCatalog,
+        *,
+        interval: float = 30.0,
+        on_change: Callable[[RescanStats], None] | None = None,
+        max_workers: int | None = None,
+    ) -> None:
+        self.scanner = LibraryScanner(catalog, max_workers=max_workers)
+        self.interval = interval
+        self.on_change = on_change
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._scanned = threading.Condition()
+        self._requested = 0
+        self._completed = 0
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Start watching; the first scan runs immediately."""
+        if self.running:
+            self.scan_now()
+            return
+        # A fresh event per thread: a previous thread that is still
+        # finishing its scan keeps seeing its own stop request.
+        self._stop = threading.Event()
+        self.scan_now()
+        self._thread = threading.Thread(
+            target=self._run,
+            args=(self._stop,),
+            name="library-watcher",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float | None = None) -> None:
+        """Stop watching; waits up to ``timeout`` for a running scan."""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def scan_now(self) -> None:
+        """Scan as soon as possible instead of after the interval."""
+        with self._scanned:
+            self._requested += 1
+        self._wake.set()
+
+    def wait_for_scan(self, timeout: float | None = None) -> bool:
+        """Block until a scan requested before this call has finished."""
+        with self._scanned:
+            target = self._requested
+
+            def done() -> bool:
+                return self._completed >= target
+
+            return self._scanned.wait_for(done, timeout)
+
+    def _run(self, stop: threading.Event) -> None:
+        while not stop.is_set():
+            self._wake.clear()
+            with self._scanned:
+                serving = self._requested
+            try:
+                stats = self.scanner.scan()
+            except FileNotFoundError as exc:
+                logger.warning("Library rescan skipped: %s", exc)
+            except Exception:
+                logger.exception("Library rescan failed")
+            else:
+                changes = stats.added + stats.updated + stats.removed
+                if changes and self.on_change is not None:
+                    self.on_change(stats)
+            with self._scanned:
+                self._completed = max(self._completed, serving)
+                self._scanned.notify_all()
+            self._wake.wait(self.interval)
@@ -0,0 +1,287 @@
+from __future__ import annotations
+
+import io
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from .. import _filelock as filelock
+from ..config_models import FileTypeDefinition
+from .catalog import CatalogEntry
+
+logger = logging.getLogger(__name__)
+
+PACK_FILENAME = "thumbnails.pack"
+INDEX_FILENAME = "thumbnails.idx"
+LOCK_FILENAME = "thumbnails.lock"
+THUMBNAIL_SIZE = 128
+
+# ``(offset, length, stamp)`` of one thumbnail inside the pack file.
+_Slot = Tuple[int, int, int]
+
+
+def _image_paths(metadata: Mapping) -> List[Tuple[str, int, str]]:
+    """Return ``(filetype, longest edge, path)`` of every image export."""
+    found: List[Tuple[str, int, str]] = []
+    for entry in metadata.get("files") or []:
+        if not isinstance(entry, dict):
+            continue
+        filetype = str(entry.get("type") or "")
+        for info in (entry.get("resolutions") or {}).values():
+            path = info.get("path") if isinstance(info, dict) else None
+            if path:
+                edge = max(info.get("dimensions") or [0])
+                found.append((filetype, int(edge), str(path)))
+    return found
+
+
+def preferred_filetypes(
+    definitions: Mapping[str, FileTypeDefinition],
+) -> Tuple[str, ...]:
+    """Return the file types tried first for previews, best first.
+
+    Colour maps come before grayscale ones; otherwise the order of the
+    library's file-type definitions is kept.
+    """
+    order = sorted(definitions.items(), key=lambda item: item[1].is_grayscale)
+    return tuple(name for name, _ in order)
+
+
+def preview_source(
+    asset_dir: Path,
+    metadata: Mapping,
+    size: int = THUMBNAIL_SIZE,
+    preferred: Sequence[str] = (),
+) -> Optional[Path]:
+    """Pick the smallest export of ``asset_dir`` that covers ``size``.
+
+    Exports of the file types in ``preferred`` are picked first, in order.
+    """
+    candidates = _image_paths(metadata)
+    if not candidates:
+        return None
+    ranks = {filetype: i for i, filetype in enumerate(preferred)}
+
+    def rank(item: Tuple[str, int, str]) -> Tuple[int, int, int]:
+        filetype, edge, _ = item
+        preferred = ranks.get(filetype, len(ranks))
+        # Exports at least ``size`` wide come first, smallest of those.
+        return preferred, edge < size, edge if edge >= size else -edge
+
+    _, _, path = min(candidates, key=rank)
+    return asset_dir / path
+
+
+def render_thumbnail(source: Path, size: int = THUMBNAIL_SIZE) -> bytes:
+    """Return a JPEG no larger than ``size`` pixels showing ``source``."""
+    from PIL import Image
+
+    with Image.open(source) as img:
+        # JPEG sources decode straight at reduced scale.
+        img.draft("RGB", (size, size))
+        if img.mode not in ("1", "L", "LA", "P", "RGB", "RGBA"):
+            from ..processing.encoders.base import to_uint8
+            from ..processing.imaging import decode_image
+
+            img = Image.fromarray(to_uint8(decode_image(source)))
+        img.thumbnail((size, size), Image.Resampling.BILINEAR)
+        if img.mode != "RGB":
+            img = img.convert("RGB")
+        buffer = io.BytesIO()
+        img.save(buffer, format="JPEG", quality=85)
+    return buffer.getvalue()
+
+
+def asset_thumbnail(
+    asset_dir: Path,
+    metadata_name: str = "metadata.json",
+    size: int = THUMBNAIL_SIZE,
+    preferred: Sequence[str] = (),
+) -> Optional[bytes]:
+    """Render a thumbnail of the asset in ``asset_dir`` (``None`` if none).
+
+    Raises ``OSError`` or ``ValueError`` for unreadable files.
+    """
+    text = (asset_dir / metadata_name).read_text()
+    source = preview_source(asset_dir, json.loads(text), size, preferred)
+    if source is None:
+        return None
+    return render_thumbnail(source, size)
+
+
+class ThumbnailCache:
+    """Small asset previews stored in a single append-only pack file.
+
+    Thumbnails are appended to ``thumbnails.pack`` and located through an
+    offset index in ``thumbnails.idx``, so thousands of previews cost two
+    open files instead of thousands of tiny ones.  Each thumbnail carries
+    the mtime of the asset's metadata it was made from; a newer metadata
+    file makes it stale.  The index line is written after the data, so a
+    crash can only lose the last thumbnail, never corrupt others.
+
+    Several instances, also in other processes, may share a cache: each
+    holds a shared lock on ``thumbnails.lock``, and superseded thumbnails
+    are only compacted away by an instance that could lock it
+    exclusively, i.e. while no other instance has the files open.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path,
+        output_root: Path,
+        *,
+        size: int = THUMBNAIL_SIZE,
+        metadata_name: str = "metadata.json",
+        preferred: Sequence[str] = (),
+    ) -> None:
+        self.cache_dir = Path(cache_dir)
+        self.output_root = Path(output_root)
+        self.size = size
+        self.metadata_name = metadata_name
+        self.preferred = tuple(preferred)
+        self.pack_path = self.cache_dir / PACK_FILENAME
+        self.index_path = self.cache_dir / INDEX_FILENAME
+        self._lock = threading.Lock()
+        self._index: Dict[str, _Slot] = {}
+        self._dead_bytes = 0
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._guard = open(self.cache_dir / LOCK_FILENAME, "a+b")
+        if filelock.lock(self._guard, blocking=False):
+            # No other instance has the cache open: safe to rewrite it.
+            self._load()
+            self._compact_if_wasteful()
+            filelock.unlock(self._guard)
+        filelock.lock(self._guard, shared=True)
+        # Read again under the shared lock; nobody rewrites it from now on.
+        self._load()
+        self._pack = open(self.pack_path, "a+b")
+        self._index_file = open(self.index_path, "a", encoding="utf-8")
+
+    @classmethod
+    def for_library(
+        cls,
+        library_path: Path,
+        output_root: Path,
+        **kwargs,
+    ) -> "ThumbnailCache":
+        cache_dir = Path(library_path) / ".asset-library"
+        return cls(cache_dir, output_root, **kwargs)
+
+    def _load(self) -> None:
+        self._index = {}
+        self._dead_bytes = 0
+        try:
+            pack_size = self.pack_path.stat().st_size
+            lines = self.index_path.read_text(encoding="utf-8").splitlines()
+        except OSError:
+            return
+        for line in lines:
+            try:
+                key, offset, length, stamp = json.loads(line)
+            except ValueError:
+                continue
+            if offset + length > pack_size:
+                continue
+            previous = self._index.get(key)
+            if previous is not None:
+                self._dead_bytes += previous[1]
+            self._index[key] = (offset, length, stamp)
+
+    def _compact_if_wasteful(self) -> None:
+        live = sum(slot[1] for slot in self._index.values())
+        if self._dead_bytes <= max(live, 1 << 20):
+            return
+        try:
+            self._compact()
+        except OSError as exc:
+            # Windows refuses to replace files that are still open.
+            logger.debug("Thumbnail cache not compacted: %s", exc)
+
+    def _compact(self) -> None:
+        """Rewrite the pack without superseded thumbnails."""
+        pack_tmp = self.pack_path.with_suffix(".pack.tmp")
+        index_tmp = self.index_path.with_suffix(".idx.tmp")
+        index: Dict[str, _Slot] = {}
+        with open(self.pack_path, "rb") as src, open(pack_tmp, "wb") as dst:
+            lines = []
+            for key, (offset, length, stamp) in self._index.items():
+                src.seek(offset)
+                index[key] = (dst.tell(), length, stamp)
+                dst.write(src.read(length))
+                lines.append(json.dumps([key, *index[key]]))
+        index_tmp.write_text("".join(f"{line}\n" for line in lines))
+        os.replace(pack_tmp, self.pack_path)
+        os.replace(index_tmp, self.index_path)
+        self._index = index
+        self._dead_bytes = 0
+
+    # ------------------------------------------------------------------
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def get(self, key: str, stamp: int = 0) -> Optional[bytes]:
+        """Return the cached thumbnail for ``key`` unless it is stale."""
+        with self._lock:
+            slot = self._index.get(key)
+            if slot is None or slot[2] < stamp:
+                return None
+            offset, length, _ = slot
+            self._pack.seek(offset)
+            return self._pack.read(length)
+
+    def put(self, key: str, data: bytes, stamp: int = 0) -> None:
+        with self._lock:
+            # The pack is opened for appending, so the data lands at the
+            # end even when another process appended meanwhile; the offset
+            # is taken from where this write ended.
+            self._pack.write(data)
+            self._pack.flush()
+            offset = self._pack.tell() - len(data)
+            previous = self._index.get(key)
+            if previous is not None:
+                self._dead_bytes += previous[1]
+            self._index[key] = slot = (offset, len(data), stamp)
+            self._index_file.write(json.dumps([key, *slot]) + "\n")
+            self._index_file.flush()
+
+    def thumbnail(self, entry: CatalogEntry) -> Optional[bytes]:
+        """Return the thumbnail of a catalog entry, rendering it if needed.
+
+        Safe to call from worker threads; rendering happens outside the
+        cache lock.
+        """
+        data = self.get(entry.path, entry.mtime_ns)
+        if data is not None:
+            return data
+        asset_dir = self.output_root / entry.path
+        try:
+            data = asset_thumbnail(
+                asset_dir, self.metadata_name, self.size, self.preferred
+            )
+        except (OSError, ValueError) as exc:
+            logger.debug("No thumbnail for %s: %s", entry.path, exc)
+            return None
+        if data is None:
+            return None
+        self.put(entry.path, data, entry.mtime_ns)
+        return data
+
+    def update(self, entries: Iterable[CatalogEntry]) -> int:
+        """Render missing or stale thumbnails for ``entries``."""
+        return sum(self.thumbnail(entry) is not None for entry in entries)
+
+    # ------------------------------------------------------------------
+    def close(self) -> None:
+        with self._lock:
+            self._pack.close()
+            self._index_file.close()
+            self._guard.close()
+
+    def __enter__(self) -> "ThumbnailCache":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
@@ -1,7 +1,17 @@
+from typing import TYPE_CHECKING
+
+from .._lazy import lazy_exports
 from ..config_models import LLMProviderProfile
 from .client import LLMClient, NoOpLLMClient
-from .ollama import OllamaClient
-from .openai import OpenAIClient
+
+# The HTTP clients are only imported once a provider is used.
+__getattr__, __dir__ = lazy_exports(
+    __name__, {"OllamaClient": ".ollama", "OpenAIClient": ".openai"}
+)
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .ollama import OllamaClient
+    from .openai import OpenAIClient
 
 
 def create_llm_client(profile: LLMProviderProfile) -> LLMClient:
@@ -9,6 +19,8 @@ def create_llm_client(profile: LLMProviderProfile) -> LLMClient:
 
     provider = profile.provider.lower()
     if provider == "openai":
+        from .openai import OpenAIClient
+
         return OpenAIClient(
             profile.api_key,
             profile.model,
@@ -16,6 +28,8 @@ def create_llm_client(profile: LLMProviderProfile) -> LLMClient:
             reasoning_effort=profile.reasoning_effort or None,
         )
     if provider == "ollama":
+        from .ollama import OllamaClient
+
         return OllamaClient(
             profile.base_url,
             profile.model,
@@ -6,6 +6,7 @@ import json
 from typing import List
 from urllib import request
 
+from .. import tracing
 from ..config_models import ClassificationSettings, LLMProviderProfile
 from .client import LLMClient  # noqa: F401
 
@@ -31,13 +32,21 @@ class OllamaClient:
             data=data,
             headers={"Content-Type": "application/json"},
         )
-        try:
-            with request.urlopen(req) as resp:  # nosec - API call
-                body = resp.read().decode("utf-8")
-                result = json.loads(body)
-                return result.get("response") or result.get("data", "")
-        except Exception:  # pragma: no cover - defensive
-            return ""
+        with tracing.span(
+            "llm.complete",
+            "llm",
+            provider="ollama",
+            model=self._model,
+            prompt_chars=len(prompt),
+        ) as span:
+            try:
+                with request.urlopen(req) as resp:  # nosec - API call
+                    body = resp.read().decode("utf-8")
+                    result = json.loads(body)
+                    return result.get("response") or result.get("data", "")
+            except Exception as exc:  # pragma: no cover - defensive
+                span.set(error=type(exc).__name__)
+                return ""
 
     # ------------------------------------------------------------------
     @classmethod
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 from typing import List
 
+from .. import tracing
 from ..config_models import ClassificationSettings, LLMProviderProfile
 from .client import LLMClient  # noqa: F401
 
@@ -34,11 +35,18 @@ class OpenAIClient:
 
         if self._reasoning_effort and "reasoning" not in kwargs:
             kwargs["reasoning"] = {"effort": self._reasoning_effort}
-        response = self._client.chat.completions.create(
+        with tracing.span(
+            "llm.complete",
+            "llm",
+            provider="openai",
             model=self._model,
-            messages=[{"role": "user", "content": prompt}],
-            **kwargs,
-        )
+            prompt_chars=len(prompt),
+        ):
+            response = self._client.chat.completions.create(
+                model=self._model,
+                messages=[{"role": "user", "content": prompt}],
+                **kwargs,
+            )
         try:  # support both dict-like and attribute access styles
             choice = response.choices[0]
             message = getattr(choice, "message", None) or choice.get("message")
@@ -0,0 +1,49 @@
+"""Processing stages that turn classified sources into library assets."""
+
+from typing import TYPE_CHECKING
+
+from .._lazy import lazy_exports
+
+_EXPORTS = {
+    "AssetCommitter": ".commit",
+    "EncoderMetrics": ".encoders",
+    "EncoderPool": ".encoders",
+    "AssetResult": ".models",
+    "ProcessingReport": ".models",
+    "HeaderProbe": ".probe",
+    "ImageInfo": ".probe",
+    "probe_stream": ".probe",
+    "ProcessingService": ".service",
+    "IOStats": ".sources",
+    "SourceReader": ".sources",
+    "ChannelStats": ".stats",
+    "compute_channel_stats": ".stats",
+    "resolve_stats_size": ".stats",
+}
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .commit import AssetCommitter
+    from .encoders import EncoderMetrics, EncoderPool
+    from .models import AssetResult, ProcessingReport
+    from .probe import HeaderProbe, ImageInfo, probe_stream
+    from .service import ProcessingService
+    from .sources import IOStats, SourceReader
+    from .stats import ChannelStats, compute_channel_stats, resolve_stats_size
+
+__all__ = [
+    "AssetCommitter",
+    "AssetResult",
+    "ChannelStats",
+    "EncoderMetrics",
+    "EncoderPool",
+    "HeaderProbe",
+    "IOStats",
+    "ImageInfo",
+    "ProcessingReport",
+    "ProcessingService",
+    "SourceReader",
+    "compute_channel_stats",
+    "probe_stream",
+    "resolve_stats_size",
+]
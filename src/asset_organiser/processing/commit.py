@@ -0,0 +1,378 @@
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import tempfile
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import IO, Dict, Iterable, List, Mapping, Optional
+
+from .. import _filelock as filelock
+
+STAGING_DIRECTORY = ".staging"
+JOURNAL_FILENAME = "journal.json"
+LOCK_SUFFIX = ".lock"
+INCOMING_PREFIX = ".incoming-"
+RETIRED_PREFIX = ".replaced-"
+
+
+def _fsync_file(path: Path) -> None:
+    with open(path, "rb+") as handle:
+        os.fsync(handle.fileno())
+
+
+def _fsync_tree(path: Path) -> None:
+    """Flush every file below ``path`` and the directories holding them."""
+    for folder, _dirs, files in os.walk(path):
+        for name in files:
+            _fsync_file(Path(folder) / name)
+        _fsync_directory(Path(folder))
+
+
+def _try_lock(handle: IO[bytes]) -> bool:
+    # A lock that can be taken means the committer holding it is gone.
+    return filelock.lock(handle, blocking=False)
+
+
+def _is_open(handle: IO[bytes], path: Path) -> bool:
+    """Whether ``path`` still names the file open as ``handle``."""
+    try:
+        return os.path.samestat(os.fstat(handle.fileno()), os.stat(path))
+    except OSError:
+        return False
+
+
+def _remove_lock(path: Path) -> None:
+    try:
+        path.unlink(missing_ok=True)
+    except OSError:  # pragma: no cover - still open elsewhere on Windows
+        pass
+
+
+def _fsync_directory(path: Path) -> None:
+    """Persist renames in ``path``; a no-op where directories can't sync."""
+    flags = getattr(os, "O_DIRECTORY", None)
+    if flags is None:
+        return
+    try:
+        fd = os.open(path, os.O_RDONLY | flags)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _device(path: Path) -> int:
+    return path.stat().st_dev
+
+
+class _Publish:
+    """One staged asset waiting to replace ``final``."""
+
+    def __init__(self, staged: Path, final: Path) -> None:
+        self.staged = staged
+        self.final = final
+        name = f"{RETIRED_PREFIX}{final.name}-{staged.name}"
+        self.retired = final.with_name(name)
+
+    def to_json(self) -> Dict[str, str]:
+        return {
+            "staged": str(self.staged),
+            "final": str(self.final),
+            "retired": str(self.retired),
+        }
+
+    @classmethod
+    def from_json(cls, data: Mapping[str, str]) -> "_Publish":
+        entry = cls(Path(data["staged"]), Path(data["final"]))
+        entry.retired = Path(data["retired"])
+        return entry
+
+
+class AssetCommitter:
+    """Publish staged asset directories into the library atomically.
+
+    Assets are written to a hidden staging directory and only become
+    visible once complete.  :meth:`commit` moves a batch of staged assets
+    into place with plain renames; the metadata file is written last and
+    flushed to disk, so an asset directory that carries metadata is always
+    complete.  A journal records each batch while it is being published,
+    and :meth:`recover` finishes or rolls back a batch interrupted by a
+    crash.  When the staging directory lives on another filesystem the
+    assets are first copied in parallel next to their destination.
+
+    Every committer stages into its own ``<pid>-<id>`` directory below the
+    shared staging root and holds a lock file beside it, so several
+    processes can publish into one library; recovery only touches runs
+    whose lock is no longer held.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        *,
+        staging_dir: Optional[Path] = None,
+        metadata_name: str = "metadata.json",
+        max_workers: int | None = None,
+    ) -> None:
+        self.root = Path(root)
+        self.staging_root = Path(staging_dir or self.root / STAGING_DIRECTORY)
+        self.metadata_name = metadata_name
+        self.max_workers = max_workers or min(8, os.cpu_count() or 1)
+        self.run_id = f"{os.getpid()}-{uuid.uuid4().hex[:12]}"
+        self._pending: List[_Publish] = []
+        self._lock: Optional[IO[bytes]] = None
+
+    @property
+    def run_dir(self) -> Path:
+        """Staging directory owned by this committer."""
+        return self.staging_root / self.run_id
+
+    @property
+    def journal_path(self) -> Path:
+        return self.run_dir / JOURNAL_FILENAME
+
+    @property
+    def lock_path(self) -> Path:
+        return self.staging_root / f"{self.run_id}{LOCK_SUFFIX}"
+
+    # ------------------------------------------------------------------
+    def _acquire(self) -> None:
+        # The lock exists before the run directory, so recovery never sees
+        # a live run without one.
+        if self._lock is not None:
+            return
+        self.staging_root.mkdir(parents=True, exist_ok=True)
+        while True:
+            handle = open(self.lock_path, "wb")
+            if not _try_lock(handle):  # pragma: no cover - ids are unique
+                handle.close()
+                raise RuntimeError(f"Staging run {self.run_id} is in use")
+            # Recovery removes stray locks it can take; one created just
+            # before is gone by now and must be created again.
+            if _is_open(handle, self.lock_path):
+                break
+            handle.close()  # pragma: no cover - timing dependent
+        self._lock = handle
+        self.run_dir.mkdir(exist_ok=True)
+
+    def stage(self) -> Path:
+        """Create an empty staging directory for one asset."""
+        self._acquire()
+        return Path(tempfile.mkdtemp(prefix="asset-", dir=self.run_dir))
+
+    def discard(self, staged: Path) -> None:
+        shutil.rmtree(staged, ignore_errors=True)
+
+    def write_metadata(self, staged: Path, metadata: Mapping) -> None:
+        """Write and flush the metadata file that completes an asset."""
+        path = staged / self.metadata_name
+        path.write_text(json.dumps(metadata, indent=2))
+        _fsync_file(path)
+
+    def publish(self, staged: Path, final: Path) -> None:
+        """Queue ``staged`` to replace ``final`` on the next commit."""
+        self._pending.append(_Publish(Path(staged), Path(final)))
+
+    # ------------------------------------------------------------------
+    def commit(self) -> Dict[Path, str]:
+        """Move every queued asset into place.
+
+        Returns a mapping of final paths that could not be published to a
+        description of the error.  Failed assets keep their previous
+        version, if any.
+        """
+        batch, self._pending = self._pending, []
+        if not batch:
+            return {}
+        errors: Dict[Path, str] = {}
+        for entry in batch:
+            entry.final.parent.mkdir(parents=True, exist_ok=True)
+        self._write_journal(batch)
+        batch = self._localise(batch, errors)
+        # Data must reach the disk before the rename makes it visible, or
+        # a crash could leave published assets with truncated images.
+        with ThreadPoolExecutor(self.max_workers) as executor:
+            list(executor.map(_fsync_tree, (e.staged for e in batch)))
+        published: List[_Publish] = []
+        for entry in batch:
+            try:
+                self._swap(entry)
+            except OSError as exc:
+                self.discard(entry.staged)
+                errors[entry.final] = f"{type(exc).__name__}: {exc}"
+            else:
+                published.append(entry)
+        for parent in {entry.final.parent for entry in published}:
+            _fsync_directory(parent)
+        self.journal_path.unlink(missing_ok=True)
+        self._remove(entry.retired for entry in published)
+        return errors
+
+    def recover(self) -> None:
+        """Finish batches of crashed committers and drop their staging.
+
+        Runs whose lock is still held belong to a live committer, in this
+        or another process, and are left alone.
+        """
+        if not self.staging_root.is_dir():
+            return
+        # Run directories are listed before their locks are looked at: a
+        # committer creates its lock first, so any run seen here without
+        # one has really lost it.
+        for run_dir in list(self.staging_root.iterdir()):
+            if run_dir.is_dir() and run_dir.name != self.run_id:
+                self._recover_run(run_dir.name)
+        # Locks of committers that crashed before creating their run.
+        for lock_path in self.staging_root.glob(f"*{LOCK_SUFFIX}"):
+            run_id = lock_path.name[: -len(LOCK_SUFFIX)]
+            if run_id != self.run_id:
+                self._recover_run(run_id)
+
+    def _recover_run(self, run_id: str) -> None:
+        run_dir = self.staging_root / run_id
+        lock_path = self.staging_root / f"{run_id}{LOCK_SUFFIX}"
+        try:
+            handle = open(lock_path, "rb+")
+        except FileNotFoundError:
+            # Left behind after its lock was removed.
+            self._replay(run_dir)
+            return
+        except OSError:
+            return
+        with handle:
+            if not _try_lock(handle):
+                return
+            self._replay(run_dir)
+            filelock.unlock(handle)
+        _remove_lock(lock_path)
+
+    def _replay(self, run_dir: Path) -> None:
+        journal = run_dir / JOURNAL_FILENAME
+        try:
+            data = json.loads(journal.read_text())
+        except (OSError, ValueError):
+            data = []
+        for item in data:
+            entry = _Publish.from_json(item)
+            complete = (entry.staged / self.metadata_name).is_file()
+            try:
+                if complete:
+                    self._swap(entry)
+                else:
+                    self.discard(entry.staged)
+                    if entry.retired.exists() and not entry.final.exists():
+                        os.rename(entry.retired, entry.final)
+            except OSError:
+                continue
+            shutil.rmtree(entry.retired, ignore_errors=True)
+        shutil.rmtree(run_dir, ignore_errors=True)
+
+    def close(self) -> None:
+        """Discard queued assets, remove this run's staging and unlock."""
+        for entry in self._pending:
+            self.discard(entry.staged)
+        self._pending = []
+        if self._lock is None:
+            return
+        shutil.rmtree(self.run_dir, ignore_errors=True)
+        # Windows cannot remove a file that is still open.
+        filelock.unlock(self._lock)
+        self._lock.close()
+        self._lock = None
+        _remove_lock(self.lock_path)
+        try:
+            self.staging_root.rmdir()
+        except OSError:
+            pass
+
+    def __enter__(self) -> "AssetCommitter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    # ------------------------------------------------------------------
+    def _write_journal(self, batch: List[_Publish]) -> None:
+        self._acquire()
+        text = json.dumps([entry.to_json() for entry in batch])
+        self.journal_path.write_text(text)
+        _fsync_file(self.journal_path)
+
+    def _swap(self, entry: _Publish) -> None:
+        if entry.final.exists():
+            os.replace(entry.final, entry.retired)
+        try:
+            os.rename(entry.staged, entry.final)
+        except OSError:
+            if entry.retired.exists() and not entry.final.exists():
+                os.rename(entry.retired, entry.final)
+            raise
+
+    def _localise(
+        self, batch: List[_Publish], errors: Dict[Path, str]
+    ) -> List[_Publish]:
+        """Copy assets staged on another filesystem next to their target."""
+        local: List[_Publish] = []
+        remote: List[_Publish] = []
+        device = _device(self.staging_root)
+        for entry in batch:
+            if _device(entry.final.parent) == device:
+                local.append(entry)
+            else:
+                remote.append(entry)
+        if not remote:
+            return local
+        copies: List[_Publish] = []
+        for entry in remote:
+            name = f"{INCOMING_PREFIX}{entry.final.name}-{entry.staged.name}"
+            copies.append(_Publish(entry.final.with_name(name), entry.final))
+        # The journal must name the copies, or recovery would miss them.
+        self._write_journal(local + copies)
+        with ThreadPoolExecutor(self.max_workers) as executor:
+            futures = [
+                executor.submit(self._copy_tree, entry.staged, copy.staged)
+                for entry, copy in zip(remote, copies)
+            ]
+            for entry, copy, future in zip(remote, copies, futures):
+                try:
+                    future.result()
+                except OSError as exc:
+                    self.discard(copy.staged)
+                    errors[entry.final] = f"{type(exc).__name__}: {exc}"
+                else:
+                    local.append(copy)
+                self.discard(entry.staged)
+        return local
+
+    def _copy_tree(self, source: Path, target: Path) -> None:
+        # Metadata goes last so a partial copy is never mistaken for a
+        # complete asset.
+        metadata = source / self.metadata_name
+        shutil.copytree(
+            source,
+            target,
+            ignore=lambda folder, names: (
+                [self.metadata_name] if Path(folder) == source else []
+            ),
+        )
+        if metadata.is_file():
+            shutil.copy2(metadata, target / self.metadata_name)
+            _fsync_file(target / self.metadata_name)
+
+    def _remove(self, paths: Iterable[Path]) -> None:
+        paths = list(paths)
+        if not paths:
+            return
+        with ThreadPoolExecutor(self.max_workers) as executor:
+            for path in paths:
+                if path.is_dir():
+                    executor.submit(shutil.rmtree, path, True)
+                else:
+                    executor.submit(path.unlink, True)
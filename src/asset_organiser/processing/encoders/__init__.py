@@ -0,0 +1,17 @@
+"""Export format modules used by processing export profiles."""
+
+from . import exr, jpeg, png, qoi  # noqa: F401 - register encoders
+from .base import ImageEncoder, get_encoder, register_encoder
+
+from .pool import BUILTIN_PROFILES, DEFAULT_PROFILE  # isort: split
+from .pool import EncoderMetrics, EncoderPool
+
+__all__ = [
+    "BUILTIN_PROFILES",
+    "DEFAULT_PROFILE",
+    "EncoderMetrics",
+    "EncoderPool",
+    "ImageEncoder",
+    "get_encoder",
+    "register_encoder",
+]
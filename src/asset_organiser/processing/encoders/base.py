@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Dict, Mapping, Type
+
+import numpy as np
+
+Settings = Mapping[str, object]
+
+
+class ImageEncoder(ABC):
+    """Base class for export format modules.
+
+    Subclasses are registered under the module names used by
+    ``ExportProfile.module`` (e.g. ``"PNG"``) and receive the profile's
+    ``settings`` on every call.
+    """
+
+    extension: str
+
+    @abstractmethod
+    def encode(self, image: np.ndarray, settings: Settings) -> bytes:
+        """Return ``image`` encoded with ``settings``."""
+
+    def write(
+        self,
+        image: np.ndarray,
+        path: Path,
+        settings: Settings,
+    ) -> int:
+        """Write ``image`` to ``path`` and return the number of bytes."""
+        data = self.encode(image, settings)
+        path.write_bytes(data)
+        return len(data)
+
+
+_REGISTRY: Dict[str, Type[ImageEncoder]] = {}
+
+
+def register_encoder(*names: str):
+    """Class decorator registering an encoder under ``names``."""
+
+    def decorator(cls: Type[ImageEncoder]) -> Type[ImageEncoder]:
+        for name in names:
+            _REGISTRY[name.upper()] = cls
+        return cls
+
+    return decorator
+
+
+def get_encoder(module: str) -> ImageEncoder:
+    """Return an encoder instance for the export module ``module``."""
+    try:
+        cls = _REGISTRY[module.upper()]
+    except KeyError:
+        raise ValueError(f"Unknown export module: {module}") from None
+    return cls()
+
+
+def available_encoders() -> list[str]:
+    return sorted(_REGISTRY)
+
+
+# ----------------------------------------------------------------------
+def to_uint8(image: np.ndarray) -> np.ndarray:
+    if image.dtype == np.uint8:
+        return image
+    if image.dtype == np.uint16:
+        return ((image.astype(np.uint32) + 128) // 257).astype(np.uint8)
+    scaled = np.clip(image, 0.0, 1.0) * 255.0
+    return np.rint(scaled).astype(np.uint8)
+
+
+def to_uint16(image: np.ndarray) -> np.ndarray:
+    if image.dtype == np.uint16:
+        return image
+    if image.dtype == np.uint8:
+        return image.astype(np.uint16) * 257
+    scaled = np.clip(image, 0.0, 1.0) * 65535.0
+    return np.rint(scaled).astype(np.uint16)
+
+
+def to_float(image: np.ndarray, dtype=np.float32) -> np.ndarray:
+    if np.issubdtype(image.dtype, np.floating):
+        return image.astype(dtype, copy=False)
+    scale = float(np.iinfo(image.dtype).max)
+    return (image.astype(np.float32) / scale).astype(dtype, copy=False)
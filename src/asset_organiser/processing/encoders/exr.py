@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import os
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+from .base import ImageEncoder, Settings, register_encoder, to_float
+
+_CHANNELS = {1: "Y", 2: "YA", 3: "RGB", 4: "RGBA"}
+
+
+@register_encoder("EXR")
+class EXREncoder(ImageEncoder):
+    """OpenEXR writer; settings: ``bit_depth`` and ``compression``.
+
+    Requires the optional ``OpenEXR`` package (``pip install
+    asset-organiser[exr]``).
+    """
+
+    extension = "exr"
+
+    @staticmethod
+    def _module():
+        try:  # defer import so the dependency stays optional
+            import OpenEXR
+        except Exception as exc:  # pragma: no cover - import guarded
+            raise RuntimeError(
+                "The 'OpenEXR' package is required to write EXR files",
+            ) from exc
+        return OpenEXR
+
+    def encode(self, image: np.ndarray, settings: Settings) -> bytes:
+        # The bindings only write to files; go through a temporary one.
+        fd, name = tempfile.mkstemp(suffix=".exr")
+        os.close(fd)
+        path = Path(name)
+        try:
+            self.write(image, path, settings)
+            return path.read_bytes()
+        finally:
+            path.unlink(missing_ok=True)
+
+    def write(
+        self,
+        image: np.ndarray,
+        path: Path,
+        settings: Settings,
+    ) -> int:
+        exr = self._module()
+        depth = str(settings.get("bit_depth", "half")).lower()
+        half = depth in ("half", "16")
+        pixels = to_float(image, np.float16 if half else np.float32)
+        if pixels.ndim == 2:
+            pixels = pixels[..., None]
+        names = _CHANNELS[pixels.shape[2]]
+        channels = {}
+        for index, name in enumerate(names):
+            channels[name] = np.ascontiguousarray(pixels[..., index])
+        compression = str(settings.get("compression", "ZIP")).upper()
+        header = {
+            "compression": getattr(exr, f"{compression}_COMPRESSION"),
+            "type": exr.scanlineimage,
+        }
+        with exr.File(header, channels) as out:
+            out.write(str(path))
+        return path.stat().st_size
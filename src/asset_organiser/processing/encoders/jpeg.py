@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+import io
+
+import numpy as np
+from PIL import Image
+
+from .base import ImageEncoder, Settings, register_encoder, to_uint8
+
+_SUBSAMPLING = {"4:4:4": 0, "4:2:2": 1, "4:2:0": 2}
+
+
+@register_encoder("JPG", "JPEG")
+class JPEGEncoder(ImageEncoder):
+    """JPEG writer; settings: ``quality`` and ``chroma_subsampling``.
+
+    JPEG has no alpha channel and is always 8-bit, so alpha is dropped and
+    16-bit or float data is quantised.
+    """
+
+    extension = "jpg"
+
+    def encode(self, image: np.ndarray, settings: Settings) -> bytes:
+        image = to_uint8(image)
+        if image.ndim == 3 and image.shape[2] in (2, 4):
+            image = image[..., :-1]
+        if image.ndim == 3 and image.shape[2] == 1:
+            image = image[..., 0]
+        options = {"quality": int(settings.get("quality", 95))}
+        subsampling = settings.get("chroma_subsampling")
+        if subsampling in _SUBSAMPLING:
+            options["subsampling"] = _SUBSAMPLING[subsampling]
+        out = io.BytesIO()
+        pil_image = Image.fromarray(np.ascontiguousarray(image))
+        pil_image.save(out, "JPEG", **options)
+        return out.getvalue()
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import struct
+import zlib
+
+import numpy as np
+
+from .base import ImageEncoder, Settings, register_encoder, to_uint8, to_uint16
+
+_COLOR_TYPES = {1: 0, 2: 4, 3: 2, 4: 6}
+
+
+def _chunk(kind: bytes, data: bytes) -> bytes:
+    crc = zlib.crc32(kind + data) & 0xFFFFFFFF
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", crc)
+
+
+def encode_png(image: np.ndarray, compression_level: int = 6) -> bytes:
+    """Encode an 8 or 16-bit image with 1-4 channels as PNG."""
+    if image.dtype not in (np.uint8, np.uint16):
+        raise ValueError(f"Cannot write {image.dtype} as PNG")
+    channels = 1 if image.ndim == 2 else image.shape[2]
+    height, width = image.shape[:2]
+    depth = 8 if image.dtype == np.uint8 else 16
+    rows = image.reshape(height, width * channels).astype(
+        ">u2" if depth == 16 else np.uint8, copy=False
+    )
+    raw = np.empty((height, rows.nbytes // height + 1), dtype=np.uint8)
+    raw[:, 0] = 0  # filter type "None" for every scanline
+    raw[:, 1:] = rows.view(np.uint8).reshape(height, -1)
+    header = struct.pack(
+        ">IIBBBBB", width, height, depth, _COLOR_TYPES[channels], 0, 0, 0
+    )
+    body = zlib.compress(raw.tobytes(), compression_level)
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + _chunk(b"IHDR", header)
+        + _chunk(b"IDAT", body)
+        + _chunk(b"IEND", b"")
+    )
+
+
+@register_encoder("PNG")
+class PNGEncoder(ImageEncoder):
+    """PNG writer; settings: ``bit_depth`` (8/16), ``compression_level``."""
+
+    extension = "png"
+
+    def encode(self, image: np.ndarray, settings: Settings) -> bytes:
+        depth = settings.get("bit_depth")
+        if depth in (8, "8"):
+            image = to_uint8(image)
+        elif depth in (16, "16") or image.dtype != np.uint8:
+            image = to_uint16(image)
+        level = int(settings.get("compression_level", 6))
+        return encode_png(image, level)
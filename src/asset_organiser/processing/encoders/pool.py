@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, Mapping
+
+import numpy as np
+from pydantic import BaseModel
+
+from ... import tracing
+from ...config_models import ExportProfile
+from .base import ImageEncoder, get_encoder
+
+DEFAULT_PROFILE = "PNG"
+BUILTIN_PROFILES: Dict[str, ExportProfile] = {
+    DEFAULT_PROFILE: ExportProfile(module="PNG"),
+}
+
+
+class EncoderMetrics(BaseModel):
+    """Throughput counters for one export profile."""
+
+    files: int = 0
+    input_bytes: int = 0
+    output_bytes: int = 0
+    seconds: float = 0.0
+
+    @property
+    def throughput(self) -> float:
+        """Uncompressed megabytes encoded per second of worker time."""
+        if not self.seconds:
+            return 0.0
+        return self.input_bytes / self.seconds / 1e6
+
+
+class EncoderPool:
+    """Encode and write images on dedicated worker threads.
+
+    Compression is usually the slowest processing step, so the engine hands
+    finished images to this pool and carries on decoding and resizing the
+    next ones.  The zlib, JPEG and EXR codecs release the GIL, so threads
+    encode in parallel.  ``max_pending`` bounds how many images may wait in
+    memory; :meth:`submit` blocks once the limit is reached.
+    """
+
+    def __init__(
+        self,
+        profiles: Mapping[str, ExportProfile],
+        *,
+        max_workers: int | None = None,
+        max_pending: int | None = None,
+    ) -> None:
+        self.profiles: Dict[str, ExportProfile] = {
+            **BUILTIN_PROFILES,
+            **profiles,
+        }
+        workers = max_workers or min(8, os.cpu_count() or 1)
+        prefix = "encoder"
+        self._executor = ThreadPoolExecutor(workers, thread_name_prefix=prefix)
+        self._slots = threading.BoundedSemaphore(max_pending or workers * 2)
+        self._encoders: Dict[str, ImageEncoder] = {}
+        self._metrics: Dict[str, EncoderMetrics] = {}
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    def profile(self, name: str) -> ExportProfile:
+        try:
+            return self.profiles[name]
+        except KeyError:
+            raise ValueError(f"Unknown export profile: {name}") from None
+
+    def encoder(self, name: str) -> ImageEncoder:
+        """Return the encoder used by profile ``name``."""
+        module = self.profile(name).module
+        with self._lock:
+            encoder = self._encoders.get(module)
+            if encoder is None:
+                encoder = self._encoders[module] = get_encoder(module)
+        return encoder
+
+    def extension(self, name: str) -> str:
+        return self.encoder(name).extension
+
+    # ------------------------------------------------------------------
+    def submit(self, name: str, image: np.ndarray, path: Path) -> Future:
+        """Queue ``image`` to be written to ``path`` with profile ``name``.
+
+        The returned future resolves to the number of bytes written.
+        """
+        encoder = self.encoder(name)
+        settings = dict(self.profile(name).settings)
+        self._slots.acquire()
+        try:
+            future = self._executor.submit(
+                tracing.propagate(self._encode),
+                name,
+                encoder,
+                settings,
+                image,
+                path,
+            )
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def _encode(
+        self,
+        name: str,
+        encoder: ImageEncoder,
+        settings: dict,
+        image: np.ndarray,
+        path: Path,
+    ) -> int:
+        start = time.perf_counter()
+        with tracing.span("encode", "processing", profile=name) as span:
+            size = encoder.write(image, path, settings)
+            span.set(file=path.name, bytes=size)
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            metrics = self._metrics.setdefault(name, EncoderMetrics())
+            metrics.files += 1
+            metrics.input_bytes += image.nbytes
+            metrics.output_bytes += size
+            metrics.seconds += elapsed
+        return size
+
+    @staticmethod
+    def wait(futures: Iterable[Future]) -> None:
+        """Wait for ``futures`` and re-raise the first failure."""
+        for future in list(futures):
+            future.result()
+
+    def metrics(self) -> Dict[str, EncoderMetrics]:
+        with self._lock:
+            return {k: v.model_copy() for k, v in self._metrics.items()}
+
+    # ------------------------------------------------------------------
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self) -> "EncoderPool":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.shutdown()
@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+import io
+
+import numpy as np
+from PIL import Image
+
+from .base import ImageEncoder, Settings, register_encoder, to_uint8
+
+
+@register_encoder("QOI", "QOIF")
+class QOIEncoder(ImageEncoder):
+    """Quite OK Image writer (8-bit RGB/RGBA) backed by Pillow."""
+
+    extension = "qoi"
+
+    def encode(self, image: np.ndarray, settings: Settings) -> bytes:
+        image = to_uint8(image)
+        if image.ndim == 2:
+            image = np.repeat(image[..., None], 3, axis=2)
+        elif image.shape[2] == 2:
+            gray, alpha = image[..., :1], image[..., 1:]
+            image = np.concatenate([gray, gray, gray, alpha], axis=2)
+        out = io.BytesIO()
+        # Pillow writes QOI since 11.3, the minimum we depend on.
+        Image.fromarray(np.ascontiguousarray(image)).save(out, "QOI")
+        return out.getvalue()
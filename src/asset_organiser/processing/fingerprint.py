@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Dict, Optional
+
+from pydantic import BaseModel, Field, ValidationError
+
+
+def fingerprint(*parts: object) -> str:
+    """Return a stable SHA256 digest of JSON-serialisable ``parts``."""
+    text = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class AssetFingerprint(BaseModel):
+    """Fingerprints recorded in an asset's ``metadata.json``.
+
+    ``inputs`` maps source members to the digest of everything that affects
+    their metadata entry, ``outputs`` maps every written file (relative to
+    the asset directory) to the digest of everything that affects its
+    bytes.  ``asset`` covers both plus the asset-level metadata.
+    """
+
+    asset: str
+    inputs: Dict[str, str] = Field(default_factory=dict)
+    outputs: Dict[str, str] = Field(default_factory=dict)
+
+
+def read_metadata(path: Path) -> dict:
+    """Return the parsed metadata file at ``path`` or ``{}``."""
+    try:
+        data = json.loads(path.read_text())
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def previous_fingerprint(metadata: dict) -> Optional[AssetFingerprint]:
+    data = metadata.get("fingerprint")
+    if not isinstance(data, dict):
+        return None
+    try:
+        return AssetFingerprint.model_validate(data)
+    except ValidationError:
+        return None
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import io
+from pathlib import Path
+from typing import Callable, Dict
+
+import numpy as np
+from PIL import Image
+
+IMAGE_EXTENSIONS = frozenset(
+    {".png", ".jpg", ".jpeg", ".tga", ".tif", ".tiff", ".bmp", ".exr"}
+)
+
+
+class UnsupportedImageError(ValueError):
+    """Raised when an image cannot be decoded by the available backends."""
+
+
+# Decoders that need a file on disk rather than bytes, by lower-case
+# suffix.  None are registered by default: Pillow decodes everything it
+# supports from memory.
+PathDecoder = Callable[[Path], np.ndarray]
+_PATH_DECODERS: Dict[str, PathDecoder] = {}
+
+
+def is_image(filename: str) -> bool:
+    return Path(filename).suffix.lower() in IMAGE_EXTENSIONS
+
+
+def register_path_decoder(suffix: str, decoder: PathDecoder) -> None:
+    """Decode files ending in ``suffix`` with ``decoder`` given a path."""
+    _PATH_DECODERS[suffix.lower()] = decoder
+
+
+def needs_path(filename: str) -> bool:
+    """Return whether ``filename`` can only be decoded from disk."""
+    return Path(filename).suffix.lower() in _PATH_DECODERS
+
+
+def decode_image(
+    data: bytes | Path,
+    *,
+    draft: int | None = None,
+) -> np.ndarray:
+    """Decode encoded image bytes (or a file) into a ``(h, w[, c])`` array.
+
+    8-bit images decode to ``uint8``, 16-bit images to ``uint16`` and float
+    images to ``float32``.  With ``draft``, formats that can (JPEG) decode
+    at a reduced scale no smaller than ``draft`` pixels.
+    """
+    if isinstance(data, Path):
+        decoder = _PATH_DECODERS.get(data.suffix.lower())
+        if decoder is not None:
+            return decoder(data)
+    source = data if isinstance(data, Path) else io.BytesIO(data)
+    try:
+        with Image.open(source) as img:
+            if draft is not None:
+                img.draft(None, (draft, draft))
+            img.load()
+            return _to_array(img)
+    except (OSError, SyntaxError) as exc:
+        raise UnsupportedImageError(str(exc)) from exc
+
+
+def _to_array(img: Image.Image) -> np.ndarray:
+    mode = img.mode
+    if mode in ("I;16", "I;16B", "I;16L"):
+        return np.asarray(img, dtype=np.uint16)
+    if mode == "I":
+        array = np.asarray(img)
+        return np.clip(array, 0, 65535).astype(np.uint16)
+    if mode == "F":
+        return np.asarray(img, dtype=np.float32)
+    if mode == "P":
+        has_alpha = "transparency" in img.info
+        img = img.convert("RGBA" if has_alpha else "RGB")
+    elif mode == "1":
+        img = img.convert("L")
+    elif mode not in ("L", "LA", "RGB", "RGBA"):
+        img = img.convert("RGBA" if "A" in mode else "RGB")
+    return np.asarray(img)
+
+
+def bit_depth(image: np.ndarray) -> int:
+    if image.dtype == np.uint8:
+        return 8
+    if image.dtype == np.uint16 or image.dtype == np.float16:
+        return 16
+    return 32
+
+
+def scaled_size(width: int, height: int, size: int) -> tuple[int, int]:
+    """Return the ``(width, height)`` :func:`resize_image` produces."""
+    longest = max(width, height)
+    if size >= longest:
+        return width, height
+    scale = size / longest
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+
+def resize_image(image: np.ndarray, size: int) -> np.ndarray:
+    """Scale ``image`` so its longest edge is ``size`` pixels.
+
+    Power-of-two reductions are done with a box filter directly in NumPy;
+    other ratios fall back to Lanczos resampling per channel.
+    """
+    height, width = image.shape[:2]
+    longest = max(height, width)
+    if size >= longest:
+        return image
+    factor = longest // size
+    if longest % size == 0 and height % factor == 0 and width % factor == 0:
+        return _box_downsample(image, factor)
+    target = scaled_size(width, height, size)
+    channels = image[..., None] if image.ndim == 2 else image
+    planes = []
+    for c in range(channels.shape[2]):
+        plane = Image.fromarray(channels[..., c].astype(np.float32), "F")
+        plane = plane.resize(target, Image.Resampling.LANCZOS)
+        planes.append(np.asarray(plane))
+    result = np.stack(planes, axis=-1)
+    if image.ndim == 2:
+        result = result[..., 0]
+    return _restore_dtype(result, image.dtype)
+
+
+def _box_downsample(image: np.ndarray, factor: int) -> np.ndarray:
+    height, width = image.shape[:2]
+    shape = (height // factor, factor, width // factor, factor)
+    shape += image.shape[2:]
+    blocks = image.reshape(shape)
+    result = blocks.mean(axis=(1, 3), dtype=np.float32)
+    return _restore_dtype(result, image.dtype)
+
+
+def _restore_dtype(image: np.ndarray, dtype: np.dtype) -> np.ndarray:
+    if np.issubdtype(dtype, np.integer):
+        info = np.iinfo(dtype)
+        image = np.clip(np.rint(image), info.min, info.max)
+    return image.astype(dtype)
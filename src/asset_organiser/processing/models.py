@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+from .encoders import EncoderMetrics
+from .sources import IOStats
+
+
+class ImageExport(BaseModel):
+    """A single image file written for an asset."""
+
+    resolution: str
+    size: int
+    profile: str
+    filename: str
+
+
+class FilePlan(BaseModel):
+    """Planned outputs for one source file of an asset."""
+
+    file_id: str
+    member: str
+    filetype: str
+    is_image: bool = False
+    exports: List[ImageExport] = Field(default_factory=list)
+    copy_to: Optional[str] = None
+
+
+class AssetPlan(BaseModel):
+    """Everything the processor needs to produce one asset."""
+
+    source: str
+    asset_key: str
+    asset_name: str
+    asset_type: str
+    supplier: str
+    tags: List[str] = Field(default_factory=list)
+    output_dir: str
+    files: List[FilePlan] = Field(default_factory=list)
+
+
+class AssetResult(BaseModel):
+    source: str
+    asset_name: str
+    output_dir: Optional[str] = None
+    files: List[str] = Field(default_factory=list)
+    reused: List[str] = Field(default_factory=list)
+    skipped: bool = False
+    error: Optional[str] = None
+
+
+class ProcessingReport(BaseModel):
+    """Outcome of a processing run, returned to the caller."""
+
+    assets: List[AssetResult] = Field(default_factory=list)
+    io: Dict[str, IOStats] = Field(default_factory=dict)
+    encoding: Dict[str, EncoderMetrics] = Field(default_factory=dict)
+
+    @property
+    def errors(self) -> List[AssetResult]:
+        return [asset for asset in self.assets if asset.error]
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+from typing import Dict, FrozenSet, Hashable, Iterable, List, Mapping
+
+DIRECTORY_TOKENS = frozenset({"supplier", "assettype", "assetname"})
+FILENAME_TOKENS = DIRECTORY_TOKENS | {"filetype", "resolution"}
+
+_TOKEN = re.compile(r"\[([^\[\]]*)\]")
+_INVALID = re.compile(r'[\x00-\x1f<>:"/\\|?*]')
+_RESERVED = frozenset(
+    {"CON", "PRN", "AUX", "NUL"}
+    | {f"COM{i}" for i in range(1, 10)}
+    | {f"LPT{i}" for i in range(1, 10)}
+)
+
+
+def sanitize_name(name: str) -> str:
+    """Make ``name`` safe to use as a single path component everywhere.
+
+    Characters Windows refuses are replaced with ``_``, trailing dots and
+    spaces are trimmed and reserved device names are prefixed.
+    """
+    name = _INVALID.sub("_", name).strip().rstrip(". ")
+    if not name or name in {".", ".."}:
+        return "_"
+    if name.split(".")[0].upper() in _RESERVED:
+        return f"_{name}"
+    return name
+
+
+class PathCollisionError(ValueError):
+    """Raised when several outputs of a batch resolve to the same path."""
+
+    def __init__(self, collisions: Mapping[str, List[Hashable]]) -> None:
+        self.collisions = dict(collisions)
+        details = "; ".join(
+            f"{path}: {', '.join(map(str, owners))}"
+            for path, owners in sorted(self.collisions.items())
+        )
+        super().__init__(f"Output path collisions: {details}")
+
+
+class PathTemplate:
+    """A compiled ``[token]`` pattern such as ``[assetname]_[filetype]``.
+
+    The pattern is parsed once; formatting only joins the pre-split parts
+    with sanitised token values.  Token values can never introduce new
+    directories: any ``/`` they contain is replaced.
+    """
+
+    def __init__(self, pattern: str, tokens: Iterable[str]) -> None:
+        self.pattern = pattern
+        allowed = frozenset(tokens)
+        literals: List[str] = []
+        names: List[str] = []
+        position = 0
+        for match in _TOKEN.finditer(pattern):
+            start = match.start()
+            literals.append(pattern[position:start])
+            names.append(match.group(1).lower())
+            position = match.end()
+        literals.append(pattern[position:])
+        unknown = sorted(set(names) - allowed)
+        if unknown:
+            raise ValueError(
+                f"Unknown token(s) {', '.join(unknown)} in pattern "
+                f"{pattern!r}; expected one of {', '.join(sorted(allowed))}"
+            )
+        text = _TOKEN.sub("_", pattern).replace("\\", "/")
+        if "[" in text or "]" in text:
+            raise ValueError(f"Unbalanced brackets in pattern {pattern!r}")
+        if text.startswith("/") or ".." in text.split("/"):
+            raise ValueError(f"Pattern {pattern!r} must stay relative")
+        self._literals = [part.replace("\\", "/") for part in literals]
+        self._names = names
+        self.tokens: FrozenSet[str] = frozenset(names)
+
+    def format(self, values: Mapping[str, str]) -> str:
+        """Return the path for ``values``, using ``/`` as separator."""
+        parts = [self._literals[0]]
+        for name, literal in zip(self._names, self._literals[1:]):
+            parts.append(sanitize_name(str(values[name])))
+            parts.append(literal)
+        segments = "".join(parts).split("/")
+        return "/".join(sanitize_name(s) for s in segments if s)
+
+    def __call__(self, **values: str) -> str:
+        return self.format(values)
+
+    def __repr__(self) -> str:
+        return f"PathTemplate({self.pattern!r})"
+
+
+@lru_cache(maxsize=64)
+def compile_template(
+    pattern: str, tokens: FrozenSet[str] = FILENAME_TOKENS
+) -> PathTemplate:
+    """Return a cached :class:`PathTemplate` for ``pattern``."""
+    return PathTemplate(pattern, tokens)
+
+
+def find_collisions(
+    paths: Iterable[tuple[Hashable, str]],
+) -> Dict[str, List[Hashable]]:
+    """Return output paths claimed by more than one owner.
+
+    ``paths`` yields ``(owner, path)`` pairs.  Paths are compared case
+    insensitively because the library is often shared with Windows and
+    macOS machines.
+    """
+    claims: Dict[str, Dict[Hashable, None]] = {}
+    display: Dict[str, str] = {}
+    for owner, path in paths:
+        key = path.casefold()
+        display.setdefault(key, path)
+        claims.setdefault(key, {})[owner] = None
+    collisions: Dict[str, List[Hashable]] = {}
+    for key, owners in claims.items():
+        if len(owners) > 1:
+            collisions[display[key]] = list(owners)
+    return collisions
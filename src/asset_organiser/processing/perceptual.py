@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import Dict, Mapping, Optional
+
+import numpy as np
+from PIL import Image
+from pydantic import BaseModel
+
+from .encoders.base import to_float
+from .imaging import UnsupportedImageError, decode_image, is_image, needs_path
+from .sources import SourceReader
+from .stats import pyramid_level
+
+# Images are sampled down to at most this size before hashing.
+SAMPLE_SIZE = 256
+_DCT_SIZE = 32
+_HASH_SIZE = 8
+# Images flatter than this (standard deviation, 0-1 scale) have no
+# structure to hash; every flat map would otherwise look identical.
+MIN_CONTRAST = 1e-3
+
+
+def _dct_matrix(size: int) -> np.ndarray:
+    n = np.arange(size)
+    return np.cos(np.pi * (2 * n[None, :] + 1) * n[:, None] / (2 * size))
+
+
+_DCT = _dct_matrix(_DCT_SIZE)
+
+
+class PerceptualHash(BaseModel):
+    """64-bit pHash and dHash of an image."""
+
+    phash: int
+    dhash: int
+
+    def distance(self, other: "PerceptualHash") -> int:
+        """Return the pHash hamming distance to ``other``."""
+        return hamming(self.phash, other.phash)
+
+    def to_metadata(self) -> Dict[str, str]:
+        return {"phash": f"{self.phash:016x}", "dhash": f"{self.dhash:016x}"}
+
+    @classmethod
+    def from_metadata(cls, data: object) -> Optional["PerceptualHash"]:
+        if not isinstance(data, Mapping):
+            return None
+        try:
+            phash, dhash = data["phash"], data["dhash"]
+            return cls(phash=int(phash, 16), dhash=int(dhash, 16))
+        except (KeyError, TypeError, ValueError):
+            return None
+
+
+def hamming(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
+
+
+def _bits(mask: np.ndarray) -> int:
+    return int.from_bytes(np.packbits(mask.ravel()).tobytes(), "big")
+
+
+def _luminance(image: np.ndarray) -> np.ndarray:
+    pixels = to_float(pyramid_level(image, SAMPLE_SIZE))
+    if pixels.ndim == 2:
+        return pixels
+    if pixels.shape[2] >= 3:
+        weights = np.array([0.299, 0.587, 0.114], dtype=np.float32)
+        return pixels[..., :3] @ weights
+    return pixels[..., 0]
+
+
+def perceptual_hash(image: np.ndarray) -> Optional[PerceptualHash]:
+    """Hash the structure of ``image``; ``None`` for flat images.
+
+    pHash keeps the sign of the low-frequency DCT coefficients relative
+    to their median, dHash the direction of horizontal gradients.  Both
+    survive re-encoding, resizing and small colour changes, so copies of
+    a texture saved differently end up a few bits apart.
+    """
+    gray = Image.fromarray(np.ascontiguousarray(_luminance(image)), "F")
+    small = np.asarray(
+        gray.resize((_DCT_SIZE, _DCT_SIZE), Image.Resampling.BOX),
+        dtype=np.float64,
+    )
+    if small.std() < MIN_CONTRAST:
+        return None
+    coefficients = _DCT @ small @ _DCT.T
+    low = coefficients[:_HASH_SIZE, :_HASH_SIZE].ravel()
+    # The DC term only encodes brightness and is left out of the median.
+    phash = _bits(low > np.median(low[1:]))
+    grid = Image.fromarray(small.astype(np.float32), "F").resize(
+        (_HASH_SIZE + 1, _HASH_SIZE), Image.Resampling.BILINEAR
+    )
+    cells = np.asarray(grid)
+    dhash = _bits(cells[:, 1:] > cells[:, :-1])
+    return PerceptualHash(phash=phash, dhash=dhash)
+
+
+def _hash_one(reader: SourceReader, member: str) -> Optional[PerceptualHash]:
+    try:
+        if needs_path(member):
+            image = decode_image(reader.local_path(member))
+        else:
+            # Only a sample is hashed; JPEGs decode straight at that scale.
+            data = reader.read(member)
+            image = decode_image(data, draft=SAMPLE_SIZE)
+    except (OSError, UnsupportedImageError):
+        return None
+    return perceptual_hash(image)
+
+
+def hash_source_images(
+    path: Path, max_workers: int | None = None
+) -> Dict[str, PerceptualHash]:
+    """Return the hash of every decodable image member of a source.
+
+    Members are decoded in parallel; only the hashes are kept.
+    """
+    hashes: Dict[str, PerceptualHash] = {}
+    with SourceReader.for_path(Path(path)) as reader:
+        members = [m for m in reader.members() if is_image(m)]
+        with ThreadPoolExecutor(max_workers) as pool:
+            values = list(pool.map(partial(_hash_one, reader), members))
+        for member, value in zip(members, values):
+            if value is not None:
+                hashes[member] = value
+    return hashes
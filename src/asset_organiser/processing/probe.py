@@ -0,0 +1,415 @@
+from __future__ import annotations
+
+import os
+import struct
+import threading
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import IO, Dict, Hashable, Iterable, Mapping, Optional, Tuple
+
+from pydantic import BaseModel
+
+# Bytes read up front; parsers pull more on demand (e.g. large JPEG EXIF
+# blocks or TIFF directories stored at the end of the file).
+HEADER_BYTES = 16 * 1024
+READ_CHUNK = 64 * 1024
+
+ProbeTarget = Path | Tuple[Path, str]
+
+
+class ImageInfo(BaseModel):
+    """Properties of an image that can be read from its header alone."""
+
+    format: str
+    width: int
+    height: int
+    channels: int
+    bit_depth: int
+    has_alpha: bool = False
+    is_float: bool = False
+
+    @property
+    def estimated_bytes(self) -> int:
+        """Approximate memory needed to hold the decoded image."""
+        bytes_per_sample = max(1, (self.bit_depth + 7) // 8)
+        return self.width * self.height * self.channels * bytes_per_sample
+
+    def resolutions(self, available: Mapping[str, int]) -> Dict[str, int]:
+        """Return the entries of ``available`` not larger than this image."""
+        longest = max(self.width, self.height)
+        return {k: v for k, v in available.items() if v <= longest}
+
+
+class _HeaderBuffer:
+    """Lazily extended view over the start of a binary stream.
+
+    Reads far beyond the buffered prefix seek instead of reading the gap;
+    those blocks are cached separately by offset and the stream is moved
+    back to the end of the prefix so it can still be extended in order.
+    """
+
+    def __init__(self, stream: IO[bytes]) -> None:
+        self._stream = stream
+        self._data = stream.read(HEADER_BYTES)
+        self._eof = len(self._data) < HEADER_BYTES
+        self._far: Dict[int, bytes] = {}
+
+    def get(self, offset: int, size: int) -> bytes:
+        end = offset + size
+        if end > len(self._data) and not self._eof:
+            if offset > len(self._data) + READ_CHUNK and self._seekable():
+                return self._get_far(offset, size)
+            while end > len(self._data) and not self._eof:
+                missing = end - len(self._data)
+                chunk = self._stream.read(max(READ_CHUNK, missing))
+                self._eof = len(chunk) == 0
+                self._data += chunk
+        if end > len(self._data):
+            raise ValueError("Unexpected end of image header")
+        return self._data[offset:end]
+
+    def _get_far(self, offset: int, size: int) -> bytes:
+        end = offset + size
+        for start, block in self._far.items():
+            if start <= offset and end <= start + len(block):
+                return block[offset - start : end - start]
+        self._stream.seek(offset)
+        block = self._stream.read(max(size, READ_CHUNK))
+        self._stream.seek(len(self._data))
+        if len(block) < size:
+            raise ValueError("Unexpected end of image header")
+        self._far[offset] = block
+        return block[:size]
+
+    def peek(self, size: int) -> bytes:
+        return self._data[:size]
+
+    def _seekable(self) -> bool:
+        try:
+            return self._stream.seekable()
+        except Exception:  # pragma: no cover - defensive
+            return False
+
+
+# ----------------------------------------------------------------------
+def _probe_png(buf: _HeaderBuffer) -> ImageInfo:
+    width, height, depth, color = struct.unpack(">IIBB", buf.get(16, 10))
+    channels = {0: 1, 2: 3, 3: 3, 4: 2, 6: 4}.get(color)
+    if channels is None:
+        raise ValueError(f"Invalid PNG color type {color}")
+    has_alpha = color in (4, 6)
+    offset = 8
+    # Walk the chunk list until image data starts to find tRNS.
+    while not has_alpha:
+        length, kind = struct.unpack(">I4s", buf.get(offset, 8))
+        if kind in (b"IDAT", b"IEND"):
+            break
+        if kind == b"tRNS":
+            has_alpha = True
+            channels += 1
+        offset += length + 12
+    if color == 3:
+        depth = 8
+    return ImageInfo(
+        format="PNG",
+        width=width,
+        height=height,
+        channels=channels,
+        bit_depth=depth,
+        has_alpha=has_alpha,
+    )
+
+
+_JPEG_SOF = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7}
+_JPEG_SOF |= {0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+_JPEG_STANDALONE = {0x01, 0xD8} | set(range(0xD0, 0xD8))
+
+
+def _probe_jpeg(buf: _HeaderBuffer) -> ImageInfo:
+    offset = 2
+    while True:
+        if buf.get(offset, 1) != b"\xff":
+            raise ValueError("Invalid JPEG marker")
+        marker = buf.get(offset + 1, 1)[0]
+        if marker == 0xFF:  # fill byte
+            offset += 1
+            continue
+        if marker in _JPEG_STANDALONE:
+            offset += 2
+            continue
+        if marker in (0xD9, 0xDA):
+            raise ValueError("JPEG has no frame header")
+        (length,) = struct.unpack(">H", buf.get(offset + 2, 2))
+        if marker in _JPEG_SOF:
+            depth, height, width, channels = struct.unpack(
+                ">BHHB", buf.get(offset + 4, 6)
+            )
+            return ImageInfo(
+                format="JPEG",
+                width=width,
+                height=height,
+                channels=channels,
+                bit_depth=depth,
+            )
+        offset += 2 + length
+
+
+_TIFF_TYPES = {3: ("H", 2), 4: ("I", 4), 16: ("Q", 8)}
+
+
+def _probe_tiff(buf: _HeaderBuffer) -> ImageInfo:
+    order = "<" if buf.get(0, 2) == b"II" else ">"
+    (ifd,) = struct.unpack(order + "I", buf.get(4, 4))
+    (count,) = struct.unpack(order + "H", buf.get(ifd, 2))
+    tags: Dict[int, Tuple[int, ...]] = {}
+    for i in range(count):
+        entry = buf.get(ifd + 2 + i * 12, 12)
+        tag, kind, num = struct.unpack(order + "HHI", entry[:8])
+        if kind not in _TIFF_TYPES:
+            continue
+        code, size = _TIFF_TYPES[kind]
+        nbytes = size * num
+        if nbytes <= 4:
+            raw = entry[8:][:nbytes]
+        else:
+            (pointer,) = struct.unpack(order + "I", entry[8:])
+            raw = buf.get(pointer, size * min(num, 4))
+            num = min(num, 4)
+        tags[tag] = struct.unpack(order + code * num, raw)
+    width = tags.get(256, (0,))[0]
+    height = tags.get(257, (0,))[0]
+    if not width or not height:
+        raise ValueError("TIFF is missing image dimensions")
+    channels = tags.get(277, (1,))[0]
+    photometric = tags.get(262, (1,))[0]
+    if photometric == 3:  # palette
+        channels = 3
+    extra = tags.get(338, ())
+    return ImageInfo(
+        format="TIFF",
+        width=width,
+        height=height,
+        channels=channels,
+        bit_depth=tags.get(258, (1,))[0],
+        has_alpha=any(value in (1, 2) for value in extra),
+        is_float=tags.get(339, (1,))[0] == 3,
+    )
+
+
+def _read_cstring(buf: _HeaderBuffer, offset: int) -> Tuple[str, int]:
+    raw = b""
+    while True:
+        char = buf.get(offset, 1)
+        offset += 1
+        if char == b"\x00":
+            return raw.decode("latin-1"), offset
+        raw += char
+
+
+def _probe_exr(buf: _HeaderBuffer) -> ImageInfo:
+    offset = 8
+    window: Optional[Tuple[int, int, int, int]] = None
+    channels: Dict[str, int] = {}
+    while True:
+        name, offset = _read_cstring(buf, offset)
+        if not name:
+            break
+        _kind, offset = _read_cstring(buf, offset)
+        (size,) = struct.unpack("<I", buf.get(offset, 4))
+        offset += 4
+        if name == "dataWindow":
+            window = struct.unpack("<iiii", buf.get(offset, 16))
+        elif name == "channels":
+            pos = offset
+            while True:
+                channel, pos = _read_cstring(buf, pos)
+                if not channel:
+                    break
+                (pixel_type,) = struct.unpack("<i", buf.get(pos, 4))
+                channels[channel] = pixel_type
+                pos += 16
+        offset += size
+    if window is None or not channels:
+        raise ValueError("EXR header is missing dataWindow or channels")
+    xmin, ymin, xmax, ymax = window
+    depth = max(16 if kind == 1 else 32 for kind in channels.values())
+    return ImageInfo(
+        format="EXR",
+        width=xmax - xmin + 1,
+        height=ymax - ymin + 1,
+        channels=len(channels),
+        bit_depth=depth,
+        has_alpha=any(c == "A" or c.endswith(".A") for c in channels),
+        is_float=any(kind != 0 for kind in channels.values()),
+    )
+
+
+def _probe_tga(buf: _HeaderBuffer) -> ImageInfo:
+    header = buf.get(0, 18)
+    image_type = header[2]
+    map_depth = header[7]
+    width, height, depth, descriptor = struct.unpack("<HHBB", header[12:])
+    if image_type not in (1, 2, 3, 9, 10, 11) or not width or not height:
+        raise ValueError("Invalid TGA header")
+    alpha_bits = descriptor & 0x0F
+    if image_type in (3, 11):
+        channels = 2 if depth == 16 else 1
+    elif image_type in (1, 9):
+        channels = 4 if map_depth == 32 else 3
+        # Colour-mapped pixels are indices; the palette holds the colours.
+        depth = map_depth
+    else:
+        channels = 4 if depth == 32 or alpha_bits else 3
+    if channels >= 3 and depth in (15, 16):
+        bit_depth = 5  # packed 5-5-5(-1) colour
+    else:
+        bit_depth = depth // channels
+    return ImageInfo(
+        format="TGA",
+        width=width,
+        height=height,
+        channels=channels,
+        bit_depth=bit_depth,
+        has_alpha=channels in (2, 4),
+    )
+
+
+def probe_stream(stream: IO[bytes], name: str = "") -> ImageInfo:
+    """Read the header of the image in ``stream``.
+
+    Only the first :data:`HEADER_BYTES` are read unless the format stores
+    its header further into the file.  ``name`` is used to recognise TGA
+    files, which have no magic number.  Raises :class:`ValueError` for
+    unsupported or malformed files.
+    """
+    buf = _HeaderBuffer(stream)
+    magic = buf.peek(4)
+    try:
+        if magic == b"\x89PNG":
+            return _probe_png(buf)
+        if magic[:3] == b"\xff\xd8\xff":
+            return _probe_jpeg(buf)
+        if magic in (b"II*\x00", b"MM\x00*"):
+            return _probe_tiff(buf)
+        if magic == b"v/1\x01":
+            return _probe_exr(buf)
+        if name.lower().endswith(".tga"):
+            return _probe_tga(buf)
+    except struct.error as exc:
+        raise ValueError(f"Malformed image header: {name}") from exc
+    raise ValueError(f"Unsupported image format: {name}")
+
+
+class HeaderProbe:
+    """Probe image headers in parallel and cache the results.
+
+    Results are keyed by ``(path, size, mtime)`` so a modified file is
+    probed again.  Archive members are keyed by the archive's stat and the
+    member name and are read directly from the zip without extraction.
+    """
+
+    def __init__(self, max_workers: int | None = None) -> None:
+        self.max_workers = max_workers
+        self._cache: Dict[Hashable, ImageInfo] = {}
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _stat_key(path: Path) -> Tuple[str, int, int]:
+        stat = os.stat(path)
+        return str(path), stat.st_size, stat.st_mtime_ns
+
+    def _cached(self, key: Hashable, load) -> ImageInfo:
+        with self._lock:
+            info = self._cache.get(key)
+        if info is None:
+            info = load()
+            with self._lock:
+                self._cache[key] = info
+        return info
+
+    # ------------------------------------------------------------------
+    def probe_file(self, path: Path) -> ImageInfo:
+        """Return the :class:`ImageInfo` of the image at ``path``."""
+        path = Path(path)
+
+        def load() -> ImageInfo:
+            with open(path, "rb") as fh:
+                return probe_stream(fh, path.name)
+
+        return self._cached(self._stat_key(path), load)
+
+    def probe_member(
+        self,
+        archive: Path,
+        member: str,
+        *,
+        zf: zipfile.ZipFile | None = None,
+    ) -> ImageInfo:
+        """Return the :class:`ImageInfo` of ``member`` inside a zip.
+
+        ``zf`` may be an already open handle of ``archive`` to avoid parsing
+        the central directory again.
+        """
+        archive = Path(archive)
+
+        def load() -> ImageInfo:
+            if zf is not None:
+                with zf.open(member) as fh:
+                    return probe_stream(fh, member)
+            with zipfile.ZipFile(archive) as own, own.open(member) as fh:
+                return probe_stream(fh, member)
+
+        return self._cached(self._stat_key(archive) + (member,), load)
+
+    def probe(self, target: ProbeTarget) -> ImageInfo:
+        if isinstance(target, tuple):
+            return self.probe_member(*target)
+        return self.probe_file(target)
+
+    def probe_many(
+        self, targets: Iterable[ProbeTarget]
+    ) -> Dict[ProbeTarget, Optional[ImageInfo]]:
+        """Probe ``targets`` concurrently.
+
+        Targets are file paths or ``(archive, member)`` tuples.  Files that
+        cannot be probed map to ``None``.
+        """
+        targets = list(targets)
+        # ZipFile handles are not shared between threads; each worker opens
+        # every archive it touches once for the duration of this call.
+        handles: Dict[Tuple[int, Path], zipfile.ZipFile] = {}
+        handles_lock = threading.Lock()
+
+        def handle(archive: Path) -> zipfile.ZipFile:
+            key = (threading.get_ident(), Path(archive))
+            with handles_lock:
+                zf = handles.get(key)
+            if zf is None:
+                zf = zipfile.ZipFile(archive)
+                with handles_lock:
+                    handles[key] = zf
+            return zf
+
+        def run(target: ProbeTarget) -> Optional[ImageInfo]:
+            try:
+                if isinstance(target, tuple):
+                    archive, member = target
+                    zf = handle(archive)
+                    return self.probe_member(archive, member, zf=zf)
+                return self.probe_file(target)
+            except (OSError, ValueError, KeyError, zipfile.BadZipFile):
+                return None
+
+        try:
+            with ThreadPoolExecutor(self.max_workers) as pool:
+                results = list(pool.map(run, targets))
+        finally:
+            for zf in handles.values():
+                zf.close()
+        return dict(zip(targets, results))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
@@ -0,0 +1,738 @@
+from __future__ import annotations
+
+import os
+import shutil
+from concurrent.futures import Future, wait
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Set,
+    Tuple,
+)
+
+import numpy as np
+
+from .. import tracing
+from ..classification.models import ClassificationState, SourceData
+from ..config_models import ExportProfile
+from ..config_service import ConfigService
+from ..hashing import SHA256_KEY, SourceFingerprintService
+from ..library.catalog import LibraryCatalog
+from ..library.thumbnails import ThumbnailCache, preferred_filetypes
+from .commit import AssetCommitter
+from .encoders import BUILTIN_PROFILES, DEFAULT_PROFILE, EncoderPool
+from .encoders.base import get_encoder, to_uint8
+from .fingerprint import (
+    AssetFingerprint,
+    fingerprint,
+    previous_fingerprint,
+    read_metadata,
+)
+from .imaging import (
+    UnsupportedImageError,
+    bit_depth,
+    decode_image,
+    is_image,
+    needs_path,
+    resize_image,
+    scaled_size,
+)
+
+from .models import AssetPlan, AssetResult, FilePlan  # isort: split
+from .models import ImageExport, ProcessingReport
+from .paths import (
+    DIRECTORY_TOKENS,
+    FILENAME_TOKENS,
+    PathCollisionError,
+    compile_template,
+    find_collisions,
+)
+from .perceptual import perceptual_hash
+from .probe import HeaderProbe, ImageInfo
+from .sources import SourceReader
+from .stats import compute_channel_stats, resolve_stats_size
+
+SKIPPED_FILETYPES = frozenset({"IGNORE", "UNIDENTIFIED"})
+EXTRA_FILETYPE = "FILE_EXTRA"
+EXTRA_DIRECTORY = "Extra"
+UNKNOWN = "Unknown"
+FORCE_8BIT = "force_8bit"
+
+
+def resolution_label(size: int) -> str:
+    """Return a descriptive name such as ``4K`` for a pixel size."""
+    if size >= 1024 and size % 1024 == 0:
+        return f"{size // 1024}K"
+    return f"{size}px"
+
+
+def _aspect_ratio(width: int, height: int) -> str:
+    divisor = np.gcd(width, height)
+    return f"{width // divisor}:{height // divisor}"
+
+
+class _AssetJob:
+    """Working state while one asset is written to its staging directory."""
+
+    def __init__(
+        self,
+        *,
+        plan: AssetPlan,
+        fingerprint: AssetFingerprint,
+        staging: Path,
+        final: Path,
+        reusable: Set[str],
+        previous: Optional[AssetFingerprint],
+        previous_files: List[Dict[str, object]],
+        pool: EncoderPool,
+    ) -> None:
+        self.plan = plan
+        self.fingerprint = fingerprint
+        self.staging = staging
+        self.final = final
+        self.reusable = reusable
+        self.previous = previous
+        self.previous_files = previous_files
+        self.written: Dict[str, str] = {}
+        self.reused: Set[str] = set()
+        self.pool = pool
+        self.pending: List[Future] = []
+
+    def reuse(self, name: str) -> bool:
+        """Carry an unchanged output over from the previous run."""
+        if name not in self.reusable:
+            return False
+        target = self.staging / name
+        target.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            os.link(self.final / name, target)
+        except OSError:
+            shutil.copy2(self.final / name, target)
+        self.written[name] = self.fingerprint.outputs[name]
+        self.reused.add(name)
+        return True
+
+    def previous_entry(self, file_plan: FilePlan) -> Optional[dict]:
+        """Return the old metadata entry if nothing about it changed."""
+        if self.previous is None:
+            return None
+        member = file_plan.member
+        old = self.previous.inputs.get(member)
+        if old != self.fingerprint.inputs.get(member):
+            return None
+        names = [export.filename for export in file_plan.exports]
+        if not all(name in self.reusable for name in names):
+            return None
+        for entry in self.previous_files:
+            if isinstance(entry, dict) and entry.get("source") == member:
+                return entry
+        return None
+
+
+class ProcessingService:
+    """Turn classified sources into assets in the output library.
+
+    The service snapshots the configuration on construction so a run is not
+    affected by edits made while it executes.  Source archives are never
+    extracted: member files are streamed from the archive, decompressed in
+    parallel, and only spilled to disk for formats whose registered decoder
+    needs a real file.
+    """
+
+    def __init__(
+        self,
+        config_service: ConfigService,
+        *,
+        max_workers: int | None = None,
+        fingerprints: SourceFingerprintService | None = None,
+        staging_dir: Path | None = None,
+        catalog: LibraryCatalog | None = None,
+        thumbnails: ThumbnailCache | None = None,
+    ) -> None:
+        if config_service.library_config is None:
+            raise RuntimeError("Library configuration not loaded")
+        self.config_version = config_service.version
+        self.settings = config_service.settings.model_copy(deep=True)
+        library_config = config_service.library_config
+        self.library_config = library_config.model_copy(deep=True)
+        self.library_path = config_service.library_path
+        self.max_workers = max_workers
+        self.staging_dir = staging_dir
+        if catalog is None and self.library_path is not None:
+            catalog = LibraryCatalog.for_library(
+                self.library_path,
+                self.output_root(),
+                metadata_name=self.settings.METADATA_FILENAME,
+            )
+        self.catalog = catalog
+        if thumbnails is None and self.library_path is not None:
+            definitions = self.library_config.FILE_TYPE_DEFINITIONS
+            thumbnails = ThumbnailCache.for_library(
+                self.library_path,
+                self.output_root(),
+                metadata_name=self.settings.METADATA_FILENAME,
+                preferred=preferred_filetypes(definitions),
+            )
+        self.thumbnails = thumbnails
+        self.probe = HeaderProbe(max_workers)
+        if fingerprints is None:
+            fingerprints = SourceFingerprintService(self.library_path)
+        self.fingerprints = fingerprints
+        resolutions = (
+            self.library_config.PROCESSING.image_resolutions
+            or self.settings.IMAGE_RESOLUTIONS
+        )
+        ordered = sorted(resolutions.items(), key=lambda item: -item[1])
+        self.resolutions = dict(ordered)
+        self.stats_size = resolve_stats_size(self.settings, self.resolutions)
+        self.directory_template = compile_template(
+            self.settings.OUTPUT_DIRECTORY_PATTERN, DIRECTORY_TOKENS
+        )
+        self.filename_template = compile_template(
+            self.settings.OUTPUT_FILENAME_PATTERN, FILENAME_TOKENS
+        )
+        self.export_profiles: Dict[str, ExportProfile] = {
+            **BUILTIN_PROFILES,
+            **self.library_config.PROCESSING.export_profiles,
+        }
+
+    # ------------------------------------------------------------------
+    def output_root(self) -> Path:
+        """Return the directory assets are written to."""
+        root = Path(self.settings.OUTPUT_BASE_DIR)
+        if not root.is_absolute() and self.library_path is not None:
+            root = self.library_path / root
+        return root.resolve()
+
+    def _alias(self, filetype: str) -> str:
+        definition = self.library_config.FILE_TYPE_DEFINITIONS.get(filetype)
+        if definition and definition.alias:
+            return definition.alias
+        return filetype
+
+    def _profile_for(self, filetype: str, depth: int, size: int) -> str:
+        """Select the export profile for one output image.
+
+        The profile category is ``16-bit`` for high bit depth images,
+        ``8-bit-lossy`` at or above ``RESOLUTION_THRESHOLD_FOR_LOSSY`` and
+        ``8-bit-lossless`` otherwise.  File type overrides take precedence
+        over ``DEFAULT_EXPORT_PROFILES``.
+        """
+        definition = self.library_config.FILE_TYPE_DEFINITIONS.get(filetype)
+        if definition and definition.bit_depth_policy == FORCE_8BIT:
+            depth = 8
+        if depth > 8:
+            category = "16-bit"
+        elif size >= self.settings.RESOLUTION_THRESHOLD_FOR_LOSSY:
+            category = "8-bit-lossy"
+        else:
+            category = "8-bit-lossless"
+        if definition and category in definition.override_export_profiles:
+            return definition.override_export_profiles[category]
+        defaults = self.settings.DEFAULT_EXPORT_PROFILES
+        return defaults.get(category, DEFAULT_PROFILE)
+
+    def _export_profile(self, name: str) -> ExportProfile:
+        try:
+            return self.export_profiles[name]
+        except KeyError:
+            raise ValueError(f"Unknown export profile: {name}") from None
+
+    def _plan_exports(
+        self, filetype: str, info: ImageInfo, tokens: Dict[str, str]
+    ) -> List[ImageExport]:
+        sizes = info.resolutions(self.resolutions)
+        if not sizes:
+            longest = max(info.width, info.height)
+            sizes = {resolution_label(longest): longest}
+        exports = []
+        for label, size in sizes.items():
+            profile = self._profile_for(filetype, info.bit_depth, size)
+            module = self._export_profile(profile).module
+            filename = self.filename_template.format(
+                {
+                    **tokens,
+                    "filetype": self._alias(filetype),
+                    "resolution": label,
+                }
+            )
+            extension = get_encoder(module).extension
+            exports.append(
+                ImageExport(
+                    resolution=label,
+                    size=size,
+                    profile=profile,
+                    filename=f"{filename}.{extension}",
+                )
+            )
+        return exports
+
+    # ------------------------------------------------------------------
+    def plan(
+        self, name: str, source: SourceData, reader: SourceReader
+    ) -> List[AssetPlan]:
+        """Build the processing plan for every asset of ``source``."""
+        supplier = str(source.metadata.get("supplier") or UNKNOWN)
+        default_type = self.settings.DEFAULT_ASSET_TYPE or UNKNOWN
+        image_members = [
+            entry.filename
+            for entry in source.contents.values()
+            if is_image(entry.filename)
+        ]
+        infos = self.probe.probe_many(
+            reader.probe_target(member) for member in image_members
+        )
+        headers = {m: infos[reader.probe_target(m)] for m in image_members}
+
+        plans: List[AssetPlan] = []
+        for key, asset in source.assets.items():
+            asset_name = asset.asset_name or f"Asset{key}"
+            asset_type = asset.asset_type or default_type
+            tokens = {
+                "supplier": supplier,
+                "assettype": asset_type,
+                "assetname": asset_name,
+            }
+            plan = AssetPlan(
+                source=name,
+                asset_key=key,
+                asset_name=asset_name,
+                asset_type=asset_type,
+                supplier=supplier,
+                tags=list(asset.asset_tags),
+                output_dir=self.directory_template.format(tokens),
+            )
+            for file_id in asset.asset_contents:
+                entry = source.contents.get(file_id)
+                if entry is None or entry.filetype in SKIPPED_FILETYPES:
+                    continue
+                filetype = entry.filetype or ""
+                file_plan = FilePlan(
+                    file_id=file_id,
+                    member=entry.filename,
+                    filetype=filetype,
+                )
+                basename = Path(entry.filename).name
+                info = headers.get(entry.filename)
+                if not filetype or filetype == EXTRA_FILETYPE:
+                    file_plan.copy_to = f"{EXTRA_DIRECTORY}/{basename}"
+                elif info is None:
+                    file_plan.copy_to = basename
+                else:
+                    file_plan.is_image = True
+                    exports = self._plan_exports(filetype, info, tokens)
+                    file_plan.exports = exports
+                plan.files.append(file_plan)
+            plans.append(plan)
+        return plans
+
+    # ------------------------------------------------------------------
+    def process(
+        self,
+        state: ClassificationState,
+        source_paths: Mapping[str, Path],
+        output_root: Optional[Path] = None,
+        on_asset: Optional[Callable[[AssetResult], None]] = None,
+    ) -> ProcessingReport:
+        """Process every asset in ``state``.
+
+        ``source_paths`` maps the source names used in ``state`` to the
+        archive, directory or file they were read from.  ``on_asset`` is
+        called with each result once its source has been committed.
+        """
+        root = Path(output_root) if output_root else self.output_root()
+        root.mkdir(parents=True, exist_ok=True)
+        report = ProcessingReport()
+        committer = AssetCommitter(
+            root,
+            staging_dir=self.staging_dir,
+            metadata_name=self.settings.METADATA_FILENAME,
+            max_workers=self.max_workers,
+        )
+        committer.recover()
+        pool = EncoderPool(self.export_profiles, max_workers=self.max_workers)
+        sources = len(state.sources)
+        with tracing.span("process", "processing", sources=sources):
+            with committer, pool:
+                self._process_sources(
+                    state, source_paths, committer, pool, report, on_asset
+                )
+        report.encoding = pool.metrics()
+        self.fingerprints.save()
+        return report
+
+    def _process_sources(
+        self,
+        state: ClassificationState,
+        source_paths: Mapping[str, Path],
+        committer: AssetCommitter,
+        pool: EncoderPool,
+        report: ProcessingReport,
+        on_asset: Optional[Callable[[AssetResult], None]] = None,
+    ) -> None:
+        plans: Dict[str, List[AssetPlan]] = {}
+        for name, source in state.sources.items():
+            path = source_paths.get(name)
+            if path is None:
+                missing = AssetResult(
+                    source=name,
+                    asset_name=name,
+                    error=f"No source path provided for {name!r}",
+                )
+                report.assets.append(missing)
+                if on_asset is not None:
+                    on_asset(missing)
+                continue
+            with tracing.span("plan", "processing", source=name):
+                with SourceReader.for_path(Path(path)) as reader:
+                    plans[name] = self.plan(name, source, reader)
+        # Every output path of the batch is known before anything is
+        # written, so clashing assets are rejected instead of overwriting
+        # each other.
+        planned = [plan for batch in plans.values() for plan in batch]
+        blocked = self._collisions(planned)
+        for name, batch in plans.items():
+            results = []
+            with SourceReader.for_path(Path(source_paths[name])) as reader:
+                for plan in batch:
+                    error = blocked.get((name, plan.asset_key))
+                    if error is None:
+                        args = (plan, reader, committer, pool)
+                        with tracing.span(
+                            "asset",
+                            "processing",
+                            source=name,
+                            asset=plan.asset_name,
+                        ):
+                            result = self._run_asset(*args)
+                    else:
+                        result = AssetResult(
+                            source=name,
+                            asset_name=plan.asset_name,
+                            error=error,
+                        )
+                    results.append(result)
+                report.io[name] = reader.stats
+            # Each source is published as one batch once all of its
+            # assets are staged.
+            with tracing.span("commit", "processing", source=name):
+                failures = committer.commit()
+            for result in results:
+                if result.output_dir is None or result.skipped:
+                    continue
+                error = failures.get(committer.root / result.output_dir)
+                if error is not None:
+                    result.error = error
+                    result.output_dir = None
+                    result.files = []
+            with tracing.span("catalog", "processing", source=name):
+                self._catalog_results(committer.root, results)
+            report.assets.extend(results)
+            if on_asset is not None:
+                for result in results:
+                    on_asset(result)
+            digest = state.sources[name].metadata.get(SHA256_KEY)
+            if digest and not any(result.error for result in results):
+                self.fingerprints.mark_imported(str(digest), name)
+
+    def _catalog_results(
+        self,
+        root: Path,
+        results: Iterable[AssetResult],
+    ) -> None:
+        catalog = self.catalog
+        if catalog is None or catalog.output_root != root:
+            return
+        published = [
+            root / result.output_dir
+            for result in results
+            if result.output_dir and not result.skipped
+        ]
+        if not published:
+            return
+        entries = catalog.refresh(published)
+        # Previews are rendered from the smallest export while it is
+        # still in the page cache.
+        if self.thumbnails is not None:
+            self.thumbnails.update(entries)
+
+    @staticmethod
+    def _collisions(
+        plans: Iterable[AssetPlan],
+    ) -> Dict[tuple[str, str], str]:
+        """Map the assets whose output paths clash to an error message."""
+        claims: List[tuple[tuple[str, str, str], str]] = []
+        for plan in plans:
+            key = (plan.source, plan.asset_key)
+            claims.append(((*key, ""), plan.output_dir))
+            for file_plan in plan.files:
+                owner = (*key, file_plan.member)
+                names = [export.filename for export in file_plan.exports]
+                if file_plan.copy_to:
+                    names.append(file_plan.copy_to)
+                for filename in names:
+                    path = f"{plan.output_dir}/{filename}"
+                    claims.append((owner, path))
+        blocked: Dict[tuple[str, str], str] = {}
+        for path, owners in find_collisions(claims).items():
+            labels = [
+                f"{source}/{member}" if member else source
+                for source, _, member in owners
+            ]
+            exc = PathCollisionError({path: labels})
+            message = f"{type(exc).__name__}: {exc}"
+            for source, asset_key, _ in owners:
+                blocked.setdefault((source, asset_key), message)
+        return blocked
+
+    # ------------------------------------------------------------------
+    def _fingerprint(
+        self,
+        plan: AssetPlan,
+        reader: SourceReader,
+    ) -> AssetFingerprint:
+        from .. import __version__
+
+        inputs: Dict[str, str] = {}
+        outputs: Dict[str, str] = {}
+        for file_plan in plan.files:
+            digest = reader.content_hash(file_plan.member)
+            inputs[file_plan.member] = fingerprint(
+                __version__, digest, file_plan.filetype, self.stats_size
+            )
+            if file_plan.copy_to:
+                outputs[file_plan.copy_to] = fingerprint(__version__, digest)
+            for export in file_plan.exports:
+                profile = self._export_profile(export.profile)
+                outputs[export.filename] = fingerprint(
+                    __version__,
+                    digest,
+                    export.size,
+                    export.profile,
+                    profile.model_dump(),
+                )
+        asset = fingerprint(
+            __version__,
+            plan.model_dump(),
+            self.settings.OUTPUT_FILENAME_PATTERN,
+            inputs,
+            outputs,
+        )
+        return AssetFingerprint(asset=asset, inputs=inputs, outputs=outputs)
+
+    def _run_asset(
+        self,
+        plan: AssetPlan,
+        reader: SourceReader,
+        committer: AssetCommitter,
+        pool: EncoderPool,
+    ) -> AssetResult:
+        result = AssetResult(source=plan.source, asset_name=plan.asset_name)
+        final = committer.root / plan.output_dir
+        metadata_name = self.settings.METADATA_FILENAME
+        previous_metadata = read_metadata(final / metadata_name)
+        previous = previous_fingerprint(previous_metadata)
+        staging: Optional[Path] = None
+        try:
+            current = self._fingerprint(plan, reader)
+            if previous is not None and previous.asset == current.asset:
+                if all((final / name).is_file() for name in previous.outputs):
+                    result.output_dir = plan.output_dir
+                    result.skipped = True
+                    names = [*previous.outputs, metadata_name]
+                    result.files = sorted(names)
+                    return result
+            reusable: Set[str] = set()
+            if previous is not None:
+                for name, digest in current.outputs.items():
+                    if previous.outputs.get(name) != digest:
+                        continue
+                    if (final / name).is_file():
+                        reusable.add(name)
+            staging = committer.stage()
+            job = _AssetJob(
+                plan=plan,
+                fingerprint=current,
+                staging=staging,
+                final=final,
+                reusable=reusable,
+                previous=previous,
+                previous_files=previous_metadata.get("files") or [],
+                pool=pool,
+            )
+            try:
+                files = self._write_asset(job, reader)
+            finally:
+                # Encodes still run on the pool; never let them outlive
+                # the staging directory they write into.
+                wait(job.pending)
+            pool.wait(job.pending)
+            committer.write_metadata(staging, self._metadata(job, files))
+        except Exception as exc:
+            if staging is not None:
+                committer.discard(staging)
+            result.error = f"{type(exc).__name__}: {exc}"
+            return result
+        result.output_dir = plan.output_dir
+        result.reused = sorted(job.reused)
+        written = [p for p in staging.rglob("*") if p.is_file()]
+        names = (p.relative_to(staging).as_posix() for p in written)
+        result.files = sorted(names)
+        committer.publish(staging, final)
+        return result
+
+    def _decoded(
+        self, reader: SourceReader, members: Iterable[str]
+    ) -> Iterator[Tuple[str, Optional[bytes]]]:
+        """Yield the bytes of ``members``, or ``None`` for path-only ones.
+
+        Members that only decode from disk are not read into memory; they
+        are decoded from :meth:`SourceReader.local_path` instead.
+        """
+        members = list(members)
+        streamed = [m for m in members if not needs_path(m)]
+        yield from reader.read_many(streamed, self.max_workers)
+        for member in members:
+            if needs_path(member):
+                yield member, None
+
+    @staticmethod
+    def _decode(reader: SourceReader, member: str, data: Optional[bytes]):
+        if data is None:
+            return decode_image(reader.local_path(member))
+        return decode_image(data)
+
+    def _write_asset(
+        self, job: "_AssetJob", reader: SourceReader
+    ) -> List[Dict[str, object]]:
+        files: List[Dict[str, object]] = []
+        to_decode: Dict[str, FilePlan] = {}
+        for file_plan in job.plan.files:
+            if file_plan.copy_to:
+                name = file_plan.copy_to
+                if not job.reuse(name):
+                    target = job.staging / name
+                    target.parent.mkdir(parents=True, exist_ok=True)
+                    reader.copy_to(file_plan.member, target)
+                    job.written[name] = job.fingerprint.outputs[name]
+                files.append(
+                    {
+                        "type": file_plan.filetype,
+                        "source": file_plan.member,
+                        "path": f"./{name}",
+                    }
+                )
+            elif file_plan.is_image:
+                entry = job.previous_entry(file_plan)
+                if entry is not None:
+                    for export in file_plan.exports:
+                        job.reuse(export.filename)
+                    files.append(entry)
+                else:
+                    to_decode[file_plan.member] = file_plan
+        for member, data in self._decoded(reader, to_decode):
+            file_plan = to_decode[member]
+            try:
+                with tracing.span("decode", "processing", member=member):
+                    image = self._decode(reader, member, data)
+            except UnsupportedImageError:
+                # Keep the original file when no decoder is available.
+                basename = Path(member).name
+                if data is None:
+                    reader.copy_to(member, job.staging / basename)
+                else:
+                    (job.staging / basename).write_bytes(data)
+                job.written[basename] = job.fingerprint.inputs[member]
+                files.append(
+                    {
+                        "type": file_plan.filetype,
+                        "source": member,
+                        "path": f"./{basename}",
+                    }
+                )
+                continue
+            filetype = file_plan.filetype
+            with tracing.span("export", "processing", filetype=filetype):
+                files.append(self._export_image(job, file_plan, image))
+        return files
+
+    def _export_image(
+        self, job: "_AssetJob", file_plan: FilePlan, image: np.ndarray
+    ) -> Dict[str, object]:
+        height, width = image.shape[:2]
+        depth = bit_depth(image)
+        definitions = self.library_config.FILE_TYPE_DEFINITIONS
+        definition = definitions.get(file_plan.filetype)
+        if definition and definition.bit_depth_policy == FORCE_8BIT:
+            image = to_uint8(image)
+        stats = compute_channel_stats(image, max_size=self.stats_size)
+        resolutions: Dict[str, object] = {}
+        for export in file_plan.exports:
+            if job.reuse(export.filename):
+                dimensions = list(scaled_size(width, height, export.size))
+            else:
+                with tracing.span("resize", "processing", size=export.size):
+                    resized = resize_image(image, export.size)
+                target = job.staging / export.filename
+                future = job.pool.submit(export.profile, resized, target)
+                job.pending.append(future)
+                digest = job.fingerprint.outputs[export.filename]
+                job.written[export.filename] = digest
+                dimensions = [resized.shape[1], resized.shape[0]]
+            resolutions[export.resolution] = {
+                "dimensions": dimensions,
+                "file_extension": Path(export.filename).suffix[1:],
+                "path": f"./{export.filename}",
+            }
+        entry: Dict[str, object] = {
+            "type": file_plan.filetype,
+            "source": file_plan.member,
+            "bit_depth": depth,
+            "aspect_ratio": _aspect_ratio(width, height),
+            "stats": {name: s.model_dump() for name, s in stats.items()},
+            "resolutions": resolutions,
+        }
+        hashes = perceptual_hash(image)
+        if hashes is not None:
+            entry["perceptual_hash"] = hashes.to_metadata()
+        return entry
+
+    def _metadata(
+        self, job: "_AssetJob", files: List[Dict[str, object]]
+    ) -> Dict[str, object]:
+        from .. import __version__
+
+        plan = job.plan
+        recorded = AssetFingerprint(
+            asset=job.fingerprint.asset,
+            inputs=job.fingerprint.inputs,
+            outputs=job.written,
+        )
+
+        available: List[str] = []
+        for entry in files:
+            for label in entry.get("resolutions", {}):
+                if label not in available:
+                    available.append(label)
+        return {
+            "asset_id": f"{plan.supplier}/{plan.asset_type}/{plan.asset_name}",
+            "asset_name": plan.asset_name,
+            "asset_type": plan.asset_type,
+            "supplier": plan.supplier,
+            "filename_pattern": self.settings.OUTPUT_FILENAME_PATTERN,
+            "processing_timestamp_utc": datetime.now(timezone.utc).strftime(
+                "%Y-%m-%dT%H:%M:%SZ"
+            ),
+            "app_version": __version__,
+            "files": files,
+            "available_resolutions": available,
+            "tags": plan.tags,
+            "fingerprint": recorded.model_dump(),
+        }
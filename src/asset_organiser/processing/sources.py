@@ -0,0 +1,264 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+import zipfile
+from abc import ABC, abstractmethod
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import count
+from pathlib import Path
+from typing import IO, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from pydantic import BaseModel
+
+COPY_BUFFER_SIZE = 1024 * 1024
+
+
+class IOStats(BaseModel):
+    """Byte counters collected while reading a source."""
+
+    members_read: int = 0
+    compressed_bytes: int = 0
+    uncompressed_bytes: int = 0
+    spilled_bytes: int = 0
+    archive_bytes: int = 0
+
+    @property
+    def extraction_bytes_saved(self) -> int:
+        """Bytes a full extraction to a temp directory would have written."""
+        return max(0, self.archive_bytes - self.spilled_bytes)
+
+
+class SourceReader(ABC):
+    """Read member files of a source without extracting it to disk."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self.stats = IOStats()
+        self._stats_lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    @staticmethod
+    def for_path(path: Path) -> "SourceReader":
+        """Return the reader matching the type of ``path``."""
+        path = Path(path)
+        if path.is_dir():
+            return DirectorySource(path)
+        if zipfile.is_zipfile(path):
+            return ArchiveSource(path)
+        return FileSource(path)
+
+    # ------------------------------------------------------------------
+    @abstractmethod
+    def members(self) -> List[str]:
+        """Return the names of all files contained in the source."""
+
+    @abstractmethod
+    def open(self, member: str) -> IO[bytes]:
+        """Return a binary stream for ``member``."""
+
+    def size(self, member: str) -> int:
+        return self.local_path(member).stat().st_size
+
+    def content_hash(self, member: str) -> str:
+        """Return a digest identifying the contents of ``member``."""
+        digest = hashlib.sha256()
+        with self.open(member) as fh:
+            while chunk := fh.read(COPY_BUFFER_SIZE):
+                digest.update(chunk)
+        return f"sha256:{digest.hexdigest()}"
+
+    def local_path(self, member: str) -> Path:
+        """Return a filesystem path for ``member``."""
+        return self._resolve(member)
+
+    def probe_target(self, member: str) -> Path | Tuple[Path, str]:
+        """Return the :class:`~.probe.HeaderProbe` target for ``member``."""
+        return self._resolve(member)
+
+    def _resolve(self, member: str) -> Path:
+        path = Path(member)
+        return path if path.is_absolute() else self.path / member
+
+    # ------------------------------------------------------------------
+    def read(self, member: str) -> bytes:
+        with self.open(member) as fh:
+            data = fh.read()
+        self._count(len(data))
+        return data
+
+    def read_many(
+        self,
+        members: Iterable[str],
+        max_workers: int | None = None,
+    ) -> Iterator[Tuple[str, bytes]]:
+        """Yield ``(member, data)`` in order, reading ahead in parallel.
+
+        At most ``2 * max_workers`` members are held in memory at a time.
+        """
+        members = list(members)
+        workers = max_workers or min(8, os.cpu_count() or 1)
+        window = workers * 2
+        pending: deque = deque()
+        with ThreadPoolExecutor(workers) as pool:
+            for member in members:
+                if len(pending) >= window:
+                    done, future = pending.popleft()
+                    yield done, future.result()
+                future = pool.submit(self._read_worker, member)
+                pending.append((member, future))
+            while pending:
+                done, future = pending.popleft()
+                yield done, future.result()
+
+    def _read_worker(self, member: str) -> bytes:
+        return self.read(member)
+
+    def copy_to(self, member: str, destination: Path) -> None:
+        """Stream ``member`` into ``destination``."""
+        with self.open(member) as src, open(destination, "wb") as dst:
+            shutil.copyfileobj(src, dst, COPY_BUFFER_SIZE)
+        self._count(destination.stat().st_size)
+
+    def _count(self, size: int, compressed: int | None = None) -> None:
+        if compressed is None:
+            compressed = size
+        with self._stats_lock:
+            self.stats.members_read += 1
+            self.stats.uncompressed_bytes += size
+            self.stats.compressed_bytes += compressed
+
+    # ------------------------------------------------------------------
+    def close(self) -> None:
+        pass
+
+    def __enter__(self) -> "SourceReader":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+class DirectorySource(SourceReader):
+    """Source backed by a directory tree."""
+
+    def members(self) -> List[str]:
+        return sorted(
+            p.relative_to(self.path).as_posix()
+            for p in self.path.rglob("*")
+            if p.is_file()
+        )
+
+    def open(self, member: str) -> IO[bytes]:
+        return open(self._resolve(member), "rb")
+
+
+class FileSource(SourceReader):
+    """Source consisting of a single loose file."""
+
+    def members(self) -> List[str]:
+        return [self.path.name]
+
+    def _resolve(self, member: str) -> Path:
+        return self.path
+
+    def open(self, member: str) -> IO[bytes]:
+        return open(self.path, "rb")
+
+
+class ArchiveSource(SourceReader):
+    """Source backed by a zip archive that is read member by member."""
+
+    def __init__(self, path: Path) -> None:
+        super().__init__(path)
+        self._zip = zipfile.ZipFile(self.path)
+        self._handles: Dict[int, zipfile.ZipFile] = {}
+        self._handles_lock = threading.Lock()
+        self._spill_dir: Optional[Path] = None
+        self._spilled: Dict[str, Path] = {}
+        self._spill_ids = count()
+        self._spill_lock = threading.Lock()
+        infos = self._zip.infolist()
+        self.stats.archive_bytes = sum(i.file_size for i in infos)
+
+    # ------------------------------------------------------------------
+    def members(self) -> List[str]:
+        return [n for n in self._zip.namelist() if not n.endswith("/")]
+
+    def size(self, member: str) -> int:
+        return self._zip.getinfo(member).file_size
+
+    def content_hash(self, member: str) -> str:
+        # The central directory already stores a checksum of every member,
+        # so archives can be fingerprinted without decompressing anything.
+        info = self._zip.getinfo(member)
+        return f"crc32:{info.CRC:08x}:{info.file_size}"
+
+    def open(self, member: str) -> IO[bytes]:
+        return self._zip.open(member)
+
+    def probe_target(self, member: str) -> Path | Tuple[Path, str]:
+        return self.path, member
+
+    def read(self, member: str) -> bytes:
+        return self._read_from(self._zip, member)
+
+    def _read_from(self, zf: zipfile.ZipFile, member: str) -> bytes:
+        data = zf.read(member)
+        info = zf.getinfo(member)
+        self._count(len(data), info.compress_size)
+        return data
+
+    def _read_worker(self, member: str) -> bytes:
+        # Each worker thread decompresses through its own file handle so
+        # that independent members inflate concurrently.
+        ident = threading.get_ident()
+        with self._handles_lock:
+            zf = self._handles.get(ident)
+            if zf is None:
+                zf = self._handles[ident] = zipfile.ZipFile(self.path)
+        return self._read_from(zf, member)
+
+    def copy_to(self, member: str, destination: Path) -> None:
+        info = self._zip.getinfo(member)
+        with self._zip.open(member) as src, open(destination, "wb") as dst:
+            shutil.copyfileobj(src, dst, COPY_BUFFER_SIZE)
+        self._count(info.file_size, info.compress_size)
+
+    def local_path(self, member: str) -> Path:
+        """Spill ``member`` to a temporary file and return its path.
+
+        Safe to call from several threads; each member is spilled once.
+        """
+        with self._spill_lock:
+            path = self._spilled.get(member)
+            if path is not None:
+                return path
+            if self._spill_dir is None:
+                spill_dir = tempfile.mkdtemp(prefix="asset-organiser-")
+                self._spill_dir = Path(spill_dir)
+            folder = self._spill_dir / str(next(self._spill_ids))
+            path = folder / Path(member).name
+            path.parent.mkdir(parents=True)
+            self.copy_to(member, path)
+            with self._stats_lock:
+                self.stats.spilled_bytes += path.stat().st_size
+            self._spilled[member] = path
+        return path
+
+    # ------------------------------------------------------------------
+    def close(self) -> None:
+        with self._handles_lock:
+            for zf in self._handles.values():
+                zf.close()
+            self._handles.clear()
+        self._zip.close()
+        with self._spill_lock:
+            if self._spill_dir is not None:
+                shutil.rmtree(self._spill_dir, ignore_errors=True)
+                self._spill_dir = None
+                self._spilled.clear()
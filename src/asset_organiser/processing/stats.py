@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+from typing import Dict, Mapping, Optional
+
+import numpy as np
+from pydantic import BaseModel
+
+from ..config_models import GeneralSettings
+
+# Number of histogram bins used for floating point images.  Integer images use
+# one bin per representable value so their statistics are exact.
+FLOAT_HISTOGRAM_BINS = 4096
+
+CHANNEL_NAMES = {
+    1: ("Gray",),
+    2: ("Gray", "A"),
+    3: ("R", "G", "B"),
+    4: ("R", "G", "B", "A"),
+}
+
+
+class ChannelStats(BaseModel):
+    """Statistics of a single image channel.
+
+    Integer channels are normalised to 0-1 by the maximum of their type.
+    Float channels keep their own scale, so HDR values may exceed 1.
+    """
+
+    min: float
+    max: float
+    mean: float
+    median: float
+
+
+def resolve_stats_size(
+    settings: GeneralSettings,
+    resolutions: Mapping[str, int] | None = None,
+) -> Optional[int]:
+    """Return the pixel size named by ``CALCULATE_STATS_RESOLUTION``.
+
+    ``None`` means statistics are calculated on the full resolution image.
+    """
+    name = settings.CALCULATE_STATS_RESOLUTION
+    if not name:
+        return None
+    if resolutions is None:
+        resolutions = settings.IMAGE_RESOLUTIONS
+    if name not in resolutions:
+        raise KeyError(f"Unknown stats resolution {name!r}")
+    return resolutions[name]
+
+
+def pyramid_level(image: np.ndarray, max_size: int | None) -> np.ndarray:
+    """Return a strided view of ``image`` no larger than ``max_size``.
+
+    The step is the smallest power of two that brings the longest edge down
+    to ``max_size``.  No pixels are copied or interpolated, so the values
+    seen by :func:`compute_channel_stats` are a subset of the source values.
+    """
+    if not max_size:
+        return image
+    longest = max(image.shape[0], image.shape[1])
+    step = 1
+    while longest > max_size * step:
+        step *= 2
+    if step == 1:
+        return image
+    return image[::step, ::step]
+
+
+def _as_channels(image: np.ndarray) -> np.ndarray:
+    if image.ndim == 2:
+        return image.reshape(-1, 1)
+    if image.ndim != 3:
+        raise ValueError(f"Expected a 2D or 3D image, got shape {image.shape}")
+    return image.reshape(-1, image.shape[2])
+
+
+def _middle_ranks(count: int) -> np.ndarray:
+    """Return the 1-based ranks whose mean is the median of ``count``."""
+    # Both ranks are the same for odd counts; even counts average the two
+    # middle values, like ``numpy.median``.
+    return np.array([(count + 1) // 2, count // 2 + 1])
+
+
+def _integer_stats(pixels: np.ndarray) -> list[ChannelStats]:
+    count, channels = pixels.shape
+    levels = int(np.iinfo(pixels.dtype).max) + 1
+    # One bincount over all channels: channel ``c`` occupies the bin range
+    # ``[c * levels, (c + 1) * levels)``.
+    offsets = np.arange(channels, dtype=np.int64) * levels
+    flat = (pixels.astype(np.int64, copy=False) + offsets).ravel()
+    hist = np.bincount(flat, minlength=channels * levels)
+    hist = hist.reshape(channels, levels)
+    scale = float(levels - 1)
+    values = np.arange(levels, dtype=np.float64)
+    cumulative = np.cumsum(hist, axis=1)
+    ranks = _middle_ranks(count)
+    result = []
+    for row, cum in zip(hist, cumulative):
+        nonzero = np.flatnonzero(row)
+        median = np.searchsorted(cum, ranks).mean()
+        result.append(
+            ChannelStats(
+                min=nonzero[0] / scale,
+                max=nonzero[-1] / scale,
+                mean=float(row @ values) / count / scale,
+                median=median / scale,
+            )
+        )
+    return result
+
+
+def _float_stats(pixels: np.ndarray) -> list[ChannelStats]:
+    if not np.isfinite(pixels).all():
+        # Infinite or NaN pixels (e.g. in EXRs) are left out; a channel
+        # without any finite value reports zeros.
+        return [_finite_stats(pixels[:, c]) for c in range(pixels.shape[1])]
+    lows = pixels.min(axis=0).astype(np.float64)
+    highs = pixels.max(axis=0).astype(np.float64)
+    means = pixels.mean(axis=0, dtype=np.float64)
+    return [
+        _channel_stats(pixels[:, c], low, high, mean)
+        for c, (low, high, mean) in enumerate(zip(lows, highs, means))
+    ]
+
+
+def _finite_stats(values: np.ndarray) -> ChannelStats:
+    values = values[np.isfinite(values)]
+    if values.size == 0:
+        return ChannelStats(min=0.0, max=0.0, mean=0.0, median=0.0)
+    low, high = float(values.min()), float(values.max())
+    return _channel_stats(values, low, high, values.mean(dtype=np.float64))
+
+
+def _channel_stats(
+    values: np.ndarray, low: float, high: float, mean: float
+) -> ChannelStats:
+    if high > low:
+        bins = FLOAT_HISTOGRAM_BINS
+        hist, edges = np.histogram(values, bins=bins, range=(low, high))
+        centres = (edges[:-1] + edges[1:]) / 2
+        ranks = _middle_ranks(len(values))
+        indices = np.searchsorted(np.cumsum(hist), ranks)
+        median = centres[indices].mean()
+    else:
+        median = low
+    return ChannelStats(
+        min=float(low),
+        max=float(high),
+        mean=float(mean),
+        median=float(median),
+    )
+
+
+def compute_channel_stats(
+    image: np.ndarray,
+    *,
+    max_size: int | None = None,
+) -> Dict[str, ChannelStats]:
+    """Return min/max/mean/median for every channel of ``image``.
+
+    ``image`` is a ``(height, width)`` or ``(height, width, channels)``
+    array.  Integer images are summarised from a single combined histogram
+    of all channels, which yields exact values without sorting; float images
+    use a fixed-size histogram for the median.  ``max_size`` selects a
+    :func:`pyramid_level` to analyse instead of the full image.
+    """
+    pixels = _as_channels(pyramid_level(np.asarray(image), max_size))
+    if pixels.shape[0] == 0:
+        raise ValueError("Cannot calculate statistics of an empty image")
+    names = CHANNEL_NAMES.get(pixels.shape[1])
+    if names is None:
+        names = tuple(str(i) for i in range(pixels.shape[1]))
+    if pixels.dtype in (np.uint8, np.uint16):
+        stats = _integer_stats(pixels)
+    else:
+        stats = _float_stats(pixels.astype(np.float32, copy=False))
+    return dict(zip(names, stats))
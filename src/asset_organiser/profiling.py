@@ -0,0 +1,154 @@
+"""Built-in sampling profiler writing flamegraph-compatible stacks.
+
+While a :func:`session` is active a background thread samples the stack
+of every thread at a fixed interval.  Identical stacks are counted and
+written in the collapsed format (``frame;frame;frame count``) read by
+``flamegraph.pl``, speedscope and most other flamegraph viewers.
+Profiles land in the library's ``.asset-library/logs`` folder so artists
+can send us the one of exactly the slow import.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import sys
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from itertools import count
+from pathlib import Path
+from types import CodeType, FrameType
+from typing import Dict, Iterator, Optional
+
+from .config_service import ConfigService
+
+logger = logging.getLogger(__name__)
+
+LOG_DIRNAME = "logs"
+# 100 samples per second costs well under one percent of a core.
+INTERVAL = 0.01
+MAX_DEPTH = 256
+
+
+def log_dir(library_path: Path) -> Path:
+    """Return the folder diagnostics of ``library_path`` are written to."""
+    return Path(library_path) / ".asset-library" / LOG_DIRNAME
+
+
+class SamplingProfiler:
+    """Periodically record the call stacks of all other threads."""
+
+    def __init__(self, interval: float = INTERVAL) -> None:
+        self.interval = interval
+        self.stacks: Counter[str] = Counter()
+        self.samples = 0
+        # Where :func:`session` writes the profile.
+        self.output: Optional[Path] = None
+        self._labels: Dict[CodeType, str] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            raise RuntimeError("Profiler already running")
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="sampling-profiler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+    def __enter__(self) -> "SamplingProfiler":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.stop()
+
+    # ------------------------------------------------------------------
+    def _label(self, code: CodeType) -> str:
+        label = self._labels.get(code)
+        if label is None:
+            name = os.path.basename(code.co_filename)
+            label = f"{code.co_qualname} ({name}:{code.co_firstlineno})"
+            # Separators of the collapsed format must not appear in frames.
+            label = label.replace(";", ":")
+            self._labels[code] = label
+        return label
+
+    def _collapse(self, thread: str, frame: Optional[FrameType]) -> str:
+        frames = []
+        while frame is not None and len(frames) < MAX_DEPTH:
+            frames.append(self._label(frame.f_code))
+            frame = frame.f_back
+        frames.append(thread.replace(";", ":"))
+        return ";".join(reversed(frames))
+
+    def sample(self) -> None:
+        """Record the current stack of every thread but our own."""
+        names = {t.ident: t.name for t in threading.enumerate()}
+        own = threading.get_ident()
+        for ident, frame in sys._current_frames().items():
+            if ident == own:
+                continue
+            name = names.get(ident, f"thread-{ident}")
+            self.stacks[self._collapse(name, frame)] += 1
+        self.samples += 1
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+    # ------------------------------------------------------------------
+    def write(self, path: Path) -> Path:
+        """Write the collapsed stacks, most frequent first, to ``path``."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        lines = [f"{stack} {n}" for stack, n in self.stacks.most_common()]
+        path.write_text("".join(line + "\n" for line in lines))
+        return path
+
+
+_sessions = count(1)
+
+
+def profile_path(library_path: Path, label: str) -> Path:
+    """Return a new profile file name; sessions never share one."""
+    stamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")[:-3]
+    unique = f"{os.getpid()}-{next(_sessions)}"
+    name = f"profile-{label}-{stamp}-{unique}.collapsed"
+    return log_dir(library_path) / name
+
+
+@contextmanager
+def session(
+    config: ConfigService,
+    label: str,
+) -> Iterator[Optional[SamplingProfiler]]:
+    """Profile the enclosed block if profiling is enabled in ``config``.
+
+    Yields the running profiler, or ``None`` when profiling is off.  The
+    profile is written when the block exits; its path is then available
+    as ``profiler.output``.
+    """
+    library = config.library_path
+    if not config.settings.PROFILING_ENABLED or library is None:
+        yield None
+        return
+    profiler = SamplingProfiler()
+    profiler.output = profile_path(library, label)
+    profiler.start()
+    try:
+        yield profiler
+    finally:
+        profiler.stop()
+        profiler.write(profiler.output)
+        logger.info("Profile written to %s", profiler.output)
@@ -0,0 +1,28 @@
+"""Discover the files contained in source packs."""
+
+from __future__ import annotations
+
+import zipfile
+from pathlib import Path
+from typing import List
+
+from . import tracing
+
+
+def collect_files(path: Path) -> List[Path]:
+    """Return the files of a source directory, zip archive or loose file.
+
+    Archive members are listed without extracting anything.
+    """
+    path = Path(path)
+    with tracing.span("collect_files", "scan", path=str(path)) as span:
+        if path.is_dir():
+            files = [p for p in path.rglob("*") if p.is_file()]
+        elif zipfile.is_zipfile(path):
+            with zipfile.ZipFile(path) as zf:
+                names = zf.namelist()
+            files = [Path(f) for f in names if not f.endswith("/")]
+        else:
+            files = [path]
+        span.set(files=len(files))
+    return files
@@ -0,0 +1,753 @@
+"""Local HTTP/JSON API: ``python -m asset_organiser serve``.
+
+Lets DCC add-ons classify files, queue imports and follow their progress,
+and query and search the library without the GUI.  The server only ever
+listens on the loopback interface; POST and DELETE requests must be sent
+as ``application/json`` and browsers may only call it from local pages.
+
+Endpoints::
+
+    GET    /health
+    POST   /classify                {"files": [...], "use_llm": bool}
+    POST   /jobs                    {"sources": [...], "skip_imported": bool}
+    GET    /jobs
+    GET    /jobs/{id}
+    DELETE /jobs/{id}               cancel a queued job
+    GET    /jobs/{id}/events        newline-delimited JSON, ?after=seq
+    GET    /library/assets          ?q=&name=&asset_type=&tag=&limit=...
+    GET    /library/facets/{attribute}
+    GET    /search                  ?q=text&k=20, or ?similar=path
+    GET    /library/embedding       semantic indexing progress
+    POST   /library/embedding/pause (kept across restarts) or .../resume
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import re
+import sys
+import threading
+from http import HTTPStatus
+from itertools import count
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+)
+from urllib.parse import parse_qs, urlsplit
+
+from .config_service import ConfigService
+from .ingest import ingest
+from .llm import LLMClient, NoOpLLMClient
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .config_models import IndexingSettings
+    from .indexing import EmbeddingJob, IndexingService
+    from .library import LibraryCatalog
+
+logger = logging.getLogger(__name__)
+
+LOCAL_HOSTS = ("127.0.0.1", "::1", "localhost")
+DEFAULT_PORT = 8765
+JSON_TYPE = "application/json"
+# Requests doing work (classification, queries, search) at the same time;
+# further requests wait for a slot.
+MAX_REQUESTS = 4
+# Jobs waiting to run; submitting more is refused with 503.
+MAX_QUEUED = 16
+# Finished jobs kept for status queries.
+MAX_FINISHED = 64
+MAX_BODY = 1 << 20
+MAX_LIMIT = 1000
+READ_TIMEOUT = 30.0
+
+QUEUED, RUNNING, DONE, FAILED, CANCELLED = (
+    "queued",
+    "running",
+    "done",
+    "failed",
+    "cancelled",
+)
+FINISHED = (DONE, FAILED, CANCELLED)
+
+Payload = Any
+Response = Tuple[int, Payload]
+
+
+class HTTPError(Exception):
+    """Aborts a request with ``status`` and a JSON error message."""
+
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class Request:
+    def __init__(
+        self,
+        method: str,
+        target: str,
+        headers: Dict[str, str],
+        body: bytes,
+    ) -> None:
+        parts = urlsplit(target)
+        self.method = method
+        self.path = parts.path
+        self.query = parse_qs(parts.query)
+        self.headers = headers
+        self.body = body
+
+    def param(self, name: str, default: Optional[str] = None) -> Optional[str]:
+        values = self.query.get(name)
+        return values[-1] if values else default
+
+    def int_param(self, name: str, default: int, maximum: int) -> int:
+        value = self.param(name)
+        if value is None:
+            return default
+        if not value.isdigit():
+            raise HTTPError(400, f"{name} must be a non-negative integer")
+        return min(int(value), maximum)
+
+    def json(self) -> Dict[str, Any]:
+        try:
+            data = json.loads(self.body or b"{}")
+        except ValueError as exc:
+            raise HTTPError(400, f"Invalid JSON: {exc}") from None
+        if not isinstance(data, dict):
+            raise HTTPError(400, "Expected a JSON object")
+        return data
+
+
+class Job:
+    """One queued import and every event it has emitted so far."""
+
+    def __init__(
+        self,
+        job_id: str,
+        sources: List[Path],
+        *,
+        skip_imported: bool = False,
+        use_llm: bool = True,
+    ) -> None:
+        self.id = job_id
+        self.sources = sources
+        self.skip_imported = skip_imported
+        self.use_llm = use_llm
+        self.state = QUEUED
+        self.failed: Optional[int] = None
+        self.events: List[Dict[str, Any]] = []
+        self._updated = asyncio.Event()
+
+    @property
+    def finished(self) -> bool:
+        return self.state in FINISHED
+
+    def add(self, event: Dict[str, Any]) -> None:
+        self.events.append({"seq": len(self.events), **event})
+        self._notify()
+
+    def finish(self, state: str) -> None:
+        self.state = state
+        self._notify()
+
+    def _notify(self) -> None:
+        self._updated.set()
+        self._updated = asyncio.Event()
+
+    async def follow(self, after: int = 0) -> AsyncIterator[Dict[str, Any]]:
+        """Yield events from sequence number ``after`` until finished."""
+        seen = after
+        while True:
+            updated = self._updated
+            while seen < len(self.events):
+                yield self.events[seen]
+                seen += 1
+            if self.finished:
+                return
+            await updated.wait()
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "state": self.state,
+            "sources": [str(path) for path in self.sources],
+            "events": len(self.events),
+            "failed": self.failed,
+        }
+
+
+def _host_name(header: str) -> str:
+    """Return the host of a ``Host`` header without its port."""
+    if header.startswith("["):
+        return header[1:].partition("]")[0]
+    return header.rpartition(":")[0] if ":" in header else header
+
+
+def _origin_host(header: str) -> str:
+    """Return the host of an ``Origin`` header, ``""`` for ``null``."""
+    try:
+        return urlsplit(header).hostname or ""
+    except ValueError:
+        return ""
+
+
+class ApiServer:
+    """Serve the library of ``config`` over HTTP on the loopback interface.
+
+    Blocking work runs in threads, at most ``max_requests`` at a time.
+    Import jobs run one after another from a queue of ``max_queued``
+    entries, each processing with ``max_workers`` threads.  Edits to the
+    library configuration files are picked up before each job starts, so
+    a running import and the requests served meanwhile all see the same
+    configuration.
+    """
+
+    def __init__(
+        self,
+        config: ConfigService,
+        *,
+        host: str = "127.0.0.1",
+        port: int = DEFAULT_PORT,
+        max_requests: int = MAX_REQUESTS,
+        max_queued: int = MAX_QUEUED,
+        max_workers: Optional[int] = None,
+        llm_client: Optional[LLMClient] = None,
+    ) -> None:
+        if host not in LOCAL_HOSTS:
+            raise ValueError(f"Refusing to listen on non-local host {host}")
+        if config.library_path is None:
+            raise RuntimeError("Library path not set")
+        self.config = config
+        self.host = host
+        self.port = port
+        self.max_requests = max_requests
+        self.max_queued = max_queued
+        self.max_workers = max_workers
+        self.llm_client = llm_client
+        self.jobs: Dict[str, Job] = {}
+        self._ids = count(1)
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._catalog: Optional["LibraryCatalog"] = None
+        self._index: Optional["IndexingService"] = None
+        self._index_stale = True
+        self._embedding: Optional["EmbeddingJob"] = None
+        self._open_lock = threading.Lock()
+        self._routes: List[Tuple[str, "re.Pattern[str]", Callable]] = [
+            ("GET", re.compile(r"/health"), self._health),
+            ("POST", re.compile(r"/classify"), self._classify),
+            ("GET", re.compile(r"/jobs"), self._list_jobs),
+            ("POST", re.compile(r"/jobs"), self._submit_job),
+            ("GET", re.compile(r"/jobs/([^/]+)"), self._job),
+            ("DELETE", re.compile(r"/jobs/([^/]+)"), self._cancel_job),
+            ("GET", re.compile(r"/jobs/([^/]+)/events"), self._job_events),
+            ("GET", re.compile(r"/library/assets"), self._assets),
+            ("GET", re.compile(r"/library/facets/(\w+)"), self._facets),
+            ("GET", re.compile(r"/search"), self._search),
+            ("GET", re.compile(r"/library/embedding"), self._embedding_state),
+            (
+                "POST",
+                re.compile(r"/library/embedding/(pause|resume)"),
+                self._control_embedding,
+            ),
+        ]
+
+    # ------------------------------------------------------------------
+    async def start(self) -> None:
+        """Start listening; with ``port=0`` :attr:`port` is updated."""
+        self._slots = asyncio.Semaphore(self.max_requests)
+        self._queue: asyncio.Queue[Job] = asyncio.Queue(self.max_queued)
+        host, port = self.host, self.port
+        self._server = await asyncio.start_server(self._handle, host, port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._worker = asyncio.create_task(self._run_jobs())
+        settings = self._indexing_settings()
+        if settings is not None and settings.enable_semantic_search:
+            # Opening the index starts embedding the library.
+            await asyncio.to_thread(self.index)
+        logger.info("API listening on http://%s:%d", self.host, self.port)
+
+    async def serve_forever(self) -> None:
+        if self._server is None:
+            await self.start()
+        assert self._server is not None
+        await self._server.serve_forever()
+
+    async def close(self) -> None:
+        if self._worker is not None:
+            self._worker.cancel()
+            await asyncio.gather(self._worker, return_exceptions=True)
+            self._worker = None
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        if self._embedding is not None:
+            await asyncio.to_thread(self._embedding.stop)
+            self._embedding = None
+        for resource in (self._index, self._catalog):
+            if resource is not None:
+                resource.close()
+        self._index = self._catalog = None
+
+    async def __aenter__(self) -> "ApiServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+
+    @property
+    def url(self) -> str:
+        host = f"[{self.host}]" if ":" in self.host else self.host
+        return f"http://{host}:{self.port}"
+
+    # ------------------------------------------------------------------
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            try:
+                request = await asyncio.wait_for(
+                    self._read_request(reader), READ_TIMEOUT
+                )
+                if request is None:
+                    return
+                status, payload = await self._dispatch(request)
+            except HTTPError as exc:
+                status, payload = exc.status, {"error": exc.message}
+            except Exception as exc:
+                logger.exception("API request failed")
+                status, payload = 500, {"error": str(exc)}
+            if hasattr(payload, "__aiter__"):
+                await self._stream(writer, payload)
+            else:
+                await self._respond(writer, status, payload)
+        except (ConnectionError, asyncio.TimeoutError):
+            logger.debug("API connection dropped", exc_info=True)
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _read_request(reader: asyncio.StreamReader) -> Optional[Request]:
+        try:
+            line = await reader.readline()
+            if not line.strip():
+                return None
+            method, target, _ = line.decode("latin-1").split()
+            headers: Dict[str, str] = {}
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+        except (ValueError, asyncio.LimitOverrunError):
+            raise HTTPError(400, "Malformed request") from None
+        length = headers.get("content-length", "0")
+        if not length.isdigit():
+            raise HTTPError(400, "Invalid Content-Length")
+        if int(length) > MAX_BODY:
+            raise HTTPError(413, "Request body too large")
+        body = await reader.readexactly(int(length)) if int(length) else b""
+        return Request(method.upper(), target, headers, body)
+
+    async def _dispatch(self, request: Request) -> Response:
+        # Browsers can be tricked into calling a local port from another
+        # site via DNS rebinding; such requests carry a foreign Host.
+        host = _host_name(request.headers.get("host", ""))
+        if host and host not in LOCAL_HOSTS:
+            raise HTTPError(403, "Only local clients are served")
+        # Pages on other sites may still post to us; their requests carry
+        # an Origin, and without a JSON content type (which needs a CORS
+        # preflight we never answer) they cannot pass as an add-on.
+        origin = request.headers.get("origin")
+        if origin is not None and _origin_host(origin) not in LOCAL_HOSTS:
+            raise HTTPError(403, "Cross-site requests are not served")
+        if request.method in ("POST", "DELETE"):
+            content_type = request.headers.get("content-type", "")
+            if content_type.partition(";")[0].strip() != JSON_TYPE:
+                raise HTTPError(415, f"Send {JSON_TYPE}")
+        allowed = []
+        for method, pattern, handler in self._routes:
+            match = pattern.fullmatch(request.path)
+            if match is None:
+                continue
+            if method == request.method:
+                return await handler(request, *match.groups())
+            allowed.append(method)
+        if allowed:
+            raise HTTPError(405, f"Use {', '.join(allowed)}")
+        raise HTTPError(404, f"No endpoint {request.path}")
+
+    @staticmethod
+    async def _respond(
+        writer: asyncio.StreamWriter, status: int, payload: Payload
+    ) -> None:
+        body = b"" if status == 204 else json.dumps(payload).encode()
+        head = [
+            f"HTTP/1.1 {status} {HTTPStatus(status).phrase}",
+            f"Content-Type: {JSON_TYPE}",
+            f"Content-Length: {len(body)}",
+            "Connection: close",
+        ]
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode() + body)
+        await writer.drain()
+
+    @staticmethod
+    async def _stream(
+        writer: asyncio.StreamWriter, events: AsyncIterator[Payload]
+    ) -> None:
+        head = [
+            "HTTP/1.1 200 OK",
+            "Content-Type: application/x-ndjson",
+            "Transfer-Encoding: chunked",
+            "Connection: close",
+        ]
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode())
+        async for event in events:
+            line = json.dumps(event).encode() + b"\n"
+            writer.write(b"%x\r\n%s\r\n" % (len(line), line))
+            await writer.drain()
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+    async def _blocking(self, func: Callable, *args: Any) -> Any:
+        """Run ``func`` in a thread once a request slot is free."""
+        async with self._slots:
+            return await asyncio.to_thread(func, *args)
+
+    # ------------------------------------------------------------------
+    def catalog(self) -> "LibraryCatalog":
+        from .library import LibraryCatalog
+
+        with self._open_lock:
+            if self._catalog is None:
+                assert self.config.library_path is not None
+                root = self.config.settings.OUTPUT_BASE_DIR
+                output_root = self.config.library_path / root
+                self._catalog = LibraryCatalog.for_library(
+                    self.config.library_path,
+                    output_root.resolve(),
+                    metadata_name=self.config.settings.METADATA_FILENAME,
+                )
+            return self._catalog
+
+    def _indexing_settings(self) -> Optional["IndexingSettings"]:
+        library = self.config.library_config
+        return library.INDEXING if library else None
+
+    def index(self) -> "IndexingService":
+        """Return the semantic index, synced with the catalog.
+
+        With semantic search enabled an :class:`EmbeddingJob` keeps the
+        index current in the background instead.
+        """
+        from .indexing import EmbeddingJob, IndexingService
+
+        catalog = self.catalog()
+        with self._open_lock:
+            if self._index is None:
+                assert self.config.library_path is not None
+                settings = self._indexing_settings()
+                self._index = IndexingService.for_library(
+                    self.config.library_path, settings
+                )
+                if settings is not None and settings.enable_semantic_search:
+                    self._embedding = EmbeddingJob.for_settings(
+                        self._index, catalog, settings
+                    )
+            if self._index_stale:
+                if self._embedding is not None:
+                    self._embedding.start()
+                else:
+                    self._index.sync(catalog)
+                self._index_stale = False
+            return self._index
+
+    def _client(self, use_llm: bool) -> Optional[LLMClient]:
+        return self.llm_client if use_llm else NoOpLLMClient()
+
+    # ------------------------------------------------------------------
+    async def _health(self, request: Request) -> Response:
+        return 200, {
+            "status": "ok",
+            "library": str(self.config.library_path),
+            "queued": self._queue.qsize(),
+        }
+
+    async def _classify(self, request: Request) -> Response:
+        data = request.json()
+        files = data.get("files")
+        if not isinstance(files, list) or not all(
+            isinstance(name, str) for name in files
+        ):
+            raise HTTPError(400, "files must be a list of file names")
+        client = self._client(bool(data.get("use_llm", True)))
+
+        def classify() -> Dict[str, Any]:
+            from .classification.service import ClassificationService
+
+            service = ClassificationService(self.config, client)
+            state = service.classify(service.from_file_list(files))
+            return state.sources["src"].model_dump(mode="json")
+
+        return 200, await self._blocking(classify)
+
+    async def _list_jobs(self, request: Request) -> Response:
+        return 200, [job.summary() for job in self.jobs.values()]
+
+    async def _submit_job(self, request: Request) -> Response:
+        data = request.json()
+        sources = data.get("sources")
+        if (
+            not isinstance(sources, list)
+            or not sources
+            or not all(isinstance(path, str) for path in sources)
+        ):
+            raise HTTPError(400, "sources must be a non-empty list of paths")
+        job = Job(
+            str(next(self._ids)),
+            [Path(path) for path in sources],
+            skip_imported=bool(data.get("skip_imported", False)),
+            use_llm=bool(data.get("use_llm", True)),
+        )
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            raise HTTPError(503, "Job queue is full") from None
+        self.jobs[job.id] = job
+        self._forget_finished()
+        return 202, job.summary()
+
+    def _get_job(self, job_id: str) -> Job:
+        job = self.jobs.get(job_id)
+        if job is None:
+            raise HTTPError(404, f"No job {job_id}")
+        return job
+
+    async def _job(self, request: Request, job_id: str) -> Response:
+        return 200, self._get_job(job_id).summary()
+
+    async def _cancel_job(self, request: Request, job_id: str) -> Response:
+        job = self._get_job(job_id)
+        if job.state != QUEUED:
+            raise HTTPError(409, f"Job {job_id} is {job.state}")
+        # The worker skips cancelled jobs when it dequeues them.
+        job.finish(CANCELLED)
+        return 200, job.summary()
+
+    async def _job_events(self, request: Request, job_id: str) -> Response:
+        job = self._get_job(job_id)
+        after = request.int_param("after", 0, len(job.events))
+        return 200, job.follow(after)
+
+    async def _assets(self, request: Request) -> Response:
+        filters: Dict[str, Any] = {
+            "asset_type": request.param("asset_type"),
+            "supplier": request.param("supplier"),
+            "resolution": request.param("resolution"),
+            "tags": request.query.get("tag", []),
+            "filetypes": request.query.get("filetype", []),
+        }
+        limit = request.int_param("limit", 100, MAX_LIMIT)
+        offset = request.int_param("offset", 0, sys.maxsize)
+        filters.update(limit=limit, offset=offset)
+        text = request.param("q")
+        name = request.param("name")
+
+        def query() -> List[Dict[str, Any]]:
+            catalog = self.catalog()
+            if text is not None:
+                entries = catalog.search(text, **filters)
+            else:
+                entries = catalog.query(name=name, **filters)
+            return [entry.model_dump(mode="json") for entry in entries]
+
+        return 200, {"assets": await self._blocking(query)}
+
+    async def _facets(self, request: Request, attribute: str) -> Response:
+        try:
+            facets = await self._blocking(self.catalog().facets, attribute)
+        except ValueError as exc:
+            raise HTTPError(404, str(exc)) from None
+        return 200, facets
+
+    async def _search(self, request: Request) -> Response:
+        text = request.param("q", "")
+        similar = request.param("similar")
+        k = request.int_param("k", 20, MAX_LIMIT)
+
+        def search() -> List[Dict[str, Any]]:
+            index = self.index()
+            if similar is not None:
+                hits = index.similar(similar, k)
+            else:
+                hits = index.search(text or "", k)
+            entries = self.catalog().get_many(path for path, _ in hits)
+            found = {entry.path: entry for entry in entries}
+            return [
+                {
+                    "path": path,
+                    "score": float(score),
+                    "asset": found[path].model_dump(mode="json"),
+                }
+                for path, score in hits
+                if path in found
+            ]
+
+        return 200, {"results": await self._blocking(search)}
+
+    def _embedding_job(self) -> "EmbeddingJob":
+        self.index()
+        if self._embedding is None:
+            raise HTTPError(409, "Semantic search is not enabled")
+        return self._embedding
+
+    @staticmethod
+    def _embedding_summary(job: "EmbeddingJob") -> Dict[str, Any]:
+        return {**job.progress.model_dump(), "paused": job.paused}
+
+    async def _embedding_state(self, request: Request) -> Response:
+        job = await self._blocking(self._embedding_job)
+        return 200, self._embedding_summary(job)
+
+    async def _control_embedding(
+        self,
+        request: Request,
+        action: str,
+    ) -> Response:
+        def control() -> Dict[str, Any]:
+            job = self._embedding_job()
+            if action == "pause":
+                job.pause()
+            else:
+                job.resume()
+            return self._embedding_summary(job)
+
+        return 200, await self._blocking(control)
+
+    # ------------------------------------------------------------------
+    async def _run_jobs(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            job = await self._queue.get()
+            if job.finished:
+                continue
+            job.state = RUNNING
+
+            def emit(event: str, _job: Job = job, **fields: object) -> None:
+                payload = {"event": event, **fields}
+                loop.call_soon_threadsafe(_job.add, payload)
+
+            try:
+                # Only reload while no import is running; see the class
+                # notes.  A broken file keeps the previous configuration.
+                self.config.reload_library_config()
+            except (OSError, ValueError) as exc:
+                logger.warning("Library configuration not reloaded: %s", exc)
+                job.add(
+                    {"event": "error", "stage": "config", "error": str(exc)},
+                )
+                job.finish(FAILED)
+                continue
+            try:
+                job.failed = await asyncio.to_thread(
+                    ingest,
+                    self.config,
+                    job.sources,
+                    emit,
+                    max_workers=self.max_workers,
+                    skip_imported=job.skip_imported,
+                    llm_client=self._client(job.use_llm),
+                )
+            except Exception as exc:
+                logger.exception("Job %s failed", job.id)
+                job.add({"event": "error", "stage": "job", "error": str(exc)})
+                job.finish(FAILED)
+            else:
+                job.finish(DONE)
+            finally:
+                if self._embedding is not None:
+                    self._embedding.start()
+                else:
+                    self._index_stale = True
+
+    def _forget_finished(self) -> None:
+        finished = [job.id for job in self.jobs.values() if job.finished]
+        for job_id in finished[: max(0, len(finished) - MAX_FINISHED)]:
+            del self.jobs[job_id]
+
+
+# ----------------------------------------------------------------------
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m asset_organiser serve",
+        description="Serve the library over a local HTTP/JSON API.",
+    )
+    parser.add_argument(
+        "--library",
+        type=Path,
+        required=True,
+        help="Library root path",
+    )
+    parser.add_argument(
+        "--settings", type=Path, default=None, help="Application settings"
+    )
+    parser.add_argument(
+        "--host",
+        default="127.0.0.1",
+        choices=LOCAL_HOSTS,
+        help="Loopback address to listen on",
+    )
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=None,
+        help="Worker threads for processing",
+    )
+    parser.add_argument(
+        "--no-llm",
+        action="store_true",
+        help="Classify with rules only, never calling a language model",
+    )
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(level=logging.INFO, stream=sys.stderr)
+    config = ConfigService(app_config_path=args.settings)
+    config.set_library_path(args.library)
+    server = ApiServer(
+        config,
+        host=args.host,
+        port=args.port,
+        max_workers=args.jobs,
+        llm_client=NoOpLLMClient() if args.no_llm else None,
+    )
+
+    async def serve() -> None:
+        try:
+            await server.serve_forever()
+        finally:
+            await server.close()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+    return 0
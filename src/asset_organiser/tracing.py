@@ -0,0 +1,194 @@
+"""Lightweight tracing spans, exported as Chrome trace JSON.
+
+Wrap a unit of work in :func:`span` to record how long it took::
+
+    with tracing.span("decode", "processing", member=name):
+        ...
+
+Spans nest: each records the span that was open when it started, also
+across threads for work submitted through :func:`propagate`.  Tracing is
+off until :func:`enable` is called; until then :func:`span` returns a
+shared no-op object and costs one global lookup.  Exported files open in
+``chrome://tracing`` and https://ui.perfetto.dev.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar, copy_context
+from functools import partial
+from itertools import count
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, TypeVar
+
+# Oldest spans are dropped beyond this many, bounding memory when tracing
+# is left on.
+MAX_EVENTS = 200_000
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+_current: ContextVar[Optional[int]] = ContextVar("span", default=None)
+
+
+class Span:
+    """An open span; ``set`` adds arguments shown with it in the trace."""
+
+    __slots__ = ("_tracer", "name", "category", "args", "_start", "_token")
+
+    def __init__(
+        self,
+        tracer: "Tracer",
+        name: str,
+        category: str,
+        args: Dict[str, Any],
+    ) -> None:
+        self._tracer = tracer
+        self.name = name
+        self.category = category
+        self.args = args
+
+    def set(self, **args: Any) -> None:
+        self.args.update(args)
+
+    def __enter__(self) -> "Span":
+        span_id = next(self._tracer._ids)
+        self.args["id"] = span_id
+        self.args["parent"] = _current.get()
+        self._token = _current.set(span_id)
+        self._start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        end = time.perf_counter_ns()
+        _current.reset(self._token)
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+        self._tracer._add(self, self._start, end)
+
+
+class _NoOpSpan:
+    __slots__ = ()
+
+    def set(self, **args: Any) -> None:
+        pass
+
+    def __enter__(self) -> "_NoOpSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        pass
+
+
+_NOOP = _NoOpSpan()
+
+
+class Tracer:
+    """Collects finished spans from every thread of the process."""
+
+    def __init__(self, max_events: int = MAX_EVENTS) -> None:
+        self._events: deque = deque(maxlen=max_events)
+        self._threads: Dict[int, str] = {}
+        self._ids = count(1)
+        self._origin = time.perf_counter_ns()
+        self.pid = os.getpid()
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    def _add(self, span: Span, start: int, end: int) -> None:
+        tid = threading.get_native_id()
+        if tid not in self._threads:
+            self._threads[tid] = threading.current_thread().name
+        self._events.append(
+            {
+                "name": span.name,
+                "cat": span.category,
+                "ph": "X",
+                "ts": (start - self._origin) / 1000,
+                "dur": (end - start) / 1000,
+                "pid": self.pid,
+                "tid": tid,
+                "args": span.args,
+            }
+        )
+
+    def events(self) -> List[Dict[str, Any]]:
+        """Return the recorded spans in Chrome trace event format."""
+        names = [
+            {
+                "name": "thread_name",
+                "ph": "M",
+                "pid": self.pid,
+                "tid": tid,
+                "args": {"name": name},
+            }
+            for tid, name in list(self._threads.items())
+        ]
+        return names + sorted(self._events, key=lambda event: event["ts"])
+
+    def export(self, path: Path) -> Path:
+        """Write the trace to ``path`` as Chrome trace JSON."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = {"traceEvents": self.events(), "displayTimeUnit": "ms"}
+        path.write_text(json.dumps(data, default=str))
+        return path
+
+
+_tracer: Optional[Tracer] = None
+
+
+def span(name: str, category: str = "app", **args: Any) -> Any:
+    """Return a context manager timing the enclosed block as ``name``."""
+    tracer = _tracer
+    if tracer is None:
+        return _NOOP
+    return Span(tracer, name, category, args)
+
+
+def propagate(func: F) -> F:
+    """Run ``func`` in the caller's span when called from another thread.
+
+    Pass the result to an executor instead of ``func`` so spans opened
+    by workers become children of the span that submitted them.
+    """
+    if _tracer is None:
+        return func
+    return partial(copy_context().run, func)  # type: ignore[return-value]
+
+
+def enable(max_events: int = MAX_EVENTS) -> Tracer:
+    """Start recording spans; returns the active tracer."""
+    global _tracer
+    if _tracer is None:
+        _tracer = Tracer(max_events)
+    return _tracer
+
+
+def disable() -> Optional[Tracer]:
+    """Stop recording; returns the tracer holding what was recorded."""
+    global _tracer
+    tracer, _tracer = _tracer, None
+    return tracer
+
+
+def active() -> Optional[Tracer]:
+    return _tracer
+
+
+@contextmanager
+def recording(path: Path) -> Iterator[Tracer]:
+    """Trace the enclosed block and export it to ``path``."""
+    previous = _tracer
+    tracer = enable()
+    try:
+        yield tracer
+    finally:
+        if previous is None:
+            disable()
+        tracer.export(path)
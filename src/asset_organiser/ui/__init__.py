@@ -1,8 +1,21 @@
 """UI components for Asset Organiser."""
 
-from .library import LibraryView
-from .main_window import MainWindow
-from .settings import SettingsView
-from .workspace import WorkspaceView
+from typing import TYPE_CHECKING
+
+from .._lazy import lazy_exports
+
+_EXPORTS = {
+    "LibraryView": ".library",
+    "MainWindow": ".main_window",
+    "SettingsView": ".settings",
+    "WorkspaceView": ".workspace",
+}
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .library import LibraryView
+    from .main_window import MainWindow
+    from .settings import SettingsView
+    from .workspace import WorkspaceView
 
 __all__ = ["MainWindow", "WorkspaceView", "LibraryView", "SettingsView"]
@@ -1,16 +1,388 @@
 from __future__ import annotations
 
-from PySide6.QtWidgets import QHBoxLayout, QListWidget, QTextEdit, QWidget
+import json
+from typing import Dict, List, Optional, Set
+
+from PySide6.QtCore import (
+    QAbstractListModel,
+    QModelIndex,
+    QObject,
+    QRunnable,
+    QSize,
+    Qt,
+    QThreadPool,
+    QTimer,
+    Signal,
+)
+from PySide6.QtGui import QIcon, QImage, QPixmap
+from PySide6.QtWidgets import (
+    QApplication,
+    QHBoxLayout,
+    QLabel,
+    QLineEdit,
+    QListView,
+    QPushButton,
+    QTextEdit,
+    QVBoxLayout,
+    QWidget,
+)
+
+from ..config_service import ConfigService
+from ..indexing.job import EmbeddingJob, JobProgress
+from ..indexing.service import IndexingService
+from ..library.catalog import CatalogEntry, LibraryCatalog, RescanStats
+from ..library.rescan import LibraryWatcher
+
+from ..library.thumbnails import THUMBNAIL_SIZE, ThumbnailCache  # isort: split
+from ..library.thumbnails import preferred_filetypes
+
+PAGE_SIZE = 256
+SEARCH_DELAY_MS = 120
+MIN_SEARCH_LENGTH = 2
+ICON_CACHE_SIZE = 2048
+# Seconds between background rescans while the library is shown.
+RESCAN_INTERVAL = 30.0
+
+
+class _ThumbnailSignals(QObject):
+    loaded = Signal(str, QImage)
+
+
+class _ScanSignals(QObject):
+    changed = Signal()
+
+
+class _EmbeddingSignals(QObject):
+    progress = Signal(object)
+
+
+class _ThumbnailTask(QRunnable):
+    """Load (or render) one thumbnail and decode it off the GUI thread."""
+
+    def __init__(
+        self,
+        cache: ThumbnailCache,
+        entry: CatalogEntry,
+        signals: _ThumbnailSignals,
+    ) -> None:
+        super().__init__()
+        self.cache = cache
+        self.entry = entry
+        self.signals = signals
+
+    def run(self) -> None:  # type: ignore[override]
+        data = self.cache.thumbnail(self.entry)
+        image = QImage()
+        if data is not None:
+            image.loadFromData(data)
+        self.signals.loaded.emit(self.entry.path, image)
+
+
+class AssetListModel(QAbstractListModel):
+    """Virtualised list of catalog assets with lazily loaded thumbnails.
+
+    Rows are fetched from the catalog a page at a time as the view scrolls,
+    and a thumbnail is only requested when the view asks for the
+    decoration of a row, i.e. when it becomes visible.  Thumbnails are
+    read and decoded on a thread pool; a small LRU of icons keeps
+    scrolling back cheap.
+    """
+
+    def __init__(
+        self,
+        catalog: Optional[LibraryCatalog] = None,
+        thumbnails: Optional[ThumbnailCache] = None,
+        parent: QObject | None = None,
+    ) -> None:
+        super().__init__(parent)
+        self.catalog = catalog
+        self.thumbnails = thumbnails
+        self.text = ""
+        self.filters: Dict[str, object] = {}
+        self._entries: List[CatalogEntry] = []
+        self._rows: Dict[str, int] = {}
+        self._exhausted = True
+        self._icons: Dict[str, QIcon] = {}
+        self._pending: Set[str] = set()
+        self._placeholder = QIcon(self._blank())
+        self._pool = QThreadPool(self)
+        threads = QThreadPool.globalInstance().maxThreadCount()
+        self._pool.setMaxThreadCount(max(2, threads // 2))
+        self._signals = _ThumbnailSignals()
+        self._signals.loaded.connect(self._thumbnail_loaded)
+
+    @staticmethod
+    def _blank() -> QPixmap:
+        pixmap = QPixmap(THUMBNAIL_SIZE, THUMBNAIL_SIZE)
+        pixmap.fill(Qt.GlobalColor.darkGray)
+        return pixmap
+
+    # ------------------------------------------------------------------
+    def reload(self, text: str = "", **filters) -> None:
+        """Restart the listing for search ``text`` and catalog filters."""
+        self.beginResetModel()
+        self.text = text
+        self.filters = filters
+        self._entries = []
+        self._rows = {}
+        self._exhausted = self.catalog is None
+        self.endResetModel()
+        if self.canFetchMore(QModelIndex()):
+            self.fetchMore(QModelIndex())
+
+    def entry(self, row: int) -> CatalogEntry:
+        return self._entries[row]
+
+    def rowCount(self, parent=QModelIndex()) -> int:  # type: ignore[override]
+        return 0 if parent.isValid() else len(self._entries)
+
+    def canFetchMore(self, parent) -> bool:  # type: ignore[override]
+        return not parent.isValid() and not self._exhausted
+
+    def fetchMore(self, parent) -> None:  # type: ignore[override]
+        if self.catalog is None or parent.isValid():
+            return
+        page = self.catalog.search(
+            self.text,
+            limit=PAGE_SIZE,
+            offset=len(self._entries),
+            **self.filters,
+        )
+        self._exhausted = len(page) < PAGE_SIZE
+        if not page:
+            return
+        first = len(self._entries)
+        self.beginInsertRows(QModelIndex(), first, first + len(page) - 1)
+        for offset, entry in enumerate(page):
+            self._rows[entry.path] = first + offset
+        self._entries.extend(page)
+        self.endInsertRows()
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):  # type: ignore
+        if not index.isValid():
+            return None
+        entry = self._entries[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return entry.name
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return f"{entry.supplier} / {entry.asset_type} / {entry.name}"
+        if role == Qt.ItemDataRole.DecorationRole:
+            return self._icon(entry)
+        if role == Qt.ItemDataRole.UserRole:
+            return entry
+        return None
+
+    # ------------------------------------------------------------------
+    def _icon(self, entry: CatalogEntry) -> QIcon:
+        icon = self._icons.get(entry.path)
+        if icon is not None:
+            # Refresh the LRU position.
+            self._icons[entry.path] = self._icons.pop(entry.path)
+            return icon
+        if self.thumbnails is not None and entry.path not in self._pending:
+            self._pending.add(entry.path)
+            task = _ThumbnailTask(self.thumbnails, entry, self._signals)
+            self._pool.start(task)
+        return self._placeholder
+
+    def _thumbnail_loaded(self, path: str, image: QImage) -> None:
+        self._pending.discard(path)
+        if image.isNull():
+            icon = self._placeholder
+        else:
+            icon = QIcon(QPixmap.fromImage(image))
+        self._icons[path] = icon
+        while len(self._icons) > ICON_CACHE_SIZE:
+            self._icons.pop(next(iter(self._icons)))
+        row = self._rows.get(path)
+        if row is not None:
+            index = self.index(row)
+            roles = [Qt.ItemDataRole.DecorationRole]
+            self.dataChanged.emit(index, index, roles)
+
+    def wait_for_thumbnails(self, msecs: int = -1) -> bool:
+        """Block until queued thumbnails are loaded (used by tests)."""
+        return self._pool.waitForDone(msecs)
 
 
 class LibraryView(QWidget):
-    """Placeholder library view with grid and metadata panel."""
+    """Browse the processed library as a grid of thumbnails."""
 
-    def __init__(self, parent: QWidget | None = None) -> None:
+    def __init__(
+        self,
+        config: ConfigService | None = None,
+        parent: QWidget | None = None,
+    ) -> None:
         super().__init__(parent)
+        self._config = config
+        self.catalog: Optional[LibraryCatalog] = None
+        self.thumbnails: Optional[ThumbnailCache] = None
+        self.watcher: Optional[LibraryWatcher] = None
+        self.index: Optional[IndexingService] = None
+        self.embedding: Optional[EmbeddingJob] = None
+        self._scan_signals = _ScanSignals()
+        self._scan_signals.changed.connect(self._run_search)
+        self._embedding_signals = _EmbeddingSignals()
+        self._embedding_signals.progress.connect(self._show_progress)
         layout = QHBoxLayout(self)
-        self.grid = QListWidget()
+        browser = QVBoxLayout()
+        self.search = QLineEdit()
+        self.search.setPlaceholderText("Search assets")
+        self.search.setClearButtonEnabled(True)
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(SEARCH_DELAY_MS)
+        self._search_timer.timeout.connect(self._run_search)
+        self.search.textChanged.connect(self._search_timer.start)
+        self.grid = QListView()
+        self.grid.setViewMode(QListView.ViewMode.IconMode)
+        self.grid.setResizeMode(QListView.ResizeMode.Adjust)
+        self.grid.setMovement(QListView.Movement.Static)
+        self.grid.setUniformItemSizes(True)
+        self.grid.setLayoutMode(QListView.LayoutMode.Batched)
+        self.grid.setIconSize(QSize(THUMBNAIL_SIZE, THUMBNAIL_SIZE))
+        self.model = AssetListModel(parent=self)
+        self.grid.setModel(self.model)
         self.metadata = QTextEdit()
         self.metadata.setReadOnly(True)
-        layout.addWidget(self.grid, 1)
+        # Semantic indexing status; shown once an embedding job exists.
+        indexing = QHBoxLayout()
+        self.indexing_status = QLabel()
+        self.pause_btn = QPushButton("Pause Indexing")
+        self.pause_btn.setCheckable(True)
+        self.pause_btn.toggled.connect(self._pause_toggled)
+        self.indexing_status.hide()
+        self.pause_btn.hide()
+        indexing.addWidget(self.indexing_status, 1)
+        indexing.addWidget(self.pause_btn)
+        browser.addWidget(self.search)
+        browser.addWidget(self.grid, 1)
+        browser.addLayout(indexing)
+        layout.addLayout(browser, 1)
         layout.addWidget(self.metadata)
+        self.grid.selectionModel().currentChanged.connect(self._show_entry)
+
+    def _open(self) -> bool:
+        config = self._config
+        if self.catalog is not None:
+            return True
+        if config is None or config.library_path is None:
+            return False
+        root = config.settings.OUTPUT_BASE_DIR
+        output_root = config.library_path / root
+        metadata_name = config.settings.METADATA_FILENAME
+        self.catalog = LibraryCatalog.for_library(
+            config.library_path,
+            output_root.resolve(),
+            metadata_name=metadata_name,
+        )
+        definitions = config.library_config.FILE_TYPE_DEFINITIONS
+        self.thumbnails = ThumbnailCache.for_library(
+            config.library_path,
+            output_root.resolve(),
+            metadata_name=metadata_name,
+            preferred=preferred_filetypes(definitions),
+        )
+        self.model.catalog = self.catalog
+        self.model.thumbnails = self.thumbnails
+        self.watcher = LibraryWatcher(
+            self.catalog,
+            interval=RESCAN_INTERVAL,
+            on_change=self._library_changed,
+        )
+        settings = config.library_config.INDEXING
+        if settings.enable_semantic_search:
+            library = config.library_path
+            self.index = IndexingService.for_library(library, settings)
+            self.embedding = EmbeddingJob.for_settings(
+                self.index,
+                self.catalog,
+                settings,
+                thumbnails=self.thumbnails,
+                # Called on the job thread; the signal queues the update.
+                on_progress=self._embedding_signals.progress.emit,
+            )
+            self.pause_btn.setChecked(self.embedding.paused)
+            self._show_progress(self.embedding.progress)
+            self.indexing_status.show()
+            self.pause_btn.show()
+        return True
+
+    def refresh(self, *, rescan: bool = True) -> None:
+        """Reset the grid and rescan the library in the background.
+
+        The grid shows the catalog as it is right away and is reloaded
+        when the rescan finds changes.
+        """
+        if not self._open():
+            return
+        if rescan:
+            self.watcher.start()
+        if self.embedding is not None:
+            self.embedding.start()
+        self._run_search()
+
+    def _library_changed(self, _stats: RescanStats) -> None:
+        # Called on the watcher thread; the signal queues the reload.
+        self._scan_signals.changed.emit()
+        if self.embedding is not None:
+            # Embeds what the scan added; queued if a run is going.
+            self.embedding.start()
+
+    def _pause_toggled(self, paused: bool) -> None:
+        if self.embedding is None or paused == self.embedding.paused:
+            return
+        if paused:
+            self.embedding.pause()
+        else:
+            self.embedding.resume()
+
+    def _show_progress(self, progress: JobProgress) -> None:
+        counts = f"{progress.done}/{progress.total}"
+        if progress.state == "paused":
+            text = f"Indexing paused ({counts})"
+        elif progress.state == "running":
+            text = f"Indexing {counts}"
+        elif progress.state == "failed":
+            text = "Indexing failed"
+        elif progress.state == "done":
+            text = "Semantic index up to date"
+        else:
+            text = "Indexing idle"
+        if progress.failed:
+            text += f", {progress.failed} failed"
+        self.indexing_status.setText(text)
+
+    def wait_for_scan(self, timeout: float | None = None) -> bool:
+        """Block until a requested rescan is applied (used by tests)."""
+        if self.watcher is None or not self.watcher.wait_for_scan(timeout):
+            return False
+        QApplication.processEvents()
+        return True
+
+    def _run_search(self) -> None:
+        text = self.search.text().strip()
+        if 0 < len(text) < MIN_SEARCH_LENGTH:
+            # Single letters match most of a large library; wait for more.
+            return
+        self.model.reload(text)
+
+    def showEvent(self, event) -> None:  # type: ignore[override]
+        super().showEvent(event)
+        if self.watcher is None:
+            self.refresh()
+        else:
+            self.watcher.start()
+
+    def hideEvent(self, event) -> None:  # type: ignore[override]
+        super().hideEvent(event)
+        if self.watcher is not None:
+            # Do not wait for a running scan; it finishes on its own.
+            self.watcher.stop(timeout=0)
+
+    def _show_entry(self, current: QModelIndex, _previous=None) -> None:
+        if not current.isValid():
+            self.metadata.clear()
+            return
+        entry = self.model.entry(current.row())
+        self.metadata.setPlainText(json.dumps(entry.model_dump(), indent=2))
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import importlib
 from pathlib import Path
 from typing import Dict
 
@@ -13,13 +14,21 @@ from PySide6.QtWidgets import (
 )
 
 from ..config_service import ConfigService
-from .library import LibraryView
-from .settings import SettingsView
-from .workspace import WorkspaceView
+
+# Sidebar pages and the ``(module, class)`` of the view shown for each.
+PAGES = {
+    "Workspace": (".workspace", "WorkspaceView"),
+    "Library": (".library", "LibraryView"),
+    "Settings": (".settings", "SettingsView"),
+}
 
 
 class MainWindow(QMainWindow):
-    """Main application window with sidebar navigation."""
+    """Main application window with sidebar navigation.
+
+    Views are only imported and built the first time their page is
+    shown, which keeps the window quick to appear.
+    """
 
     def __init__(
         self,
@@ -45,16 +54,38 @@ class MainWindow(QMainWindow):
         layout.addWidget(self.stack, 1)
         self.setCentralWidget(central)
 
-        # Views
-        self.views: Dict[str, QWidget] = {
-            "Workspace": WorkspaceView(self._config),
-            "Library": LibraryView(),
-            "Settings": SettingsView(self._config),
-        }
-        for name, widget in self.views.items():
-            item = QListWidgetItem(name)
-            self.sidebar.addItem(item)
-            self.stack.addWidget(widget)
-
-        self.sidebar.currentRowChanged.connect(self.stack.setCurrentIndex)
+        # Views built so far, by page name.
+        self.views: Dict[str, QWidget] = {}
+        for name in PAGES:
+            self.sidebar.addItem(QListWidgetItem(name))
+            self.stack.addWidget(QWidget())
+
+        self.sidebar.currentRowChanged.connect(self._show_page)
         self.sidebar.setCurrentRow(0)
+
+    def view(self, name: str) -> QWidget:
+        """Return the view of page ``name``, building it if needed."""
+        widget = self.views.get(name)
+        if widget is None:
+            module, class_name = PAGES[name]
+            view_class = getattr(
+                importlib.import_module(module, __package__), class_name
+            )
+            widget = view_class(self._config)
+            row = list(PAGES).index(name)
+            placeholder = self.stack.widget(row)
+            self.stack.insertWidget(row, widget)
+            self.stack.removeWidget(placeholder)
+            placeholder.deleteLater()
+            self.views[name] = widget
+        return widget
+
+    def _show_page(self, row: int) -> None:
+        if row < 0:
+            return
+        self.stack.setCurrentWidget(self.view(list(PAGES)[row]))
+
+    def closeEvent(self, event) -> None:  # type: ignore[override]
+        # Settings editors defer their writes; do not lose the last one.
+        self._config.flush()
+        super().closeEvent(event)
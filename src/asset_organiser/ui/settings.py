@@ -1,11 +1,16 @@
 from __future__ import annotations
 
-from typing import Dict
+from pathlib import Path
+from typing import Dict, Optional
 
+from PySide6.QtCore import Qt
 from PySide6.QtWidgets import (
+    QCheckBox,
+    QFileDialog,
     QFormLayout,
     QHBoxLayout,
     QInputDialog,
+    QLabel,
     QLineEdit,
     QListWidget,
     QListWidgetItem,
@@ -16,6 +21,8 @@ from PySide6.QtWidgets import (
     QWidget,
 )
 
+from .. import profiling, tracing
+
 from ..config_models import AssetTypeDefinition  # isort: split
 from ..config_models import FileTypeDefinition, LLMProviderProfile
 from ..config_service import ConfigService
@@ -125,7 +132,7 @@ class FileTypesEditor(QWidget):
         definition.UI_color = self.color.text() or None
         definition.UI_keybind = self.hotkey.text() or None
         self._config.library_config.FILE_TYPE_DEFINITIONS[key] = definition
-        self._config.save_library_config()
+        self._config.request_library_save()
 
     def _add(self) -> None:
         text, ok = QInputDialog.getText(self, "New File Type", "ID")
@@ -147,7 +154,7 @@ class FileTypesEditor(QWidget):
         self._config.library_config.FILE_TYPE_DEFINITIONS.pop(key, None)
         row = self.list.row(item)
         self.list.takeItem(row)
-        self._config.save_library_config()
+        self._config.request_library_save()
 
 
 class AssetTypesEditor(QWidget):
@@ -206,7 +213,7 @@ class AssetTypesEditor(QWidget):
         definition = self.asset_types[key]
         definition.color = self.color.text() or None
         self._config.library_config.ASSET_TYPE_DEFINITIONS[key] = definition
-        self._config.save_library_config()
+        self._config.request_library_save()
 
     def _add(self) -> None:
         text, ok = QInputDialog.getText(self, "New Asset Type", "ID")
@@ -228,7 +235,7 @@ class AssetTypesEditor(QWidget):
         self._config.library_config.ASSET_TYPE_DEFINITIONS.pop(key, None)
         row = self.list.row(item)
         self.list.takeItem(row)
-        self._config.save_library_config()
+        self._config.request_library_save()
 
 
 class LLMProfileEditor(QWidget):
@@ -300,7 +307,7 @@ class LLMProfileEditor(QWidget):
         else:
             classification.providers.append(profile)
         self._config.library_config.CLASSIFICATION = classification
-        self._config.save_library_config()
+        self._config.request_library_save()
 
     # ------------------------------------------------------------------
     def test_profile(self) -> None:
@@ -316,6 +323,76 @@ class LLMProfileEditor(QWidget):
             QMessageBox.critical(self, "LLM Test", str(exc))
 
 
+class DiagnosticsEditor(QWidget):
+    """Record traces of scanning, classification and processing."""
+
+    def __init__(
+        self,
+        config: ConfigService,
+        parent: QWidget | None = None,
+    ) -> None:
+        super().__init__(parent)
+        self._config = config
+        # The last recording, kept after tracing is switched off so it
+        # can still be exported.
+        self._tracer: Optional[tracing.Tracer] = tracing.active()
+
+        self.trace_box = QCheckBox("Record trace")
+        self.trace_box.setChecked(self._tracer is not None)
+        self.trace_box.toggled.connect(self.set_tracing)
+        self.export_btn = QPushButton("Export Trace...")
+        self.export_btn.setEnabled(self._tracer is not None)
+        self.export_btn.clicked.connect(self._export_dialog)
+
+        self.profile_box = QCheckBox("Profile classification and processing")
+        self.profile_box.setChecked(config.settings.PROFILING_ENABLED)
+        self.profile_box.toggled.connect(self.set_profiling)
+        self.profile_dir = QLabel()
+        self.profile_dir.setTextInteractionFlags(Qt.TextSelectableByMouse)
+        self._show_profile_dir()
+
+        layout = QVBoxLayout(self)
+        layout.addWidget(self.trace_box)
+        layout.addWidget(self.export_btn)
+        layout.addWidget(self.profile_box)
+        layout.addWidget(self.profile_dir)
+        layout.addStretch()
+
+    def set_tracing(self, enabled: bool) -> None:
+        if enabled:
+            self._tracer = tracing.enable()
+        else:
+            tracing.disable()
+        self.export_btn.setEnabled(self._tracer is not None)
+
+    def set_profiling(self, enabled: bool) -> None:
+        self._config.settings.PROFILING_ENABLED = enabled
+        self._config.save_settings()
+        self._show_profile_dir()
+
+    def _show_profile_dir(self) -> None:
+        library = self._config.library_path
+        if library is None or not self.profile_box.isChecked():
+            self.profile_dir.setText("")
+        else:
+            folder = profiling.log_dir(library)
+            self.profile_dir.setText(f"Profiles are saved to {folder}")
+
+    def export_trace(self, path: Path) -> Optional[Path]:
+        """Write the current or last recording to ``path``."""
+        tracer = tracing.active() or self._tracer
+        if tracer is None:
+            return None
+        return tracer.export(path)
+
+    def _export_dialog(self) -> None:
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Export Trace", "trace.json", "Chrome trace (*.json)"
+        )
+        if path:
+            self.export_trace(Path(path))
+
+
 class SettingsView(QWidget):
     """Settings view with category navigation."""
 
@@ -338,6 +415,7 @@ class SettingsView(QWidget):
             "File Types": FileTypesEditor(self._config),
             "Asset Types": AssetTypesEditor(self._config),
             "LLM Profile": LLMProfileEditor(self._config),
+            "Diagnostics": DiagnosticsEditor(self._config),
         }
 
         for name, editor in self.editors.items():
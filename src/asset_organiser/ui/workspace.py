@@ -2,11 +2,12 @@ from __future__ import annotations
 
 import zipfile
 from pathlib import Path
-from typing import Dict, Iterable, List
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple
 
-from PySide6.QtCore import Qt
+from PySide6.QtCore import QObject, QRunnable, Qt, QThreadPool, Signal
 from PySide6.QtGui import QColor, QKeySequence, QShortcut
 from PySide6.QtWidgets import (
+    QApplication,
     QComboBox,
     QFileDialog,
     QHBoxLayout,
@@ -17,9 +18,78 @@ from PySide6.QtWidgets import (
     QWidget,
 )
 
-from ..classification.service import ClassificationService
+from .. import profiling
 from ..config_models import AssetTypeDefinition, FileTypeDefinition
 from ..config_service import ConfigService
+from ..hashing import DUPLICATE_KEY, SourceFingerprintService
+from ..library.catalog import LibraryCatalog
+from ..scanning import collect_files
+
+if TYPE_CHECKING:  # pragma: no cover
+    from ..classification.service import ClassificationService
+    from ..library.duplicates import DuplicateFinder, DuplicateMatch
+
+# Item data role holding the library paths a file looks like.
+LOOKALIKES_ROLE = Qt.UserRole + 2
+# Item data role holding a source's ``SourceData.metadata``.
+METADATA_ROLE = Qt.UserRole + 3
+
+
+# Image member -> library images it looks like, for each source.
+_Lookalikes = Dict[Path, Dict[str, List["DuplicateMatch"]]]
+
+
+class _HashSignals(QObject):
+    hashed = Signal(object, object, object, object)
+
+
+class _HashTask(QRunnable):
+    """Fingerprint dropped sources and find look-alikes off the GUI thread.
+
+    Runs before the sources are classified, so packs imported before
+    are recognised without asking the classifier (and its LLM) about them.
+
+    Sources that are not exact re-imports have their images compared
+    with the library's when ``finder`` is given.
+    """
+
+    def __init__(
+        self,
+        fingerprints: SourceFingerprintService,
+        items: List[Tuple[Path, QTreeWidgetItem]],
+        signals: _HashSignals,
+        finder: Optional[DuplicateFinder] = None,
+    ) -> None:
+        super().__init__()
+        self.fingerprints = fingerprints
+        self.items = items
+        self.signals = signals
+        self.finder = finder
+
+    def run(self) -> None:  # type: ignore[override]
+        existing = [path for path, _item in self.items if path.exists()]
+        metadata: Dict[Path, dict] = {path: {} for path in existing}
+        try:
+            duplicates = self.fingerprints.annotate_many(metadata)
+        except OSError:
+            duplicates = {}
+        found: _Lookalikes = {}
+        try:
+            if self.finder is not None:
+                self.finder.reload()
+                for path in existing:
+                    if not duplicates.get(path):
+                        found[path] = self._find(path)
+        finally:
+            # The view counts pending tasks; always report back.
+            self.signals.hashed.emit(self.items, metadata, duplicates, found)
+
+    def _find(self, path: Path) -> Dict[str, List[DuplicateMatch]]:
+        assert self.finder is not None
+        try:
+            return self.finder.find_source(path)
+        except (OSError, ValueError, zipfile.BadZipFile):
+            return {}
 
 
 class WorkspaceView(QWidget):
@@ -40,7 +110,14 @@ class WorkspaceView(QWidget):
         self.asset_types: Dict[str, AssetTypeDefinition] = dict(
             getattr(self._config.library_config, "ASSET_TYPE_DEFINITIONS", {})
         )
-        self._classifier = ClassificationService(self._config)
+        self._classifier: Optional[ClassificationService] = None
+        library_path = self._config.library_path
+        self._fingerprints = SourceFingerprintService(library_path)
+        self._duplicates: Optional[DuplicateFinder] = None
+        self._pool = QThreadPool(self)
+        self._pending = 0
+        self._signals = _HashSignals()
+        self._signals.hashed.connect(self._sources_hashed)
         # Ensure special types exist
         self.file_types.setdefault(
             "UNIDENTIFIED",
@@ -123,14 +200,6 @@ class WorkspaceView(QWidget):
         event.acceptProposedAction()
 
     # ------------------------------------------------------------------
-    def _collect_files(self, path: Path) -> List[Path]:
-        if path.is_dir():
-            return [p for p in path.rglob("*") if p.is_file()]
-        if zipfile.is_zipfile(path):
-            with zipfile.ZipFile(path) as zf:
-                return [Path(f) for f in zf.namelist() if not f.endswith("/")]
-        return [path]
-
     def _default_asset_type(self) -> str:
         return self._config.settings.DEFAULT_ASSET_TYPE or next(
             iter(self.asset_types.keys()), ""
@@ -176,17 +245,129 @@ class WorkspaceView(QWidget):
                 self.tree.setItemWidget(file_item, 1, combo_f)
                 self._set_file_type(file_item, filetype)
 
+    def _classification(self) -> ClassificationService:
+        """Return the classifier, rebuilt if the configuration changed."""
+        # Imported on first use: it pulls in the LLM clients.
+        from ..classification.service import ClassificationService
+
+        classifier = self._classifier
+        version = self._config.version
+        if classifier is None or classifier.config_version != version:
+            classifier = ClassificationService(self._config)
+            self._classifier = classifier
+        return classifier
+
+    def _duplicate_finder(self) -> Optional[DuplicateFinder]:
+        library_path = self._config.library_path
+        if library_path is None:
+            return None
+        if self._duplicates is None:
+            # Imported on first use: it pulls in numpy and Pillow.  The
+            # hashes are loaded by the worker that uses the finder.
+            from ..library.duplicates import DuplicateFinder
+
+            settings = self._config.settings
+            output_root = library_path / settings.OUTPUT_BASE_DIR
+            catalog = LibraryCatalog.for_library(
+                library_path,
+                output_root.resolve(),
+                metadata_name=settings.METADATA_FILENAME,
+            )
+            self._duplicates = DuplicateFinder(catalog)
+        return self._duplicates
+
+    def _mark_lookalikes(
+        self,
+        source_item: QTreeWidgetItem,
+        path: Path,
+        found: Dict[str, List[DuplicateMatch]],
+    ) -> None:
+        """Flag files that look like images already in the library."""
+        if path.is_dir():
+            by_file = {str(path / m): v for m, v in found.items()}
+        elif zipfile.is_zipfile(path):
+            by_file = found
+        else:
+            by_file = {str(path): v for v in found.values()}
+        flagged = 0
+        for i in range(source_item.childCount()):
+            asset_item = source_item.child(i)
+            for j in range(asset_item.childCount()):
+                file_item = asset_item.child(j)
+                name = file_item.data(0, Qt.UserRole + 1)
+                matches = by_file.get(str(name))
+                if not matches:
+                    continue
+                flagged += 1
+                lines = [f"{m.path} ({m.filetype})" for m in matches]
+                file_item.setToolTip(0, "Looks like:\n" + "\n".join(lines))
+                paths = [m.path for m in matches]
+                file_item.setData(0, LOOKALIKES_ROLE, paths)
+        if flagged and not source_item.text(1):
+            source_item.setText(1, f"{flagged} look-alike(s) in library")
+
     # ------------------------------------------------------------------
     def add_paths(self, paths: Iterable[Path]) -> None:
+        items: List[Tuple[Path, QTreeWidgetItem]] = []
         for path in paths:
             source_item = QTreeWidgetItem([path.name, ""])
             source_item.setData(0, Qt.UserRole, "source")
             self.tree.addTopLevelItem(source_item)
-            files = [str(f) for f in self._collect_files(path)]
-            if files:
-                state = ClassificationService.from_file_list(files)
-                result = self._classifier.classify(state)
-                self._populate_from_state(source_item, result)
+            items.append((path, source_item))
+        # Sources are hashed and compared with the library on a worker so
+        # large packs do not freeze the window; those not imported before
+        # are classified once the results are in.
+        finder = self._duplicate_finder()
+        task = _HashTask(self._fingerprints, items, self._signals, finder)
+        self._start(task)
+
+    def _start(self, task: QRunnable) -> None:
+        self._pending += 1
+        self._pool.start(task)
+
+    def _sources_hashed(
+        self,
+        items: List[Tuple[Path, QTreeWidgetItem]],
+        metadata: Dict[Path, dict],
+        duplicates: Dict[Path, bool],
+        found: _Lookalikes,
+    ) -> None:
+        self._pending -= 1
+        with profiling.session(self._config, "classify"):
+            for path, source_item in items:
+                if self.tree.indexOfTopLevelItem(source_item) < 0:
+                    continue  # removed while it was being hashed
+                source_metadata = metadata.get(path, {})
+                source_item.setData(0, METADATA_ROLE, source_metadata)
+                if duplicates.get(path):
+                    previous = source_metadata[DUPLICATE_KEY]
+                    source_item.setText(1, f"Already imported ({previous})")
+                    continue
+                files = [str(f) for f in collect_files(path)]
+                self._classify(source_item, files)
+                if found.get(path):
+                    # Re-shipped textures are pointed out before anything
+                    # is processed; exact re-imports are flagged above.
+                    self._mark_lookalikes(source_item, path, found[path])
+
+    def _classify(self, item: QTreeWidgetItem, files: List[str]) -> None:
+        """Classify ``files`` as the contents of the source ``item``."""
+        if not files:
+            return
+        state = self._classification().from_file_list(files)
+        metadata = item.data(0, METADATA_ROLE) or {}
+        state.sources["src"].metadata.update(metadata)
+        result = self._classification().classify(state)
+        item.takeChildren()
+        self._populate_from_state(item, result)
+
+    def wait_for_background(self, msecs: int = -1) -> bool:
+        """Block until background checks are applied (used by tests)."""
+        while self._pending:
+            if not self._pool.waitForDone(msecs):
+                return False
+            QApplication.processEvents()
+        return True
 
     # ------------------------------------------------------------------
     def _set_file_type(self, item: QTreeWidgetItem, file_type: str) -> None:
@@ -208,6 +389,10 @@ class WorkspaceView(QWidget):
 
     # ------------------------------------------------------------------
     def reclassify(self) -> None:
+        with profiling.session(self._config, "reclassify"):
+            self._reclassify()
+
+    def _reclassify(self) -> None:
         for i in range(self.tree.topLevelItemCount()):
             source_item = self.tree.topLevelItem(i)
             files: List[str] = []
@@ -219,12 +404,7 @@ class WorkspaceView(QWidget):
                         path = file_item.data(0, Qt.UserRole + 1)
                         if path:
                             files.append(str(path))
-            if not files:
-                continue
-            state = ClassificationService.from_file_list(files)
-            result = self._classifier.classify(state)
-            source_item.takeChildren()
-            self._populate_from_state(source_item, result)
+            self._classify(source_item, files)
 
     # ------------------------------------------------------------------
     def remove_selected(self) -> None:
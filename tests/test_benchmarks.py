@@ -0,0 +1,117 @@
+import json
+from pathlib import Path
+
+from benchmarks import compare, generator
+from benchmarks.run import run_suite, summarize
+
+
+def _tree(root: Path) -> dict:
+    return {
+        str(path.relative_to(root)): path.read_bytes()
+        for path in sorted(root.rglob("*"))
+        if path.is_file()
+    }
+
+
+def test_generator_is_deterministic_and_realistic(tmp_path: Path) -> None:
+    first = generator.generate(tmp_path / "a", 40, seed=3)
+    generator.generate(tmp_path / "b", 40, seed=3)
+    assert _tree(tmp_path / "a") == _tree(tmp_path / "b")
+
+    plans = generator.plan_sources(40, seed=3)
+    assert [p.name for p in plans] == [p.name for p in first]
+    layouts = {plan.layout for plan in plans}
+    assert layouts == {generator.FOLDER, generator.ZIP, generator.LOOSE}
+    names = [Path(f).name for plan in plans for f in plan.files]
+    assert any(name.endswith(("_COL_4K.jpg", "_COL_2K.jpg")) for name in names)
+    assert any(name.endswith((".hdr", ".exr")) for name in names)
+    assert generator.plan_sources(40, seed=4) != plans
+
+
+def test_suite_records_rounds_and_statistics(tmp_path: Path) -> None:
+    results = run_suite(
+        generator.SCALES["tiny"],
+        rounds=3,
+        select=["scan", "classify", "modules", "serialize"],
+        workdir=tmp_path,
+    )
+    benchmarks = json.loads(json.dumps(results))["benchmarks"]
+    assert {
+        "scan.collect_files",
+        "classify.service",
+        "classify.module.RuleBasedFileTypeModule",
+        "serialize.from_json",
+    } <= set(benchmarks)
+    for result in benchmarks.values():
+        assert len(result["rounds"]) == 3
+        assert result["min"] <= result["median"] <= result["max"]
+    assert results["parameters"]["files"] > 0
+
+    assert summarize([1.0, 2.0, 3.0, 4.0, 100.0]) == {
+        "median": 3.0,
+        "iqr": 2.0,
+        "min": 1.0,
+        "max": 100.0,
+    }
+
+
+def test_catalog_benchmark_searches_generated_library(tmp_path: Path) -> None:
+    entries = generator.catalog_entries(50, seed=1)
+    assert len({entry.path for entry in entries}) == 50
+    assert entries == generator.catalog_entries(50, seed=1)
+
+    results = run_suite(
+        0, rounds=2, select=["catalog"], workdir=tmp_path, catalog_assets=200
+    )
+    assert results["parameters"]["catalog_assets"] == 200
+    assert "catalog.search.name" in results["benchmarks"]
+    assert "catalog.search.page" in results["benchmarks"]
+
+
+def _results(**benchmarks: list) -> dict:
+    return {
+        "parameters": {"sources": 4, "seed": 0, "rounds": 5},
+        "benchmarks": {
+            name.replace("_", "."): {"rounds": rounds, **summarize(rounds)}
+            for name, rounds in benchmarks.items()
+        },
+    }
+
+
+def test_compare_separates_changes_from_noise(tmp_path: Path) -> None:
+    baseline = _results(
+        stable=[1.0, 1.01, 0.99, 1.0, 1.02],
+        noisy=[1.0, 1.4, 0.7, 1.1, 0.9],
+        slow=[1.0, 1.01, 0.99, 1.0, 1.02],
+        fast=[1.0, 1.01, 0.99, 1.0, 1.02],
+        hot_path=[1.0, 1.0, 1.0, 1.0, 1.0],
+        gone=[1.0, 1.0, 1.0],
+    )
+    current = _results(
+        stable=[1.05, 1.04, 1.06, 1.05, 1.03],
+        noisy=[1.3, 0.9, 1.6, 1.2, 1.0],
+        slow=[1.3, 1.31, 1.29, 1.3, 1.32],
+        fast=[0.5, 0.51, 0.49, 0.5, 0.52],
+        hot_path=[1.05, 1.05, 1.05, 1.05, 1.05],
+        new=[1.0],
+    )
+    thresholds = {"hot.*": 0.03}
+    items = compare.compare(baseline, current, thresholds=thresholds)
+    verdicts = {item.name: item.verdict for item in items}
+    assert verdicts == {
+        "stable": compare.SAME,
+        "noisy": compare.SAME,
+        "slow": compare.SLOWER,
+        "fast": compare.FASTER,
+        "hot.path": compare.SLOWER,
+        "gone": compare.REMOVED,
+        "new": compare.ADDED,
+    }
+
+    old, new = tmp_path / "old.json", tmp_path / "new.json"
+    old.write_text(json.dumps(baseline))
+    new.write_text(json.dumps(current))
+    assert compare.main([str(old), str(new)]) == compare.EXIT_SLOWER
+    assert compare.main([str(old), str(old)]) == 0
+    args = [str(old), str(new), "-t", "50%", "-t", "hot.*=0.1"]
+    assert compare.main(args) == 0
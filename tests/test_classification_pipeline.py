@@ -16,6 +16,7 @@ from asset_organiser.classification import (
     LLMTaggingModule,
     RuleBasedFileTypeModule,
     SeparateStandaloneModule,
+    keywords,
 )
 
 
@@ -484,3 +485,21 @@ def test_llm_tagging_module_assigns_tags() -> None:
     asset = result.sources["src"].assets["0"]
     assert asset.asset_tags == ["wood", "plank"]
     assert client.calls == 1
+
+
+def test_keyword_automaton_matches_linear_scan() -> None:
+    rules = [(f"_k{i}", f"T{i}") for i in range(40)]
+    # Overlapping keywords: the one listed first wins, not the longest.
+    rules += [("col", "COLOR"), ("_COL", "MAP_COL"), ("ol", "OL")]
+    names = ["wood_col.png", "a_k12_k3.png", "x_k39", "nothing", "OLD"]
+    automaton = keywords.KeywordMatcher(rules)
+    assert len(automaton) >= keywords.AUTOMATON_THRESHOLD
+    linear = keywords.KeywordMatcher(rules[-3:])
+    for name in names:
+        expected = next(
+            (value for key, value in rules if key.lower() in name.lower()),
+            None,
+        )
+        assert automaton.match(name) == expected
+    assert linear.match("wood_col.png") == "COLOR"
+    assert automaton.match("a_k12_k3.png") == "T1"
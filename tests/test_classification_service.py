@@ -1,3 +1,7 @@
+import pickle
+
+import pytest
+
 from asset_organiser.classification import ClassificationState
 from asset_organiser.classification.service import ClassificationService
 from asset_organiser.config_models import (
@@ -143,3 +147,43 @@ def test_service_names_and_types_assets() -> None:
     assert tags["mesh"] == ["mesh"]
     assert tags["wood"] == ["wood"]
     assert any("asset_type" in p for p in llm.prompts)
+
+
+def test_compiled_config_is_shared_and_leaves_config_untouched() -> None:
+    cfg_service = ConfigService()
+    cfg_service.library_config = LibraryConfig(
+        ASSET_TYPE_DEFINITIONS={
+            "MODEL": AssetTypeDefinition(rule_keywords=["mesh"]),
+        },
+        CLASSIFICATION=ClassificationSettings(
+            asset_type_keywords={"MODEL": ["prop"], "DECAL": ["decal"]},
+        ),
+    )
+    first = ClassificationService(cfg_service, llm_client=NoOpLLMClient())
+    second = ClassificationService(cfg_service, llm_client=NoOpLLMClient())
+    assert first.compiled is second.compiled
+    definitions = cfg_service.library_config.ASSET_TYPE_DEFINITIONS
+    assert definitions["MODEL"].rule_keywords == ["mesh"]
+    assert set(definitions) == {"MODEL"}
+    keywords = first.compiled.asset_type_keywords
+    assert keywords.rules == (
+        ("mesh", "MODEL"),
+        ("prop", "MODEL"),
+        ("decal", "DECAL"),
+    )
+    with pytest.raises(AttributeError):
+        first.compiled.prompts = {}
+
+    # Workers receive the tables pickled and share one copy per process.
+    copy = pickle.loads(pickle.dumps(first.compiled))
+    assert copy is first.compiled
+    worker = ClassificationService.from_compiled(copy, NoOpLLMClient())
+    state = ClassificationService.from_file_list(["readme.txt"])
+    assert worker.classify(state).sources["src"].contents["0"].filetype is None
+
+    config = cfg_service.library_config.model_copy(deep=True)
+    config.CLASSIFICATION.prompts = {"tagging": "tags"}
+    cfg_service.library_config = config
+    third = ClassificationService(cfg_service, llm_client=NoOpLLMClient())
+    assert third.compiled != first.compiled
+    assert third.compiled.prompts == {"tagging": "tags"}
@@ -0,0 +1,126 @@
+import io
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+from asset_organiser.cli import EXIT_FAILED, build_parser, run_batch
+from asset_organiser.config_models import (
+    ClassificationSettings,
+    FileTypeDefinition,
+    LibraryConfig,
+)
+from asset_organiser.config_service import ConfigService
+
+
+def _library(tmp_path: Path) -> tuple[Path, Path]:
+    library = tmp_path / "library"
+    settings = tmp_path / "settings.json"
+    service = ConfigService(app_config_path=settings)
+    service.settings.IMAGE_RESOLUTIONS = {"PREVIEW": 32}
+    service.settings.OUTPUT_BASE_DIR = "out"
+    service.save_settings()
+    service.set_library_path(library)
+    service.library_config = LibraryConfig(
+        FILE_TYPE_DEFINITIONS={
+            "MAP_COL": FileTypeDefinition(alias="COL", rule_keywords=["_col"]),
+            "MAP_NRM": FileTypeDefinition(alias="NRM", rule_keywords=["_nrm"]),
+        },
+        CLASSIFICATION=ClassificationSettings(providers=[]),
+    )
+    service.save_library_config()
+    return library, settings
+
+
+def _source(tmp_path: Path, name: str) -> Path:
+    source = tmp_path / name
+    source.mkdir()
+    rng = np.random.default_rng(0)
+    for suffix in ("col", "nrm"):
+        pixels = rng.integers(0, 255, (64, 64, 3), dtype=np.uint8)
+        Image.fromarray(pixels).save(source / f"{name}_{suffix}.png")
+    return source
+
+
+def _events(text: str) -> list[dict]:
+    return [json.loads(line) for line in text.splitlines()]
+
+
+def test_batch_processes_sources_and_reports_json_lines(
+    tmp_path: Path,
+) -> None:
+    library, settings = _library(tmp_path)
+    source = _source(tmp_path, "bark")
+    argv = [str(source), str(tmp_path / "missing.zip")]
+    argv += ["--library", str(library), "--settings", str(settings)]
+    out = io.StringIO()
+    status = run_batch(build_parser().parse_args(argv + ["-j", "2"]), out)
+
+    events = _events(out.getvalue())
+    kinds = [event["event"] for event in events]
+    assert kinds[0] == "error" and events[0]["source"] == "missing.zip"
+    assert kinds[1:3] == ["source", "classified"]
+    assert events[2]["files"] == 2
+    assets = [event for event in events if event["event"] == "asset"]
+    assert assets and all(asset["error"] is None for asset in assets)
+    written = [f for asset in assets for f in asset["files"]]
+    assert any(name.endswith("_COL_PREVIEW.png") for name in written)
+    assert events[-1]["event"] == "done" and events[-1]["failed"] == 1
+    assert status == EXIT_FAILED
+
+    out = io.StringIO()
+    argv = [str(source), "--skip-imported", "--library", str(library)]
+    args = build_parser().parse_args(argv + ["--settings", str(settings)])
+    status = run_batch(args, out)
+    events = _events(out.getvalue())
+    assert events[0]["imported_as"] == "bark"
+    assert [e["event"] for e in events] == ["source", "skipped", "done"]
+    assert status == 0
+
+
+def test_batch_embeds_assets_when_semantic_search_is_on(
+    tmp_path: Path,
+) -> None:
+    library, settings = _library(tmp_path)
+    config = ConfigService(app_config_path=settings)
+    config.set_library_path(library)
+    config.library_config.INDEXING.enable_semantic_search = True
+    config.save_library_config()
+    source = _source(tmp_path, "bark")
+    argv = [str(source), "--library", str(library)]
+    out = io.StringIO()
+    args = build_parser().parse_args(argv + ["--settings", str(settings)])
+    assert run_batch(args, out) == 0
+    events = _events(out.getvalue())
+    assert [e["event"] for e in events[-2:]] == ["done", "indexed"]
+    assert (events[-1]["done"], events[-1]["failed"]) == (1, 0)
+    assert (library / ".asset-library" / "index.db").is_file()
+
+
+def test_batch_runs_without_qt(tmp_path: Path) -> None:
+    library, settings = _library(tmp_path)
+    source = _source(tmp_path, "rock")
+    script = (
+        "import sys\n"
+        "from asset_organiser.__main__ import main\n"
+        "try:\n"
+        "    main(sys.argv[1:])\n"
+        "finally:\n"
+        "    assert 'PySide6' not in sys.modules\n"
+    )
+    args = ["batch", str(source), "--library", str(library)]
+    args += ["--settings", str(settings), "--no-llm"]
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+    result = subprocess.run(
+        [sys.executable, "-c", script, *args],
+        capture_output=True,
+        text=True,
+        env=env,
+        timeout=120,
+    )
+    assert result.returncode == 0, result.stderr
+    assert _events(result.stdout)[-1]["failed"] == 0
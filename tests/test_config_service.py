@@ -1,11 +1,12 @@
 import json
+import time
 from pathlib import Path
 
 import pytest
 from pydantic import ValidationError
 
 from asset_organiser import ConfigService
-from asset_organiser.config_models import GeneralSettings
+from asset_organiser.config_models import FileTypeDefinition, GeneralSettings
 
 
 def test_loads_and_saves_settings(tmp_path: Path) -> None:
@@ -41,3 +42,95 @@ def test_load_library_config_invalid(tmp_path: Path) -> None:
     service = ConfigService(app_config_path=tmp_path / "settings.json")
     with pytest.raises(ValidationError):
         service.set_library_path(lib_root)
+
+
+def test_library_config_reloads_only_changed_files(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    lib_root = tmp_path / "lib"
+    service = ConfigService(app_config_path=tmp_path / "settings.json")
+    service.set_library_path(lib_root)
+    versions = []
+    unsubscribe = service.subscribe(versions.append)
+    config = service.library_config
+
+    reads = []
+    read_text = Path.read_text
+
+    def counting_read(path: Path, *args, **kwargs) -> str:
+        reads.append(path.name)
+        return read_text(path, *args, **kwargs)
+
+    monkeypatch.setattr(Path, "read_text", counting_read)
+    service.set_library_path(lib_root)
+    assert service.library_config is config
+    assert reads == [] and versions == []
+
+    cfg_dir = lib_root / ".asset-library"
+    data = {"MAP_COL": {"alias": "COL"}}
+    (cfg_dir / "file-types.json").write_text(json.dumps(data) + "\n")
+    assert service.reload_library_config()
+    assert reads == ["file-types.json"]
+    assert "MAP_COL" in service.library_config.FILE_TYPE_DEFINITIONS
+    assert versions == [service.version]
+    assert not service.reload_library_config()
+
+    service.save_library_config()
+    assert not service.reload_library_config()
+    assert versions == [service.version - 1, service.version]
+    unsubscribe()
+    service.save_settings()
+    assert len(versions) == 2
+
+
+def test_save_rewrites_only_changed_files_atomically(tmp_path: Path) -> None:
+    lib_root = tmp_path / "lib"
+    service = ConfigService(app_config_path=tmp_path / "settings.json")
+    service.set_library_path(lib_root)
+    cfg_dir = lib_root / ".asset-library"
+
+    def inodes() -> dict:
+        return {p.name: p.stat().st_ino for p in cfg_dir.iterdir()}
+
+    before = inodes()
+    definitions = service.library_config.FILE_TYPE_DEFINITIONS
+    definitions["MAP_COL"] = FileTypeDefinition(alias="COL")
+    service.save_library_config()
+    after = inodes()
+    changed = {name for name in after if after[name] != before.get(name)}
+    assert changed == {"file-types.json"}
+    data = json.loads((cfg_dir / "file-types.json").read_text())
+    assert data["MAP_COL"]["alias"] == "COL"
+    service.save_library_config()
+    assert inodes() == after
+
+
+def test_requested_saves_are_coalesced(tmp_path: Path) -> None:
+    lib_root = tmp_path / "lib"
+    service = ConfigService(app_config_path=tmp_path / "settings.json")
+    service.set_library_path(lib_root)
+    path = lib_root / ".asset-library" / "file-types.json"
+    versions = []
+    service.subscribe(versions.append)
+    definitions = service.library_config.FILE_TYPE_DEFINITIONS
+    for alias in ("A", "B", "C"):
+        definitions["MAP_COL"] = FileTypeDefinition(alias=alias)
+        service.request_library_save(delay=60)
+    assert json.loads(path.read_text()) == {}
+    assert len(versions) == 3
+
+    inode = path.stat().st_ino
+    service.flush()
+    assert json.loads(path.read_text())["MAP_COL"]["alias"] == "C"
+    inode, previous = path.stat().st_ino, inode
+    assert inode != previous
+    service.flush()
+    assert path.stat().st_ino == inode
+
+    definitions["MAP_COL"] = FileTypeDefinition(alias="D")
+    service.request_library_save(delay=0.01)
+    deadline = time.monotonic() + 5
+    while json.loads(path.read_text())["MAP_COL"]["alias"] != "D":
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+    assert [p.name for p in path.parent.glob(".*")] == []
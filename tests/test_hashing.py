@@ -0,0 +1,118 @@
+import hashlib
+import zipfile
+from pathlib import Path
+
+import asset_organiser.hashing as hashing
+from asset_organiser import ConfigService
+from asset_organiser.classification import ClassificationState
+from asset_organiser.config_models import LibraryConfig
+from asset_organiser.hashing import SHA256_KEY, SourceFingerprintService
+from asset_organiser.processing import ProcessingService
+
+
+def test_sha256_file_mmap(tmp_path: Path, monkeypatch) -> None:
+    path = tmp_path / "big.bin"
+    data = bytes(range(256)) * 1000
+    path.write_bytes(data)
+    expected = hashlib.sha256(data).hexdigest()
+    assert hashing.sha256_file(path) == expected
+    monkeypatch.setattr(hashing, "MMAP_THRESHOLD", 1024)
+    assert hashing.sha256_file(path) == expected
+
+
+def test_fingerprint_cache(tmp_path: Path, monkeypatch) -> None:
+    library = tmp_path / "lib"
+    archive = tmp_path / "pack.zip"
+    with zipfile.ZipFile(archive, "w") as zf:
+        zf.writestr("a.txt", "a")
+    folder = tmp_path / "folder"
+    (folder / "sub").mkdir(parents=True)
+    (folder / "sub" / "b.txt").write_text("b")
+    (folder / "a.txt").write_text("a")
+
+    calls = []
+    real = hashing.sha256_file
+
+    def counting(path: Path) -> str:
+        calls.append(path)
+        return real(path)
+
+    monkeypatch.setattr(hashing, "sha256_file", counting)
+    service = SourceFingerprintService(library, max_workers=2)
+    digests = service.fingerprint_many([archive, folder])
+    assert digests[archive] == real(archive)
+    assert digests[folder] == hashing.tree_digest(
+        folder,
+        {
+            folder / "a.txt": hashlib.sha256(b"a").hexdigest(),
+            folder / "sub" / "b.txt": hashlib.sha256(b"b").hexdigest(),
+        },
+    )
+    assert len(calls) == 3
+
+    reloaded = SourceFingerprintService(library)
+    assert reloaded.fingerprint(archive) == digests[archive]
+    assert reloaded.fingerprint(folder) == digests[folder]
+    assert len(calls) == 3
+    assert (library / ".asset-library" / "source-hashes.json").exists()
+
+    (folder / "a.txt").write_text("changed")
+    assert reloaded.fingerprint(folder) != digests[folder]
+    assert len(calls) == 4
+
+
+def test_packs_sharing_a_first_file_differ(tmp_path: Path) -> None:
+    packs = []
+    for name, texture in (("rock", b"rock"), ("moss", b"moss")):
+        pack = tmp_path / name
+        (pack / "maps").mkdir(parents=True)
+        (pack / "License.txt").write_text("same licence")
+        (pack / "maps" / "col.png").write_bytes(texture)
+        packs.append(pack)
+    service = SourceFingerprintService()
+    digests = service.fingerprint_many(packs)
+    assert digests[packs[0]] != digests[packs[1]]
+
+    (packs[1] / "maps" / "col.png").write_bytes(b"rock")
+    assert service.fingerprint(packs[1]) == digests[packs[0]]
+    (packs[1] / "maps" / "col.png").rename(packs[1] / "maps" / "alb.png")
+    assert service.fingerprint(packs[1]) != digests[packs[0]]
+
+
+def test_processed_sources_are_detected_as_duplicates(tmp_path: Path) -> None:
+    library = tmp_path / "lib"
+    config = ConfigService(app_config_path=tmp_path / "settings.json")
+    config.set_library_path(library)
+    config.library_config = LibraryConfig()
+    source = tmp_path / "pack"
+    source.mkdir()
+    (source / "readme.txt").write_text("hello")
+
+    fingerprints = SourceFingerprintService(library)
+    metadata: dict = {}
+    assert not fingerprints.annotate(metadata, source)
+    state = ClassificationState.model_validate(
+        {"sources": {"pack": {"metadata": metadata, "contents": {}}}}
+    )
+    service = ProcessingService(config, fingerprints=fingerprints)
+    service.process(state, {"pack": source}, tmp_path / "out")
+
+    again: dict = {}
+    duplicate = SourceFingerprintService(library).annotate(again, source)
+    assert duplicate
+    assert again[SHA256_KEY] == metadata[SHA256_KEY]
+    assert again["duplicate_of"] == "pack"
+
+
+def test_saves_merge_entries_written_by_other_services(tmp_path: Path) -> None:
+    gui = SourceFingerprintService(tmp_path)
+    batch = SourceFingerprintService(tmp_path)
+    batch.mark_imported("aaa", "Bark")
+    batch.save()
+    gui.mark_imported("bbb", "Moss")
+    gui.save()
+
+    assert gui.imported_as("aaa") == "Bark"
+    reloaded = SourceFingerprintService(tmp_path)
+    assert reloaded.imported_as("aaa") == "Bark"
+    assert reloaded.imported_as("bbb") == "Moss"
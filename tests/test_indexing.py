@@ -0,0 +1,133 @@
+from pathlib import Path
+
+import numpy as np
+from test_library_catalog import _asset, _catalog
+
+from asset_organiser.config_models import IndexingSettings
+from asset_organiser.indexing import (
+    HashingEmbedder,
+    IndexingService,
+    SentenceTransformerEmbedder,
+    VectorStore,
+    create_embedder,
+)
+from asset_organiser.library import CatalogEntry
+
+
+def test_hashing_embedder_is_deterministic() -> None:
+    embedder = HashingEmbedder(64)
+    first = embedder.embed(["OakBark wood", "granite"])
+    again = HashingEmbedder(64).embed(["OakBark wood", "granite"])
+    assert first.shape == (2, 64) and first.dtype == np.float32
+    assert np.array_equal(first, again)
+    assert np.allclose(np.linalg.norm(first, axis=1), 1.0)
+    bark, rock = embedder.embed(["oak bark", "mossy rock"])
+    assert first[0] @ bark > first[0] @ rock
+
+
+def test_create_embedder_from_settings() -> None:
+    assert create_embedder().name == "hashing-256"
+    settings = IndexingSettings(embedding_model="hashing-32")
+    assert create_embedder(settings).dimension == 32
+    settings = IndexingSettings(embedding_model="all-MiniLM-L6-v2")
+    assert isinstance(create_embedder(settings), SentenceTransformerEmbedder)
+
+
+def test_only_multimodal_models_embed_images(tmp_path: Path) -> None:
+    class CLIPModel:
+        pass
+
+    class Transformer:
+        pass
+
+    clip = SentenceTransformerEmbedder("clip-ViT-B-32")
+    clip._model = [CLIPModel()]
+    text = SentenceTransformerEmbedder("all-MiniLM-L6-v2")
+    text._model = [Transformer(), object()]
+    assert clip.supports_images and not text.supports_images
+    assert not HashingEmbedder(16).supports_images
+    assert HashingEmbedder(16, images=True).supports_images
+
+    class TextOnly(HashingEmbedder):
+        supports_images = False
+
+        def embed_images(self, images):
+            raise AssertionError("text model given images")
+
+    entry = CatalogEntry(
+        path="a", asset_id="a", name="Bark", asset_type="", supplier=""
+    )
+    image = np.zeros((4, 4, 3), dtype=np.uint8)
+    with IndexingService(tmp_path / "i.db", TextOnly(16)) as service:
+        assert not service.embeds_images
+        assert service.index_batch([entry], [image]) == 1
+
+
+def test_store_reuses_rows_and_survives_reopen(tmp_path: Path) -> None:
+    path = tmp_path / "index.db"
+    rng = np.random.default_rng(1)
+    vectors = rng.normal(size=(3000, 8)).astype(np.float32)
+    keys = [f"asset{i}" for i in range(3000)]
+    with VectorStore(path, 8, model="test") as store:
+        store.add(keys, vectors, list(range(3000)))
+        assert store.remove(["asset5", "missing"]) == 1
+        store.add(["new"], vectors[5])
+        assert store.search(vectors[5], 1)[0][0] == "new"
+        capacity = len(store._matrix)
+    with VectorStore(path, 8, model="test") as store:
+        assert len(store) == 3000 and "asset5" not in store
+        assert len(store._matrix) == capacity
+        assert store.stamps()["asset7"] == 7
+        [(key, score)] = store.search(vectors[42], 1)
+        assert key == "asset42" and abs(score - 1.0) < 1e-5
+    # A different model invalidates every stored vector.
+    with VectorStore(path, 8, model="other") as store:
+        assert len(store) == 0
+
+
+def test_exact_and_ivf_search_agree(tmp_path: Path) -> None:
+    rng = np.random.default_rng(2)
+    centres = rng.normal(size=(20, 16))
+    labels = rng.integers(0, 20, size=4000)
+    vectors = centres[labels] + rng.normal(scale=0.1, size=(4000, 16))
+    keys = [str(i) for i in range(4000)]
+    with VectorStore(tmp_path / "index.db", 16) as store:
+        store.add(keys, vectors)
+        queries = vectors[:50] + rng.normal(scale=0.05, size=(50, 16))
+        exact = store.search_many(queries, 10, exact=True)
+        approx = store.search_many(queries, 10, exact=False, nprobe=4)
+        assert [hits[0][0] for hits in exact] == keys[:50]
+        recall = np.mean(
+            [
+                len({k for k, _ in a} & {k for k, _ in e}) / 10
+                for a, e in zip(approx, exact)
+            ]
+        )
+        assert recall > 0.9
+        # Vectors added after training are found through their group.
+        store.add(["late"], centres[3])
+        assert store.search(centres[3], 1, exact=False)[0][0] == "late"
+
+
+def test_service_syncs_with_catalog(tmp_path: Path) -> None:
+    out = tmp_path / "out"
+    _asset(out, "Acme/Surface/OakBark", tags=["wood", "brown"])
+    _asset(out, "Acme/Surface/MossyRock", tags=["stone", "green"])
+    chair = _asset(out, "Acme/Model/Chair", tags=["furniture"])
+    with (
+        _catalog(tmp_path) as catalog,
+        IndexingService.for_library(tmp_path, batch_size=2) as service,
+    ):
+        catalog.rescan()
+        assert service.sync(catalog).indexed == 3
+        assert service.sync(catalog).unchanged == 3
+        hits = service.search("green stones")
+        assert hits[0][0] == "Acme/Surface/MossyRock"
+        [(similar, _)] = service.similar("Acme/Model/Chair", 1)
+        assert similar != "Acme/Model/Chair"
+        (chair / "metadata.json").unlink()
+        catalog.rescan()
+        stats = service.sync(catalog)
+        assert (stats.removed, stats.unchanged) == (1, 2)
+        assert len(service) == 2
+    assert (tmp_path / ".asset-library" / "index.vectors").exists()
@@ -0,0 +1,125 @@
+import json
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+from test_library_catalog import _asset, _catalog
+
+from asset_organiser.indexing import EmbeddingJob, HashingEmbedder
+from asset_organiser.indexing import IndexingService as Service
+
+
+def _library(tmp_path: Path, count: int) -> None:
+    out = tmp_path / "out"
+    preview = {"dimensions": [32, 32], "path": "./col.png"}
+    for number in range(count):
+        colour = (255, 0, 0) if number % 2 else (0, 0, 255)
+        folder = _asset(
+            out,
+            f"Acme/Surface/Asset{number}",
+            files=[
+                {
+                    "type": "MAP_COL",
+                    "resolutions": {"S": preview},
+                }
+            ],
+        )
+        Image.new("RGB", (32, 32), colour).save(folder / "col.png")
+
+
+def _service(tmp_path: Path) -> Service:
+    embedder = HashingEmbedder(32, images=True)
+    return Service.for_library(tmp_path, embedder=embedder)
+
+
+def test_image_embedding_tracks_colour() -> None:
+    embedder = HashingEmbedder(32)
+    red = np.full((8, 8, 3), (255, 0, 0), dtype=np.uint8)
+    blue = np.full((8, 8, 3), (0, 0, 255), dtype=np.uint8)
+    reds = embedder.embed_images([red, red[:4], blue])
+    assert reds.shape == (3, 32)
+    assert reds[0] @ reds[1] > 0.99 > reds[0] @ reds[2]
+
+
+def test_job_embeds_previews_and_skips_done_assets(tmp_path: Path) -> None:
+    _library(tmp_path, 5)
+    seen = []
+    with _catalog(tmp_path) as catalog, _service(tmp_path) as service:
+        catalog.rescan()
+        job = EmbeddingJob(service, catalog, batch_size=2)
+        job.on_progress = seen.append
+        job.start()
+        assert job.wait(10)
+        assert (job.progress.state, job.progress.done) == ("done", 5)
+        assert [p.done for p in seen if p.state == "running"][-1] == 5
+        # Previews pull same-coloured assets together.
+        [(similar, _)] = service.similar("Acme/Surface/Asset1", 1)
+        assert similar == "Acme/Surface/Asset3"
+        assert EmbeddingJob(service, catalog).pending() == []
+
+
+def test_pause_survives_restart_and_resume_continues(tmp_path: Path) -> None:
+    _library(tmp_path, 4)
+    with _catalog(tmp_path) as catalog, _service(tmp_path) as service:
+        catalog.rescan()
+        job = EmbeddingJob(service, catalog, batch_size=1)
+
+        def pause_after_first(progress):
+            if progress.done == 1 and not job.paused:
+                job.pause()
+
+        job.on_progress = pause_after_first
+        job.start()
+        while job.progress.state != "paused":
+            job.wait(0.01)
+        job.stop(10)
+        assert len(service) == 1
+
+        restarted = EmbeddingJob(service, catalog, batch_size=1)
+        assert restarted.paused and len(restarted.pending()) == 3
+        restarted.start()
+        assert not restarted.wait(0.2)
+        assert len(service) == 1
+        restarted.resume()
+        assert restarted.wait(10)
+        assert len(service) == 4
+        checkpoint = json.loads(restarted.checkpoint_path.read_text())
+        assert checkpoint["paused"] is False
+
+
+def test_failed_batches_are_not_retried(tmp_path: Path) -> None:
+    _library(tmp_path, 2)
+
+    class Broken(HashingEmbedder):
+        def embed(self, texts):
+            if any("Asset1" in text for text in texts):
+                raise RuntimeError("model crashed")
+            return super().embed(texts)
+
+    with _catalog(tmp_path) as catalog:
+        catalog.rescan()
+        path = tmp_path / "index.db"
+        with Service(path, Broken(32)) as service:
+            job = EmbeddingJob(service, catalog, batch_size=1)
+            job.start()
+            assert job.wait(10)
+            assert (job.progress.done, job.progress.failed) == (1, 1)
+            assert EmbeddingJob(service, catalog).pending() == []
+
+
+def test_start_while_running_queues_another_pass(tmp_path: Path) -> None:
+    _library(tmp_path, 2)
+    with _catalog(tmp_path) as catalog, _service(tmp_path) as service:
+        catalog.rescan()
+        job = EmbeddingJob(service, catalog, batch_size=1)
+
+        def add_asset(progress):
+            if progress.done == 1 and len(catalog.asset_states()) == 2:
+                _library(tmp_path, 3)
+                catalog.rescan()
+                job.start()
+
+        job.on_progress = add_asset
+        job.start()
+        assert job.wait(10)
+        assert len(service) == 3 and job.pending() == []
@@ -0,0 +1,101 @@
+import json
+import os
+import sqlite3
+import zipfile
+from pathlib import Path
+
+from test_processing_service import _config, _png, _state
+
+from asset_organiser.library import LibraryCatalog
+from asset_organiser.library import catalog as catalog_module
+from asset_organiser.processing import ProcessingService
+
+
+def _asset(root: Path, path: str, **metadata) -> Path:
+    folder = root / path
+    folder.mkdir(parents=True, exist_ok=True)
+    supplier, asset_type, name = path.split("/")
+    data = {
+        "asset_name": name,
+        "asset_type": asset_type,
+        "supplier": supplier,
+        "files": [{"type": "MAP_COL"}, {"type": "MAP_NRM"}],
+        "available_resolutions": ["1K"],
+        "tags": [],
+        **metadata,
+    }
+    (folder / "metadata.json").write_text(json.dumps(data))
+    return folder
+
+
+def _catalog(tmp_path: Path) -> LibraryCatalog:
+    return LibraryCatalog.for_library(tmp_path, tmp_path / "out")
+
+
+def test_rescan_indexes_and_filters_assets(tmp_path: Path) -> None:
+    out = tmp_path / "out"
+    _asset(out, "Acme/Surface/Bark", tags=["wood", "Brown"])
+    _asset(out, "Acme/Surface/Rock", tags=["stone"])
+    _asset(out, "Other/Model/Chair", tags=["wood"], files=[])
+    _asset(out, ".staging/asset-1/Ghost")
+    with _catalog(tmp_path) as catalog:
+        stats = catalog.rescan()
+        assert (stats.added, stats.unchanged) == (3, 0)
+        names = [e.name for e in catalog.query(tags=["wood"])]
+        assert names == ["Bark", "Chair"]
+        bark = catalog.query(tags=["WOOD", "brown"], asset_type="Surface")
+        assert [e.path for e in bark] == ["Acme/Surface/Bark"]
+        assert bark[0].filetypes == ["MAP_COL", "MAP_NRM"]
+        assert catalog.query(filetypes=["MAP_NRM"], supplier="Other") == []
+        assert [e.name for e in catalog.query(name="o")] == ["Rock"]
+        assert catalog.facets("asset_type") == {"Model": 1, "Surface": 2}
+        assert catalog.facets("tags")["wood"] == 2
+        assert len(catalog.query(limit=2, offset=2)) == 1
+
+
+def test_reads_stay_within_sqlite_parameter_limit(
+    tmp_path: Path,
+    monkeypatch,
+) -> None:
+    monkeypatch.setattr(catalog_module, "MAX_PARAMETERS", 3)
+    out = tmp_path / "out"
+    for number in range(8):
+        _asset(out, f"Acme/Surface/Asset{number}", tags=["wood"])
+    with _catalog(tmp_path) as catalog:
+        catalog.rescan()
+        catalog._conn.setlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER, 3)
+        entries = catalog.query()
+        assert len(entries) == 8
+        assert all(entry.tags == ["wood"] for entry in entries)
+        paths = [entry.path for entry in entries][::-1]
+        assert [e.path for e in catalog.get_many(paths)] == paths
+
+
+def test_rescan_only_rereads_changed_metadata(tmp_path: Path) -> None:
+    out = tmp_path / "out"
+    bark = _asset(out, "Acme/Surface/Bark")
+    rock = _asset(out, "Acme/Surface/Rock")
+    with _catalog(tmp_path) as catalog:
+        catalog.rescan()
+        _asset(out, "Acme/Surface/Bark", tags=["new"])
+        stat = (bark / "metadata.json").stat()
+        os.utime(bark / "metadata.json", ns=(stat.st_atime_ns, 1))
+        (rock / "metadata.json").unlink()
+        stats = catalog.rescan()
+        assert (stats.updated, stats.removed) == (1, 1)
+        assert catalog.get("Acme/Surface/Bark").tags == ["new"]
+        assert catalog.count() == 1
+
+
+def test_processor_updates_catalog(tmp_path: Path) -> None:
+    archive = tmp_path / "pack.zip"
+    with zipfile.ZipFile(archive, "w") as zf:
+        zf.writestr("bark_col.png", _png(32))
+    output = tmp_path / "out"
+    with _catalog(tmp_path) as catalog:
+        service = ProcessingService(_config(tmp_path), catalog=catalog)
+        service.process(_state(["bark_col.png"]), {"pack": archive}, output)
+        [entry] = catalog.query(tags=["wood"])
+        assert entry.path == "Acme/Surface/Bark"
+        assert entry.resolutions == ["PREVIEW"]
+        assert entry.filetypes == ["MAP_COL"]
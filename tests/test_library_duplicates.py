@@ -0,0 +1,108 @@
+import io
+import json
+import zipfile
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+from test_processing_service import _config, _state
+
+from asset_organiser.library import DuplicateFinder, HammingIndex
+from asset_organiser.library.catalog import LibraryCatalog
+from asset_organiser.processing import ProcessingService
+from asset_organiser.processing.imaging import decode_image
+from asset_organiser.processing.perceptual import (
+    SAMPLE_SIZE,
+    PerceptualHash,
+    hamming,
+    hash_source_images,
+    perceptual_hash,
+)
+
+
+def _texture(seed: int, size: int = 256) -> np.ndarray:
+    """Smooth random pattern, like a tiling texture."""
+    rng = np.random.default_rng(seed)
+    cells = rng.integers(0, 256, (8, 8, 3), dtype=np.uint8)
+    image = Image.fromarray(cells).resize((size, size), Image.BICUBIC)
+    return np.asarray(image)
+
+
+def _encoded(image: np.ndarray, fmt: str = "PNG", size: int = 0) -> bytes:
+    picture = Image.fromarray(image)
+    if size:
+        picture = picture.resize((size, size), Image.LANCZOS)
+    buffer = io.BytesIO()
+    picture.save(buffer, format=fmt)
+    return buffer.getvalue()
+
+
+def test_hash_survives_reencoding_but_separates_textures() -> None:
+    original = perceptual_hash(_texture(1))
+    jpeg = Image.open(io.BytesIO(_encoded(_texture(1), "JPEG", 100)))
+    copy = perceptual_hash(np.asarray(jpeg))
+    other = perceptual_hash(_texture(2))
+    assert original.distance(copy) <= 4
+    assert hamming(original.dhash, copy.dhash) <= 8
+    assert original.distance(other) > 16
+    assert perceptual_hash(np.full((64, 64), 0.5, np.float32)) is None
+    restored = PerceptualHash.from_metadata(original.to_metadata())
+    assert restored == original
+    assert PerceptualHash.from_metadata({"phash": "zz"}) is None
+
+
+def test_multi_index_search_matches_brute_force() -> None:
+    rng = np.random.default_rng(3)
+    values = [int(v) for v in rng.integers(0, 1 << 64, 500, dtype=np.uint64)]
+    # Near copies with flips spread over several chunks.
+    values += [v ^ 0x8001_0000_8001_0001 for v in values[:50]]
+    values += [v ^ 0b1011 for v in values[:50]]
+    tree = HammingIndex(values, list(range(len(values))))
+    assert len(tree) == 600
+    for query in values[:60]:
+        near = [hamming(query, value) <= 6 for value in values]
+        expected = [index for index, hit in enumerate(near) if hit]
+        hits = tree.search(query, 6)
+        assert sorted(i for _, i in hits) == expected
+        assert [d for d, _ in hits] == sorted(d for d, _ in hits)
+
+
+def test_processed_assets_are_found_from_new_sources(tmp_path: Path) -> None:
+    archive = tmp_path / "pack.zip"
+    with zipfile.ZipFile(archive, "w") as zf:
+        zf.writestr("bark_col.png", _encoded(_texture(1)))
+        zf.writestr("rock_nrm.png", _encoded(_texture(2)))
+    output = tmp_path / "out"
+    catalog = LibraryCatalog.for_library(tmp_path, output)
+    service = ProcessingService(_config(tmp_path), catalog=catalog)
+    state = _state(["bark_col.png", "rock_nrm.png"])
+    service.process(state, {"pack": archive}, output)
+    [entry] = catalog.query()
+    metadata = json.loads((output / entry.path / "metadata.json").read_text())
+    col = next(f for f in metadata["files"] if f["type"] == "MAP_COL")
+    assert set(col["perceptual_hash"]) == {"phash", "dhash"}
+    assert set(entry.image_hashes) == {"MAP_COL", "MAP_NRM"}
+
+    reshipped = tmp_path / "reshipped.zip"
+    with zipfile.ZipFile(reshipped, "w") as zf:
+        zf.writestr("Tree_Bark_Albedo.jpg", _encoded(_texture(1), "JPEG"))
+        zf.writestr("new_col.png", _encoded(_texture(9)))
+    finder = DuplicateFinder(catalog)
+    assert len(finder) == 2
+    found = finder.find_source(reshipped)
+    assert list(found) == ["Tree_Bark_Albedo.jpg"]
+    [match] = found["Tree_Bark_Albedo.jpg"]
+    assert (match.path, match.filetype) == (entry.path, "MAP_COL")
+    assert finder.library_duplicates() == []
+    catalog.close()
+
+
+def test_source_images_are_hashed_from_a_draft_decode(tmp_path: Path) -> None:
+    large = _encoded(_texture(1, 2048), "JPEG")
+    assert decode_image(large).shape == (2048, 2048, 3)
+    assert decode_image(large, draft=SAMPLE_SIZE).shape == (256, 256, 3)
+    source = tmp_path / "source"
+    source.mkdir()
+    (source / "bark_col.jpg").write_bytes(large)
+    [value] = hash_source_images(source).values()
+    assert value.distance(perceptual_hash(_texture(1))) <= 4
@@ -0,0 +1,114 @@
+import os
+import threading
+from pathlib import Path
+
+import pytest
+from test_library_catalog import _asset, _catalog
+
+from asset_organiser.library import LibraryScanner, LibraryWatcher, rescan
+
+
+def _age(root: Path) -> None:
+    """Backdate every directory so its mtime is outside the racy window."""
+    for folder, _, _ in os.walk(root):
+        os.utime(folder, ns=(0, 10**9))
+
+
+def test_unchanged_directories_are_not_listed_again(
+    tmp_path: Path, monkeypatch
+) -> None:
+    out = tmp_path / "out"
+    for name in ("Bark", "Rock", "Moss"):
+        _asset(out, f"Acme/Surface/{name}")
+    _asset(out, "Other/Model/Chair")
+    _age(out)
+    listed = []
+    scandir = os.scandir
+
+    def counting(path):
+        listed.append(Path(path).relative_to(out).as_posix())
+        return scandir(path)
+
+    monkeypatch.setattr(rescan.os, "scandir", counting)
+    with _catalog(tmp_path) as catalog:
+        scanner = LibraryScanner(catalog, max_workers=4)
+        assert scanner.scan().added == 4
+        assert "Acme/Surface/Bark" in listed
+        listed.clear()
+        assert scanner.scan().unchanged == 4
+        assert listed == []
+
+        _asset(out, "Other/Model/Table")
+        (out / "Acme" / "Surface" / "Rock" / "metadata.json").unlink()
+        stats = scanner.scan()
+        assert (stats.added, stats.removed) == (1, 1)
+        assert sorted(listed) == [
+            "Acme/Surface/Rock",
+            "Other/Model",
+            "Other/Model/Table",
+        ]
+        names = sorted(entry.name for entry in catalog.query())
+        assert names == ["Bark", "Chair", "Moss", "Table"]
+
+
+def test_metadata_size_change_is_detected(tmp_path: Path) -> None:
+    out = tmp_path / "out"
+    bark = _asset(out, "Acme/Surface/Bark")
+    metadata = bark / "metadata.json"
+    with _catalog(tmp_path) as catalog:
+        catalog.rescan()
+        mtime = metadata.stat().st_mtime_ns
+        _asset(out, "Acme/Surface/Bark", tags=["longer", "tags"])
+        os.utime(metadata, ns=(mtime, mtime))
+        assert catalog.rescan().updated == 1
+        assert catalog.get("Acme/Surface/Bark").tags == ["longer", "tags"]
+
+
+def test_missing_library_keeps_catalog(tmp_path: Path) -> None:
+    out = tmp_path / "out"
+    _asset(out, "Acme/Surface/Bark")
+    with _catalog(tmp_path) as catalog:
+        catalog.rescan()
+        out.rename(tmp_path / "unmounted")
+        with pytest.raises(FileNotFoundError):
+            catalog.rescan()
+        assert catalog.count() == 1
+
+
+def test_watcher_reports_changes(tmp_path: Path) -> None:
+    out = tmp_path / "out"
+    _asset(out, "Acme/Surface/Bark")
+    changed = threading.Event()
+    seen = []
+
+    def on_change(stats):
+        seen.append(stats)
+        changed.set()
+
+    with _catalog(tmp_path) as catalog:
+        watcher = LibraryWatcher(catalog, interval=0.05, on_change=on_change)
+        watcher.start()
+        try:
+            assert changed.wait(5)
+        finally:
+            watcher.stop(5)
+        assert not watcher.running
+        assert seen[0].added == 1
+
+
+def test_watcher_scans_on_request(tmp_path: Path) -> None:
+    out = tmp_path / "out"
+    _asset(out, "Acme/Surface/Bark")
+    seen = []
+    with _catalog(tmp_path) as catalog:
+        watcher = LibraryWatcher(catalog, interval=60, on_change=seen.append)
+        watcher.start()
+        try:
+            assert watcher.wait_for_scan(5)
+            _asset(out, "Acme/Surface/Rock")
+            watcher.scan_now()
+            assert watcher.wait_for_scan(5)
+        finally:
+            watcher.stop(5)
+        assert [stats.added for stats in seen] == [1, 1]
+        assert catalog.count() == 2
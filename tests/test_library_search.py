@@ -0,0 +1,81 @@
+from pathlib import Path
+
+import pytest
+
+from asset_organiser.library import CatalogEntry, LibraryCatalog
+
+
+def _entry(name: str, asset_type: str = "Surface", **fields) -> CatalogEntry:
+    return CatalogEntry(
+        path=f"Acme/{asset_type}/{name}",
+        asset_id=name,
+        name=name,
+        asset_type=asset_type,
+        supplier="Acme",
+        **fields,
+    )
+
+
+@pytest.fixture
+def catalog(tmp_path: Path):
+    with LibraryCatalog(tmp_path / "catalog.db", tmp_path) as catalog:
+        catalog.upsert_many(
+            [
+                _entry("OakBark", tags=["wood", "brown"]),
+                _entry("MossyRock", tags=["stone", "bark"]),
+                _entry("Chair", "Model", tags=["oak", "furniture"]),
+                _entry("Cobble", tags=["stone"], filetypes=["MAP_NRM"]),
+            ]
+        )
+        yield catalog
+
+
+def _names(entries) -> list:
+    return [entry.name for entry in entries]
+
+
+def test_prefix_search_ranks_names_above_tags(catalog) -> None:
+    assert _names(catalog.search("bar")) == ["OakBark", "MossyRock"]
+    assert _names(catalog.search("oak")) == ["OakBark", "Chair"]
+    assert _names(catalog.search("st mos")) == ["MossyRock"]
+    assert _names(catalog.search("furn mod")) == ["Chair"]
+    assert catalog.search("granite") == []
+
+
+def test_search_combines_with_filters(catalog) -> None:
+    assert _names(catalog.search("stone", filetypes=["MAP_NRM"])) == ["Cobble"]
+    assert _names(catalog.search("oak", asset_type="Model")) == ["Chair"]
+    assert len(catalog.search("", limit=2)) == 2
+    assert _names(catalog.search("o", limit=1, offset=1)) == ["Chair"]
+
+
+def test_index_follows_updates_and_removals(catalog) -> None:
+    catalog.upsert(_entry("OakBark", tags=["timber"]))
+    assert _names(catalog.search("timber")) == ["OakBark"]
+    assert _names(catalog.search("brown")) == []
+    catalog.remove("Acme/Surface/OakBark")
+    assert _names(catalog.search("oak")) == ["Chair"]
+
+
+def test_like_fallback_without_fts(catalog, monkeypatch) -> None:
+    monkeypatch.setattr(catalog, "has_fts", False)
+    assert _names(catalog.search("bark")) == ["MossyRock", "OakBark"]
+    assert _names(catalog.search("rock st")) == ["MossyRock"]
+
+
+def test_tiers_order_by_name_and_page_across_groups(catalog) -> None:
+    catalog.upsert_many(
+        [
+            _entry("Pine", tags=["bark"]),
+            _entry("BarkDry"),
+            _entry("Tree", "Bark"),
+        ]
+    )
+    names = ["BarkDry", "OakBark", "MossyRock", "Pine", "Tree"]
+    assert _names(catalog.search("bark")) == names
+    pages = [catalog.search("bark", limit=2, offset=n) for n in (0, 2, 4)]
+    assert [_names(page) for page in pages] == [
+        names[:2],
+        names[2:4],
+        names[4:],
+    ]
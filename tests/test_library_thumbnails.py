@@ -0,0 +1,102 @@
+import io
+import zipfile
+from pathlib import Path
+
+from PIL import Image
+from test_processing_service import _config, _png, _state
+
+from asset_organiser.config_models import FileTypeDefinition
+from asset_organiser.library import LibraryCatalog
+from asset_organiser.library.thumbnails import (
+    ThumbnailCache,
+    preferred_filetypes,
+    preview_source,
+)
+from asset_organiser.processing import ProcessingService
+
+
+def test_preview_source_prefers_colour_maps_covering_size() -> None:
+    metadata = {
+        "files": [
+            {
+                "type": "MAP_NRM",
+                "resolutions": {"1K": {"dimensions": [64, 64], "path": "n"}},
+            },
+            {
+                "type": "MAP_COL",
+                "resolutions": {
+                    "2K": {"dimensions": [2048, 1024], "path": "./c2"},
+                    "1K": {"dimensions": [1024, 512], "path": "./c1"},
+                    "S": {"dimensions": [64, 32], "path": "./c0"},
+                },
+            },
+        ]
+    }
+    preferred = preferred_filetypes(
+        {
+            "MAP_ROUGH": FileTypeDefinition(alias="R", is_grayscale=True),
+            "MAP_COL": FileTypeDefinition(alias="COL"),
+            "MAP_NRM": FileTypeDefinition(alias="NRM"),
+        }
+    )
+    assert preferred == ("MAP_COL", "MAP_NRM", "MAP_ROUGH")
+    source = preview_source(Path("a"), metadata, 128, preferred)
+    assert source == Path("a/c1")
+    assert preview_source(Path("a"), metadata, 128, ["MAP_NRM"]) == Path("a/n")
+    assert preview_source(Path("a"), {"files": []}) is None
+
+
+def test_cache_survives_reopen_and_tracks_staleness(tmp_path: Path) -> None:
+    with ThumbnailCache(tmp_path, tmp_path) as cache:
+        cache.put("a", b"first", 1)
+        cache.put("b", b"bee", 1)
+        cache.put("a", b"second", 2)
+    # A torn write at the end of the index is ignored.
+    with open(tmp_path / "thumbnails.idx", "a") as index:
+        index.write('["c", 0, 99')
+    with ThumbnailCache(tmp_path, tmp_path) as cache:
+        assert len(cache) == 2
+        assert cache.get("a", 2) == b"second"
+        assert cache.get("a", 3) is None
+        assert cache.get("b") == b"bee"
+
+
+def test_compaction_waits_until_no_other_cache_is_open(
+    tmp_path: Path,
+) -> None:
+    other = ThumbnailCache(tmp_path, tmp_path)
+    with ThumbnailCache(tmp_path, tmp_path) as cache:
+        for stamp in range(3):
+            cache.put("a", bytes([stamp]) * (1 << 20), stamp)
+    size = (tmp_path / "thumbnails.pack").stat().st_size
+    with ThumbnailCache(tmp_path, tmp_path) as cache:
+        # ``other`` still has the pack open, so it must not be rewritten.
+        assert (tmp_path / "thumbnails.pack").stat().st_size == size
+        cache.put("b", b"bee", 1)
+    other.put("c", b"sea", 1)
+    other.close()
+
+    with ThumbnailCache(tmp_path, tmp_path) as cache:
+        assert (tmp_path / "thumbnails.pack").stat().st_size < size
+        assert cache.get("a", 2) == bytes([2]) * (1 << 20)
+        assert cache.get("b") == b"bee"
+        assert cache.get("c") == b"sea"
+
+
+def test_processor_renders_thumbnails(tmp_path: Path) -> None:
+    archive = tmp_path / "pack.zip"
+    with zipfile.ZipFile(archive, "w") as zf:
+        zf.writestr("bark_col.png", _png(64))
+    output = tmp_path / "out"
+    catalog = LibraryCatalog.for_library(tmp_path, output)
+    thumbnails = ThumbnailCache.for_library(tmp_path, output, size=16)
+    service = ProcessingService(
+        _config(tmp_path), catalog=catalog, thumbnails=thumbnails
+    )
+    service.process(_state(["bark_col.png"]), {"pack": archive}, output)
+    [entry] = catalog.query()
+    data = thumbnails.get(entry.path, entry.mtime_ns)
+    assert data is not None
+    assert Image.open(io.BytesIO(data)).size == (16, 16)
+    thumbnails.close()
+    catalog.close()
@@ -0,0 +1,133 @@
+import json
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+from asset_organiser.processing import commit
+from asset_organiser.processing.commit import AssetCommitter
+
+
+def _stage(committer: AssetCommitter, text: str, *, complete=True) -> Path:
+    staged = committer.stage()
+    (staged / "map.png").write_text(text)
+    if complete:
+        committer.write_metadata(staged, {"asset_name": text})
+    return staged
+
+
+def test_commit_replaces_assets_atomically(tmp_path: Path) -> None:
+    final = tmp_path / "Acme" / "Bark"
+    final.mkdir(parents=True)
+    (final / "old.png").write_text("old")
+    with AssetCommitter(tmp_path) as committer:
+        staged = _stage(committer, "new")
+        assert staged.parent.parent.name == ".staging"
+        committer.publish(staged, final)
+        committer.publish(_stage(committer, "rock"), tmp_path / "Rock")
+        assert not (final / "map.png").exists()
+        assert committer.commit() == {}
+    assert sorted(p.name for p in final.iterdir()) == [
+        "map.png",
+        "metadata.json",
+    ]
+    assert (tmp_path / "Rock" / "map.png").read_text() == "rock"
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["Acme", "Rock"]
+
+
+# Stages three assets in a child process that then dies mid-commit,
+# after the old version of "Partial" was moved aside.
+_CRASH = """
+import json, os, sys
+from pathlib import Path
+from asset_organiser.processing import commit
+
+root = Path(sys.argv[1])
+committer = commit.AssetCommitter(root)
+staged = {}
+for name in ("new", "half", "stale"):
+    staged[name] = committer.stage()
+    (staged[name] / "map.png").write_text(name)
+    if name != "half":
+        committer.write_metadata(staged[name], {"asset_name": name})
+entries = [
+    commit._Publish(staged["new"], root / "Done").to_json(),
+    commit._Publish(staged["half"], root / "Partial").to_json(),
+]
+os.rename(root / "Partial", entries[1]["retired"])
+committer.journal_path.write_text(json.dumps(entries))
+print(json.dumps([str(staged["stale"]), entries[1]["retired"]]))
+os._exit(1)
+"""
+
+
+def test_recover_finishes_complete_and_drops_partial_assets(
+    tmp_path: Path,
+) -> None:
+    done = tmp_path / "Done"
+    done.mkdir()
+    (done / "map.png").write_text("old")
+    partial = tmp_path / "Partial"
+    partial.mkdir()
+    (partial / "map.png").write_text("kept")
+    live = AssetCommitter(tmp_path)
+    in_flight = _stage(live, "in flight")
+    script = textwrap.dedent(_CRASH)
+    output = subprocess.run(
+        [sys.executable, "-c", script, str(tmp_path)],
+        capture_output=True,
+        text=True,
+    ).stdout
+    stale, retired = (Path(p) for p in json.loads(output))
+
+    AssetCommitter(tmp_path).recover()
+    assert (done / "map.png").read_text() == "new"
+    assert (partial / "map.png").read_text() == "kept"
+    assert not retired.exists()
+    assert not stale.exists()
+    # The live committer's run is untouched by the other's recovery.
+    assert (in_flight / "metadata.json").is_file()
+    live.close()
+    assert not live.staging_root.exists()
+
+
+def test_cross_device_staging_copies_next_to_target(
+    tmp_path: Path, monkeypatch
+) -> None:
+    scratch = tmp_path / "scratch"
+    library = tmp_path / "library"
+    library.mkdir()
+    devices = {scratch: 1}
+    monkeypatch.setattr(commit, "_device", lambda p: devices.get(p, 2))
+    committer = AssetCommitter(library, staging_dir=scratch)
+    staged = _stage(committer, "new")
+    committer.publish(staged, library / "Bark")
+    assert committer.commit() == {}
+    assert (library / "Bark" / "map.png").read_text() == "new"
+    assert (library / "Bark" / "metadata.json").is_file()
+    assert not staged.exists()
+    assert sorted(p.name for p in library.iterdir()) == ["Bark"]
+
+
+def test_recover_drops_orphaned_runs_and_locks(tmp_path: Path) -> None:
+    root = AssetCommitter(tmp_path).staging_root
+    (root / "lost" / "asset-x").mkdir(parents=True)
+    (root / f"early{commit.LOCK_SUFFIX}").touch()
+    AssetCommitter(tmp_path).recover()
+    assert list(root.iterdir()) == []
+
+
+def test_close_tolerates_an_undeletable_lock(
+    tmp_path: Path,
+    monkeypatch,
+) -> None:
+    committer = AssetCommitter(tmp_path)
+    _stage(committer, "new")
+    lock_path = committer.lock_path
+
+    def unlink(path: Path, missing_ok: bool = False) -> None:
+        raise PermissionError(f"{path} is in use")
+
+    monkeypatch.setattr(Path, "unlink", unlink)
+    committer.close()
+    assert lock_path.exists() and not committer.run_dir.exists()
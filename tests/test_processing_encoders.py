@@ -0,0 +1,132 @@
+import io
+import zipfile
+from pathlib import Path
+
+import numpy as np
+import pytest
+from PIL import Image
+from test_processing_service import _state
+
+from asset_organiser import ConfigService
+from asset_organiser.config_models import (
+    ExportProfile,
+    FileTypeDefinition,
+    LibraryConfig,
+)
+from asset_organiser.processing import EncoderPool, ProcessingService
+from asset_organiser.processing.encoders import get_encoder
+from asset_organiser.processing.encoders.png import encode_png
+from asset_organiser.processing.imaging import decode_image
+
+
+def _gradient(dtype=np.uint8) -> np.ndarray:
+    top = np.iinfo(dtype).max
+    ramp = np.linspace(0, top, 64).astype(dtype)
+    return np.stack([np.tile(ramp, (64, 1))] * 3, axis=-1)
+
+
+def test_registry_resolves_modules_case_insensitively() -> None:
+    assert get_encoder("png").extension == "png"
+    assert get_encoder("JPEG").extension == "jpg"
+    with pytest.raises(ValueError):
+        get_encoder("BMP")
+
+
+def test_exr_encodes_float_channels(tmp_path: Path) -> None:
+    exr = pytest.importorskip("OpenEXR")
+    image = np.linspace(0, 4, 64 * 64 * 3, dtype=np.float32)
+    image = image.reshape(64, 64, 3)
+    encoder = get_encoder("EXR")
+    settings = {"bit_depth": "float", "compression": "ZIP"}
+    data = encoder.encode(image, settings)
+    assert data[:4] == b"v/1\x01"
+    path = tmp_path / "hdr.exr"
+    path.write_bytes(data)
+    with exr.File(str(path)) as read:
+        channels = read.channels()
+        assert set(channels) == {"RGB"}
+        pixels = channels["RGB"].pixels
+    assert np.allclose(pixels, image)
+
+
+def test_png_round_trips_both_bit_depths() -> None:
+    image = _gradient(np.uint16)[..., 0]
+    decoded = decode_image(encode_png(image))
+    assert decoded.dtype == np.uint16
+    assert decoded.max() == 65535
+    encoder = get_encoder("PNG")
+    data = encoder.encode(image, {"bit_depth": 8})
+    assert decode_image(data).dtype == np.uint8
+
+
+def test_jpeg_drops_alpha_and_honours_quality() -> None:
+    rgba = np.dstack([_gradient(), np.full((64, 64), 128, np.uint8)])
+    encoder = get_encoder("JPG")
+    small = encoder.encode(rgba, {"quality": 20})
+    large = encoder.encode(rgba, {"quality": 95})
+    assert len(small) < len(large)
+    assert Image.open(io.BytesIO(large)).mode == "RGB"
+
+
+def test_qoi_writes_lossless_image(tmp_path: Path) -> None:
+    image = _gradient()
+    target = tmp_path / "map.qoi"
+    get_encoder("QOI").write(image, target, {})
+    assert np.array_equal(decode_image(target), image)
+
+
+def test_pool_encodes_in_background_and_records_metrics(
+    tmp_path: Path,
+) -> None:
+    profiles = {"Preview": ExportProfile(module="JPG")}
+    with EncoderPool(profiles, max_workers=2, max_pending=1) as pool:
+        image = _gradient()
+        futures = []
+        for i in range(4):
+            target = tmp_path / f"{i}.jpg"
+            futures.append(pool.submit("Preview", image, target))
+        futures.append(pool.submit("PNG", _gradient(), tmp_path / "a.png"))
+        pool.wait(futures)
+        with pytest.raises(ValueError):
+            pool.submit("Missing", _gradient(), tmp_path / "x.png")
+    metrics = pool.metrics()
+    assert metrics["Preview"].files == 4
+    assert metrics["PNG"].files == 1
+    written = (tmp_path / "0.jpg").stat().st_size
+    assert metrics["Preview"].output_bytes == written * 4
+    assert metrics["Preview"].input_bytes == 4 * 64 * 64 * 3
+
+
+def test_service_picks_profiles_per_filetype(tmp_path: Path) -> None:
+    config = ConfigService(app_config_path=tmp_path / "settings.json")
+    config.settings.IMAGE_RESOLUTIONS = {"PREVIEW": 32, "SMALL": 16}
+    config.settings.RESOLUTION_THRESHOLD_FOR_LOSSY = 32
+    config.settings.DEFAULT_EXPORT_PROFILES = {"8-bit-lossy": "Lossy"}
+    config.library_config = LibraryConfig(
+        FILE_TYPE_DEFINITIONS={
+            "MAP_COL": FileTypeDefinition(alias="COL"),
+            "MAP_NRM": FileTypeDefinition(
+                alias="NRM",
+                OVERRIDE_EXPORT_PROFILES={"8-bit-lossy": "PNG"},
+            ),
+        },
+        PROCESSING={
+            "FILE_EXPORT_PROFILES": {
+                "Lossy": {"module": "JPG", "settings": {"quality": 80}}
+            }
+        },
+    )
+    archive = tmp_path / "pack.zip"
+    names = ["bark_col.png", "bark_nrm.png"]
+    with zipfile.ZipFile(archive, "w") as zf:
+        for name in names:
+            zf.writestr(name, encode_png(_gradient()))
+    service = ProcessingService(config)
+    report = service.process(_state(names), {"pack": archive}, tmp_path)
+    assert not report.errors
+    files = report.assets[0].files
+    assert "Bark_COL_PREVIEW.jpg" in files
+    assert "Bark_COL_SMALL.png" in files
+    assert "Bark_NRM_PREVIEW.png" in files
+    assert report.encoding["Lossy"].files == 1
+    assert report.encoding["PNG"].files == 3
@@ -0,0 +1,69 @@
+import zipfile
+from pathlib import Path
+
+import pytest
+from test_processing_service import _config, _png, _state
+
+from asset_organiser.classification import ClassificationState
+from asset_organiser.processing import ProcessingService
+from asset_organiser.processing.paths import (
+    DIRECTORY_TOKENS,
+    PathTemplate,
+    compile_template,
+    find_collisions,
+    sanitize_name,
+)
+
+
+def test_template_formats_and_sanitises_values() -> None:
+    template = compile_template("[Supplier]/[assettype]/[assetname]")
+    assert template.tokens == DIRECTORY_TOKENS
+    path = template(supplier="Acme: Inc.", assettype="a/b", assetname="CON")
+    assert path == "Acme_ Inc/a_b/_CON"
+    assert compile_template("[supplier]/[assetname]") is compile_template(
+        "[supplier]/[assetname]"
+    )
+
+
+def test_sanitize_name_handles_degenerate_values() -> None:
+    assert sanitize_name("..") == "_"
+    assert sanitize_name("  ") == "_"
+    assert sanitize_name("lpt1.txt") == "_lpt1.txt"
+    assert sanitize_name("Bark\tWood?") == "Bark_Wood_"
+
+
+@pytest.mark.parametrize(
+    "pattern",
+    ["[assetname]_[size]", "[assetname", "/[assetname]", "../[assetname]"],
+)
+def test_invalid_patterns_are_rejected(pattern: str) -> None:
+    with pytest.raises(ValueError):
+        PathTemplate(pattern, DIRECTORY_TOKENS)
+
+
+def test_find_collisions_is_case_insensitive() -> None:
+    claims = [("a", "Acme/Bark"), ("b", "acme/bark"), ("c", "Acme/Rock")]
+    assert find_collisions(claims) == {"Acme/Bark": ["a", "b"]}
+
+
+def test_service_rejects_unknown_tokens(tmp_path: Path) -> None:
+    config = _config(tmp_path)
+    config.settings.OUTPUT_FILENAME_PATTERN = "[assetname]_[colour]"
+    with pytest.raises(ValueError, match="colour"):
+        ProcessingService(config)
+
+
+def test_colliding_assets_are_not_written(tmp_path: Path) -> None:
+    archives = {}
+    for name in ("one", "two"):
+        archives[name] = tmp_path / f"{name}.zip"
+        with zipfile.ZipFile(archives[name], "w") as zf:
+            zf.writestr("bark_col.png", _png(32))
+    source = _state(["bark_col.png"]).sources["pack"]
+    state = ClassificationState(sources={"one": source, "two": source})
+    output = tmp_path / "out"
+    service = ProcessingService(_config(tmp_path))
+    report = service.process(state, archives, output)
+    assert len(report.errors) == 2
+    assert "PathCollisionError" in report.errors[0].error
+    assert not (output / "Acme").exists()
@@ -0,0 +1,182 @@
+import io
+import struct
+import zipfile
+import zlib
+from pathlib import Path
+
+import pytest
+
+from asset_organiser.processing import HeaderProbe, ImageInfo, probe_stream
+from asset_organiser.processing.probe import HEADER_BYTES, READ_CHUNK
+
+
+def _chunk(kind: bytes, data: bytes) -> bytes:
+    crc = zlib.crc32(kind + data)
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", crc)
+
+
+def make_png(width: int, height: int, color: int = 2, trns=False) -> bytes:
+    ihdr = struct.pack(">IIBBBBB", width, height, 8, color, 0, 0, 0)
+    data = b"\x89PNG\r\n\x1a\n" + _chunk(b"IHDR", ihdr)
+    if trns:
+        data += _chunk(b"tRNS", b"\x00\x00")
+    data += _chunk(b"IDAT", zlib.compress(b"\x00" * 16))
+    return data + _chunk(b"IEND", b"")
+
+
+def make_jpeg(width: int, height: int, exif_size: int = 0) -> bytes:
+    data = b"\xff\xd8"
+    if exif_size:
+        data += b"\xff\xe1" + struct.pack(">H", exif_size + 2)
+        data += b"\x00" * exif_size
+    sof = struct.pack(">BHHB", 8, height, width, 3) + b"\x00" * 9
+    data += b"\xff\xc0" + struct.pack(">H", len(sof) + 2) + sof
+    return data + b"\xff\xda\x00\x02\xff\xd9"
+
+
+def make_tga(width: int, height: int, depth: int = 32) -> bytes:
+    header = struct.pack(
+        "<BBB5sHHHHBB",
+        0,
+        0,
+        2,
+        b"",
+        0,
+        0,
+        width,
+        height,
+        depth,
+        8 if depth == 32 else 0,
+    )
+    return header + b"\x00" * 16
+
+
+def make_tiff(width: int, height: int) -> bytes:
+    entries = [
+        (256, 3, 1, width),
+        (257, 4, 1, height),
+        (258, 3, 1, 16),
+        (277, 3, 1, 4),
+        (338, 3, 1, 2),
+    ]
+    ifd = struct.pack("<H", len(entries))
+    for tag, kind, count, value in entries:
+        fmt = "<HHIH2x" if kind == 3 else "<HHII"
+        ifd += struct.pack(fmt, tag, kind, count, value)
+    return b"II*\x00" + struct.pack("<I", 8) + ifd + b"\x00" * 4
+
+
+def make_exr(width: int, height: int) -> bytes:
+    channels = b""
+    for name in (b"A", b"B", b"G", b"R"):
+        channels += name + b"\x00" + struct.pack("<iB3xii", 1, 0, 1, 1)
+    channels += b"\x00"
+    window = struct.pack("<iiii", 0, 0, width - 1, height - 1)
+    header = b"v/1\x01" + struct.pack("<I", 2)
+    for name, kind, value in (
+        (b"channels", b"chlist", channels),
+        (b"dataWindow", b"box2i", window),
+    ):
+        header += name + b"\x00" + kind + b"\x00"
+        header += struct.pack("<I", len(value)) + value
+    return header + b"\x00"
+
+
+@pytest.mark.parametrize(
+    "name, data, expected",
+    [
+        ("a.png", make_png(64, 32), ("PNG", 64, 32, 3, 8, False)),
+        ("a.png", make_png(8, 8, color=6), ("PNG", 8, 8, 4, 8, True)),
+        ("a.png", make_png(8, 8, trns=True), ("PNG", 8, 8, 4, 8, True)),
+        ("a.jpg", make_jpeg(300, 200), ("JPEG", 300, 200, 3, 8, False)),
+        ("a.tga", make_tga(16, 8), ("TGA", 16, 8, 4, 8, True)),
+        ("a.tga", make_tga(16, 8, 24), ("TGA", 16, 8, 3, 8, False)),
+        ("a.tga", make_tga(16, 8, 16), ("TGA", 16, 8, 3, 5, False)),
+        ("a.tif", make_tiff(40, 20), ("TIFF", 40, 20, 4, 16, True)),
+        ("a.exr", make_exr(128, 64), ("EXR", 128, 64, 4, 16, True)),
+    ],
+)
+def test_probe_formats(name: str, data: bytes, expected: tuple) -> None:
+    info = probe_stream(io.BytesIO(data), name)
+    actual = (
+        info.format,
+        info.width,
+        info.height,
+        info.channels,
+        info.bit_depth,
+        info.has_alpha,
+    )
+    assert actual == expected
+
+
+def test_jpeg_frame_beyond_initial_read() -> None:
+    info = probe_stream(io.BytesIO(make_jpeg(10, 20, exif_size=60000)))
+    assert (info.width, info.height) == (10, 20)
+
+
+def test_tiff_directory_far_out_pointing_into_the_gap() -> None:
+    # The IFD sits beyond the initial read and the seek threshold, while
+    # its BitsPerSample array lives between the two.
+    bits_offset = HEADER_BYTES + 1000
+    ifd_offset = HEADER_BYTES + READ_CHUNK + 50000
+    entries = [
+        struct.pack("<HHIH2x", 256, 3, 1, 40),
+        struct.pack("<HHII", 257, 4, 1, 20),
+        struct.pack("<HHII", 258, 3, 4, bits_offset),
+        struct.pack("<HHIH2x", 277, 3, 1, 4),
+    ]
+    data = bytearray(ifd_offset + 2 + 12 * len(entries) + 4)
+    data[:8] = b"II*\x00" + struct.pack("<I", ifd_offset)
+    data[bits_offset : bits_offset + 8] = struct.pack("<4H", 16, 16, 16, 16)
+    ifd = struct.pack("<H", len(entries)) + b"".join(entries)
+    data[ifd_offset : ifd_offset + len(ifd)] = ifd
+    info = probe_stream(io.BytesIO(bytes(data)), "far.tif")
+    assert (info.width, info.height, info.channels) == (40, 20, 4)
+    assert info.bit_depth == 16
+
+
+def test_unsupported_format_raises() -> None:
+    with pytest.raises(ValueError):
+        probe_stream(io.BytesIO(b"not an image"), "readme.txt")
+
+
+def test_image_info_helpers() -> None:
+    info = ImageInfo(
+        format="PNG",
+        width=2048,
+        height=1024,
+        channels=4,
+        bit_depth=16,
+    )
+    assert info.estimated_bytes == 2048 * 1024 * 4 * 2
+    resolutions = {"4K": 4096, "2K": 2048, "1K": 1024}
+    assert info.resolutions(resolutions) == {"2K": 2048, "1K": 1024}
+
+
+def test_probe_many_reads_zip_members_and_caches(tmp_path: Path) -> None:
+    archive = tmp_path / "source.zip"
+    with zipfile.ZipFile(archive, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("tex/wood_col.png", make_png(512, 256))
+        zf.writestr("tex/wood_nrm.jpg", make_jpeg(512, 256))
+        zf.writestr("readme.txt", "hello")
+    loose = tmp_path / "hdri.exr"
+    loose.write_bytes(make_exr(64, 32))
+
+    probe = HeaderProbe(max_workers=4)
+    targets = [
+        (archive, "tex/wood_col.png"),
+        (archive, "tex/wood_nrm.jpg"),
+        (archive, "readme.txt"),
+        loose,
+    ]
+    results = probe.probe_many(targets)
+    assert results[(archive, "tex/wood_col.png")].width == 512
+    assert results[(archive, "tex/wood_nrm.jpg")].format == "JPEG"
+    assert results[(archive, "readme.txt")] is None
+    assert results[loose].format == "EXR"
+
+    # Cached results are returned without touching the file again.
+    first = probe.probe_file(loose)
+    assert probe.probe_file(loose) is first
+    loose.write_bytes(make_exr(32, 16) + b"\x00")
+    assert probe.probe_file(loose).width == 32
@@ -0,0 +1,236 @@
+import json
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+from test_processing_probe import make_exr
+
+import asset_organiser.processing.imaging as imaging
+from asset_organiser import ConfigService
+from asset_organiser.classification import ClassificationState
+from asset_organiser.config_models import FileTypeDefinition, LibraryConfig
+from asset_organiser.processing import ProcessingService, SourceReader
+from asset_organiser.processing.encoders.png import encode_png
+from asset_organiser.processing.imaging import decode_image
+
+
+def _png(size: int, channels: int = 3) -> bytes:
+    rng = np.random.default_rng(size)
+    shape = (size, size, channels)
+    return encode_png(rng.integers(0, 256, shape, dtype=np.uint8))
+
+
+def _config(tmp_path: Path) -> ConfigService:
+    service = ConfigService(app_config_path=tmp_path / "settings.json")
+    service.settings.IMAGE_RESOLUTIONS = {"1K": 1024, "PREVIEW": 32}
+    service.settings.CALCULATE_STATS_RESOLUTION = "PREVIEW"
+    service.library_config = LibraryConfig(
+        FILE_TYPE_DEFINITIONS={
+            "MAP_COL": FileTypeDefinition(alias="COL"),
+            "MAP_NRM": FileTypeDefinition(alias="NRM"),
+        }
+    )
+    return service
+
+
+def _process(config, state, path: Path, output: Path):
+    service = ProcessingService(config)
+    return service.process(state, {"pack": path}, output)
+
+
+def _state(names: list[str]) -> ClassificationState:
+    types = {".png": None, ".fbx": "FILE_MODEL", ".txt": "FILE_EXTRA"}
+    contents = {}
+    for i, name in enumerate(names):
+        filetype = types.get(Path(name).suffix)
+        if filetype is None:
+            filetype = "MAP_COL" if "col" in name else "MAP_NRM"
+        contents[str(i)] = {"filename": name, "filetype": filetype}
+    data = {
+        "sources": {
+            "pack": {
+                "metadata": {"supplier": "Acme"},
+                "contents": contents,
+                "assets": {
+                    "0": {
+                        "asset_name": "Bark",
+                        "asset_type": "Surface",
+                        "asset_tags": ["wood"],
+                        "asset_contents": list(contents),
+                    }
+                },
+            }
+        }
+    }
+    return ClassificationState.model_validate(data)
+
+
+def test_archive_reader_streams_members_in_parallel(tmp_path: Path) -> None:
+    archive = tmp_path / "pack.zip"
+    with zipfile.ZipFile(archive, "w", zipfile.ZIP_DEFLATED) as zf:
+        for i in range(6):
+            zf.writestr(f"maps/file{i}.bin", bytes([i]) * 10000)
+    with SourceReader.for_path(archive) as reader:
+        members = reader.members()
+        result = dict(reader.read_many(members, max_workers=3))
+        assert [m for m in result] == members
+        assert result["maps/file3.bin"] == b"\x03" * 10000
+        spilled = reader.local_path("maps/file1.bin")
+        assert spilled.read_bytes() == b"\x01" * 10000
+        stats = reader.stats
+        assert stats.uncompressed_bytes == 70000
+        assert stats.compressed_bytes < stats.uncompressed_bytes
+        assert stats.spilled_bytes == 10000
+        assert stats.extraction_bytes_saved == 50000
+    assert not spilled.exists()
+
+
+def test_only_path_decoders_spill_members(tmp_path: Path, monkeypatch) -> None:
+    archive = tmp_path / "pack.zip"
+    names = [f"Bark_col_{i}.png" for i in range(8)]
+    with zipfile.ZipFile(archive, "w") as zf:
+        for i, name in enumerate(names):
+            zf.writestr(name, bytes([i]) * 100)
+    with SourceReader.for_path(archive) as reader:
+        with ThreadPoolExecutor(4) as pool:
+            paths = list(pool.map(reader.local_path, names * 2))
+        assert len(set(paths)) == len(names)
+        assert paths[3].read_bytes() == bytes([3]) * 100
+        assert reader.stats.spilled_bytes == 800
+
+    names = ["Bark_col.png", "Bark_nrm.exr"]
+    with zipfile.ZipFile(archive, "w") as zf:
+        zf.writestr(names[0], _png(64))
+        zf.writestr(names[1], make_exr(64, 64))
+    config, state = _config(tmp_path), _state(names)
+    report = _process(config, state, archive, tmp_path / "a")
+    assert report.io["pack"].spilled_bytes == 0
+
+    decoded = []
+
+    def decode_exr(path: Path) -> np.ndarray:
+        decoded.append(path.read_bytes())
+        return np.zeros((64, 64, 3), dtype=np.uint8)
+
+    monkeypatch.setitem(imaging._PATH_DECODERS, ".exr", decode_exr)
+    report = _process(config, state, archive, tmp_path / "b")
+    assert decoded == [make_exr(64, 64)]
+    assert report.io["pack"].spilled_bytes == len(decoded[0])
+    assert "Bark_NRM_PREVIEW.png" in report.assets[0].files
+
+
+def test_process_zip_source_without_extraction(tmp_path: Path) -> None:
+    archive = tmp_path / "pack.zip"
+    names = ["Bark_col.png", "Bark_nrm.png", "Bark.fbx", "notes.txt"]
+    with zipfile.ZipFile(archive, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr(names[0], _png(64))
+        zf.writestr(names[1], _png(64, channels=4))
+        zf.writestr(names[2], b"model")
+        zf.writestr(names[3], b"notes")
+
+    service = ProcessingService(_config(tmp_path))
+    output = tmp_path / "library"
+    report = service.process(_state(names), {"pack": archive}, output)
+
+    assert not report.errors
+    asset_dir = output / "Acme" / "Surface" / "Bark"
+    assert report.assets[0].files == [
+        "Bark.fbx",
+        "Bark_COL_PREVIEW.png",
+        "Bark_NRM_PREVIEW.png",
+        "Extra/notes.txt",
+        "metadata.json",
+    ]
+    preview = decode_image((asset_dir / "Bark_NRM_PREVIEW.png").read_bytes())
+    assert preview.shape == (32, 32, 4)
+
+    metadata = json.loads((asset_dir / "metadata.json").read_text())
+    assert metadata["asset_name"] == "Bark"
+    assert metadata["tags"] == ["wood"]
+    assert metadata["available_resolutions"] == ["PREVIEW"]
+    col = next(f for f in metadata["files"] if f["type"] == "MAP_COL")
+    assert col["resolutions"]["PREVIEW"]["dimensions"] == [32, 32]
+    assert set(col["stats"]) == {"R", "G", "B"}
+    assert not list(output.glob(".processing-*"))
+
+    io = report.io["pack"]
+    assert io.spilled_bytes == 0
+    assert io.extraction_bytes_saved == io.archive_bytes
+
+
+def test_process_directory_source(tmp_path: Path) -> None:
+    source = tmp_path / "pack"
+    source.mkdir()
+    (source / "Bark_col.png").write_bytes(_png(2048))
+    state = _state([str(source / "Bark_col.png")])
+
+    service = ProcessingService(_config(tmp_path))
+    report = service.process(state, {"pack": source}, tmp_path / "out")
+    assert report.assets[0].files == [
+        "Bark_COL_1K.png",
+        "Bark_COL_PREVIEW.png",
+        "metadata.json",
+    ]
+
+
+def test_missing_source_path_is_reported(tmp_path: Path) -> None:
+    service = ProcessingService(_config(tmp_path))
+    report = service.process(_state(["a_col.png"]), {}, tmp_path / "out")
+    assert report.errors[0].error
+
+
+def test_reprocessing_skips_unchanged_assets(tmp_path: Path) -> None:
+    source = tmp_path / "pack"
+    source.mkdir()
+    names = [str(source / "Bark_col.png"), str(source / "Bark_nrm.png")]
+    (source / "Bark_col.png").write_bytes(_png(64))
+    (source / "Bark_nrm.png").write_bytes(_png(64, channels=4))
+    output = tmp_path / "out"
+    config = _config(tmp_path)
+
+    first = _process(config, _state(names), source, output)
+    assert not first.assets[0].skipped
+    metadata_path = output / "Acme" / "Surface" / "Bark" / "metadata.json"
+    metadata = json.loads(metadata_path.read_text())
+    assert set(metadata["fingerprint"]["outputs"]) == {
+        "Bark_COL_PREVIEW.png",
+        "Bark_NRM_PREVIEW.png",
+    }
+
+    second = _process(config, _state(names), source, output)
+    assert second.assets[0].skipped
+    assert json.loads(metadata_path.read_text()) == metadata
+
+    # Changing one source only regenerates the outputs derived from it.
+    (source / "Bark_nrm.png").write_bytes(_png(48, channels=4))
+    third = _process(config, _state(names), source, output)
+    assert not third.assets[0].skipped
+    assert third.assets[0].reused == ["Bark_COL_PREVIEW.png"]
+
+    # Metadata-only edits reuse every image.
+    state = _state(names)
+    state.sources["pack"].assets["0"].asset_tags = ["bark"]
+    fourth = _process(config, state, source, output)
+    assert fourth.assets[0].reused == [
+        "Bark_COL_PREVIEW.png",
+        "Bark_NRM_PREVIEW.png",
+    ]
+    assert json.loads(metadata_path.read_text())["tags"] == ["bark"]
+
+
+def test_reprocessing_regenerates_deleted_outputs(tmp_path: Path) -> None:
+    archive = tmp_path / "pack.zip"
+    with zipfile.ZipFile(archive, "w") as zf:
+        zf.writestr("Bark_col.png", _png(64))
+    output = tmp_path / "out"
+    config = _config(tmp_path)
+    state = _state(["Bark_col.png"])
+    _process(config, state, archive, output)
+    preview = output / "Acme" / "Surface" / "Bark" / "Bark_COL_PREVIEW.png"
+    preview.unlink()
+
+    report = _process(config, _state(["Bark_col.png"]), archive, output)
+    assert not report.assets[0].skipped
+    assert report.assets[0].reused == []
+    assert preview.exists()
@@ -0,0 +1,95 @@
+import numpy as np
+import pytest
+
+from asset_organiser.config_models import GeneralSettings
+from asset_organiser.processing.stats import (
+    compute_channel_stats,
+    pyramid_level,
+    resolve_stats_size,
+)
+
+
+def test_integer_stats_match_numpy() -> None:
+    rng = np.random.default_rng(0)
+    image = rng.integers(0, 256, size=(31, 17, 3), dtype=np.uint8)
+    stats = compute_channel_stats(image)
+    assert list(stats) == ["R", "G", "B"]
+    for index, name in enumerate(stats):
+        channel = image[..., index].astype(np.float64) / 255
+        assert stats[name].min == pytest.approx(channel.min())
+        assert stats[name].max == pytest.approx(channel.max())
+        assert stats[name].mean == pytest.approx(channel.mean())
+        assert stats[name].median == pytest.approx(np.median(channel))
+
+
+def test_sixteen_bit_and_grayscale() -> None:
+    image = np.array([[0, 65535], [32768, 32768]], dtype=np.uint16)
+    stats = compute_channel_stats(image)
+    assert list(stats) == ["Gray"]
+    assert stats["Gray"].min == 0.0
+    assert stats["Gray"].max == 1.0
+    assert stats["Gray"].median == pytest.approx(32768 / 65535)
+
+
+def test_even_pixel_count_median_averages_middle_values() -> None:
+    image = np.array([[0, 10], [20, 255]], dtype=np.uint8)
+    stats = compute_channel_stats(image)
+    assert stats["Gray"].median == pytest.approx(15 / 255)
+    hdr = np.array([[0.0, 1.0], [3.0, 8.0]], dtype=np.float32)
+    stats = compute_channel_stats(hdr)
+    assert stats["Gray"].max == 8.0
+    assert stats["Gray"].median == pytest.approx(2.0, abs=0.01)
+
+
+def test_float_stats_use_histogram_median() -> None:
+    rng = np.random.default_rng(1)
+    image = rng.random((64, 64, 4), dtype=np.float32)
+    stats = compute_channel_stats(image)
+    assert list(stats) == ["R", "G", "B", "A"]
+    alpha = image[..., 3]
+    assert stats["A"].min == pytest.approx(alpha.min())
+    assert stats["A"].mean == pytest.approx(alpha.mean(), rel=1e-6)
+    assert stats["A"].median == pytest.approx(np.median(alpha), abs=1e-3)
+
+
+def test_constant_float_channel() -> None:
+    image = np.full((4, 4), 0.25, dtype=np.float32)
+    stats = compute_channel_stats(image)
+    assert stats["Gray"].median == pytest.approx(0.25)
+
+
+def test_non_finite_float_pixels_are_ignored() -> None:
+    rows = [
+        [[0.0, 1.0, np.nan], [np.inf, 3.0, np.nan]],
+        [[2.0, -np.inf, 0.5], [2.0, -np.inf, 0.5]],
+    ]
+    image = np.array(rows, dtype=np.float32)
+    stats = compute_channel_stats(image)
+    assert stats["R"].model_dump() == pytest.approx(
+        {"min": 0.0, "max": 2.0, "mean": 4 / 3, "median": 2.0}, abs=1e-3
+    )
+    assert stats["G"].max == 3.0 and stats["G"].mean == pytest.approx(2.0)
+    assert stats["B"].model_dump() == pytest.approx(
+        {"min": 0.5, "max": 0.5, "mean": 0.5, "median": 0.5}
+    )
+    blank = compute_channel_stats(np.full((2, 2), np.nan, dtype=np.float32))
+    assert blank["Gray"].mean == 0.0
+
+
+def test_pyramid_level_limits_size_without_copy() -> None:
+    image = np.zeros((1000, 400, 3), dtype=np.uint8)
+    level = pyramid_level(image, 256)
+    assert max(level.shape[:2]) <= 256
+    assert np.shares_memory(level, image)
+    assert pyramid_level(image, None) is image
+
+
+def test_resolve_stats_size() -> None:
+    settings = GeneralSettings(
+        IMAGE_RESOLUTIONS={"1K": 1024, "4K": 4096},
+        CALCULATE_STATS_RESOLUTION="1K",
+    )
+    assert resolve_stats_size(settings) == 1024
+    assert resolve_stats_size(GeneralSettings()) is None
+    with pytest.raises(KeyError):
+        resolve_stats_size(settings, {"2K": 2048})
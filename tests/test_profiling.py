@@ -0,0 +1,72 @@
+import io
+import json
+import threading
+from pathlib import Path
+
+from test_cli import _library, _source
+
+from asset_organiser import profiling
+from asset_organiser.cli import build_parser, run_batch
+from asset_organiser.config_service import ConfigService
+
+
+def _busy(stop: threading.Event) -> None:
+    while not stop.is_set():
+        sum(range(1000))
+
+
+def test_profiler_collapses_stacks_of_other_threads(tmp_path: Path) -> None:
+    stop = threading.Event()
+    worker = threading.Thread(target=_busy, args=(stop,), name="busy")
+    worker.start()
+    try:
+        with profiling.SamplingProfiler(interval=0.001) as profiler:
+            while profiler.samples < 20:
+                threading.Event().wait(0.005)
+    finally:
+        stop.set()
+        worker.join()
+
+    path = profiler.write(tmp_path / "profile.collapsed")
+    lines = path.read_text().splitlines()
+    stacks = [line.rpartition(" ") for line in lines]
+    assert all(count.isdigit() for _, _, count in stacks)
+    busy = [stack for stack, _, _ in stacks if stack.startswith("busy;")]
+    assert any(stack.split(";")[-1].startswith("_busy (") for stack in busy)
+    assert not any("sampling-profiler" in stack for stack, _, _ in stacks)
+
+
+def test_session_only_profiles_when_enabled(tmp_path: Path) -> None:
+    config = ConfigService(app_config_path=tmp_path / "settings.json")
+    config.set_library_path(tmp_path)
+    with profiling.session(config, "off") as profiler:
+        assert profiler is None
+    assert not profiling.log_dir(tmp_path).exists()
+
+    config.settings.PROFILING_ENABLED = True
+    with profiling.session(config, "on") as profiler:
+        assert profiler is not None
+    assert profiler.output.parent == profiling.log_dir(tmp_path)
+    assert profiler.output.exists()
+    # Sessions started within the same second keep their own files.
+    with profiling.session(config, "on") as again:
+        pass
+    assert again.output != profiler.output and profiler.output.exists()
+
+
+def test_batch_profile_flag_writes_profile_next_to_logs(
+    tmp_path: Path,
+) -> None:
+    library, settings = _library(tmp_path)
+    source = _source(tmp_path, "bark")
+    argv = [str(source), "--library", str(library), "--no-llm"]
+    argv += ["--settings", str(settings), "--profile"]
+    out = io.StringIO()
+    assert run_batch(build_parser().parse_args(argv), out) == 0
+
+    events = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert [e["event"] for e in events][-2:] == ["profile", "done"]
+    path = Path(events[-2]["path"])
+    assert path.parent == profiling.log_dir(library)
+    assert path.name.startswith("profile-ingest-")
+    assert path.exists()
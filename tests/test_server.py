@@ -0,0 +1,227 @@
+import asyncio
+import json
+import urllib.error
+import urllib.request
+from functools import partial
+from pathlib import Path
+
+import pytest
+from test_cli import _library, _source
+
+from asset_organiser.config_models import FileTypeDefinition
+from asset_organiser.config_service import ConfigService
+from asset_organiser.llm import NoOpLLMClient
+from asset_organiser.server import ApiServer
+
+
+def _request(url: str, payload=None, method=None, headers=None):
+    data = None if payload is None else json.dumps(payload).encode()
+    headers = {"Content-Type": "application/json", **(headers or {})}
+    request = urllib.request.Request(url, data, headers, method=method)
+    try:
+        with urllib.request.urlopen(request, timeout=60) as response:
+            status, body = response.status, response.read()
+            kind = response.headers.get_content_type()
+    except urllib.error.HTTPError as exc:
+        status, body = exc.code, exc.read()
+        kind = exc.headers.get_content_type()
+    if kind == "application/x-ndjson":
+        return status, [json.loads(line) for line in body.splitlines()]
+    return status, json.loads(body) if body else None
+
+
+def _call(server: ApiServer, path: str, payload=None, **kwargs):
+    url = server.url + path
+    return asyncio.to_thread(_request, url, payload, **kwargs)
+
+
+def _server(tmp_path: Path, **kwargs) -> ApiServer:
+    library, settings = _library(tmp_path)
+    config = ConfigService(app_config_path=settings)
+    config.set_library_path(library)
+    return ApiServer(config, port=0, llm_client=NoOpLLMClient(), **kwargs)
+
+
+def test_server_classifies_processes_and_searches(tmp_path: Path) -> None:
+    source = _source(tmp_path, "bark")
+    server = _server(tmp_path)
+
+    async def scenario() -> None:
+        async with server:
+            call = partial(_call, server)
+            status, health = await call("/health")
+            assert status == 200 and health["status"] == "ok"
+
+            files = ["bark_col.png", "bark_nrm.png"]
+            status, result = await call("/classify", {"files": files})
+            assert status == 200
+            contents = result["contents"].values()
+            types = {c["filename"]: c["filetype"] for c in contents}
+            assert types == dict(zip(files, ["MAP_COL", "MAP_NRM"]))
+
+            sources = {"sources": [str(source)]}
+            status, job = await call("/jobs", sources)
+            assert status == 202 and job["state"] in ("queued", "running")
+            path = f"/jobs/{job['id']}"
+            status, events = await call(path + "/events")
+            assert status == 200
+            assert [e["seq"] for e in events] == list(range(len(events)))
+            assert events[-1]["event"] == "done"
+            assert events[-1]["failed"] == 0
+            assert any(e["event"] == "asset" for e in events)
+
+            status, job = await call(path)
+            assert job["state"] == "done" and job["failed"] == 0
+            status, tail = await call(path + "/events?after=2")
+            assert tail == events[2:]
+
+            status, found = await call("/library/assets?q=bar")
+            assert [asset["name"] for asset in found["assets"]] == ["bark"]
+            status, facets = await call("/library/facets/filetypes")
+            assert set(facets) >= {"MAP_COL", "MAP_NRM"}
+            status, hits = await call("/search?q=bark&k=5")
+            assert hits["results"][0]["asset"]["name"] == "bark"
+
+    asyncio.run(scenario())
+
+
+def test_server_embeds_imports_in_the_background(tmp_path: Path) -> None:
+    source = _source(tmp_path, "bark")
+    server = _server(tmp_path)
+    server.config.library_config.INDEXING.enable_semantic_search = True
+
+    async def scenario() -> None:
+        async with server:
+            call = partial(_call, server)
+            assert server._embedding is not None
+            status, job = await call("/jobs", {"sources": [str(source)]})
+            await call(f"/jobs/{job['id']}/events")
+            assert await asyncio.to_thread(server._embedding.wait, 10)
+            assert len(server._index) == 1
+            status, hits = await call("/search?q=bark&k=5")
+            assert hits["results"][0]["asset"]["name"] == "bark"
+            status, state = await call("/library/embedding/pause", {})
+            assert status == 200 and state["paused"] and state["done"] == 1
+            assert server._embedding.paused
+            status, state = await call("/library/embedding")
+            assert state["state"] == "paused"
+            status, state = await call("/library/embedding/resume", {})
+            assert not state["paused"] and not server._embedding.paused
+
+    asyncio.run(scenario())
+
+
+def test_library_config_is_reloaded_between_jobs_only(tmp_path: Path) -> None:
+    source = _source(tmp_path, "bark")
+    server = _server(tmp_path)
+    config = ConfigService(app_config_path=server.config.app_config_path)
+    config.set_library_path(server.config.library_path)
+
+    async def scenario() -> None:
+        async with server:
+            call = partial(_call, server)
+            version = server.config.version
+            definition = FileTypeDefinition(alias="RGH", rule_keywords=["_"])
+            config.library_config.FILE_TYPE_DEFINITIONS["MAP_RGH"] = definition
+            config.save_library_config()
+            status, _ = await call("/classify", {"files": ["bark_col.png"]})
+            assert status == 200 and server.config.version == version
+            status, job = await call("/jobs", {"sources": [str(source)]})
+            await call(f"/jobs/{job['id']}/events")
+            assert server.config.version > version
+            types = server.config.library_config.FILE_TYPE_DEFINITIONS
+            assert "MAP_RGH" in types
+
+    asyncio.run(scenario())
+
+
+def test_broken_library_config_fails_the_job_only(tmp_path: Path) -> None:
+    source = _source(tmp_path, "bark")
+    server = _server(tmp_path)
+    path = server.config.library_path / ".asset-library" / "suppliers.json"
+    saved = path.read_text()
+
+    async def scenario() -> None:
+        async with server:
+            call = partial(_call, server)
+            library = server.config.library_config
+            path.write_text("{")
+            status, job = await call("/jobs", {"sources": [str(source)]})
+            _, events = await call(f"/jobs/{job['id']}/events")
+            assert events[-1]["event"] == "error"
+            assert events[-1]["stage"] == "config"
+            assert (await call(f"/jobs/{job['id']}"))[1]["state"] == "failed"
+            assert server.config.library_config is library
+            path.write_text(saved + " ")
+            status, job = await call("/jobs", {"sources": [str(source)]})
+            await call(f"/jobs/{job['id']}/events")
+            assert (await call(f"/jobs/{job['id']}"))[1]["state"] == "done"
+
+    asyncio.run(scenario())
+
+
+def test_server_rejects_bad_requests(tmp_path: Path) -> None:
+    server = _server(tmp_path, max_queued=1)
+
+    async def scenario() -> None:
+        async with server:
+            call = partial(_call, server)
+            status, body = await call("/jobs", {"sources": "x"})
+            assert status == 400 and "sources" in body["error"]
+            assert (await call("/jobs/99"))[0] == 404
+            assert (await call("/classify"))[0] == 405
+            assert (await call("/library/facets/colour"))[0] == 404
+            assert (await call("/library/embedding"))[0] == 409
+            foreign = {"Host": "attacker.example:8765"}
+            assert (await call("/health", headers=foreign))[0] == 403
+
+    asyncio.run(scenario())
+
+
+def test_server_refuses_cross_site_requests(tmp_path: Path) -> None:
+    source = _source(tmp_path, "bark")
+    server = _server(tmp_path)
+
+    async def scenario() -> None:
+        async with server:
+            call = partial(_call, server, "/jobs", {"sources": [str(source)]})
+            foreign = {"Origin": "https://attacker.example"}
+            assert (await call(headers=foreign))[0] == 403
+            assert (await call(headers={"Origin": "null"}))[0] == 403
+            text = {"Content-Type": "text/plain;charset=UTF-8"}
+            assert (await call(headers=text))[0] == 415
+            assert not server.jobs
+            local = {"Origin": f"http://127.0.0.1:{server.port}"}
+            assert (await call(headers=local))[0] == 202
+
+    asyncio.run(scenario())
+
+
+def test_server_queues_and_cancels_jobs(tmp_path: Path) -> None:
+    server = _server(tmp_path, max_queued=1)
+
+    async def scenario() -> None:
+        async with server:
+            call = partial(_call, server)
+            # Stop the worker so submitted jobs stay queued.
+            assert server._worker is not None
+            server._worker.cancel()
+            status, job = await call("/jobs", {"sources": ["a.zip"]})
+            assert status == 202
+            status, _ = await call("/jobs", {"sources": ["b.zip"]})
+            assert status == 503
+            path = f"/jobs/{job['id']}"
+            status, job = await call(path, method="DELETE")
+            assert status == 200 and job["state"] == "cancelled"
+            status, _ = await call(path, method="DELETE")
+            assert status == 409
+
+    asyncio.run(scenario())
+
+
+def test_server_only_listens_locally(tmp_path: Path) -> None:
+    library, settings = _library(tmp_path)
+    config = ConfigService(app_config_path=settings)
+    config.set_library_path(library)
+    with pytest.raises(ValueError):
+        ApiServer(config, host="0.0.0.0")
@@ -0,0 +1,85 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("PySide6.QtWidgets")
+
+# Generous ceilings so slow CI machines do not flake; a workstation
+# paints the first window in under half a second.
+IMPORT_BUDGET = 1.5
+FIRST_PAINT_BUDGET = 2.0
+
+# Nothing the first page needs; each is imported on first use.
+DEFERRED_MODULES = [
+    "numpy",
+    "PIL.Image",
+    "urllib.request",
+    "asset_organiser.classification.service",
+    "asset_organiser.library.duplicates",
+    "asset_organiser.llm.ollama",
+    "asset_organiser.llm.openai",
+    "asset_organiser.processing.service",
+    "asset_organiser.ui.library",
+    "asset_organiser.ui.settings",
+]
+
+STARTUP_SCRIPT = """
+import json, sys, time
+from pathlib import Path
+
+started = time.perf_counter()
+from PySide6.QtTest import QTest
+from PySide6.QtWidgets import QApplication
+
+from asset_organiser import ConfigService
+from asset_organiser.ui import MainWindow
+
+imported = time.perf_counter()
+app = QApplication([])
+library = Path(sys.argv[1])
+config = ConfigService(app_config_path=library / "settings.json")
+config.set_library_path(library)
+window = MainWindow(config)
+window.show()
+QTest.qWaitForWindowExposed(window)
+app.processEvents()
+painted = time.perf_counter()
+print(json.dumps({
+    "import": imported - started,
+    "first_paint": painted - started,
+    "views": list(window.views),
+    "modules": sorted(sys.modules),
+}))
+"""
+
+
+def _startup(library: Path) -> dict:
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    result = subprocess.run(
+        [sys.executable, "-c", STARTUP_SCRIPT, str(library)],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+        timeout=60,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def test_cold_start_is_lazy_and_within_budget(
+    tmp_path: Path,
+    record_property,
+) -> None:
+    timings = _startup(tmp_path)
+    record_property("import_seconds", round(timings["import"], 3))
+    record_property("first_paint_seconds", round(timings["first_paint"], 3))
+
+    assert timings["views"] == ["Workspace"]
+    loaded = set(timings["modules"])
+    assert [name for name in DEFERRED_MODULES if name in loaded] == []
+    assert timings["import"] < IMPORT_BUDGET
+    assert timings["first_paint"] < FIRST_PAINT_BUDGET
@@ -0,0 +1,76 @@
+import io
+import json
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+from test_cli import _library, _source
+
+from asset_organiser import tracing
+from asset_organiser.cli import build_parser, run_batch
+
+
+@pytest.fixture(autouse=True)
+def _no_tracer():
+    tracing.disable()
+    yield
+    tracing.disable()
+
+
+def _spans(path: Path) -> list[dict]:
+    events = json.loads(path.read_text())["traceEvents"]
+    return [event for event in events if event["ph"] == "X"]
+
+
+def test_spans_nest_across_threads_and_export(tmp_path: Path) -> None:
+    assert tracing.span("idle") is tracing.span("other")
+
+    def work(index: int) -> None:
+        with tracing.span("work", "test", index=index):
+            pass
+
+    with tracing.recording(tmp_path / "trace.json"):
+        with tracing.span("outer", "test") as outer:
+            with ThreadPoolExecutor(2, thread_name_prefix="worker") as pool:
+                list(pool.map(tracing.propagate(work), range(3)))
+            outer.set(done=True)
+        with pytest.raises(KeyError):
+            with tracing.span("broken"):
+                raise KeyError("x")
+    assert tracing.active() is None
+
+    events = json.loads((tmp_path / "trace.json").read_text())["traceEvents"]
+    names = {e["args"]["name"] for e in events if e["ph"] == "M"}
+    assert any(name.startswith("worker") for name in names)
+    spans = {e["name"]: e for e in _spans(tmp_path / "trace.json")}
+    outer_id = spans["outer"]["args"]["id"]
+    assert spans["outer"]["args"]["done"] is True
+    assert spans["outer"]["args"]["parent"] is None
+    work = [e for e in _spans(tmp_path / "trace.json") if e["name"] == "work"]
+    assert sorted(e["args"]["index"] for e in work) == [0, 1, 2]
+    assert all(e["args"]["parent"] == outer_id for e in work)
+    assert all(e["ts"] >= spans["outer"]["ts"] for e in work)
+    assert spans["broken"]["args"]["error"] == "KeyError"
+
+
+def test_batch_trace_covers_scanning_classification_and_processing(
+    tmp_path: Path,
+) -> None:
+    library, settings = _library(tmp_path)
+    source = _source(tmp_path, "bark")
+    trace = tmp_path / "trace.json"
+    argv = [str(source), "--library", str(library), "--no-llm"]
+    argv += ["--settings", str(settings), "--trace", str(trace)]
+    run_batch(build_parser().parse_args(argv), io.StringIO())
+
+    spans = _spans(trace)
+    by_id = {span["args"]["id"]: span for span in spans}
+    names = {span["name"] for span in spans}
+    assert {"collect_files", "classify", "RuleBasedFileTypeModule"} <= names
+    assert {"process", "asset", "decode", "resize", "encode"} <= names
+    for span in spans:
+        if span["name"] == "RuleBasedFileTypeModule":
+            assert by_id[span["args"]["parent"]]["name"] == "classify"
+        if span["name"] == "encode":
+            assert by_id[span["args"]["parent"]]["name"] == "export"
+    assert tracing.active() is None
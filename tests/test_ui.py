@@ -1,18 +1,33 @@
+import json
 import os
+import threading
 from pathlib import Path
 
 import pytest
+from test_library_duplicates import _encoded, _texture
+
+from asset_organiser.library import CatalogEntry, LibraryCatalog
+from asset_organiser.library.duplicates import DuplicateFinder
+from asset_organiser.processing.perceptual import perceptual_hash
 
 os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
 
 try:
     from PySide6.QtCore import Qt
+    from PySide6.QtGui import QImage
     from PySide6.QtTest import QTest
     from PySide6.QtWidgets import QApplication
 
     import asset_organiser.config_models as cm
-    from asset_organiser import ConfigService
-    from asset_organiser.ui import MainWindow, WorkspaceView
+    import asset_organiser.ui as ui
+    from asset_organiser import ConfigService, tracing
+    from asset_organiser.hashing import (
+        SHA256_KEY,
+        SourceFingerprintService,
+        sha256_file,
+    )
+    from asset_organiser.ui import LibraryView, MainWindow, WorkspaceView
+    from asset_organiser.ui.workspace import LOOKALIKES_ROLE, METADATA_ROLE
 except Exception as exc:  # pragma: no cover - environment-specific
     pytest.skip(f"PySide6 not available: {exc}", allow_module_level=True)
 
@@ -60,6 +75,9 @@ def test_workspace_adds_items_and_hotkey(tmp_path: Path) -> None:
     file_path.write_text("x")
     view.add_paths([file_path])
     assert view.tree.topLevelItemCount() == 1
+    assert view.wait_for_background(5000)
+    metadata = view.tree.topLevelItem(0).data(0, METADATA_ROLE)
+    assert metadata[SHA256_KEY] == sha256_file(file_path)
     asset_item = view.tree.topLevelItem(0).child(0)
     file_item = asset_item.child(0)
     view.tree.setCurrentItem(file_item)
@@ -67,3 +85,208 @@ def test_workspace_adds_items_and_hotkey(tmp_path: Path) -> None:
     assert file_item.text(1) == "MAP_COL"
     view.deleteLater()
     app.quit()
+
+
+def test_workspace_flags_reimports_after_background_hashing(
+    tmp_path: Path,
+) -> None:
+    app = QApplication.instance() or QApplication([])
+    service = ConfigService(app_config_path=tmp_path / "settings.json")
+    service.set_library_path(tmp_path / "library")
+    source = tmp_path / "pack"
+    source.mkdir()
+    (source / "bark_col.png").write_bytes(b"png")
+
+    fingerprints = SourceFingerprintService(service.library_path)
+    fingerprints.mark_imported(fingerprints.fingerprint(source), "Bark")
+    fingerprints.save()
+    view = WorkspaceView(service)
+    view.add_paths([source, tmp_path / "missing"])
+    assert view.tree.topLevelItemCount() == 2
+    assert view.wait_for_background(5000)
+    assert view.tree.topLevelItem(0).text(1) == "Already imported (Bark)"
+    # Re-imports are recognised without being classified.
+    assert view.tree.topLevelItem(0).childCount() == 0
+    view.deleteLater()
+    app.quit()
+
+
+def _previewed_library(tmp_path: Path) -> ConfigService:
+    service = ConfigService(app_config_path=tmp_path / "settings.json")
+    service.set_library_path(tmp_path)
+    service.settings.OUTPUT_BASE_DIR = "out"
+    image = QImage(32, 32, QImage.Format_RGB32)
+    image.fill(Qt.red)
+    for name in ("Bark", "Rock"):
+        folder = tmp_path / "out" / "Acme" / "Surface" / name
+        folder.mkdir(parents=True)
+        image.save(str(folder / "col.png"))
+        preview = {"dimensions": [32, 32], "path": "./col.png"}
+        metadata = {
+            "asset_name": name,
+            "asset_type": "Surface",
+            "supplier": "Acme",
+            "files": [
+                {
+                    "type": "MAP_COL",
+                    "resolutions": {"S": preview},
+                }
+            ],
+        }
+        (folder / "metadata.json").write_text(json.dumps(metadata))
+    return service
+
+
+def test_library_view_lists_assets_with_lazy_thumbnails(
+    tmp_path: Path,
+) -> None:
+    app = QApplication.instance() or QApplication([])
+    service = _previewed_library(tmp_path)
+    view = LibraryView(service)
+    view.refresh()
+    assert view.wait_for_scan(5)
+    view.watcher.stop(5)
+    assert view.embedding is None
+    model = view.model
+    assert model.rowCount() == 2
+    assert model.data(model.index(0)) == "Bark"
+    assert len(view.thumbnails) == 0
+    model.data(model.index(0), Qt.DecorationRole)
+    assert model.wait_for_thumbnails(5000)
+    app.processEvents()
+    assert len(view.thumbnails) == 1
+    icon = model.data(model.index(0), Qt.DecorationRole)
+    colour = icon.pixmap(16, 16).toImage().pixelColor(8, 8)
+    assert colour.red() > 240 and colour.green() < 16
+    view.search.setText("r")
+    view._run_search()
+    assert model.rowCount() == 2
+    view.search.setText("ro")
+    view._run_search()
+    assert [model.data(model.index(0)), model.rowCount()] == ["Rock", 1]
+    view.deleteLater()
+    app.quit()
+
+
+def test_library_view_embeds_assets_with_semantic_search(
+    tmp_path: Path,
+) -> None:
+    app = QApplication.instance() or QApplication([])
+    service = _previewed_library(tmp_path)
+    service.library_config.INDEXING.enable_semantic_search = True
+    view = LibraryView(service)
+    view.refresh()
+    assert view.wait_for_scan(5)
+    view.watcher.stop(5)
+    # The scan's changes queue embedding the assets it found.
+    assert view.embedding.wait(10)
+    assert len(view.index) == 2
+    QApplication.processEvents()
+    assert view.indexing_status.text() == "Semantic index up to date"
+    # A pause is kept in the job's checkpoint across restarts.
+    view.pause_btn.click()
+    assert view.embedding.paused
+    assert view.indexing_status.text() == "Indexing paused (2/2)"
+    checkpoint = json.loads(view.embedding.checkpoint_path.read_text())
+    assert checkpoint["paused"] is True
+    view.pause_btn.click()
+    assert not view.embedding.paused
+    view.index.close()
+    view.deleteLater()
+    app.quit()
+
+
+def test_workspace_flags_lookalikes_of_library_images(
+    tmp_path: Path, monkeypatch
+) -> None:
+    app = QApplication.instance() or QApplication([])
+    threads = []
+    find_source = DuplicateFinder.find_source
+
+    def recorded(self, path, max_workers=None):
+        threads.append(threading.current_thread())
+        return find_source(self, path, max_workers)
+
+    monkeypatch.setattr(DuplicateFinder, "find_source", recorded)
+    service = ConfigService(app_config_path=tmp_path / "settings.json")
+    service.set_library_path(tmp_path)
+    service.settings.OUTPUT_BASE_DIR = "out"
+    value = perceptual_hash(_texture(1))
+    output = (tmp_path / "out").resolve()
+    with LibraryCatalog.for_library(tmp_path, output) as catalog:
+        catalog.upsert(
+            CatalogEntry(
+                path="Acme/Surface/Bark",
+                asset_id="Bark",
+                name="Bark",
+                asset_type="Surface",
+                supplier="Acme",
+                image_hashes={"MAP_COL": (value.phash, value.dhash)},
+            )
+        )
+    source = tmp_path / "source"
+    source.mkdir()
+    (source / "bark_col.jpg").write_bytes(_encoded(_texture(1), "JPEG"))
+    (source / "moss_col.png").write_bytes(_encoded(_texture(5)))
+
+    view = WorkspaceView(service)
+    view.add_paths([source])
+    assert view.wait_for_background(5000)
+    source_item = view.tree.topLevelItem(0)
+    assert source_item.text(1) == "1 look-alike(s) in library"
+    flagged = {}
+    for i in range(source_item.childCount()):
+        asset_item = source_item.child(i)
+        for j in range(asset_item.childCount()):
+            item = asset_item.child(j)
+            flagged[item.text(0)] = item.data(0, LOOKALIKES_ROLE)
+    assert flagged["bark_col.jpg"] == ["Acme/Surface/Bark"]
+    assert flagged["moss_col.png"] is None
+    assert threads and threading.main_thread() not in threads
+    view.deleteLater()
+    app.quit()
+
+
+def test_main_window_builds_views_on_first_navigation(tmp_path: Path) -> None:
+    app = QApplication.instance() or QApplication([])
+    service = ConfigService(app_config_path=tmp_path / "settings.json")
+    service.set_library_path(tmp_path)
+    window = MainWindow(service)
+    assert list(window.views) == ["Workspace"]
+    assert window.stack.count() == 3
+
+    window.sidebar.setCurrentRow(1)
+    library = window.views["Library"]
+    assert isinstance(library, LibraryView)
+    assert window.stack.currentWidget() is library
+    assert window.stack.indexOf(library) == 1
+    assert window.view("Library") is library
+    assert isinstance(window.view("Settings"), ui.SettingsView)
+    assert window.stack.count() == 3
+    window.close()
+    app.quit()
+
+
+def test_diagnostics_records_and_exports_trace(tmp_path: Path) -> None:
+    app = QApplication.instance() or QApplication([])
+    service = ConfigService(app_config_path=tmp_path / "settings.json")
+    service.set_library_path(tmp_path)
+    view = ui.SettingsView(service)
+    editor = view.editors["Diagnostics"]
+    assert not editor.export_btn.isEnabled()
+
+    editor.trace_box.setChecked(True)
+    with tracing.span("from-ui"):
+        pass
+    editor.trace_box.setChecked(False)
+    assert tracing.active() is None
+    path = editor.export_trace(tmp_path / "trace.json")
+    events = json.loads(path.read_text())["traceEvents"]
+    assert [e["name"] for e in events if e["ph"] == "X"] == ["from-ui"]
+
+    editor.profile_box.setChecked(True)
+    reloaded = ConfigService(app_config_path=tmp_path / "settings.json")
+    assert reloaded.settings.PROFILING_ENABLED
+    assert ".asset-library" in editor.profile_dir.text()
+    view.deleteLater()
+    app.quit()